@@ -18,7 +18,7 @@ def asignar_periodos_a_evaluaciones():
     """Asignar período actual a evaluaciones existentes"""
     
     # Obtener o crear período actual
-    periodo_actual = PeriodoAcademico.get_periodo_actual()
+    periodo_actual = PeriodoAcademico.obtener_o_crear_periodo_actual()
     print(f"Período actual: {periodo_actual.codigo} - {periodo_actual.nombre}")
     
     # Encontrar evaluaciones sin período
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark de consultas por evaluación en las escrituras de evaluaciones
+
+Cuenta las consultas SQL al registrar N evaluaciones de un estudiante con:
+  1. El camino anterior de crear_evaluaciones_masivas: RAC.objects.get y
+     update_or_create por ítem, con full_clean() en cada save().
+  2. Evaluacion.objects.crear_validada por ítem (validación en memoria).
+  3. La vista crear_evaluaciones_masivas actual (un upsert en bloque).
+
+Todo corre dentro de una transacción que se revierte al final, así que no
+deja datos en la base configurada.
+
+Uso:
+    python benchmark_evaluaciones_consultas.py [evaluaciones]
+"""
+import os
+import sys
+import django
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_grado_api.settings')
+django.setup()
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from competencias.models import RAC, Evaluacion, PeriodoAcademico
+from competencias.views import crear_evaluaciones_masivas
+from usuarios.models import Estudiante, Profesor
+
+
+def crear_estudiante(sufijo):
+    return Estudiante.objects.create(
+        documento=f"9999990{sufijo}", nombre=f"ESTUDIANTE BENCHMARK {sufijo}",
+        correo=f"benchmark{sufijo}@unbosque.edu.co", grupo='1A', estado='matriculado'
+    )
+
+
+def camino_anterior(estudiante, profesor, racs):
+    for rac in racs:
+        rac = RAC.objects.get(id=rac.id)
+        Evaluacion.objects.update_or_create(
+            estudiante_id=estudiante.id, rac_id=rac.id, profesor_id=profesor.id,
+            defaults={'puntaje': 4.0}
+        )
+
+
+def camino_validado(estudiante, profesor, racs):
+    periodo = PeriodoAcademico.obtener_o_crear_periodo_actual()
+    for rac in racs:
+        Evaluacion.objects.crear_validada(estudiante, rac, profesor, 4.0, periodo=periodo)
+
+
+def vista_masivas(estudiante, profesor, racs):
+    request = APIRequestFactory().post('/competencias/api/evaluaciones/masivas/', {
+        'estudiante_id': estudiante.id,
+        'evaluaciones': [{'rac_id': rac.id, 'puntaje': 4.0} for rac in racs],
+    }, format='json')
+    force_authenticate(request, user=profesor)
+    respuesta = crear_evaluaciones_masivas(request)
+    assert respuesta.status_code == 201, respuesta.data
+
+
+def contar(funcion, *args):
+    with CaptureQueriesContext(connection) as consultas:
+        funcion(*args)
+    return len(consultas.captured_queries)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+
+    with transaction.atomic():
+        profesor = Profesor.objects.create_user(
+            correo='benchmark@unbosque.edu.co', nombre='Profesor Benchmark',
+            cedula='99999900', contrasenia='benchmark'
+        )
+        base = (RAC.objects.order_by('-numero').values_list('numero', flat=True).first() or 0) + 1000
+        racs = [RAC.objects.create(numero=base + i, descripcion=f'RAC benchmark {i}') for i in range(total)]
+
+        print(f"📝 {total} evaluaciones nuevas de un estudiante")
+        anteriores = contar(camino_anterior, crear_estudiante(1), profesor, racs)
+        print(f"   update_or_create + full_clean: {anteriores:5d} consultas ({anteriores / total:.1f} por evaluación)")
+        validadas = contar(camino_validado, crear_estudiante(2), profesor, racs)
+        print(f"   crear_validada:                {validadas:5d} consultas ({validadas / total:.1f} por evaluación)")
+        masivas = contar(vista_masivas, crear_estudiante(3), profesor, racs)
+        print(f"   vista masivas (upsert):        {masivas:5d} consultas ({masivas / total:.1f} por evaluación)")
+        print(f"✅ Ahorro en masivas: {(anteriores - masivas) / total:.1f} consultas por evaluación")
+
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark de memoria de la lectura del Excel de grupos (usuarios/importacion.py)
+
+Genera un libro sintético con las siete hojas de grupo y lo recorre de dos
+formas, cada una en un proceso nuevo para que el pico de memoria (ru_maxrss)
+sea solo suyo:
+
+  pandas    el camino anterior: pd.read_excel(sheet_name=None) carga todas las
+            hojas completas antes de procesarlas
+  bloques   openpyxl en modo solo lectura + lotes_hoja_estudiantes, bloques de
+            IMPORTACION_FILAS_POR_LOTE filas
+
+Solo se mide la lectura y normalización, sin escribir en la base de datos.
+
+Uso:
+    python benchmark_importacion_memoria.py [estudiantes_por_hoja ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import django
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_grado_api.settings')
+django.setup()
+
+import pandas as pd
+from django.conf import settings
+from openpyxl import Workbook
+
+from usuarios.importacion import (
+    HOJAS_ESTUDIANTES, abrir_libro_excel, cerrar_libro_excel, filas_hoja, lotes_hoja_estudiantes,
+)
+
+
+def pico_mb():
+    # ru_maxrss está en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def generar_libro(ruta, por_hoja):
+    """Libro con el formato del listado de grupos: mitad prematriculados, mitad matriculados"""
+    libro = Workbook(write_only=True)
+    encabezado = ['No.', 'DOCUMENTO', 'APELLIDOS Y NOMBRES', 'EMAIL INSTITUCIONAL']
+    for h, nombre in enumerate(HOJAS_ESTUDIANTES):
+        hoja = libro.create_sheet(nombre)
+        for fila in (['UNIVERSIDAD EL BOSQUE'], ['LISTADO DE ESTUDIANTES'], [None], [None, 'GRUPO', nombre]):
+            hoja.append(fila)
+        for i in range(por_hoja):
+            if i == 0:
+                hoja.append(['PREMATRICULADOS'])
+                hoja.append(encabezado)
+            elif i == por_hoja // 2:
+                hoja.append(['MATRICULADOS'])
+                hoja.append(encabezado)
+            documento = 10_000_000 + h * por_hoja + i
+            hoja.append([i + 1, documento, f'APELLIDO NOMBRE {documento}', f'est{documento}@unbosque.edu.co'])
+    libro.save(ruta)
+
+
+def medir(modo, ruta):
+    """Se ejecuta en el proceso hijo: lee y normaliza todas las hojas y reporta"""
+    base = pico_mb()
+    inicio = time.perf_counter()
+    estudiantes = 0
+
+    with open(ruta, 'rb') as archivo:
+        if modo == 'pandas':
+            hojas = pd.read_excel(archivo, sheet_name=None, header=None)
+            for nombre in HOJAS_ESTUDIANTES:
+                filas = hojas[nombre].itertuples(index=False, name=None)
+                for lote in lotes_hoja_estudiantes(nombre, filas, {}, len(hojas[nombre])):
+                    estudiantes += len(lote)
+        else:
+            libro = abrir_libro_excel(archivo)
+            try:
+                for nombre in HOJAS_ESTUDIANTES:
+                    filas = filas_hoja(libro, nombre)
+                    for lote in lotes_hoja_estudiantes(nombre, filas, {}, settings.IMPORTACION_FILAS_POR_LOTE):
+                        estudiantes += len(lote)
+            finally:
+                cerrar_libro_excel(libro)
+
+    print(f"{time.perf_counter() - inicio:.2f} {base:.1f} {pico_mb():.1f} {estudiantes}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--modo':
+        medir(sys.argv[2], sys.argv[3])
+        return
+
+    tamanos = [int(valor) for valor in sys.argv[1:]] or [2000, 20000]
+    print(f"📥 Lectura del Excel de grupos (IMPORTACION_FILAS_POR_LOTE={settings.IMPORTACION_FILAS_POR_LOTE})")
+
+    for por_hoja in tamanos:
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'grupos.xlsx')
+            generar_libro(ruta, por_hoja)
+            print(f"   {len(HOJAS_ESTUDIANTES)} hojas x {por_hoja} estudiantes "
+                  f"({os.path.getsize(ruta) / 1024 / 1024:.1f} MB)")
+            for modo in ('pandas', 'bloques'):
+                salida = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--modo', modo, ruta],
+                    capture_output=True, text=True, check=True
+                ).stdout.split()
+                tiempo, base, pico = (float(valor) for valor in salida[:3])
+                print(f"      {modo:8} {tiempo:6.2f}s  {int(salida[3]):7d} estudiantes  "
+                      f"RSS pico +{pico - base:6.1f} MB")
+
+    print("✅ Con bloques el pico no crece con el tamaño del archivo")
+
+
+if __name__ == '__main__':
+    main()
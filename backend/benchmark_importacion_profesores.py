@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark de la importación de profesores (usuarios/importacion.py)
+
+Importa N profesores sintéticos de dos formas, cada una dentro de una
+transacción que se revierte al terminar:
+
+  por_fila   el camino anterior: create_user por profesor, con su hash y su
+             INSERT uno tras otro
+  bloque     importar_filas_profesores: hash de las contraseñas repartido en
+             IMPORTACION_PROCESOS_HASH procesos y un solo bulk_create
+
+Usa el hasher configurado en PASSWORD_HASHERS (PBKDF2 por defecto), que es lo
+que domina el tiempo.
+
+Uso:
+    python benchmark_importacion_profesores.py [profesores ...]
+"""
+import os
+import sys
+import time
+import django
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_grado_api.settings')
+django.setup()
+
+import pandas as pd
+from django.db import transaction
+
+from usuarios.importacion import importar_filas_profesores, procesos_hash
+from usuarios.models import Profesor
+
+
+class Revertir(Exception):
+    pass
+
+
+def filas_sinteticas(cantidad):
+    """Bloque con el formato de lotes_profesores"""
+    cedulas = [str(90_000_000 + i) for i in range(cantidad)]
+    return pd.DataFrame({
+        'fila': range(2, cantidad + 2),
+        'nombre': [f'PROFESOR {cedula}' for cedula in cedulas],
+        'cedula': cedulas,
+        'correo': [f'prof{cedula}@unbosque.edu.co' for cedula in cedulas],
+    })
+
+
+def por_fila(filas):
+    for registro in filas.itertuples(index=False):
+        Profesor.objects.create_user(
+            correo=registro.correo, nombre=registro.nombre, cedula=registro.cedula, contrasenia=registro.cedula
+        )
+    return len(filas)
+
+
+def bloque(filas):
+    return importar_filas_profesores(filas)['creados']
+
+
+def medir(importar, filas):
+    inicio = time.perf_counter()
+    try:
+        with transaction.atomic():
+            creados = importar(filas)
+            raise Revertir
+    except Revertir:
+        pass
+    return time.perf_counter() - inicio, creados
+
+
+def main():
+    tamanos = [int(valor) for valor in sys.argv[1:]] or [50, 200]
+    print(f"👩‍🏫 Importación de profesores ({procesos_hash()} procesos para el hash)")
+
+    for cantidad in tamanos:
+        filas = filas_sinteticas(cantidad)
+        print(f"   {cantidad} profesores")
+        tiempos = {}
+        for nombre, importar in (('por_fila', por_fila), ('bloque', bloque)):
+            tiempo, creados = medir(importar, filas)
+            tiempos[nombre] = tiempo
+            print(f"      {nombre:8} {tiempo:7.2f}s  {creados:5d} creados  {creados / tiempo:8.1f} filas/s")
+        print(f"      aceleración x{tiempos['por_fila'] / tiempos['bloque']:.1f}")
+
+    print("✅ Benchmark terminado (sin cambios en la base de datos)")
+
+
+if __name__ == '__main__':
+    main()
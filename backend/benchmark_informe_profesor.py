@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Benchmark de las estadísticas del informe individual de profesor
+
+Compara el cálculo anterior (una lista por comprensión por puntaje de la escala
+para el profesor, cada materia y cada estudiante) con
+estadisticas_informe_profesor, que acumula todo en una pasada. Usa evaluaciones
+sintéticas en memoria con rac.gacs/rac.materias ya "precargados", así que no
+mide las 7 consultas COUNT por puntaje que el cálculo anterior además hacía a
+la base de datos.
+
+Uso:
+    python benchmark_informe_profesor.py [evaluaciones] [estudiantes]
+"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+import django
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_grado_api.settings')
+django.setup()
+
+from competencias.views import PUNTAJES_INFORME, estadisticas_informe_profesor
+
+
+class Relacion(list):
+    """Imita un related manager con prefetch: all() no consulta la base de datos"""
+
+    def all(self):
+        return self
+
+
+class Objeto(SimpleNamespace):
+    """Modelo sintético que, como las instancias de Django, se puede guardar en sets"""
+    __hash__ = object.__hash__
+
+
+def generar_evaluaciones(total, n_estudiantes, n_racs=40, n_materias=6, n_gacs=8):
+    gacs = [Objeto(numero=g, descripcion=f'GAC {g}') for g in range(1, n_gacs + 1)]
+    materias = [Objeto(id=m, nombre=f'MATERIA {m}') for m in range(1, n_materias + 1)]
+    racs = [
+        Objeto(
+            numero=r,
+            gacs=Relacion([gacs[r % n_gacs], gacs[(r * 3) % n_gacs]]),
+            materias=Relacion([materias[r % n_materias]]),
+        )
+        for r in range(1, n_racs + 1)
+    ]
+    estudiantes = [Objeto(id=i, nombre=f'ESTUDIANTE {i:05d}') for i in range(n_estudiantes)]
+    return [
+        Objeto(
+            estudiante=estudiantes[i % n_estudiantes],
+            rac=racs[i % n_racs],
+            puntaje=PUNTAJES_INFORME[(i * 7) % len(PUNTAJES_INFORME)],
+        )
+        for i in range(total)
+    ]
+
+
+def estadisticas_anteriores(evaluaciones):
+    """Cálculo previo de la vista, sin sus consultas a la base de datos"""
+    estadisticas_puntaje = {p: len([e for e in evaluaciones if e.puntaje == p]) for p in PUNTAJES_INFORME}
+
+    materias_stats = {}
+    for evaluacion in evaluaciones:
+        for materia in evaluacion.rac.materias.all():
+            materia_key = f"{materia.nombre} (ID: {materia.id})"
+            if materia_key not in materias_stats:
+                materias_stats[materia_key] = {'materia': materia, 'evaluaciones': [], 'estudiantes': set(), 'racs': set()}
+            materias_stats[materia_key]['evaluaciones'].append(evaluacion)
+            materias_stats[materia_key]['estudiantes'].add(evaluacion.estudiante)
+            materias_stats[materia_key]['racs'].add(evaluacion.rac)
+    for data in materias_stats.values():
+        evaluaciones_materia = data['evaluaciones']
+        data['promedio'] = sum(e.puntaje for e in evaluaciones_materia) / len(evaluaciones_materia)
+        data['estadisticas_puntaje'] = {
+            p: len([e for e in evaluaciones_materia if e.puntaje == p]) for p in PUNTAJES_INFORME
+        }
+
+    estudiantes_detalle = {}
+    for evaluacion in evaluaciones:
+        estudiante = evaluacion.estudiante
+        if estudiante.id not in estudiantes_detalle:
+            estudiantes_detalle[estudiante.id] = {'estudiante': estudiante, 'evaluaciones': [], 'materias': set(), 'gacs': {}}
+        detalle = estudiantes_detalle[estudiante.id]
+        detalle['evaluaciones'].append(evaluacion)
+        for materia in evaluacion.rac.materias.all():
+            detalle['materias'].add(materia.nombre)
+        for gac in evaluacion.rac.gacs.all():
+            if gac.numero not in detalle['gacs']:
+                detalle['gacs'][gac.numero] = {'descripcion': gac.descripcion, 'evaluaciones': [], 'promedio': 0}
+            detalle['gacs'][gac.numero]['evaluaciones'].append(evaluacion.puntaje)
+    for data in estudiantes_detalle.values():
+        evaluaciones_estudiante = data['evaluaciones']
+        data['promedio'] = sum(e.puntaje for e in evaluaciones_estudiante) / len(evaluaciones_estudiante)
+        for gac_data in data['gacs'].values():
+            gac_data['promedio'] = round(sum(gac_data['evaluaciones']) / len(gac_data['evaluaciones']), 2)
+        data['estadisticas_puntaje'] = {
+            p: len([e for e in evaluaciones_estudiante if e.puntaje == p]) for p in PUNTAJES_INFORME
+        }
+    return estadisticas_puntaje, materias_stats, estudiantes_detalle
+
+
+def medir(funcion, evaluaciones, repeticiones=5):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(evaluaciones)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    estudiantes = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    evaluaciones = generar_evaluaciones(total, estudiantes)
+
+    print(f"👨‍🏫 Profesor con {total:,} evaluaciones de {estudiantes} estudiantes")
+    t_anterior, (puntajes, materias_ant, detalle_ant) = medir(estadisticas_anteriores, evaluaciones)
+    print(f"   Listas por puntaje:  {t_anterior * 1000:8.1f} ms")
+    t_nuevo, (generales, materias, detalle) = medir(estadisticas_informe_profesor, evaluaciones)
+    print(f"   Una pasada:          {t_nuevo * 1000:8.1f} ms")
+
+    iguales = (
+        puntajes == generales['estadisticas_puntaje']
+        and all(materias[k]['estadisticas_puntaje'] == d['estadisticas_puntaje'] for k, d in materias_ant.items())
+        and all(detalle[k]['estadisticas_puntaje'] == d['estadisticas_puntaje']
+                and detalle[k]['gacs'] == d['gacs'] for k, d in detalle_ant.items())
+    )
+    print(f"{'✅' if iguales else '❌'} Resultados {'idénticos' if iguales else 'distintos'}; "
+          f"aceleración: {t_anterior / t_nuevo:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
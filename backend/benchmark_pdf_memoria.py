@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark de memoria de la salida de PDFs (competencias/informes_pdf.py)
+
+Genera un informe grande con datos sintéticos de dos formas, cada una en un
+proceso nuevo para que el pico de memoria (ru_maxrss) sea solo suyo:
+
+  bytesio   el camino anterior: BytesIO → getvalue() → HttpResponse
+  archivo   SpooledTemporaryFile (a disco por encima de PDF_MEMORIA_MAX_MB)
+            → FileResponse por bloques
+
+En ambos casos se consume la respuesta completa, como haría el servidor.
+
+Uso:
+    python benchmark_pdf_memoria.py [estudiantes]
+"""
+import os
+import resource
+import subprocess
+import sys
+import time
+import django
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_grado_api.settings')
+django.setup()
+
+from io import BytesIO
+from django.http import HttpResponse
+from reportlab.platypus import SimpleDocTemplate
+
+from benchmark_pdf_paralelo import generar_secciones
+from competencias import informes_pdf, pdf_paralelo
+
+OPCIONES = dict(informes_pdf.MARGENES_INFORME)
+
+
+def pico_mb():
+    # ru_maxrss está en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def actual_mb():
+    # RSS en este momento (Linux); 0 si /proc no está disponible
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() / 1024 / 1024
+    except OSError:
+        return 0.0
+
+
+def story(estudiantes):
+    return pdf_paralelo.story_estudiantes_por_semestre(
+        generar_secciones(estudiantes), {'fecha': '01/01/2025 00:00'}, True
+    )
+
+
+def medir(modo, estudiantes):
+    """Se ejecuta en el proceso hijo: genera, consume la respuesta y reporta"""
+    contenido = story(estudiantes)
+    base = pico_mb()
+    antes = actual_mb()
+    inicio = time.perf_counter()
+
+    if modo == 'bytesio':
+        buffer = BytesIO()
+        SimpleDocTemplate(buffer, **OPCIONES).build(contenido)
+        buffer.seek(0)
+        respuesta = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+        bloques = iter(respuesta)
+    else:
+        respuesta = informes_pdf.informe_pdf(contenido, 'benchmark', **OPCIONES)
+        bloques = iter(respuesta.streaming_content)
+
+    # Memoria que sigue ocupada mientras se envía el primer bloque a un cliente lento
+    enviados = len(next(bloques))
+    retenida = actual_mb() - antes
+    enviados += sum(len(bloque) for bloque in bloques)
+    respuesta.close()
+
+    print(f"{time.perf_counter() - inicio:.2f} {base:.1f} {pico_mb():.1f} {retenida:.1f} {enviados}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--modo':
+        medir(sys.argv[2], int(sys.argv[3]))
+        return
+
+    estudiantes = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    print(f"📄 Informe de {estudiantes} estudiantes (PDF_MEMORIA_MAX_MB={informes_pdf.settings.PDF_MEMORIA_MAX_MB})")
+
+    resultados = {}
+    for modo in ('bytesio', 'archivo'):
+        salida = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--modo', modo, str(estudiantes)],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        tiempo, base, pico, retenida = (float(valor) for valor in salida[:4])
+        enviados = int(salida[4])
+        resultados[modo] = (pico - base, retenida)
+        print(f"   {modo:8} {tiempo:6.2f}s  PDF {enviados / 1024 / 1024:5.1f} MB  "
+              f"RSS pico {pico:6.1f} MB (+{pico - base:5.1f} MB sobre la story)  "
+              f"retenida durante el envío {retenida:5.1f} MB")
+
+    (pico_antes, retenida_antes), (pico_despues, retenida_despues) = resultados['bytesio'], resultados['archivo']
+    print(f"✅ Pico por informe: {pico_antes:.1f} MB → {pico_despues:.1f} MB; "
+          f"retenida durante el envío: {retenida_antes:.1f} MB → {retenida_despues:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Benchmark del renderizado por fragmentos (competencias/pdf_paralelo.py)
+
+Genera el informe de estudiantes por semestre con datos sintéticos en un solo
+proceso y repartido en N procesos, y compara el tiempo total. No usa la base de
+datos: mide solo la construcción del PDF, que es la parte que se reparte.
+
+Uso:
+    python benchmark_pdf_paralelo.py [estudiantes] [procesos]
+"""
+import os
+import sys
+import time
+import django
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_grado_api.settings')
+django.setup()
+
+from competencias import pdf_paralelo
+
+
+def semestre(promedio, n_gacs=8):
+    return {
+        'resumen_general': {'promedio_general': promedio, 'total_evaluaciones': n_gacs * 3},
+        'grafico_gacs': [{'gac': f'GAC {g}', 'promedio': (promedio + g / 10) % 5} for g in range(1, n_gacs + 1)],
+    }
+
+
+def generar_secciones(n):
+    secciones = []
+    for i in range(n):
+        segundo = i % 2 == 0
+        secciones.append({
+            'nombre': f'ESTUDIANTE SINTÉTICO {i:05d}',
+            'grupo': '2A' if segundo else '1A',
+            'documento': str(10_000_000 + i),
+            'segundo_semestre': segundo,
+            'resultados': {
+                'primer_semestre': semestre(3.2),
+                'segundo_semestre': semestre(3.8),
+                'filtrado': semestre(3.5),
+            },
+        })
+    return secciones
+
+
+def medir(procesos, secciones):
+    inicio = time.perf_counter()
+    pdf = pdf_paralelo.renderizar_por_fragmentos(
+        pdf_paralelo.story_estudiantes_por_semestre,
+        secciones,
+        contexto={'fecha': '01/01/2025 00:00'},
+        procesos=procesos,
+        rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18
+    )
+    return time.perf_counter() - inicio, len(pdf)
+
+
+def main():
+    estudiantes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    secciones = generar_secciones(estudiantes)
+
+    print(f"📄 Informe de {estudiantes} estudiantes, {os.cpu_count()} núcleo(s) disponibles")
+    if pdf_paralelo.PdfWriter is None:
+        print("⚠️  pypdf no está instalado: ambos modos se renderizan en serie")
+
+    t_serie, tamano_serie = medir(1, secciones)
+    print(f"   1 proceso:    {t_serie:7.2f}s  ({tamano_serie / 1024:,.0f} KB)")
+
+    t_paralelo, tamano_paralelo = medir(procesos, secciones)
+    print(f"   {procesos} procesos:   {t_paralelo:7.2f}s  ({tamano_paralelo / 1024:,.0f} KB)")
+    print(f"✅ Aceleración: {t_serie / t_paralelo:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+Benchmark del motor columnar de resultados_globales (competencias/analytics.py)
+
+Compara, con datos sintéticos de 10k, 100k y 1M evaluaciones:
+  - referencia: los bucles en Python de la implementación anterior (diccionarios de
+    listas por GAC, materia, profesor, estudiante y semestre) sobre tuplas ya cargadas
+  - numpy: calcular_resultados_globales sobre DatosColumnares
+
+La referencia no incluye el costo de instanciar modelos con select_related /
+prefetch_related, así que la comparación favorece a la implementación anterior.
+
+Uso:
+    python benchmark_resultados_globales.py [tamaño ...]
+"""
+import os
+import sys
+import time
+import django
+
+# Configurar Django
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_grado_api.settings')
+django.setup()
+
+import numpy as np
+
+from competencias.analytics import (
+    DatosColumnares, Dimension, calcular_resultados_globales,
+    GRUPOS_PRIMER_SEMESTRE, GRUPOS_SEGUNDO_SEMESTRE,
+)
+
+TAMANOS = [10_000, 100_000, 1_000_000]
+PUNTAJES = np.array([0, 1, 2, 3, 3.5, 4, 5])
+GRUPOS = GRUPOS_PRIMER_SEMESTRE + GRUPOS_SEGUNDO_SEMESTRE + ['3A']
+
+
+def generar_datos(n, semilla=2025):
+    """Evaluaciones sintéticas con proporciones parecidas a las reales"""
+    rng = np.random.default_rng(semilla)
+    n_estudiantes = max(50, n // 40)
+    n_profesores, n_racs, n_gacs, n_materias = 40, 120, 12, 30
+
+    estudiantes = Dimension(
+        np.arange(1, n_estudiantes + 1),
+        nombre=[f"ESTUDIANTE {i}" for i in range(n_estudiantes)],
+        grupo=[GRUPOS[i % len(GRUPOS)] for i in range(n_estudiantes)],
+    )
+    profesores = Dimension(np.arange(1, n_profesores + 1), nombre=[f"Profesor {i}" for i in range(n_profesores)])
+    racs = Dimension(
+        np.arange(1, n_racs + 1),
+        numero=list(range(1, n_racs + 1)),
+        descripcion=[f"RAC {i}" for i in range(1, n_racs + 1)],
+    )
+    gacs = Dimension(
+        np.arange(1, n_gacs + 1),
+        numero=list(range(1, n_gacs + 1)),
+        descripcion=[f"GAC {i}" for i in range(1, n_gacs + 1)],
+    )
+    materias = Dimension(np.arange(1, n_materias + 1), nombre=[f"Materia {i}" for i in range(n_materias)])
+
+    # Cada RAC pertenece a 1-2 GACs y a 1-3 materias
+    rac_gac = [(r, g) for r in range(1, n_racs + 1) for g in {r % n_gacs + 1, (r * 7) % n_gacs + 1}]
+    rac_materia = [(r, m) for r in range(1, n_racs + 1) for m in {r % n_materias + 1, (r * 3) % n_materias + 1}]
+
+    columnas = {
+        'estudiante_id': rng.integers(1, n_estudiantes + 1, n),
+        'profesor_id': rng.integers(1, n_profesores + 1, n),
+        'rac_id': rng.integers(1, n_racs + 1, n),
+        'periodo_id': rng.integers(1, 4, n),
+        'puntaje': rng.choice(PUNTAJES, n),
+        'fecha': rng.uniform(1.7e9, 1.76e9, n),
+    }
+    return DatosColumnares(
+        columnas, estudiantes, profesores, racs, gacs, materias,
+        rac_gac=tuple(zip(*rac_gac)), rac_materia=tuple(zip(*rac_materia)),
+    ), columnas, rac_gac, rac_materia
+
+
+def referencia(columnas, estudiantes, rac_gac, rac_materia):
+    """Bucles de la implementación anterior sobre tuplas (sin ORM)"""
+    gacs_de_rac, materias_de_rac = {}, {}
+    for r, g in rac_gac:
+        gacs_de_rac.setdefault(r, []).append(g)
+    for r, m in rac_materia:
+        materias_de_rac.setdefault(r, []).append(m)
+    grupo_de = dict(zip(estudiantes.ids.tolist(), estudiantes.grupo))
+
+    filas = zip(
+        columnas['estudiante_id'].tolist(), columnas['profesor_id'].tolist(),
+        columnas['rac_id'].tolist(), columnas['puntaje'].tolist(),
+    )
+    por_profesor, por_estudiante, gacs_stats, materias_stats = {}, {}, {}, {}
+    for estudiante, profesor, rac, puntaje in filas:
+        por_profesor.setdefault(profesor, []).append(puntaje)
+        por_estudiante.setdefault(estudiante, []).append(puntaje)
+        grupo = grupo_de[estudiante]
+        for destino, stats in ((gacs_de_rac.get(rac, []), gacs_stats), (materias_de_rac.get(rac, []), materias_stats)):
+            for clave in destino:
+                datos = stats.setdefault(clave, {'puntajes': [], 'primer_semestre': [], 'segundo_semestre': []})
+                datos['puntajes'].append(puntaje)
+                if grupo in GRUPOS_PRIMER_SEMESTRE:
+                    datos['primer_semestre'].append(puntaje)
+                elif grupo in GRUPOS_SEGUNDO_SEMESTRE:
+                    datos['segundo_semestre'].append(puntaje)
+
+    def promedio(valores):
+        return round(sum(valores) / len(valores), 2) if valores else 0
+
+    return {
+        'gacs': {g: promedio(d['puntajes']) for g, d in gacs_stats.items()},
+        'materias': {m: promedio(d['puntajes']) for m, d in materias_stats.items()},
+        'profesores': {p: promedio(v) for p, v in por_profesor.items()},
+        'estudiantes': {e: promedio(v) for e, v in por_estudiante.items()},
+    }
+
+
+def medir(funcion, repeticiones=3):
+    mejor = float('inf')
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    tamanos = [int(t) for t in sys.argv[1:]] or TAMANOS
+    print("📊 Benchmark resultados_globales (mejor de 3, segundos)")
+    print(f"{'evaluaciones':>14} {'referencia':>12} {'numpy':>10} {'numpy+detalle':>14} {'aceleración':>12}")
+
+    for n in tamanos:
+        datos, columnas, rac_gac, rac_materia = generar_datos(n)
+        repeticiones = 1 if n >= 1_000_000 else 3
+
+        t_ref, ref = medir(lambda: referencia(columnas, datos.estudiantes, rac_gac, rac_materia), repeticiones)
+        t_np, res = medir(lambda: calcular_resultados_globales(datos, incluir_detalle=False), repeticiones)
+        t_det, _ = medir(lambda: calcular_resultados_globales(datos), repeticiones)
+
+        # Verificar que ambos cálculos coinciden
+        gacs_np = {int(g['gac_numero']): g['promedio_general'] for g in res['gacs_por_semestre']}
+        assert gacs_np == ref['gacs'], "Los promedios por GAC no coinciden"
+        assert len(res['materias_por_semestre']) == len(ref['materias'])
+
+        print(f"{n:>14,} {t_ref:>12.3f} {t_np:>10.3f} {t_det:>14.3f} {t_ref / t_np:>11.1f}x")
+
+    print("✅ Resultados equivalentes en todos los tamaños")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+"""
+Motor de analítica columnar (NumPy) para resultados_globales.
+
+Las evaluaciones se cargan con values_list en arreglos NumPy, una columna por
+campo, y las relaciones RAC→GAC y RAC→Materia se expanden con arreglos de
+índices. Todos los promedios, conteos y tasas de aprobación agrupados se
+calculan con operaciones vectorizadas (bincount, unique, repeat) en lugar de
+instanciar modelos y recorrer evaluaciones en Python.
+"""
+import numpy as np
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+from usuarios.models import Estudiante, Profesor
+from .models import GAC, RAC, Materia, Evaluacion, GRUPOS_PRIMER_SEMESTRE, GRUPOS_SEGUNDO_SEMESTRE
+
+# Códigos de semestre por evaluación
+SIN_SEMESTRE, PRIMER_SEMESTRE, SEGUNDO_SEMESTRE = 0, 1, 2
+
+
+class Dimension:
+    """Tabla de dimensión (estudiantes, GACs, ...) con ids ordenados y atributos alineados"""
+
+    def __init__(self, ids, **atributos):
+        ids = np.asarray(ids, dtype=np.int64)
+        orden = np.argsort(ids, kind='stable')
+        self.ids = ids[orden]
+        for nombre, valores in atributos.items():
+            setattr(self, nombre, [valores[i] for i in orden])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def posiciones(self, ids):
+        """Posición densa (0..n-1) de cada id"""
+        return np.searchsorted(self.ids, np.asarray(ids, dtype=np.int64))
+
+
+class DatosColumnares:
+    """Evaluaciones en columnas NumPy más las dimensiones y relaciones que necesitan los informes"""
+
+    CAMPOS = ('estudiante_id', 'profesor_id', 'rac_id', 'periodo_id', 'puntaje', 'fecha')
+
+    def __init__(self, columnas, estudiantes, profesores, racs, gacs, materias, rac_gac, rac_materia):
+        self.estudiantes = estudiantes
+        self.profesores = profesores
+        self.racs = racs
+        self.gacs = gacs
+        self.materias = materias
+
+        self.puntaje = np.asarray(columnas['puntaje'], dtype=np.float64)
+        self.periodo = np.asarray(columnas['periodo_id'], dtype=np.int64)
+        self.fecha = np.asarray(columnas['fecha'], dtype=np.float64)
+        self.estudiante = estudiantes.posiciones(columnas['estudiante_id'])
+        self.profesor = profesores.posiciones(columnas['profesor_id'])
+        self.rac = racs.posiciones(columnas['rac_id'])
+
+        # Relaciones M2M como pares de posiciones (rac, destino)
+        self.rac_gac = (racs.posiciones(rac_gac[0]), gacs.posiciones(rac_gac[1]))
+        self.rac_materia = (racs.posiciones(rac_materia[0]), materias.posiciones(rac_materia[1]))
+
+        # Semestre de cada evaluación según el grupo del estudiante
+        semestre_estudiante = np.array([
+            PRIMER_SEMESTRE if grupo in GRUPOS_PRIMER_SEMESTRE
+            else SEGUNDO_SEMESTRE if grupo in GRUPOS_SEGUNDO_SEMESTRE
+            else SIN_SEMESTRE
+            for grupo in estudiantes.grupo
+        ], dtype=np.int8)
+        self.semestre = semestre_estudiante[self.estudiante] if len(estudiantes) else np.zeros(0, dtype=np.int8)
+
+    def __len__(self):
+        return len(self.puntaje)
+
+    @classmethod
+    def desde_bd(cls, evaluaciones=None):
+        """Cargar columnas con values_list (periodo nulo → 0, fecha como timestamp)"""
+        if evaluaciones is None:
+            evaluaciones = Evaluacion.objects.all()
+
+        filas = list(evaluaciones.values_list(
+            'estudiante_id', 'profesor_id', 'rac_id',
+            Coalesce('periodo_id', Value(0)), 'puntaje', 'fecha'
+        ))
+        if filas:
+            estudiante, profesor, rac, periodo, puntaje, fecha = zip(*filas)
+            fecha = [f.timestamp() for f in fecha]
+        else:
+            estudiante = profesor = rac = periodo = puntaje = fecha = ()
+        columnas = dict(zip(cls.CAMPOS, (estudiante, profesor, rac, periodo, puntaje, fecha)))
+
+        def dimension(queryset, *campos):
+            valores = list(queryset.values_list('id', *campos))
+            columnas_dim = list(zip(*valores)) if valores else [()] * (len(campos) + 1)
+            return Dimension(columnas_dim[0], **{
+                nombre: list(columna) for nombre, columna in zip(campos, columnas_dim[1:])
+            })
+
+        def relacion(through, destino):
+            pares = list(through.objects.values_list('rac_id', destino))
+            return tuple(zip(*pares)) if pares else ((), ())
+
+        return cls(
+            columnas,
+            estudiantes=dimension(Estudiante.objects.order_by(), 'nombre', 'grupo'),
+            profesores=dimension(Profesor.objects.order_by(), 'nombre'),
+            racs=dimension(RAC.objects.order_by(), 'numero', 'descripcion'),
+            gacs=dimension(GAC.objects.order_by(), 'numero', 'descripcion'),
+            materias=dimension(Materia.objects.order_by(), 'nombre'),
+            rac_gac=relacion(RAC.gacs.through, 'gac_id'),
+            rac_materia=relacion(Materia.racs.through, 'materia_id'),
+        )
+
+
+def expandir_relacion(rac_evaluacion, pares, n_racs):
+    """
+    Repetir cada evaluación una vez por cada destino (GAC o materia) de su RAC.
+
+    Devuelve (índice de evaluación, índice de destino) con una fila por par.
+    """
+    rac_par, destino_par = pares
+    orden = np.argsort(rac_par, kind='stable')
+    destino_par = np.asarray(destino_par)[orden]
+
+    por_rac = np.bincount(rac_par, minlength=n_racs)
+    inicio = np.cumsum(por_rac) - por_rac
+    repeticiones = por_rac[rac_evaluacion]
+
+    evaluacion = np.repeat(np.arange(len(rac_evaluacion)), repeticiones)
+    desplazamiento = np.arange(len(evaluacion)) - np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+    destino = destino_par[inicio[rac_evaluacion[evaluacion]] + desplazamiento]
+    return evaluacion, destino
+
+
+def agrupar(grupos, puntajes, n_grupos):
+    """(conteo, suma, aprobadas) por grupo"""
+    conteo = np.bincount(grupos, minlength=n_grupos)
+    suma = np.bincount(grupos, weights=puntajes, minlength=n_grupos)
+    aprobadas = np.bincount(grupos, weights=(puntajes >= 3).astype(np.float64), minlength=n_grupos)
+    return conteo, suma, aprobadas.astype(np.int64)
+
+
+def promedios(conteo, suma):
+    """suma / conteo, 0 donde no hay evaluaciones"""
+    return np.divide(suma, conteo, out=np.zeros(len(suma)), where=conteo > 0)
+
+
+def contar_distintos(valores):
+    """Número de valores distintos de un arreglo de índices"""
+    return int(np.unique(valores).size)
+
+
+def _por_semestre(indices, semestres, puntajes, n_grupos):
+    """Conteo y promedio por grupo para el total, primer y segundo semestre"""
+    resultado = {}
+    for clave, mascara in (
+        ('general', slice(None)),
+        ('primer_semestre', semestres == PRIMER_SEMESTRE),
+        ('segundo_semestre', semestres == SEGUNDO_SEMESTRE),
+    ):
+        conteo, suma, _ = agrupar(indices[mascara], puntajes[mascara], n_grupos)
+        resultado[clave] = (conteo, promedios(conteo, suma))
+    return resultado
+
+
+def _grafico(dimension, nombres, indices, puntajes, etiqueta):
+    """Promedio por elemento de la dimensión, solo los evaluados, de mayor a menor"""
+    conteo, suma, _ = agrupar(indices, puntajes, len(dimension))
+    promedio = promedios(conteo, suma)
+    evaluados = np.flatnonzero(conteo)
+    orden = evaluados[np.argsort(-promedio[evaluados], kind='stable')]
+    return [{etiqueta: nombres[i], "promedio": round(float(promedio[i]), 2)} for i in orden]
+
+
+def calcular_resultados_globales(datos, incluir_detalle=True):
+    """Mismo contenido que la respuesta de resultados_globales, calculado sobre columnas"""
+    puntaje = datos.puntaje
+    semestre = datos.semestre
+    n = len(datos)
+    primer = semestre == PRIMER_SEMESTRE
+    segundo = semestre == SEGUNDO_SEMESTRE
+
+    def promedio_de(mascara=slice(None)):
+        valores = puntaje[mascara]
+        return round(float(valores.mean()), 2) if len(valores) else 0
+
+    # Expansión RAC→GAC y RAC→Materia
+    eval_gac, gac = expandir_relacion(datos.rac, datos.rac_gac, len(datos.racs))
+    eval_materia, materia = expandir_relacion(datos.rac, datos.rac_materia, len(datos.racs))
+
+    gacs_semestre = _por_semestre(gac, semestre[eval_gac], puntaje[eval_gac], len(datos.gacs))
+    materias_semestre = _por_semestre(materia, semestre[eval_materia], puntaje[eval_materia], len(datos.materias))
+
+    def por_semestre(semestres, i):
+        conteo_general, promedio_general = semestres['general']
+        return {
+            'promedio_general': round(float(promedio_general[i]), 2),
+            'primer_semestre': {
+                'promedio': round(float(semestres['primer_semestre'][1][i]), 2),
+                'total_evaluaciones': int(semestres['primer_semestre'][0][i])
+            },
+            'segundo_semestre': {
+                'promedio': round(float(semestres['segundo_semestre'][1][i]), 2),
+                'total_evaluaciones': int(semestres['segundo_semestre'][0][i])
+            }
+        }
+
+    gacs_evaluados = np.flatnonzero(gacs_semestre['general'][0])
+    gacs_por_semestre = [
+        {
+            'gac_numero': str(datos.gacs.numero[i]),
+            'gac_descripcion': datos.gacs.descripcion[i],
+            **por_semestre(gacs_semestre, i)
+        }
+        for i in gacs_evaluados
+    ]
+    gacs_por_semestre.sort(key=lambda x: x['promedio_general'], reverse=True)
+
+    grafico_gacs = [
+        {
+            "gac": f"GAC {g['gac_numero']}",
+            "descripcion": g['gac_descripcion'],
+            "promedio": g['promedio_general'],
+        }
+        for g in gacs_por_semestre
+    ]
+
+    materias_por_semestre = [
+        {'materia_nombre': datos.materias.nombre[i], **por_semestre(materias_semestre, i)}
+        for i in np.flatnonzero(materias_semestre['general'][0])
+    ]
+    materias_por_semestre.sort(key=lambda x: x['promedio_general'], reverse=True)
+
+    data = {
+        "resumen_general": {
+            "promedio_general": promedio_de(),
+            "promedio_primer_semestre": promedio_de(primer),
+            "promedio_segundo_semestre": promedio_de(segundo),
+            "total_evaluaciones": n,
+            "total_evaluaciones_primer": int(primer.sum()),
+            "total_evaluaciones_segundo": int(segundo.sum()),
+            "total_gacs_evaluados": len(gacs_evaluados),
+            "total_racs_evaluados": contar_distintos(datos.rac),
+            "total_estudiantes": contar_distintos(datos.estudiante),
+            "total_estudiantes_primer": contar_distintos(datos.estudiante[primer]),
+            "total_estudiantes_segundo": contar_distintos(datos.estudiante[segundo]),
+            "total_profesores": contar_distintos(datos.profesor),
+            "total_materias": contar_distintos(materia),
+        },
+        "grafico_profesores": _grafico(datos.profesores, datos.profesores.nombre, datos.profesor, puntaje, "profesor"),
+        "grafico_gacs": grafico_gacs,
+        "grafico_estudiantes": _grafico(datos.estudiantes, datos.estudiantes.nombre, datos.estudiante, puntaje, "estudiante"),
+        "gacs_por_semestre": gacs_por_semestre,
+        "materias_por_semestre": materias_por_semestre,
+    }
+
+    if incluir_detalle:
+        estudiantes, profesores, racs = datos.estudiantes, datos.profesores, datos.racs
+        data["evaluaciones"] = [
+            {
+                "estudiante": estudiantes.nombre[e],
+                "profesor": profesores.nombre[p],
+                "rac_numero": racs.numero[r],
+                "rac_descripcion": racs.descripcion[r],
+                "puntaje": float(valor),
+            }
+            for e, p, r, valor in zip(
+                datos.estudiante.tolist(), datos.profesor.tolist(), datos.rac.tolist(), puntaje.tolist()
+            )
+        ]
+
+    return data
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CompetenciasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'competencias'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .informes_pdf import estilos_pdf
+
+        # Estilos de los informes listos antes de la primera solicitud
+        estilos_pdf()
@@ -0,0 +1,215 @@
+"""
+Almacén en disco de informes PDF ya generados.
+
+Cada PDF se guarda en MEDIA_ROOT/reportes_cache bajo el sha256 del nombre de
+la vista, sus argumentos, los parámetros de consulta y la versión de datos de
+los artefactos. Esa versión es un archivo del propio directorio que se renueva
+al invalidar la caché de informes (competencias.cache.invalidar_cache), así que
+el servidor y el worker de reportes ven la misma versión aunque sean procesos
+distintos. Al leer un artefacto se actualiza su mtime; al superar la cuota se
+eliminan primero los de mtime más antiguo (LRU).
+
+Las descargas repetidas se sirven con FileResponse y ETag; si el cliente envía
+If-None-Match con la misma etiqueta se responde 304 sin cuerpo.
+"""
+import functools
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponseNotModified
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_VERSION = 'VERSION'
+
+
+def directorio_artefactos():
+    return os.path.join(settings.MEDIA_ROOT, 'reportes_cache')
+
+
+def cuota_artefactos():
+    """Tamaño máximo del almacén en bytes (REPORTES_ARTEFACTOS_CUOTA_MB; 0 lo desactiva)"""
+    return getattr(settings, 'REPORTES_ARTEFACTOS_CUOTA_MB', 200) * 1024 * 1024
+
+
+def _escribir_atomico(ruta, contenido):
+    """Escribir bytes o un archivo abierto en un temporal del mismo directorio y reemplazar de una vez"""
+    directorio = os.path.dirname(ruta)
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            if hasattr(contenido, 'read'):
+                shutil.copyfileobj(contenido, archivo)
+            else:
+                archivo.write(contenido)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def version_artefactos():
+    """Versión de datos compartida por todos los procesos que usan el almacén"""
+    ruta = os.path.join(directorio_artefactos(), ARCHIVO_VERSION)
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            return archivo.read().strip()
+    except FileNotFoundError:
+        renovar_version_artefactos()
+        with open(ruta, encoding='utf-8') as archivo:
+            return archivo.read().strip()
+
+
+def renovar_version_artefactos():
+    """Nueva versión: los artefactos anteriores dejan de servirse y la LRU los expulsa"""
+    try:
+        ruta = os.path.join(directorio_artefactos(), ARCHIVO_VERSION)
+        _escribir_atomico(ruta, f"{time.time_ns()}-{uuid.uuid4().hex}".encode('utf-8'))
+    except OSError as e:
+        logger.warning("No se pudo renovar la versión de artefactos: %s", e)
+
+
+def clave_artefacto(nombre_vista, request, kwargs):
+    """sha256 de la vista, argumentos, parámetros de consulta y versión de datos"""
+    huella = json.dumps({
+        'vista': nombre_vista,
+        'argumentos': sorted((clave, str(valor)) for clave, valor in kwargs.items()),
+        'parametros': sorted((clave, sorted(valores)) for clave, valores in request.GET.lists()),
+        'version': version_artefactos(),
+    }, sort_keys=True)
+    return hashlib.sha256(huella.encode('utf-8')).hexdigest()
+
+
+def _rutas(clave):
+    base = os.path.join(directorio_artefactos(), clave[:2], clave)
+    return f"{base}.pdf", f"{base}.json"
+
+
+def obtener_artefacto(clave):
+    """(ruta del PDF, metadatos) si existe, marcándolo como usado recientemente"""
+    ruta_pdf, ruta_meta = _rutas(clave)
+    try:
+        with open(ruta_meta, encoding='utf-8') as archivo:
+            metadatos = json.load(archivo)
+        os.utime(ruta_pdf)
+    except (OSError, ValueError):
+        return None, None
+    return ruta_pdf, metadatos
+
+
+def guardar_artefacto(clave, contenido, nombre_archivo):
+    """Guardar un PDF (bytes o archivo abierto) y aplicar la cuota del almacén"""
+    ruta_pdf, ruta_meta = _rutas(clave)
+    _escribir_atomico(ruta_pdf, contenido)
+    _escribir_atomico(ruta_meta, json.dumps({'nombre_archivo': nombre_archivo}).encode('utf-8'))
+    expulsar_artefactos()
+
+
+def expulsar_artefactos(cuota=None):
+    """Eliminar los artefactos usados hace más tiempo hasta quedar dentro de la cuota"""
+    cuota = cuota_artefactos() if cuota is None else cuota
+    artefactos = []
+    total = 0
+    for raiz, _, archivos in os.walk(directorio_artefactos()):
+        for nombre in archivos:
+            if not nombre.endswith('.pdf'):
+                continue
+            ruta = os.path.join(raiz, nombre)
+            try:
+                info = os.stat(ruta)
+            except FileNotFoundError:
+                continue
+            artefactos.append((info.st_mtime, info.st_size, ruta))
+            total += info.st_size
+
+    eliminados = 0
+    for _, tamano, ruta in sorted(artefactos):
+        if total <= cuota:
+            break
+        for eliminar in (ruta, ruta[:-len('.pdf')] + '.json'):
+            try:
+                os.remove(eliminar)
+            except FileNotFoundError:
+                pass
+        total -= tamano
+        eliminados += 1
+    return eliminados
+
+
+def _etag_coincide(request, etag, existe):
+    """If-None-Match del cliente; '*' solo coincide si el artefacto existe"""
+    valor = request.META.get('HTTP_IF_NONE_MATCH', '')
+    etiquetas = [e.strip() for e in valor.split(',') if e.strip()]
+    return etag in etiquetas or f'W/{etag}' in etiquetas or ('*' in etiquetas and existe)
+
+
+def _nombre_archivo(respuesta, clave):
+    """Nombre de descarga de la respuesta de la vista"""
+    if getattr(respuesta, 'filename', None):
+        return respuesta.filename
+    disposicion = respuesta.get('Content-Disposition', '')
+    return disposicion.split('filename=')[-1].strip('"') if 'filename=' in disposicion else f"{clave}.pdf"
+
+
+def _respuesta_archivo(ruta_pdf, nombre_archivo, etag):
+    respuesta = FileResponse(
+        open(ruta_pdf, 'rb'), as_attachment=True, filename=nombre_archivo, content_type='application/pdf'
+    )
+    respuesta['ETag'] = etag
+    respuesta['Cache-Control'] = 'private, no-cache'
+    return respuesta
+
+
+def artefacto_pdf(vista):
+    """
+    Decorador para vistas que generan un PDF que no depende del usuario.
+
+    Va debajo de @api_view/@permission_classes, como cache_respuesta. Solo se
+    almacenan respuestas 200 de tipo application/pdf.
+    """
+    @functools.wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if request.method != 'GET' or cuota_artefactos() <= 0:
+            return vista(request, *args, **kwargs)
+
+        try:
+            clave = clave_artefacto(vista.__name__, request, kwargs)
+        except OSError as e:
+            logger.warning("Almacén de artefactos no disponible: %s", e)
+            return vista(request, *args, **kwargs)
+
+        etag = f'"{clave}"'
+        ruta_pdf, metadatos = obtener_artefacto(clave)
+        if _etag_coincide(request, etag, existe=ruta_pdf is not None):
+            respuesta = HttpResponseNotModified()
+            respuesta['ETag'] = etag
+            return respuesta
+
+        if ruta_pdf:
+            return _respuesta_archivo(ruta_pdf, metadatos['nombre_archivo'], etag)
+
+        respuesta = vista(request, *args, **kwargs)
+        # PDFs completos: HttpResponse o FileResponse sobre el archivo temporal del informe
+        archivo = getattr(respuesta, 'file_to_stream', None)
+        if (respuesta.status_code == 200 and respuesta.get('Content-Type') == 'application/pdf'
+                and (archivo is not None or not respuesta.streaming)):
+            try:
+                guardar_artefacto(clave, archivo if archivo is not None else respuesta.content, _nombre_archivo(respuesta, clave))
+                respuesta['ETag'] = etag
+                respuesta['Cache-Control'] = 'private, no-cache'
+            except OSError as e:
+                logger.warning("No se pudo guardar el artefacto %s: %s", clave, e)
+            if archivo is not None:
+                archivo.seek(0)
+        return respuesta
+
+    return envoltura
@@ -0,0 +1,140 @@
+"""
+Caché versionada de las respuestas de lectura de informes y evaluaciones.
+
+Cada respuesta se guarda bajo una clave derivada del nombre de la vista, sus
+argumentos y los parámetros de consulta, usando como `version` de Django la
+"versión de datos de evaluación". Cualquier escritura sobre Evaluacion, RAC,
+GAC, Materia, PeriodoAcademico, Estudiante o Profesor (incluidos cambios M2M) renueva
+esa versión (ver competencias.signals), así que las entradas anteriores dejan
+de leerse y la política MAX_ENTRIES del backend las expulsa con el tiempo.
+
+La versión es el archivo de versión de los artefactos PDF (ver
+competencias.artefactos) y no un valor de la caché: los workers de gunicorn,
+procesar_reportes y procesar_importaciones son procesos distintos y con la
+caché en memoria (LocMem) cada uno vería solo sus propias escrituras.
+"""
+import functools
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from .artefactos import renovar_version_artefactos, version_artefactos
+
+ALIAS_CACHE = 'reportes'
+CLAVE_VERSION = 'competencias:version_datos'
+CLAVE_ACIERTOS = 'competencias:cache_aciertos'
+CLAVE_FALLOS = 'competencias:cache_fallos'
+
+
+def obtener_cache():
+    return caches[ALIAS_CACHE]
+
+
+def version_datos():
+    """
+    Versión actual de los datos de evaluación, compartida por todos los procesos.
+
+    Si el archivo de versión no se puede leer (MEDIA_ROOT sin permisos) se usa
+    un contador en la caché, que solo es compartido con un backend compartido.
+    """
+    try:
+        return version_artefactos()
+    except OSError:
+        return _version_en_cache()
+
+
+def _version_en_cache():
+    cache = obtener_cache()
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        # Si la clave fue expulsada se parte de una marca de tiempo, nunca de
+        # un valor ya usado, para no volver a servir entradas antiguas
+        cache.add(CLAVE_VERSION, int(time.time() * 1000), timeout=None)
+        version = cache.get(CLAVE_VERSION)
+    return version
+
+
+def _incrementar_version():
+    cache = obtener_cache()
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        cache.add(CLAVE_VERSION, int(time.time() * 1000), timeout=None)
+
+
+def invalidar_cache():
+    """Incrementar la versión de datos (y la de los PDFs en disco) al confirmar la transacción actual"""
+    transaction.on_commit(_incrementar_version)
+    transaction.on_commit(renovar_version_artefactos)
+
+
+def _contar(clave):
+    cache = obtener_cache()
+    try:
+        cache.incr(clave)
+    except ValueError:
+        cache.add(clave, 1, timeout=None)
+
+
+def estadisticas_cache():
+    """Aciertos, fallos y versión actual de la caché de reportes"""
+    cache = obtener_cache()
+    aciertos = cache.get(CLAVE_ACIERTOS, 0)
+    fallos = cache.get(CLAVE_FALLOS, 0)
+    consultas = aciertos + fallos
+    return {
+        'aciertos': aciertos,
+        'fallos': fallos,
+        'tasa_aciertos': round(aciertos / consultas * 100, 2) if consultas else 0,
+        'version_datos': version_datos(),
+        'backend': cache.__class__.__name__,
+    }
+
+
+def clave_respuesta(nombre_vista, request, kwargs):
+    """Clave estable a partir de la vista, sus argumentos y los parámetros de consulta"""
+    parametros = sorted((clave, sorted(valores)) for clave, valores in request.GET.lists())
+    argumentos = sorted(kwargs.items())
+    huella = hashlib.sha256(repr((parametros, argumentos)).encode('utf-8')).hexdigest()
+    return f"competencias:respuesta:{nombre_vista}:{huella}"
+
+
+def cache_respuesta(vista):
+    """
+    Decorador para vistas GET de solo lectura cuyo resultado no depende del usuario.
+
+    Va debajo de @api_view/@permission_classes para que la autenticación y los
+    permisos se evalúen antes de consultar la caché. Solo se guardan respuestas 200.
+    """
+    @functools.wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if request.method != 'GET':
+            return vista(request, *args, **kwargs)
+
+        cache = obtener_cache()
+        version = version_datos()
+        clave = clave_respuesta(vista.__name__, request, kwargs)
+
+        almacenada = cache.get(clave, version=version)
+        if almacenada is not None:
+            _contar(CLAVE_ACIERTOS)
+            tipo, contenido, content_type = almacenada
+            if tipo == 'drf':
+                return Response(contenido)
+            return HttpResponse(contenido, content_type=content_type)
+
+        _contar(CLAVE_FALLOS)
+        respuesta = vista(request, *args, **kwargs)
+        if respuesta.status_code == 200 and not respuesta.streaming:
+            if isinstance(respuesta, Response):
+                almacenada = ('drf', respuesta.data, None)
+            else:
+                almacenada = ('http', respuesta.content, respuesta['Content-Type'])
+            cache.set(clave, almacenada, version=version)
+        return respuesta
+
+    return envoltura
@@ -0,0 +1,306 @@
+"""
+Motor común de los informes PDF.
+
+Los estilos de párrafo y las plantillas de TableStyle se crean una sola vez por
+proceso y se comparten entre solicitudes: reportlab solo los lee al construir
+el documento (Table.setStyle copia los comandos), así que no hace falta
+rehacerlos por informe. Las vistas arman la story con las secciones de este
+módulo y devuelven informe_pdf(); un informe nuevo que use estas piezas
+obtiene el mismo camino rápido sin configuración propia.
+
+El documento se escribe en un SpooledTemporaryFile que pasa a disco por encima
+de PDF_MEMORIA_MAX_MB y se envía con FileResponse por bloques, sin copiarlo a
+un HttpResponse.
+
+Los colores se indican por su nombre en reportlab.lib.colors ('darkblue',
+'beige', ...) para que las plantillas se puedan cachear por argumentos.
+"""
+import tempfile
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+
+from django.conf import settings
+from django.http import FileResponse
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+# Márgenes de los informes generales (resumen, GAC, profesor, semestre)
+MARGENES_INFORME = {'rightMargin': 72, 'leftMargin': 72, 'topMargin': 72, 'bottomMargin': 18}
+
+# Tablas de detalle: encabezado 9 con relleno 8 y filas en fuente 8
+COMPACTA = {'fuente': 9, 'fuente_filas': 8, 'relleno_encabezado': 8}
+
+# Tamaño de los bloques con que FileResponse envía el PDF
+BLOQUE_RESPUESTA = 64 * 1024
+
+
+def _color(nombre):
+    return getattr(colors, nombre)
+
+
+@lru_cache(maxsize=None)
+def estilos_pdf():
+    """
+    Estilos de párrafo de todos los informes, creados una vez por proceso.
+
+    El diccionario es compartido: se usa tal cual y no se modifica.
+    """
+    base = getSampleStyleSheet()
+    return {
+        # Informes de estudiante y de profesor
+        'titulo': ParagraphStyle(
+            'TituloPrincipal', parent=base['Heading1'], fontSize=18, spaceAfter=30,
+            alignment=TA_CENTER, textColor=colors.darkblue
+        ),
+        'subtitulo': ParagraphStyle(
+            'Subtitulo', parent=base['Heading2'], fontSize=14, spaceAfter=20,
+            alignment=TA_LEFT, textColor=colors.darkblue
+        ),
+        'texto': ParagraphStyle(
+            'TextoNormal', parent=base['Normal'], fontSize=10, spaceAfter=12, alignment=TA_LEFT
+        ),
+        # Informes generales (resumen, GAC, profesor y materia)
+        'titulo_informe': ParagraphStyle(
+            'TituloInforme', parent=base['Heading1'], fontSize=20, spaceAfter=30,
+            alignment=TA_CENTER, textColor=colors.darkblue, fontName='Helvetica-Bold'
+        ),
+        'subtitulo_informe': ParagraphStyle(
+            'SubtituloInforme', parent=base['Heading2'], fontSize=14, spaceAfter=12,
+            textColor=colors.darkgreen, fontName='Helvetica-Bold'
+        ),
+        'seccion': ParagraphStyle(
+            'Seccion', parent=base['Heading3'], fontSize=12, spaceAfter=8,
+            textColor=colors.darkred, fontName='Helvetica-Bold'
+        ),
+        'encabezado': ParagraphStyle(
+            'Encabezado', parent=base['Heading2'], fontSize=14, spaceAfter=12,
+            textColor=colors.darkblue
+        ),
+        # Texto dentro de celdas de tabla
+        'celda': ParagraphStyle('Celda', parent=base['Normal'], fontSize=8, leading=10, alignment=TA_LEFT),
+        'celda_centro': ParagraphStyle('CeldaCentro', parent=base['Normal'], fontSize=8, leading=10, alignment=TA_CENTER),
+        'normal': base['Normal'],
+        'heading3': base['Heading3'],
+        'heading4': base['Heading4'],
+    }
+
+
+@lru_cache(maxsize=None)
+def estilo_tabla(encabezado='grey', filas='beige', fuente=10, fuente_filas=None, relleno_encabezado=12,
+                 relleno=None, alternas=False, columnas=(), izquierda=(), vertical=None):
+    """
+    Plantilla de TableStyle para tablas con fila de encabezado, cacheada por argumentos.
+
+    - encabezado/filas: colores de fondo (filas=None deja las filas sin fondo)
+    - fuente/fuente_filas: tamaño de letra del encabezado y de los datos
+    - relleno: (vertical, horizontal) para todas las celdas; si no se indica,
+      solo el encabezado lleva relleno inferior (relleno_encabezado)
+    - alternas: filas de datos alternando blanco y gris claro
+    - columnas: pares (índice, color) con fondo propio en las filas de datos
+    - izquierda: columnas de datos alineadas a la izquierda
+    - vertical: alineación vertical de todas las celdas ('TOP', 'MIDDLE')
+    """
+    comandos = [
+        ('BACKGROUND', (0, 0), (-1, 0), _color(encabezado)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), fuente),
+    ]
+    if relleno:
+        vertical_pt, horizontal_pt = relleno
+        comandos += [
+            ('BOTTOMPADDING', (0, 0), (-1, -1), vertical_pt),
+            ('TOPPADDING', (0, 0), (-1, -1), vertical_pt),
+            ('LEFTPADDING', (0, 0), (-1, -1), horizontal_pt),
+            ('RIGHTPADDING', (0, 0), (-1, -1), horizontal_pt),
+        ]
+    else:
+        comandos.append(('BOTTOMPADDING', (0, 0), (-1, 0), relleno_encabezado))
+    if filas:
+        comandos.append(('BACKGROUND', (0, 1), (-1, -1), _color(filas)))
+    comandos.append(('GRID', (0, 0), (-1, -1), 1, colors.black))
+    if fuente_filas:
+        comandos.append(('FONTSIZE', (0, 1), (-1, -1), fuente_filas))
+    if alternas:
+        comandos.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]))
+    for indice, color in columnas:
+        comandos.append(('BACKGROUND', (indice, 1), (indice, -1), _color(color)))
+    for indice in izquierda:
+        comandos.append(('ALIGN', (indice, 1), (indice, -1), 'LEFT'))
+    if vertical:
+        comandos.append(('VALIGN', (0, 0), (-1, -1), vertical))
+    return TableStyle(comandos)
+
+
+@lru_cache(maxsize=None)
+def estilo_clave_valor(fondo='lightgrey', fuente=10, negrita=(), relleno=None, alternas=False):
+    """
+    Plantilla para tablas de dos columnas etiqueta/valor, cacheada por argumentos.
+
+    negrita: columnas en Helvetica-Bold; relleno: (vertical, horizontal) y
+    centrado vertical, o solo relleno inferior de 12 si no se indica.
+    """
+    comandos = [
+        ('BACKGROUND', (0, 0), (0, -1), _color(fondo)),
+        ('BACKGROUND', (1, 0), (1, -1), colors.white),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ]
+    for indice in negrita:
+        comandos.append(('FONTNAME', (indice, 0), (indice, -1), 'Helvetica-Bold'))
+    comandos.append(('FONTSIZE', (0, 0), (-1, -1), fuente))
+    if relleno:
+        vertical_pt, horizontal_pt = relleno
+        comandos += [
+            ('BOTTOMPADDING', (0, 0), (-1, -1), vertical_pt),
+            ('TOPPADDING', (0, 0), (-1, -1), vertical_pt),
+            ('LEFTPADDING', (0, 0), (-1, -1), horizontal_pt),
+            ('RIGHTPADDING', (0, 0), (-1, -1), horizontal_pt),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]
+    else:
+        comandos.append(('BOTTOMPADDING', (0, 0), (-1, -1), 12))
+    comandos.append(('GRID', (0, 0), (-1, -1), 1, colors.black))
+    if alternas:
+        comandos.append(('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.lightgrey, colors.white]))
+    return TableStyle(comandos)
+
+
+def _anchos(anchos):
+    return [ancho * inch for ancho in anchos] if anchos else None
+
+
+# ===============================
+# SECCIONES
+# ===============================
+
+def tabla(datos, anchos=None, **estilo):
+    """Tabla con encabezado; `anchos` en pulgadas y `estilo` según estilo_tabla()"""
+    resultado = Table(datos, colWidths=_anchos(anchos))
+    resultado.setStyle(estilo_tabla(**estilo))
+    return resultado
+
+
+def tabla_clave_valor(filas, anchos=None, **estilo):
+    """Tabla etiqueta/valor; `estilo` según estilo_clave_valor()"""
+    resultado = Table(filas, colWidths=_anchos(anchos))
+    resultado.setStyle(estilo_clave_valor(**estilo))
+    return resultado
+
+
+def encabezado_informe(titulo, estilo='titulo_informe', etiqueta_fecha='Generado el'):
+    """Título del informe, fecha de generación y separación"""
+    estilos = estilos_pdf()
+    return [
+        Paragraph(titulo, estilos[estilo]),
+        Paragraph(f"{etiqueta_fecha}: {datetime.now().strftime('%d/%m/%Y %H:%M')}", estilos['normal']),
+        Spacer(1, 20),
+    ]
+
+
+def seccion_tabla(titulo, datos, anchos=None, estilo_titulo='subtitulo_informe', espacio=20, **estilo):
+    """Subtítulo, tabla y separación"""
+    return [
+        Paragraph(titulo, estilos_pdf()[estilo_titulo]),
+        tabla(datos, anchos, **estilo),
+        Spacer(1, espacio),
+    ]
+
+
+# ===============================
+# DOCUMENTO Y RESPUESTA
+# ===============================
+
+def construir_pdf(story, opciones_documento):
+    """Construir un SimpleDocTemplate en memoria y devolver los bytes"""
+    opciones_documento.setdefault('pagesize', A4)
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, **opciones_documento).build(story)
+    return buffer.getvalue()
+
+
+def archivo_temporal_pdf():
+    """SpooledTemporaryFile que pasa a disco al superar PDF_MEMORIA_MAX_MB"""
+    limite = getattr(settings, 'PDF_MEMORIA_MAX_MB', 4) * 1024 * 1024
+    return tempfile.SpooledTemporaryFile(max_size=limite, suffix='.pdf')
+
+
+def construir_pdf_en_archivo(story, opciones_documento):
+    """Construir el documento en un archivo temporal y devolverlo en la posición 0"""
+    opciones_documento.setdefault('pagesize', A4)
+    archivo = archivo_temporal_pdf()
+    try:
+        SimpleDocTemplate(archivo, **opciones_documento).build(story)
+    except BaseException:
+        archivo.close()
+        raise
+    archivo.seek(0)
+    return archivo
+
+
+def respuesta_pdf(contenido, prefijo=None, nombre_archivo=None):
+    """
+    FileResponse de descarga para un PDF ya construido.
+
+    `contenido` es un archivo abierto en la posición 0 (se cierra al terminar el
+    envío) o bytes. Sin `nombre_archivo`, se usa `<prefijo>_<fecha y hora>.pdf`.
+    """
+    if not nombre_archivo:
+        nombre_archivo = f"{prefijo}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    if isinstance(contenido, bytes):
+        contenido = BytesIO(contenido)
+    response = FileResponse(contenido, as_attachment=True, filename=nombre_archivo, content_type='application/pdf')
+    response.block_size = BLOQUE_RESPUESTA
+    return response
+
+
+def informe_pdf(story, prefijo=None, nombre_archivo=None, **opciones_documento):
+    """Construir la story en un archivo temporal y devolverla como descarga (ver respuesta_pdf)"""
+    return respuesta_pdf(construir_pdf_en_archivo(story, opciones_documento), prefijo, nombre_archivo)
+
+
+# ===============================
+# ZIP EN STREAMING
+# ===============================
+
+class _SalidaZip:
+    """Destino sin seek para ZipFile: guarda lo escrito hasta que se vacía"""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self.partes)
+        self.partes = []
+        return datos
+
+
+def zip_en_streaming(archivos):
+    """
+    Bytes de un ZIP a partir de pares (nombre, contenido) generados uno a uno.
+
+    Cada archivo se entrega en cuanto se escribe, así que en memoria solo queda
+    el que se está procesando. Los PDFs ya vienen comprimidos y se guardan sin
+    volver a comprimir.
+    """
+    salida = _SalidaZip()
+    with zipfile.ZipFile(salida, 'w', compression=zipfile.ZIP_STORED) as archivo_zip:
+        for nombre, contenido in archivos:
+            archivo_zip.writestr(nombre, contenido)
+            yield salida.vaciar()
+    yield salida.vaciar()
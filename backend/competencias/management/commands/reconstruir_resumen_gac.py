@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from competencias.models import ResumenEstudianteGAC
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el resumen Estudiante × GAC × Período a partir de las evaluaciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--estudiante',
+            type=int,
+            action='append',
+            help='ID de estudiante a reconstruir (puede repetirse; por defecto: todos)'
+        )
+
+    def handle(self, *args, **options):
+        estudiante_ids = options.get('estudiante')
+        filas = ResumenEstudianteGAC.recalcular(estudiante_ids=estudiante_ids)
+
+        alcance = f'{len(estudiante_ids)} estudiante(s)' if estudiante_ids else 'todos los estudiantes'
+        self.stdout.write(
+            self.style.SUCCESS(f'Resumen reconstruido para {alcance}: {filas} filas')
+        )
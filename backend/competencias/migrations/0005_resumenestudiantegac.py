@@ -0,0 +1,65 @@
+# Generated manually for ResumenEstudianteGAC model
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+
+def poblar_resumen(apps, schema_editor):
+    """Construir el resumen inicial a partir de las evaluaciones existentes"""
+    Evaluacion = apps.get_model('competencias', 'Evaluacion')
+    ResumenEstudianteGAC = apps.get_model('competencias', 'ResumenEstudianteGAC')
+
+    filas = (
+        Evaluacion.objects.filter(rac__gacs__isnull=False)
+        .values('estudiante_id', 'rac__gacs', 'periodo_id')
+        .annotate(
+            total=Count('id'),
+            suma=Sum('puntaje'),
+            total_aprobadas=Count('id', filter=Q(puntaje__gte=3))
+        )
+        .order_by()
+    )
+    ResumenEstudianteGAC.objects.bulk_create([
+        ResumenEstudianteGAC(
+            estudiante_id=fila['estudiante_id'],
+            gac_id=fila['rac__gacs'],
+            periodo_id=fila['periodo_id'],
+            total_evaluaciones=fila['total'],
+            suma_puntajes=fila['suma'],
+            aprobadas=fila['total_aprobadas']
+        )
+        for fila in filas
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencias', '0004_periodoacademico_evaluacion_periodo'),
+        ('usuarios', '0004_profesor_foto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenEstudianteGAC',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_evaluaciones', models.PositiveIntegerField(default=0, verbose_name='Total de evaluaciones')),
+                ('suma_puntajes', models.FloatField(default=0, verbose_name='Suma de puntajes')),
+                ('aprobadas', models.PositiveIntegerField(default=0, verbose_name='Evaluaciones aprobadas')),
+                ('estudiante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_gac', to='usuarios.estudiante', verbose_name='Estudiante')),
+                ('gac', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes', to='competencias.gac', verbose_name='GAC')),
+                ('periodo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='resumenes_gac', to='competencias.periodoacademico', verbose_name='Período académico')),
+            ],
+            options={
+                'verbose_name': 'Resumen Estudiante por GAC',
+                'verbose_name_plural': 'Resúmenes Estudiante por GAC',
+                'indexes': [models.Index(fields=['gac', 'periodo'], name='competencia_gac_id_8f6315_idx')],
+                'unique_together': {('estudiante', 'gac', 'periodo')},
+            },
+        ),
+
+        # Poblar con las evaluaciones ya registradas
+        migrations.RunPython(poblar_resumen, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated manually: índices compuestos que empiezan por período
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencias', '0005_resumenestudiantegac'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(fields=['periodo', 'estudiante'], name='competencia_periodo_8ec36e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(fields=['periodo', 'profesor'], name='competencia_periodo_3e1459_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(fields=['periodo', 'rac'], name='competencia_periodo_af2cb9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resumenestudiantegac',
+            index=models.Index(fields=['periodo', 'gac'], name='competencia_periodo_e62b0a_idx'),
+        ),
+    ]
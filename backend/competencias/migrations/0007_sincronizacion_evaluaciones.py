@@ -0,0 +1,36 @@
+# Generated manually: claves de idempotencia de la sincronización de evaluaciones
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencias', '0006_indices_por_periodo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioSincronizado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=64, verbose_name='Clave de idempotencia')),
+                ('resultado', models.CharField(choices=[('aplicado', 'Aplicado'), ('obsoleto', 'Obsoleto')], max_length=10, verbose_name='Resultado')),
+                ('fecha_cliente', models.DateTimeField(verbose_name='Fecha del cambio en el cliente')),
+                ('fecha', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de recepción')),
+                ('profesor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cambios_sincronizados', to=settings.AUTH_USER_MODEL, verbose_name='Profesor')),
+            ],
+            options={
+                'verbose_name': 'Cambio sincronizado',
+                'verbose_name_plural': 'Cambios sincronizados',
+                'unique_together': {('profesor', 'clave')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='evaluacion',
+            index=models.Index(fields=['profesor', 'fecha_modificacion'], name='competencia_profeso_db2b7c_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated manually: fecha de la escritura vigente para la sincronización de evaluaciones
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copiar_fecha_modificacion(apps, schema_editor):
+    Evaluacion = apps.get_model('competencias', 'Evaluacion')
+    Evaluacion.objects.filter(fecha_escritura__isnull=True).update(fecha_escritura=F('fecha_modificacion'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('competencias', '0007_sincronizacion_evaluaciones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluacion',
+            name='fecha_escritura',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fecha de la escritura'),
+        ),
+        migrations.RunPython(copiar_fecha_modificacion, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,17 @@
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, Q, Sum
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 # Create your models here.
 from django.db import models
 from usuarios.models import Profesor, Estudiante  # Importas los que ya tienes
 
+# Grupos de estudiantes por semestre (los informes clasifican por estos grupos)
+GRUPOS_PRIMER_SEMESTRE = ['Virtual 1', '1A', '1B', '1C']
+GRUPOS_SEGUNDO_SEMESTRE = ['2A', '2B', '2C']
+
 # -----------------------
 # Período Académico
 # -----------------------
@@ -61,35 +67,68 @@ class PeriodoAcademico(models.Model):
 
     @classmethod
     def get_periodo_actual(cls):
-        """Retorna el período académico actual basado en la fecha"""
-        from django.utils import timezone
-        
+        """
+        Retorna el período académico actual basado en la fecha, o None si no hay
+        ninguno activo. Es de solo lectura: el período lo crean las escrituras
+        (ver obtener_o_crear_periodo_actual).
+
+        Se memoriza por proceso hasta el cambio de día o el fin del período, y
+        se olvida al guardar o eliminar cualquier período (competencias.signals).
+        Solo se guarda en memoria al confirmar la transacción, para no recordar
+        un período que luego se revierte.
+        """
         fecha_actual = timezone.now().date()
-        
-        # Buscar período activo que contenga la fecha actual
-        periodo_actual = cls.objects.filter(
+        memorizado = _periodo_actual_memorizado
+        if memorizado is not None:
+            fecha, periodo_actual = memorizado
+            if fecha == fecha_actual and fecha_actual <= periodo_actual.fecha_fin:
+                return periodo_actual
+
+        periodo_actual = cls.buscar_periodo_actual(fecha_actual)
+        if periodo_actual is not None:
+            def memorizar():
+                global _periodo_actual_memorizado
+                _periodo_actual_memorizado = (fecha_actual, periodo_actual)
+            transaction.on_commit(memorizar)
+        return periodo_actual
+
+    @classmethod
+    def obtener_o_crear_periodo_actual(cls):
+        """Período actual para las escrituras: si no hay ninguno activo se crea el del semestre"""
+        return cls.get_periodo_actual() or cls.crear_periodo_para(timezone.now().date())
+
+    @classmethod
+    def olvidar_periodo_actual(cls):
+        """Descartar el período actual memorizado en este proceso"""
+        global _periodo_actual_memorizado
+        _periodo_actual_memorizado = None
+
+    @classmethod
+    def buscar_periodo_actual(cls, fecha):
+        """Período activo que contiene la fecha, o None (solo lectura)"""
+        return cls.objects.filter(
             activo=True,
-            fecha_inicio__lte=fecha_actual,
-            fecha_fin__gte=fecha_actual
+            fecha_inicio__lte=fecha,
+            fecha_fin__gte=fecha
         ).first()
-        
-        if not periodo_actual:
-            # Si no hay período activo, crear uno automáticamente
-            año_actual = fecha_actual.year
-            mes_actual = fecha_actual.month
-            
-            # Determinar semestre basado en el mes
-            semestre = 1 if mes_actual <= 6 else 2
-            
-            periodo_actual = cls.objects.create(
-                año=año_actual,
-                semestre=semestre,
-                fecha_inicio=fecha_actual,
-                fecha_fin=fecha_actual.replace(month=12, day=31) if semestre == 2 
-                         else fecha_actual.replace(month=6, day=30)
-            )
-        
-        return periodo_actual
+
+    @classmethod
+    def crear_periodo_para(cls, fecha):
+        """Crear el período del semestre de la fecha cuando no hay ninguno activo"""
+        # Determinar semestre basado en el mes
+        semestre = 1 if fecha.month <= 6 else 2
+
+        return cls.objects.create(
+            año=fecha.year,
+            semestre=semestre,
+            fecha_inicio=fecha,
+            fecha_fin=fecha.replace(month=12, day=31) if semestre == 2
+                     else fecha.replace(month=6, day=30)
+        )
+
+
+# (fecha de consulta, período) de PeriodoAcademico.get_periodo_actual en este proceso
+_periodo_actual_memorizado = None
 
 # -----------------------
 # GAC
@@ -146,6 +185,123 @@ class Materia(models.Model):
 # -----------------------
 # Evaluación
 # -----------------------
+PUNTAJES_VALIDOS = (0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0)
+
+
+class EvaluacionManager(models.Manager):
+    """
+    Escrituras validadas de evaluaciones.
+
+    Validan puntaje y estado del estudiante contra objetos que quien llama ya
+    cargó y dejan la unicidad (estudiante, rac, profesor, periodo) a la
+    restricción de la base de datos, sin las consultas de full_clean().
+    """
+
+    def validar_puntaje(self, puntaje):
+        """Puntaje como float si es uno de la escala; ValidationError si no"""
+        try:
+            puntaje = float(puntaje)
+        except (TypeError, ValueError):
+            puntaje = None
+        if puntaje not in PUNTAJES_VALIDOS:
+            raise ValidationError({
+                'puntaje': 'El puntaje debe ser uno de los valores válidos: 0, 1, 2, 3, 3.5, 4, 5'
+            })
+        return puntaje
+
+    def validar_evaluacion(self, estudiante, puntaje):
+        """Validar con el estudiante ya cargado; devuelve el puntaje normalizado"""
+        if estudiante.estado != 'matriculado':
+            raise ValidationError({
+                'estudiante': 'Solo se pueden evaluar estudiantes matriculados'
+            })
+        return self.validar_puntaje(puntaje)
+
+    def crear_validada(self, estudiante, rac, profesor, puntaje, periodo=None):
+        """Crear una evaluación con la validación en memoria y un solo INSERT"""
+        evaluacion = self.model(
+            estudiante=estudiante, rac=rac, profesor=profesor, periodo=periodo,
+            puntaje=self.validar_evaluacion(estudiante, puntaje)
+        )
+        try:
+            evaluacion.save(validar=False)
+        except IntegrityError:
+            raise ValidationError(
+                'Ya existe una evaluación de este profesor para el estudiante y RAC en el período'
+            )
+        return evaluacion
+
+    def guardar_puntajes(self, estudiante_id, profesor_id, puntajes, periodo=None):
+        """
+        Crear o actualizar en bloque las evaluaciones de un estudiante por un profesor.
+
+        `puntajes` es {rac_id: puntaje}; ver guardar_matriz_puntajes. Devuelve el
+        conjunto de rac_id que se crearon.
+        """
+        creadas = self.guardar_matriz_puntajes(
+            profesor_id, {(estudiante_id, rac_id): puntaje for rac_id, puntaje in puntajes.items()}, periodo
+        )
+        return {rac_id for _, rac_id in creadas}
+
+    def guardar_matriz_puntajes(self, profesor_id, puntajes, periodo=None, fechas=None):
+        """
+        Crear o actualizar en bloque evaluaciones de varios estudiantes por un profesor.
+
+        `puntajes` es {(estudiante_id, rac_id): puntaje} ya validado (estudiantes
+        matriculados, RAC existentes y puntajes válidos): no pasa por save() ni
+        full_clean(). Escribe con un solo INSERT ... ON CONFLICT sobre la
+        restricción única (estudiante, rac, profesor, periodo), actualiza el
+        resumen por GAC y la versión de la caché de informes en la misma
+        transacción. `fechas` es {(estudiante_id, rac_id): datetime} opcional con la
+        hora de cada escritura en el cliente; por defecto se usa la del servidor.
+        Devuelve el conjunto de (estudiante_id, rac_id) creados.
+        """
+        from .cache import invalidar_cache
+
+        if not puntajes:
+            return set()
+        periodo = periodo or PeriodoAcademico.obtener_o_crear_periodo_actual()
+        fechas = fechas or {}
+        ahora = timezone.now()
+
+        with transaction.atomic():
+            existentes = self.select_for_update().filter(
+                profesor_id=profesor_id, periodo=periodo,
+                estudiante_id__in={estudiante_id for estudiante_id, _ in puntajes},
+                rac_id__in={rac_id for _, rac_id in puntajes}
+            ).order_by().values_list('estudiante_id', 'rac_id', 'puntaje')
+            anteriores = {
+                (estudiante_id, rac_id): puntaje
+                for estudiante_id, rac_id, puntaje in existentes
+                if (estudiante_id, rac_id) in puntajes
+            }
+            # MySQL resuelve el conflicto con cualquier índice único y no admite indicarlo
+            campos_unicos = None
+            if connection.features.supports_update_conflicts_with_target:
+                campos_unicos = ['estudiante', 'rac', 'profesor', 'periodo']
+            self.bulk_create(
+                [
+                    self.model(estudiante_id=estudiante_id, rac_id=rac_id, profesor_id=profesor_id,
+                        periodo=periodo, puntaje=puntaje, fecha_escritura=fechas.get((estudiante_id, rac_id), ahora))
+                    for (estudiante_id, rac_id), puntaje in puntajes.items()
+                ],
+                update_conflicts=True,
+                update_fields=['puntaje', 'fecha_modificacion', 'fecha_escritura'],
+                unique_fields=campos_unicos
+            )
+            ResumenEstudianteGAC.registrar_cambios([
+                (
+                    (*clave, periodo.id, anteriores[clave]) if clave in anteriores else None,
+                    (*clave, periodo.id, puntaje)
+                )
+                for clave, puntaje in puntajes.items()
+            ])
+            # bulk_create no emite post_save
+            invalidar_cache()
+        return set(puntajes) - set(anteriores)
+
+
+
 class Evaluacion(models.Model):
     rac = models.ForeignKey(
         RAC, 
@@ -188,6 +344,12 @@ class Evaluacion(models.Model):
     )
     fecha = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de evaluación")
     fecha_modificacion = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+    # Momento de la escritura vigente para "gana la última escritura": la fecha del
+    # cliente en las sincronizaciones sin conexión y la del servidor en el resto.
+    # fecha_modificacion (hora del servidor al guardar) queda solo para el token.
+    fecha_escritura = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de la escritura")
+
+    objects = EvaluacionManager()
 
     class Meta:
         verbose_name = "Evaluación"
@@ -195,9 +357,15 @@ class Evaluacion(models.Model):
         ordering = ['-fecha']
         # Índice compuesto para búsquedas eficientes
         indexes = [
+            # Informes filtrados por período y agrupados por estudiante / profesor / RAC
+            models.Index(fields=['periodo', 'estudiante']),
+            models.Index(fields=['periodo', 'profesor']),
+            models.Index(fields=['periodo', 'rac']),
             models.Index(fields=['estudiante', 'rac']),
             models.Index(fields=['profesor', 'estudiante']),
             models.Index(fields=['fecha']),
+            # Cambios del profesor desde el último token de sincronización
+            models.Index(fields=['profesor', 'fecha_modificacion']),
         ]
         # Restricción única: un profesor solo puede evaluar un estudiante en un RAC específico por período
         unique_together = ['estudiante', 'rac', 'profesor', 'periodo']
@@ -217,20 +385,56 @@ class Evaluacion(models.Model):
         
         # Validar que el puntaje esté en el rango correcto (0-5) y sea un valor válido
         if self.puntaje is not None:
-            valid_puntajes = [0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0]
-            if self.puntaje not in valid_puntajes:
+            if self.puntaje not in PUNTAJES_VALIDOS:
                 raise ValidationError({
                     'puntaje': 'El puntaje debe ser uno de los valores válidos: 0, 1, 2, 3, 3.5, 4, 5'
                 })
 
-    def save(self, *args, **kwargs):
-        """Override save para aplicar validaciones y asignar período automáticamente"""
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Recordar los valores cargados para actualizar el resumen por GAC al guardar"""
+        instancia = super().from_db(db, field_names, values)
+        instancia._estado_resumen = instancia._clave_resumen()
+        return instancia
+
+    def _clave_resumen(self):
+        """(estudiante, rac, periodo, puntaje) o None si algún campo está diferido"""
+        campos = ('estudiante_id', 'rac_id', 'periodo_id', 'puntaje')
+        if any(campo not in self.__dict__ for campo in campos):
+            return None
+        return tuple(self.__dict__[campo] for campo in campos)
+
+    def save(self, *args, validar=True, **kwargs):
+        """
+        Override save para aplicar validaciones y asignar período automáticamente.
+
+        validar=False omite full_clean(): solo para EvaluacionManager y quien ya
+        validó con Evaluacion.objects.validar_evaluacion().
+        """
         # Asignar período actual si no se proporciona
-        if not self.periodo:
-            self.periodo = PeriodoAcademico.get_periodo_actual()
+        if not self.periodo_id:
+            self.periodo = PeriodoAcademico.obtener_o_crear_periodo_actual()
+
+        self.fecha_escritura = timezone.now()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'fecha_escritura'}
         
-        self.full_clean()
-        super().save(*args, **kwargs)
+        if validar:
+            self.full_clean()
+
+        anterior = None
+        if not self._state.adding:
+            anterior = getattr(self, '_estado_resumen', None)
+            if anterior is None:
+                anterior = Evaluacion.objects.filter(pk=self.pk).values_list(
+                    'estudiante_id', 'rac_id', 'periodo_id', 'puntaje'
+                ).first()
+
+        # El resumen por GAC se actualiza en la misma transacción
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            ResumenEstudianteGAC.registrar_cambio(anterior, self._clave_resumen())
+        self._estado_resumen = self._clave_resumen()
 
     @property
     def puntaje_formateado(self):
@@ -241,3 +445,254 @@ class Evaluacion(models.Model):
     def es_aprobado(self):
         """Determina si la evaluación está aprobada (puntaje >= 3)"""
         return self.puntaje >= 3
+
+
+# -----------------------
+# Resumen Estudiante × GAC × Período
+# -----------------------
+class ResumenEstudianteGAC(models.Model):
+    """
+    Acumulado desnormalizado de evaluaciones por (estudiante, GAC, período).
+
+    Se actualiza en la misma transacción que las escrituras de Evaluacion:
+    Evaluacion.save() aplica el cambio y la señal pre_delete lo revierte.
+    Las escrituras masivas que no pasan por save() deben llamar a
+    registrar_cambios() o recalcular(). El comando reconstruir_resumen_gac
+    regenera la tabla completa.
+    """
+    estudiante = models.ForeignKey(
+        Estudiante,
+        on_delete=models.CASCADE,
+        related_name="resumenes_gac",
+        verbose_name="Estudiante"
+    )
+    gac = models.ForeignKey(
+        GAC,
+        on_delete=models.CASCADE,
+        related_name="resumenes",
+        verbose_name="GAC"
+    )
+    periodo = models.ForeignKey(
+        PeriodoAcademico,
+        on_delete=models.CASCADE,
+        related_name="resumenes_gac",
+        verbose_name="Período académico",
+        null=True,
+        blank=True
+    )
+    total_evaluaciones = models.PositiveIntegerField(default=0, verbose_name="Total de evaluaciones")
+    suma_puntajes = models.FloatField(default=0, verbose_name="Suma de puntajes")
+    aprobadas = models.PositiveIntegerField(default=0, verbose_name="Evaluaciones aprobadas")
+
+    class Meta:
+        verbose_name = "Resumen Estudiante por GAC"
+        verbose_name_plural = "Resúmenes Estudiante por GAC"
+        unique_together = ['estudiante', 'gac', 'periodo']
+        indexes = [
+            models.Index(fields=['gac', 'periodo']),
+            models.Index(fields=['periodo', 'gac']),
+        ]
+
+    def __str__(self):
+        return f"Resumen {self.estudiante_id} - GAC {self.gac_id} ({self.total_evaluaciones})"
+
+    @property
+    def promedio(self):
+        """Promedio de puntajes del estudiante en el GAC y período"""
+        return self.suma_puntajes / self.total_evaluaciones if self.total_evaluaciones else 0
+
+    @classmethod
+    def registrar_cambio(cls, anterior, actual):
+        """Aplicar el cambio de una evaluación; cada estado es (estudiante, rac, periodo, puntaje) o None"""
+        if anterior == actual:
+            return
+        cls.registrar_cambios([(anterior, actual)])
+
+    @classmethod
+    def registrar_cambios(cls, cambios):
+        """Aplicar en bloque una lista de pares (anterior, actual) de evaluaciones"""
+        cambios = [(anterior, actual) for anterior, actual in cambios if anterior != actual]
+        if not cambios:
+            return
+
+        rac_ids = {estado[1] for par in cambios for estado in par if estado}
+        gacs_por_rac = {}
+        for rac_id, gac_id in RAC.gacs.through.objects.filter(rac_id__in=rac_ids).values_list('rac_id', 'gac_id'):
+            gacs_por_rac.setdefault(rac_id, []).append(gac_id)
+
+        # Acumular deltas por fila de resumen antes de tocar la base de datos
+        deltas = {}
+        for anterior, actual in cambios:
+            for estado, signo in ((anterior, -1), (actual, 1)):
+                if not estado:
+                    continue
+                estudiante_id, rac_id, periodo_id, puntaje = estado
+                for gac_id in gacs_por_rac.get(rac_id, []):
+                    delta = deltas.setdefault((estudiante_id, gac_id, periodo_id), [0, 0.0, 0])
+                    delta[0] += signo
+                    delta[1] += signo * puntaje
+                    delta[2] += signo if puntaje >= 3 else 0
+
+        deltas = {clave: delta for clave, delta in deltas.items() if any(delta)}
+        if not deltas:
+            return
+
+        # Las filas que solo suman evaluaciones (las únicas que pueden no existir aún)
+        # van en un upsert sin lectura previa: dos profesores que califican a la vez
+        # al mismo estudiante pueden crear la misma fila
+        sumas = {
+            clave: delta for clave, delta in deltas.items()
+            if clave[2] is not None and delta[0] > 0 and delta[2] >= 0
+        }
+        with transaction.atomic():
+            if sumas:
+                cls._sumar_deltas(sumas)
+            deltas = {clave: delta for clave, delta in deltas.items() if clave not in sumas}
+            if deltas:
+                cls._aplicar_deltas(deltas)
+
+    @classmethod
+    def _sumar_deltas(cls, deltas):
+        """
+        INSERT de las filas con sus deltas que, si la fila ya existe, los suma en la
+        misma sentencia (ON CONFLICT ... DO UPDATE / ON DUPLICATE KEY UPDATE).
+        """
+        nombre = connection.ops.quote_name
+        tabla = nombre(cls._meta.db_table)
+        columnas = [
+            nombre(cls._meta.get_field(campo).column)
+            for campo in ('estudiante', 'gac', 'periodo', 'total_evaluaciones', 'suma_puntajes', 'aprobadas')
+        ]
+        if connection.features.supports_update_conflicts_with_target:
+            conflicto = f"ON CONFLICT ({', '.join(columnas[:3])}) DO UPDATE SET " + ', '.join(
+                f"{columna} = {tabla}.{columna} + EXCLUDED.{columna}" for columna in columnas[3:]
+            )
+        else:
+            # MySQL resuelve el conflicto con el índice único (estudiante, gac, periodo)
+            conflicto = 'ON DUPLICATE KEY UPDATE ' + ', '.join(
+                f"{columna} = {columna} + VALUES({columna})" for columna in columnas[3:]
+            )
+
+        # Siempre en el mismo orden para que dos transacciones bloqueen las filas igual
+        filas = [(*clave, *deltas[clave]) for clave in sorted(deltas)]
+        with connection.cursor() as cursor:
+            for inicio in range(0, len(filas), 500):
+                lote = filas[inicio:inicio + 500]
+                cursor.execute(
+                    f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES "
+                    f"{', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(lote))} {conflicto}",
+                    [valor for fila in lote for valor in fila]
+                )
+
+    @classmethod
+    def _aplicar_deltas(cls, deltas):
+        """Restas y cambios de puntaje sobre filas que ya existen (y filas sin período)"""
+        periodo_ids = {periodo_id for _, _, periodo_id in deltas}
+        filtro_periodo = Q(periodo_id__in=periodo_ids - {None})
+        if None in periodo_ids:
+            filtro_periodo |= Q(periodo__isnull=True)
+
+        # Una lectura bloqueada de las filas afectadas y escrituras en bloque
+        existentes = {
+            (resumen.estudiante_id, resumen.gac_id, resumen.periodo_id): resumen
+            for resumen in cls.objects.select_for_update().filter(
+                filtro_periodo,
+                estudiante_id__in={estudiante_id for estudiante_id, _, _ in deltas},
+                gac_id__in={gac_id for _, gac_id, _ in deltas}
+            )
+        }
+        nuevos, actualizados, vacios = [], [], []
+        for (estudiante_id, gac_id, periodo_id), (total, suma, aprobadas) in deltas.items():
+            resumen = existentes.get((estudiante_id, gac_id, periodo_id))
+            if resumen is None:
+                if total > 0:
+                    nuevos.append(cls(
+                        estudiante_id=estudiante_id, gac_id=gac_id, periodo_id=periodo_id,
+                        total_evaluaciones=total, suma_puntajes=suma, aprobadas=aprobadas
+                    ))
+                continue
+            resumen.total_evaluaciones += total
+            resumen.suma_puntajes += suma
+            resumen.aprobadas += aprobadas
+            if resumen.total_evaluaciones <= 0:
+                vacios.append(resumen.pk)
+            else:
+                actualizados.append(resumen)
+
+        if actualizados:
+            cls.objects.bulk_update(actualizados, ['total_evaluaciones', 'suma_puntajes', 'aprobadas'])
+        if nuevos:
+            cls.objects.bulk_create(nuevos)
+        if vacios:
+            cls.objects.filter(pk__in=vacios).delete()
+
+    @classmethod
+    def recalcular(cls, estudiante_ids=None):
+        """Reconstruir el resumen desde Evaluacion (todos o solo los estudiantes indicados)"""
+        evaluaciones = Evaluacion.objects.filter(rac__gacs__isnull=False)
+        resumenes = cls.objects.all()
+        if estudiante_ids is not None:
+            estudiante_ids = list(estudiante_ids)
+            evaluaciones = evaluaciones.filter(estudiante_id__in=estudiante_ids)
+            resumenes = resumenes.filter(estudiante_id__in=estudiante_ids)
+
+        filas = (
+            evaluaciones
+            .values('estudiante_id', 'rac__gacs', 'periodo_id')
+            .annotate(
+                total=Count('id'),
+                suma=Sum('puntaje'),
+                total_aprobadas=Count('id', filter=Q(puntaje__gte=3))
+            )
+            .order_by()
+        )
+
+        with transaction.atomic():
+            resumenes.delete()
+            creados = cls.objects.bulk_create([
+                cls(
+                    estudiante_id=fila['estudiante_id'],
+                    gac_id=fila['rac__gacs'],
+                    periodo_id=fila['periodo_id'],
+                    total_evaluaciones=fila['total'],
+                    suma_puntajes=fila['suma'],
+                    aprobadas=fila['total_aprobadas']
+                )
+                for fila in filas
+            ], batch_size=1000)
+        return len(creados)
+
+
+# -----------------------
+# Sincronización de evaluaciones sin conexión
+# -----------------------
+class CambioSincronizado(models.Model):
+    """
+    Clave de idempotencia de un cambio de puntaje recibido por sincronización.
+
+    Si el cliente reenvía un lote (por ejemplo, porque perdió la respuesta),
+    los cambios con una clave ya registrada no se vuelven a aplicar.
+    """
+    RESULTADOS = [
+        ('aplicado', 'Aplicado'),
+        ('obsoleto', 'Obsoleto'),
+    ]
+
+    profesor = models.ForeignKey(
+        Profesor,
+        on_delete=models.CASCADE,
+        related_name="cambios_sincronizados",
+        verbose_name="Profesor"
+    )
+    clave = models.CharField(max_length=64, verbose_name="Clave de idempotencia")
+    resultado = models.CharField(max_length=10, choices=RESULTADOS, verbose_name="Resultado")
+    fecha_cliente = models.DateTimeField(verbose_name="Fecha del cambio en el cliente")
+    fecha = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de recepción")
+
+    class Meta:
+        verbose_name = "Cambio sincronizado"
+        verbose_name_plural = "Cambios sincronizados"
+        unique_together = ['profesor', 'clave']
+
+    def __str__(self):
+        return f"{self.clave} ({self.resultado})"
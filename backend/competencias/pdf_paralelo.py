@@ -0,0 +1,161 @@
+"""
+Renderizado de informes PDF por fragmentos en varios procesos.
+
+Los informes con una sección por estudiante se dividen en fragmentos
+contiguos; cada fragmento se construye como un PDF independiente en un
+ProcessPoolExecutor y las partes se concatenan en orden con pypdf. Las
+funciones que arman el contenido reciben solo datos (dicts y listas) para
+poder ejecutarse en otro proceso, sin acceso a la base de datos.
+
+Sin pypdf, con un solo proceso (PDF_PROCESOS=1) o con pocos elementos, el
+documento se construye completo en el proceso actual.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Paragraph, Spacer, PageBreak
+
+from .informes_pdf import archivo_temporal_pdf, construir_pdf, construir_pdf_en_archivo, estilos_pdf, tabla
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # pypdf es opcional: sin él se renderiza en serie
+    PdfReader = PdfWriter = None
+
+# Elementos mínimos por fragmento para que compense repartir el trabajo
+MINIMO_POR_FRAGMENTO = 25
+
+
+def procesos_pdf():
+    """Procesos de renderizado: PDF_PROCESOS en settings, o los núcleos disponibles"""
+    configurado = getattr(settings, 'PDF_PROCESOS', 0)
+    return max(1, configurado or os.cpu_count() or 1)
+
+
+def dividir_en_fragmentos(elementos, fragmentos):
+    """Partir la lista en `fragmentos` tramos contiguos de tamaño similar"""
+    tamano = -(-len(elementos) // fragmentos)
+    return [elementos[i:i + tamano] for i in range(0, len(elementos), tamano)]
+
+
+def _renderizar_fragmento(constructor, elementos, contexto, es_primero, opciones_documento):
+    """Tarea de cada proceso: armar la story del fragmento y renderizarla"""
+    return construir_pdf(constructor(elementos, contexto, es_primero), opciones_documento)
+
+
+def concatenar_pdfs(partes, salida=None):
+    """
+    Unir varios PDFs en uno, respetando el orden de las partes.
+
+    Con `salida` (archivo abierto) se escribe allí y se devuelve en la posición 0;
+    si no, se devuelven los bytes.
+    """
+    escritor = PdfWriter()
+    for parte in partes:
+        escritor.append(PdfReader(BytesIO(parte)))
+    if salida is not None:
+        escritor.write(salida)
+        salida.seek(0)
+        return salida
+    buffer = BytesIO()
+    escritor.write(buffer)
+    return buffer.getvalue()
+
+
+def renderizar_por_fragmentos(constructor, elementos, contexto=None, procesos=None,
+                              minimo_por_fragmento=MINIMO_POR_FRAGMENTO, en_archivo=False,
+                              **opciones_documento):
+    """
+    Renderizar un informe repartido en procesos.
+
+    `constructor(elementos, contexto, es_primero)` debe ser una función de módulo
+    (se envía a otros procesos) que devuelve la story de un tramo de elementos;
+    `es_primero` indica que debe incluir el encabezado del informe. Con
+    `en_archivo` el resultado es un archivo temporal (ver
+    informes_pdf.construir_pdf_en_archivo) en lugar de bytes. Las opciones
+    restantes se pasan a SimpleDocTemplate.
+    """
+    opciones_documento.setdefault('pagesize', A4)
+    procesos = procesos or procesos_pdf()
+    fragmentos = min(procesos, len(elementos) // max(1, minimo_por_fragmento))
+
+    if PdfWriter is None or fragmentos < 2:
+        story = constructor(elementos, contexto, True)
+        if en_archivo:
+            return construir_pdf_en_archivo(story, opciones_documento)
+        return construir_pdf(story, opciones_documento)
+
+    partes = dividir_en_fragmentos(elementos, fragmentos)
+    with ProcessPoolExecutor(max_workers=len(partes)) as ejecutor:
+        pdfs = list(ejecutor.map(
+            _renderizar_fragmento,
+            [constructor] * len(partes),
+            partes,
+            [contexto] * len(partes),
+            [i == 0 for i in range(len(partes))],
+            [opciones_documento] * len(partes),
+        ))
+    return concatenar_pdfs(pdfs, archivo_temporal_pdf() if en_archivo else None)
+
+
+# ===============================
+# ESTUDIANTES POR SEMESTRE
+# ===============================
+
+def _tabla_gacs(grafico_gacs, color_encabezado, color_filas):
+    gac_data = [['GAC', 'Promedio', 'Estado']]
+    for gac in grafico_gacs:
+        estado = "Excelente" if gac['promedio'] >= 4.5 else "Bueno" if gac['promedio'] >= 3.5 else "Regular" if gac['promedio'] >= 2.5 else "Deficiente"
+        gac_data.append([gac['gac'], f"{gac['promedio']:.2f}", estado])
+    return tabla(gac_data, [1.5, 1, 1.5], encabezado=color_encabezado, filas=color_filas)
+
+
+def story_estudiantes_por_semestre(estudiantes, contexto, es_primero):
+    """
+    Secciones del informe de estudiantes por semestre y GAC.
+
+    Cada estudiante es un dict con nombre, grupo, documento, segundo_semestre y
+    los resultados de resultados_por_semestre_estudiantes().
+    """
+    estilos = estilos_pdf()
+    story = []
+
+    def seccion_semestre(titulo, datos, color_encabezado, color_filas):
+        resumen = datos['resumen_general']
+        story.append(Paragraph(f"<b>{titulo}</b>", estilos['heading3']))
+        story.append(Paragraph(f"Promedio General: {resumen['promedio_general']:.2f}", estilos['normal']))
+        story.append(Paragraph(f"Total Evaluaciones: {resumen['total_evaluaciones']}", estilos['normal']))
+        if datos['grafico_gacs']:
+            story.append(_tabla_gacs(datos['grafico_gacs'], color_encabezado, color_filas))
+            story.append(Spacer(1, 12))
+
+    # Título principal
+    if es_primero:
+        story.append(Paragraph("INFORME DE ESTUDIANTES POR SEMESTRE Y GAC", estilos['titulo']))
+        story.append(Paragraph(f"Generado el: {contexto['fecha']}", estilos['normal']))
+        story.append(Spacer(1, 20))
+
+    for estudiante in estudiantes:
+        # Información del estudiante
+        story.append(Paragraph(f"<b>ESTUDIANTE:</b> {estudiante['nombre']}", estilos['encabezado']))
+        story.append(Paragraph(f"<b>GRUPO:</b> {estudiante['grupo']} | <b>DOCUMENTO:</b> {estudiante['documento']}", estilos['normal']))
+
+        resultados = estudiante['resultados']
+        if estudiante['segundo_semestre']:
+            # Resultados separados por semestre
+            if resultados['primer_semestre']['resumen_general']['total_evaluaciones'] > 0:
+                seccion_semestre("PRIMER SEMESTRE", resultados['primer_semestre'], 'blue', 'beige')
+            if resultados['segundo_semestre']['resumen_general']['total_evaluaciones'] > 0:
+                seccion_semestre("SEGUNDO SEMESTRE", resultados['segundo_semestre'], 'green', 'lightgreen')
+        elif resultados['filtrado']['resumen_general']['total_evaluaciones'] > 0:
+            # Estudiantes de primer semestre: evaluaciones del período filtrado
+            seccion_semestre("PRIMER SEMESTRE", resultados['filtrado'], 'blue', 'beige')
+        else:
+            story.append(Paragraph("No hay evaluaciones registradas", estilos['normal']))
+
+        story.append(PageBreak())
+
+    return story
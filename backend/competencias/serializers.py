@@ -1,3 +1,5 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import GAC, RAC, Materia, Evaluacion, PeriodoAcademico
 from usuarios.models import Profesor, Estudiante
@@ -64,6 +66,36 @@ class EvaluacionSerializer(serializers.ModelSerializer):
             "periodo", "periodo_id",
             "puntaje", "fecha"
         ]
+        # La unicidad la garantiza la restricción de la base de datos
+        validators = []
+
+    def validate(self, attrs):
+        """Estado del estudiante y puntaje con los objetos ya cargados por los campos"""
+        estudiante = attrs.get('estudiante', getattr(self.instance, 'estudiante', None))
+        puntaje = attrs.get('puntaje', getattr(self.instance, 'puntaje', None))
+        try:
+            attrs['puntaje'] = Evaluacion.objects.validar_evaluacion(estudiante, puntaje)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+        return attrs
+
+    def create(self, validated_data):
+        try:
+            return Evaluacion.objects.crear_validada(**validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'non_field_errors': e.messages})
+
+    def update(self, instance, validated_data):
+        for campo, valor in validated_data.items():
+            setattr(instance, campo, valor)
+        try:
+            with transaction.atomic():
+                instance.save(validar=False)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                'non_field_errors': ['Ya existe una evaluación de este profesor para el estudiante y RAC en el período']
+            })
+        return instance
         
 class EstadisticaGACSerializer(serializers.Serializer):
     gac_numero = serializers.IntegerField()
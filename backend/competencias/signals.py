@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from usuarios.models import Estudiante, Profesor
+from .cache import invalidar_cache
+from .models import GAC, RAC, Evaluacion, Materia, PeriodoAcademico, ResumenEstudianteGAC
+
+# Modelos cuyas escrituras cambian el resultado de los informes
+MODELOS_INFORMES = (Evaluacion, RAC, GAC, Materia, PeriodoAcademico, Estudiante, Profesor)
+RELACIONES_INFORMES = (RAC.gacs.through, Materia.racs.through, Materia.profesores.through)
+
+
+@receiver(pre_delete, sender=Evaluacion)
+def descontar_evaluacion_eliminada(sender, instance, **kwargs):
+    """Revertir el aporte de la evaluación al resumen por GAC.
+
+    Se usa pre_delete porque las filas de RAC.gacs pueden borrarse en cascada
+    antes de post_delete; ambas señales corren dentro de la transacción del borrado.
+    """
+    ResumenEstudianteGAC.registrar_cambio(instance._clave_resumen(), None)
+
+
+@receiver(post_save, sender=PeriodoAcademico)
+@receiver(post_delete, sender=PeriodoAcademico)
+def invalidar_periodo_actual(sender, **kwargs):
+    """El período actual memorizado pudo cambiar: olvidarlo ahora y al confirmar"""
+    PeriodoAcademico.olvidar_periodo_actual()
+    transaction.on_commit(PeriodoAcademico.olvidar_periodo_actual)
+
+
+@receiver(m2m_changed, sender=RAC.gacs.through)
+def recalcular_resumen_por_cambio_de_gacs(sender, instance, action, reverse, pk_set, **kwargs):
+    """Al cambiar los GAC de un RAC se recalculan los estudiantes evaluados en él"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        rac_ids = [instance.pk]
+    elif pk_set:
+        rac_ids = pk_set
+    else:
+        # gac.racs.clear(): ya no se sabe qué RAC estaban asociados
+        ResumenEstudianteGAC.recalcular()
+        return
+
+    estudiante_ids = (
+        Evaluacion.objects.filter(rac_id__in=rac_ids)
+        .values_list('estudiante_id', flat=True)
+        .distinct()
+    )
+    ResumenEstudianteGAC.recalcular(estudiante_ids=estudiante_ids)
+
+
+def invalidar_cache_informes(sender, **kwargs):
+    """Nueva versión de datos: las respuestas cacheadas anteriores dejan de usarse"""
+    # El inicio de sesión solo actualiza last_login del profesor
+    if kwargs.get('update_fields') == frozenset({'last_login'}):
+        return
+    if kwargs.get('action', 'post_').startswith('post_'):
+        invalidar_cache()
+
+
+for modelo in MODELOS_INFORMES:
+    post_save.connect(invalidar_cache_informes, sender=modelo, dispatch_uid=f'cache_informes_save_{modelo.__name__}')
+    post_delete.connect(invalidar_cache_informes, sender=modelo, dispatch_uid=f'cache_informes_delete_{modelo.__name__}')
+
+for relacion in RELACIONES_INFORMES:
+    m2m_changed.connect(invalidar_cache_informes, sender=relacion, dispatch_uid=f'cache_informes_m2m_{relacion.__name__}')
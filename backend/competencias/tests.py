@@ -1,3 +1,917 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from usuarios.models import Profesor, Estudiante
+from .cache import estadisticas_cache
+from .models import GAC, RAC, Materia, Evaluacion, PeriodoAcademico, ResumenEstudianteGAC
+
+
+# Las pruebas de consultas y resultados miden las vistas sin la caché de respuestas
+# ni el almacén de PDFs generados
+SIN_CACHE_INFORMES = override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'reportes': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}, REPORTES_ARTEFACTOS_CUOTA_MB=0)
+
+
+class DatosEvaluacionMixin:
+    """Crea GACs, RACs, un profesor autenticado y estudiantes evaluados"""
+
+    def crear_base(self):
+        # PDFs generados y versión de artefactos en un MEDIA_ROOT temporal
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        ajustes = override_settings(MEDIA_ROOT=media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        # El período actual memorizado no debe pasar de una prueba a otra
+        self.addCleanup(PeriodoAcademico.olvidar_periodo_actual)
+
+        self.profesor = Profesor.objects.create_user(
+            correo='profesor@unbosque.edu.co', nombre='Profesor Prueba',
+            cedula='1000001', contrasenia='secreta'
+        )
+        self.gac_1 = GAC.objects.create(numero=1, descripcion='Comunicación')
+        self.gac_2 = GAC.objects.create(numero=2, descripcion='Liderazgo')
+        self.rac_1 = RAC.objects.create(numero=1, descripcion='RAC uno')
+        self.rac_1.gacs.set([self.gac_1])
+        self.rac_2 = RAC.objects.create(numero=2, descripcion='RAC dos')
+        self.rac_2.gacs.set([self.gac_1, self.gac_2])
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.profesor)
+
+    def crear_estudiantes(self, cantidad, desde=0, grupo='1A'):
+        estudiantes = []
+        for i in range(desde, desde + cantidad):
+            estudiante = Estudiante.objects.create(
+                documento=f"{9000000 + i}", nombre=f"ESTUDIANTE {i:03d}",
+                correo=f"e{i}@unbosque.edu.co", grupo=grupo, estado='matriculado'
+            )
+            Evaluacion.objects.create(estudiante=estudiante, rac=self.rac_1, profesor=self.profesor, puntaje=4.0)
+            Evaluacion.objects.create(estudiante=estudiante, rac=self.rac_2, profesor=self.profesor, puntaje=2.0)
+            estudiantes.append(estudiante)
+        return estudiantes
+
+
+@SIN_CACHE_INFORMES
+class EstadisticasEvaluacionesTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+        self.url = reverse('estadisticas_evaluaciones')
+
+    def test_resultado_por_gac(self):
+        self.crear_estudiantes(2)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        resumen = response.data['resumen_general']
+        # (profesor, estudiante, GAC): GAC 1 toma el máximo entre RAC 1 y RAC 2
+        self.assertEqual(resumen['total_evaluaciones'], 4)
+        self.assertEqual(resumen['total_estudiantes'], 2)
+        self.assertEqual(resumen['aprobadas'], 2)
+        self.assertEqual(resumen['promedio_general'], 3.0)
+
+        top_gacs = {g['gac_numero']: g for g in response.data['top_gacs']}
+        self.assertEqual(top_gacs[1]['promedio'], 4.0)
+        self.assertEqual(top_gacs[2]['reprobadas'], 2)
+        self.assertNotIn('estudiantes', response.data)
+
+    def test_detalle_estudiantes_paginado_por_cursor(self):
+        self.crear_estudiantes(5)
+        url = reverse('estadisticas_evaluaciones_estudiantes')
+
+        vistos = []
+        cursor = None
+        while True:
+            parametros = {'limite': 2}
+            if cursor is not None:
+                parametros['cursor'] = cursor
+            with self.assertNumQueries(2):
+                response = self.client.get(url, parametros)
+            vistos.extend(response.data['estudiantes'])
+            cursor = response.data['siguiente_cursor']
+            if cursor is None:
+                break
+
+        # 5 estudiantes × 2 GACs, sin repetidos entre páginas
+        self.assertEqual(len(vistos), 10)
+        self.assertEqual(len({(f['estudiante_id'], f['gac']) for f in vistos}), 10)
+        gac_1 = [f for f in vistos if f['gac'] == 1]
+        self.assertTrue(all(f['puntaje'] == 4.0 for f in gac_1))
+
+    def test_detalle_estudiantes_ndjson(self):
+        self.crear_estudiantes(3)
+        response = self.client.get(reverse('estadisticas_evaluaciones_estudiantes'), {'formato': 'ndjson'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lineas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(len(lineas), 6)
+        self.assertEqual(json.loads(lineas[0])['estudiante'], 'ESTUDIANTE 000')
+
+    def test_numero_de_consultas_no_depende_de_los_estudiantes(self):
+        self.crear_estudiantes(3)
+        self.client.get(self.url)  # autenticación y caches de contenttypes
+
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+
+        self.crear_estudiantes(25, desde=3)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['resumen_general']['total_estudiantes'], 28)
+
+
+@SIN_CACHE_INFORMES
+class ResumenEstudianteGACTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+
+    def resumen(self):
+        return {
+            (r.estudiante_id, r.gac_id, r.periodo_id): (r.total_evaluaciones, r.suma_puntajes, r.aprobadas)
+            for r in ResumenEstudianteGAC.objects.all()
+        }
+
+    def test_altas_cambios_y_bajas_mantienen_el_resumen(self):
+        estudiante = self.crear_estudiantes(1)[0]
+        periodo_id = Evaluacion.objects.first().periodo_id
+        self.assertEqual(self.resumen()[(estudiante.id, self.gac_1.id, periodo_id)], (2, 6.0, 1))
+        self.assertEqual(self.resumen()[(estudiante.id, self.gac_2.id, periodo_id)], (1, 2.0, 0))
+
+        evaluacion = Evaluacion.objects.get(estudiante=estudiante, rac=self.rac_2)
+        evaluacion.puntaje = 5.0
+        evaluacion.save()
+        self.assertEqual(self.resumen()[(estudiante.id, self.gac_2.id, periodo_id)], (1, 5.0, 1))
+
+        evaluacion.delete()
+        self.assertNotIn((estudiante.id, self.gac_2.id, periodo_id), self.resumen())
+        self.assertEqual(self.resumen()[(estudiante.id, self.gac_1.id, periodo_id)], (1, 4.0, 1))
+
+    def test_fila_de_resumen_creada_por_otra_transaccion(self):
+        estudiante = Estudiante.objects.create(
+            documento='8000002', nombre='CONCURRENTE', correo='concurrente@unbosque.edu.co',
+            grupo='1A', estado='matriculado'
+        )
+        periodo = PeriodoAcademico.obtener_o_crear_periodo_actual()
+        tabla = ResumenEstudianteGAC._meta.db_table
+        concurrente = []
+
+        def crear_antes(execute, sql, params, many, context):
+            # Otro profesor confirma la misma fila de resumen justo antes de nuestro INSERT
+            if not concurrente and sql.startswith('INSERT') and tabla in sql:
+                concurrente.append(sql)
+                ResumenEstudianteGAC.objects.create(
+                    estudiante=estudiante, gac=self.gac_1, periodo=periodo,
+                    total_evaluaciones=1, suma_puntajes=5.0, aprobadas=1
+                )
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(crear_antes):
+            Evaluacion.objects.create(
+                estudiante=estudiante, rac=self.rac_1, profesor=self.profesor, puntaje=2.0, periodo=periodo
+            )
+        self.assertTrue(concurrente)
+        self.assertEqual(self.resumen()[(estudiante.id, self.gac_1.id, periodo.id)], (2, 7.0, 1))
+
+    def test_cambio_de_gacs_de_un_rac_y_reconstruccion(self):
+        self.crear_estudiantes(3)
+        self.rac_1.gacs.add(self.gac_2)
+        incremental = self.resumen()
+
+        ResumenEstudianteGAC.recalcular()
+        self.assertEqual(self.resumen(), incremental)
+
+        self.rac_2.delete()
+        incremental = self.resumen()
+        ResumenEstudianteGAC.recalcular()
+        self.assertEqual(self.resumen(), incremental)
+
+    def test_evaluaciones_masivas_con_upsert_en_bloque(self):
+        estudiante = self.crear_estudiantes(1)[0]
+        racs = [self.rac_1, self.rac_2] + [
+            RAC.objects.create(numero=10 + i, descripcion=f'RAC {10 + i}') for i in range(28)
+        ]
+        for rac in racs[2:]:
+            rac.gacs.set([self.gac_2])
+        url = reverse('crear_evaluaciones_masivas')
+        cuerpo = {
+            'estudiante_id': estudiante.id,
+            'evaluaciones': [{'rac_id': rac.id, 'puntaje': 3.5} for rac in racs] + [
+                {'rac_id': 999999, 'puntaje': 4}, {'rac_id': self.rac_1.id, 'puntaje': 7}
+            ]
+        }
+
+        # Estudiante, RACs, período, bloqueo, INSERT, GACs de los RAC y resumen: upsert
+        # de las filas que suman y lectura bloqueada más UPDATE de las que solo cambian
+        with self.assertNumQueries(13):
+            response = self.client.post(url, cuerpo, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['resumen'], {
+            'total_procesadas': 32, 'creadas': 28, 'actualizadas': 2, 'errores': 2
+        })
+        self.assertEqual(response.data['resultados'][0], {
+            'rac_id': self.rac_1.id, 'puntaje': 3.5, 'created': False, 'success': True
+        })
+        self.assertEqual(response.data['resultados'][30]['error'], 'RAC no encontrado')
+        self.assertEqual(Evaluacion.objects.filter(estudiante=estudiante).count(), 30)
+        self.assertEqual(set(Evaluacion.objects.values_list('puntaje', flat=True)), {3.5})
+
+        incremental = self.resumen()
+        ResumenEstudianteGAC.recalcular()
+        self.assertEqual(self.resumen(), incremental)
+
+        response = self.client.post(reverse('crear_o_actualizar_evaluacion'), {
+            'estudiante_id': estudiante.id, 'rac_id': self.rac_2.id, 'puntaje': 5
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['puntaje'], 5.0)
+        self.assertEqual(Evaluacion.objects.filter(estudiante=estudiante).count(), 30)
+        self.assertEqual(self.resumen()[(estudiante.id, self.gac_2.id, response.data['periodo']['id'])][0], 29)
+
+    def test_evaluaciones_masivas_con_rac_repetido(self):
+        estudiante = Estudiante.objects.create(
+            documento='8000001', nombre='SIN EVALUACIONES', correo='sin@unbosque.edu.co',
+            grupo='1A', estado='matriculado'
+        )
+        response = self.client.post(reverse('crear_evaluaciones_masivas'), {
+            'estudiante_id': estudiante.id,
+            'evaluaciones': [
+                {'rac_id': self.rac_1.id, 'puntaje': 2}, {'rac_id': self.rac_2.id, 'puntaje': 4},
+                {'rac_id': self.rac_1.id, 'puntaje': 5},
+            ]
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['resumen'], {
+            'total_procesadas': 3, 'creadas': 2, 'actualizadas': 0, 'errores': 0
+        })
+        # La primera entrada del RAC repetido informa el puntaje que quedó guardado
+        self.assertEqual(response.data['resultados'][0], {
+            'rac_id': self.rac_1.id, 'puntaje': 5.0, 'created': False, 'superseded': True, 'success': True
+        })
+        self.assertTrue(response.data['resultados'][2]['created'])
+        self.assertEqual(Evaluacion.objects.get(estudiante=estudiante, rac=self.rac_1).puntaje, 5.0)
+
+    def test_escritura_validada_sin_consultas_de_full_clean(self):
+        from django.core.exceptions import ValidationError
+
+        estudiante = Estudiante.objects.get(pk=self.crear_estudiantes(1)[0].pk)
+        rac = RAC.objects.create(numero=30, descripcion='RAC treinta')
+        periodo = PeriodoAcademico.get_periodo_actual()
+
+        # SAVEPOINT, INSERT, GACs del RAC y RELEASE: ni existencia de FKs ni unicidad
+        with self.assertNumQueries(4):
+            evaluacion = Evaluacion.objects.crear_validada(estudiante, rac, self.profesor, '3.5', periodo=periodo)
+        self.assertEqual(evaluacion.puntaje, 3.5)
+
+        # La restricción única de la base de datos rechaza el duplicado
+        with self.assertRaises(ValidationError):
+            Evaluacion.objects.crear_validada(estudiante, rac, self.profesor, 4, periodo=periodo)
+        estudiante.estado = 'retirado'
+        with self.assertNumQueries(0), self.assertRaises(ValidationError):
+            Evaluacion.objects.crear_validada(estudiante, self.rac_1, self.profesor, 4, periodo=periodo)
+
+        # El ModelViewSet usa la misma escritura
+        response = self.client.post(reverse('evaluacion-list'), {
+            'estudiante_id': estudiante.id, 'rac_id': rac.id, 'profesor_id': self.profesor.id, 'puntaje': 5
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(reverse('evaluacion-list'), {
+            'estudiante_id': estudiante.id, 'rac_id': rac.id, 'profesor_id': self.profesor.id, 'puntaje': 4.5
+        }, format='json')
+        self.assertIn('puntaje', response.data)
+
+    def test_matriz_de_evaluaciones_de_un_grupo(self):
+        estudiantes = self.crear_estudiantes(3)
+        otro_grupo = self.crear_estudiantes(1, desde=3, grupo='2A')[0]
+        cuerpo = {
+            'grupo': '1A',
+            'racs': [self.rac_1.id, self.rac_2.id, 999999],
+            'estudiantes': [e.id for e in estudiantes] + [otro_grupo.id],
+            'puntajes': [
+                [5, None, 3],
+                [3.5, 4, None],
+                [7, 1, None],
+                [4, 4, None],
+            ]
+        }
+        # Estudiantes, RACs, período, bloqueo, INSERT, GACs y resumen: no crece con la matriz
+        with self.assertNumQueries(12):
+            response = self.client.post(reverse('guardar_matriz_evaluaciones'), cuerpo, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['estados'], [
+            ['actualizada', None, 'rac_no_encontrado'],
+            ['actualizada', 'actualizada', None],
+            ['puntaje_invalido', 'actualizada', None],
+            ['estudiante_no_encontrado', 'estudiante_no_encontrado', None],
+        ])
+        self.assertEqual(response.data['resumen'], {'creadas': 0, 'actualizadas': 4, 'omitidas': 4, 'errores': 4})
+        puntajes = dict(Evaluacion.objects.filter(rac=self.rac_1).values_list('estudiante_id', 'puntaje'))
+        self.assertEqual([puntajes[e.id] for e in estudiantes], [5.0, 3.5, 4.0])
+
+        incremental = self.resumen()
+        ResumenEstudianteGAC.recalcular()
+        self.assertEqual(self.resumen(), incremental)
+
+        nuevo = RAC.objects.create(numero=20, descripcion='RAC veinte')
+        response = self.client.post(reverse('guardar_matriz_evaluaciones'), {
+            'grupo': '1A', 'racs': [nuevo.id], 'estudiantes': [estudiantes[0].id], 'puntajes': [[3]]
+        }, format='json')
+        self.assertEqual(response.data['estados'], [['creada']])
+
+        response = self.client.post(reverse('guardar_matriz_evaluaciones'), {
+            'grupo': '1A', 'racs': [nuevo.id], 'estudiantes': [estudiantes[0].id], 'puntajes': [[3, 4]]
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_estadisticas_por_gac_desde_el_resumen(self):
+        self.crear_estudiantes(2)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('estadisticas_por_gac'))
+        estadisticas = {g['gac_numero']: g for g in response.data['estadisticas_por_gac']}
+        self.assertEqual(estadisticas[1]['total_evaluaciones'], 4)
+        self.assertEqual(estadisticas[1]['promedio'], 3.0)
+        self.assertEqual(estadisticas[2]['reprobadas'], 2)
+
+    def test_informe_gac_semestre_con_materias(self):
+        materia = Materia.objects.create(nombre='Cálculo')
+        materia.racs.set([self.rac_1, self.rac_2])
+        self.crear_estudiantes(2, grupo='1A')
+        self.crear_estudiantes(1, desde=2, grupo='2A')
+
+        response = self.client.get(reverse('informes_por_gac_semestre'))
+        gacs = {g['gac_numero']: g for g in response.json()['gacs_por_semestre']}
+        self.assertEqual(gacs[1]['primer_semestre']['total_evaluaciones'], 4)
+        self.assertEqual(gacs[1]['segundo_semestre']['promedio'], 3.0)
+        self.assertEqual(gacs[2]['primer_semestre']['materias'][0]['promedio'], 2.0)
+
+        globales = self.client.get(reverse('resultados_globales')).json()
+        self.assertEqual(globales['resumen_general']['total_gacs_evaluados'], 2)
+        self.assertEqual(globales['grafico_gacs'][0]['promedio'], 3.0)
+
+    def test_resultados_globales_columnares(self):
+        materia = Materia.objects.create(nombre='Cálculo')
+        materia.racs.set([self.rac_2])
+        self.crear_estudiantes(2, grupo='1A')
+        self.crear_estudiantes(1, desde=2, grupo='2A')
+        Evaluacion.objects.filter(estudiante__grupo='2A', rac=self.rac_2).update(puntaje=5.0)
+
+        data = self.client.get(reverse('resultados_globales')).json()
+        resumen = data['resumen_general']
+        self.assertEqual(resumen['total_evaluaciones'], 6)
+        self.assertEqual(resumen['total_evaluaciones_segundo'], 2)
+        self.assertEqual(resumen['total_estudiantes_primer'], 2)
+        self.assertEqual(resumen['promedio_general'], 3.5)
+        self.assertEqual(resumen['total_materias'], 1)
+
+        gacs = {g['gac_numero']: g for g in data['gacs_por_semestre']}
+        # GAC 2 solo recibe RAC 2: 2.0, 2.0 (1A) y 5.0 (2A)
+        self.assertEqual(gacs['2']['primer_semestre'], {'promedio': 2.0, 'total_evaluaciones': 2})
+        self.assertEqual(gacs['2']['segundo_semestre'], {'promedio': 5.0, 'total_evaluaciones': 1})
+        self.assertEqual(gacs['1']['promedio_general'], 3.5)
+        self.assertEqual(data['materias_por_semestre'][0]['promedio_general'], 3.0)
+        self.assertEqual(data['grafico_estudiantes'][0]['promedio'], 4.5)
+        self.assertEqual(len(data['evaluaciones']), 6)
+
+    def test_estadisticas_por_gac_filtradas_por_periodo(self):
+        self.crear_estudiantes(2)
+        periodo_actual = Evaluacion.objects.first().periodo
+        otro = PeriodoAcademico.objects.create(
+            año=periodo_actual.año - 1, semestre=periodo_actual.semestre, nombre='Anterior',
+            fecha_inicio=periodo_actual.fecha_inicio.replace(year=periodo_actual.año - 1),
+            fecha_fin=periodo_actual.fecha_fin.replace(year=periodo_actual.año - 1), activo=False
+        )
+        estudiante = self.crear_estudiantes(1, desde=2)[0]
+        Evaluacion.objects.filter(estudiante=estudiante).update(periodo=otro)
+        ResumenEstudianteGAC.recalcular(estudiante_ids=[estudiante.id])
+
+        url = reverse('estadisticas_por_gac')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'periodo': otro.id})
+        estadisticas = {g['gac_numero']: g for g in response.data['estadisticas_por_gac']}
+        self.assertEqual(estadisticas[1]['total_evaluaciones'], 2)
+
+        response = self.client.get(url, {'periodo': periodo_actual.codigo})
+        self.assertEqual(response.data['estadisticas_por_gac'][0]['total_evaluaciones'], 4)
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['estadisticas_por_gac'][0]['total_evaluaciones'], 6)
+
+
+class CacheInformesTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        caches['reportes'].clear()
+        self.crear_base()
+        self.crear_estudiantes(2)
+        self.url = reverse('estadisticas_por_gac')
+
+    def test_segunda_lectura_sin_consultas(self):
+        primera = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            segunda = self.client.get(self.url)
+        self.assertEqual(primera.data, segunda.data)
+
+        # Parámetros distintos, entrada distinta
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'periodo': '1999-1'})
+
+        estadisticas = estadisticas_cache()
+        self.assertEqual(estadisticas['aciertos'], 1)
+        self.assertEqual(estadisticas['fallos'], 2)
+
+    def test_escrituras_invalidan_la_cache(self):
+        self.client.get(self.url)
+        version = estadisticas_cache()['version_datos']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crear_estudiantes(1, desde=2)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['estadisticas_por_gac'][0]['total_evaluaciones'], 6)
+
+        # Cambios M2M también cuentan como escritura
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rac_1.gacs.add(self.gac_2)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['estadisticas_por_gac'][1]['total_evaluaciones'], 6)
+        self.assertNotEqual(estadisticas_cache()['version_datos'], version)
+
+    def test_respuestas_json_de_django(self):
+        url = reverse('informes_por_gac_semestre')
+        primera = self.client.get(url)
+        with self.assertNumQueries(0):
+            segunda = self.client.get(url)
+        self.assertEqual(primera.json(), segunda.json())
+        self.assertEqual(segunda['Content-Type'], 'application/json')
+
+
+@SIN_CACHE_INFORMES
+class FiltroPeriodoTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+        self.crear_estudiantes(2)
+        self.actual = Evaluacion.objects.first().periodo
+        self.anterior = PeriodoAcademico.objects.create(
+            año=self.actual.año - 1, semestre=self.actual.semestre, nombre='Anterior',
+            fecha_inicio=self.actual.fecha_inicio.replace(year=self.actual.año - 1),
+            fecha_fin=self.actual.fecha_fin.replace(year=self.actual.año - 1), activo=False
+        )
+        estudiante = self.crear_estudiantes(1, desde=2)[0]
+        Evaluacion.objects.filter(estudiante=estudiante).update(periodo=self.anterior)
+        ResumenEstudianteGAC.recalcular(estudiante_ids=[estudiante.id])
+
+    def total_globales(self, **parametros):
+        data = self.client.get(reverse('resultados_globales'), parametros).json()
+        return data['resumen_general']['total_evaluaciones']
+
+    def test_periodo_y_rangos(self):
+        self.assertEqual(self.total_globales(), 6)
+        self.assertEqual(self.total_globales(periodo=self.anterior.id), 2)
+        self.assertEqual(self.total_globales(periodo=f"{self.actual.codigo},{self.anterior.id}"), 6)
+        self.assertEqual(self.total_globales(periodo_desde=self.actual.codigo), 4)
+        self.assertEqual(self.total_globales(periodo_hasta=self.anterior.codigo), 2)
+        self.assertEqual(self.total_globales(periodo_desde='1990-1', periodo_hasta=self.actual.id), 0)
+
+    def test_informes_respetan_el_periodo(self):
+        response = self.client.get(reverse('informes_por_gac_semestre'), {'periodo': self.anterior.codigo})
+        gacs = {g['gac_numero']: g for g in response.json()['gacs_por_semestre']}
+        self.assertEqual(gacs[1]['primer_semestre']['total_evaluaciones'], 2)
+
+        response = self.client.get(reverse('estadisticas_evaluaciones'), {'periodo': self.anterior.id})
+        self.assertEqual(response.data['resumen_general']['total_estudiantes'], 1)
+
+    def test_periodo_actual_memorizado_hasta_cambio_de_dia_o_escritura(self):
+        # Solo se memoriza al confirmar la transacción
+        PeriodoAcademico.get_periodo_actual()
+        with self.assertNumQueries(1):
+            PeriodoAcademico.get_periodo_actual()
+        with self.captureOnCommitCallbacks(execute=True):
+            PeriodoAcademico.get_periodo_actual()
+        with self.assertNumQueries(0):
+            self.assertEqual(PeriodoAcademico.get_periodo_actual(), self.actual)
+
+        manana = timezone.now() + timedelta(days=1)
+        with mock.patch('competencias.models.timezone.now', return_value=manana):
+            with CaptureQueriesContext(connection) as consultas:
+                PeriodoAcademico.get_periodo_actual()
+            self.assertTrue(consultas.captured_queries)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PeriodoAcademico.get_periodo_actual()
+        self.anterior.save()
+        with self.assertNumQueries(1):
+            PeriodoAcademico.get_periodo_actual()
+
+    def test_lecturas_sin_periodo_activo_no_lo_crean(self):
+        segundo = self.crear_estudiantes(1, desde=5, grupo='2A')[0]
+        PeriodoAcademico.objects.update(activo=False)
+        PeriodoAcademico.olvidar_periodo_actual()
+        periodos = PeriodoAcademico.objects.count()
+
+        self.assertIsNone(PeriodoAcademico.get_periodo_actual())
+        self.assertEqual(self.client.get(reverse('obtener_periodo_actual')).status_code, 404)
+        respuesta = self.client.get(reverse('resultados_estudiante_por_semestre', args=[segundo.id]))
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(self.client.get(reverse('descargar_pdf_estudiantes_por_semestre')).status_code, 200)
+        self.assertEqual(PeriodoAcademico.objects.count(), periodos)
+
+
+@SIN_CACHE_INFORMES
+class SincronizacionEvaluacionesTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+        self.estudiantes = self.crear_estudiantes(2)
+        self.url = reverse('sincronizar_evaluaciones')
+
+    def cambio(self, clave, estudiante, rac, puntaje, minutos):
+        return {
+            'clave': clave, 'estudiante_id': estudiante.id, 'rac_id': rac.id, 'puntaje': puntaje,
+            'fecha_cliente': (timezone.now() + timedelta(minutes=minutos)).isoformat()
+        }
+
+    def puntaje(self, estudiante, rac):
+        return Evaluacion.objects.get(estudiante=estudiante, rac=rac).puntaje
+
+    def test_lote_idempotente_con_ultima_escritura_y_delta(self):
+        primero, segundo = self.estudiantes
+        cambios = [
+            self.cambio('a', primero, self.rac_1, 5, 1),
+            # Anterior a la última modificación del servidor
+            self.cambio('b', segundo, self.rac_1, 1, -60 * 24),
+            # Dos cambios de la misma celda en el lote: gana el más reciente
+            self.cambio('c', segundo, self.rac_2, 3, 2),
+            self.cambio('d', segundo, self.rac_2, 5, 1),
+            self.cambio('e', primero, self.rac_2, 9, 1),
+        ]
+        response = self.client.post(self.url, {'token': None, 'cambios': cambios}, format='json')
+        self.assertEqual(response.status_code, 200)
+        estados = {r['clave']: r['estado'] for r in response.data['resultados']}
+        self.assertEqual(estados, {'a': 'aplicado', 'b': 'obsoleto', 'c': 'aplicado', 'd': 'obsoleto', 'e': 'error'})
+        self.assertEqual(self.puntaje(primero, self.rac_1), 5.0)
+        self.assertEqual(self.puntaje(segundo, self.rac_1), 4.0)
+        self.assertEqual(self.puntaje(segundo, self.rac_2), 3.0)
+        self.assertEqual(len(response.data['evaluaciones']), 4)
+
+        incremental = {(r.estudiante_id, r.gac_id): r.suma_puntajes for r in ResumenEstudianteGAC.objects.all()}
+        ResumenEstudianteGAC.recalcular()
+        self.assertEqual(incremental, {(r.estudiante_id, r.gac_id): r.suma_puntajes for r in ResumenEstudianteGAC.objects.all()})
+
+        # Reintento del mismo lote con el token recibido: nada se aplica dos veces
+        token = response.data['token']
+        Evaluacion.objects.filter(estudiante=primero, rac=self.rac_1).update(puntaje=2.0)
+        # Escritura concurrente confirmada tras la respuesta con una fecha anterior al token
+        tardia = Evaluacion.objects.get(estudiante=primero, rac=self.rac_2)
+        Evaluacion.objects.filter(pk=tardia.pk).update(
+            puntaje=1.0, fecha_modificacion=datetime.fromisoformat(token) - timedelta(seconds=1)
+        )
+        # Estudiantes, RACs, claves, período, transacción vacía y delta
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, {'token': token, 'cambios': cambios[:4]}, format='json')
+        self.assertEqual({r['estado'] for r in response.data['resultados']}, {'duplicado'})
+        self.assertEqual(self.puntaje(primero, self.rac_1), 2.0)
+        # El delta relee el margen anterior al token: la escritura tardía no se pierde
+        delta = {e['id']: e['puntaje'] for e in response.data['evaluaciones']}
+        self.assertEqual(delta[tardia.pk], 1.0)
+        self.assertEqual(response.data['token'], token)
+
+        response = self.client.post(self.url, {'token': 'no es una fecha', 'cambios': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_dos_dispositivos_gana_la_fecha_del_cliente(self):
+        primero, segundo = self.estudiantes
+        # El dispositivo A editó a las 10:00 y el B a las 12:00, ambos sin conexión
+        # y después del último guardado en línea
+        a_primero = self.cambio('a1', primero, self.rac_1, 1, 60)
+        b_primero = self.cambio('b1', primero, self.rac_1, 5, 180)
+        a_segundo = self.cambio('a2', segundo, self.rac_1, 1, 60)
+        b_segundo = self.cambio('b2', segundo, self.rac_1, 5, 180)
+
+        # A sincroniza antes que B: la edición posterior de B gana igual
+        response = self.client.post(self.url, {'token': None, 'cambios': [a_primero]}, format='json')
+        self.assertEqual(response.data['resultados'][0]['estado'], 'aplicado')
+        response = self.client.post(self.url, {'token': None, 'cambios': [b_primero]}, format='json')
+        self.assertEqual(response.data['resultados'][0]['estado'], 'aplicado')
+        self.assertEqual(self.puntaje(primero, self.rac_1), 5.0)
+
+        # B sincroniza antes que A: la edición anterior de A queda obsoleta
+        response = self.client.post(self.url, {'token': None, 'cambios': [b_segundo]}, format='json')
+        self.assertEqual(response.data['resultados'][0]['estado'], 'aplicado')
+        response = self.client.post(self.url, {'token': None, 'cambios': [a_segundo]}, format='json')
+        self.assertEqual(response.data['resultados'][0]['estado'], 'obsoleto')
+        self.assertEqual(self.puntaje(segundo, self.rac_1), 5.0)
+
+        evaluacion = Evaluacion.objects.get(estudiante=segundo, rac=self.rac_1)
+        self.assertEqual(evaluacion.fecha_escritura, datetime.fromisoformat(b_segundo['fecha_cliente']))
+
+
+@SIN_CACHE_INFORMES
+class ProfesorMateriaTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+        self.otro = Profesor.objects.create_user(
+            correo='otro@unbosque.edu.co', nombre='Otro Profesor', cedula='1000002', contrasenia='secreta'
+        )
+        self.materia = Materia.objects.create(nombre='Cálculo', descripcion='')
+        self.materia.racs.set([self.rac_1, self.rac_2])
+
+    def test_dos_consultas_agrupadas(self):
+        estudiantes = self.crear_estudiantes(4)
+        # El otro profesor evalúa solo a uno de los cuatro estudiantes
+        Evaluacion.objects.create(estudiante=estudiantes[0], rac=self.rac_1, profesor=self.otro, puntaje=5.0)
+
+        url = reverse('informes_por_profesor_materia')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        filas = {f['profesor_nombre']: f for f in response.json()['profesores_materias']}
+
+        self.assertEqual(filas['Profesor Prueba']['promedio'], 3.0)
+        self.assertEqual(filas['Profesor Prueba']['estudiantes_evaluados'], 4)
+        self.assertEqual(filas['Profesor Prueba']['color_semaforo'], 'verde')
+        self.assertEqual(filas['Otro Profesor']['total_estudiantes'], 4)
+        self.assertEqual(filas['Otro Profesor']['porcentaje_evaluacion'], 25.0)
+        self.assertEqual(filas['Otro Profesor']['color_semaforo'], 'rojo')
+
+    def test_pdf_por_profesor(self):
+        self.crear_estudiantes(2)
+        response = self.client.get(reverse('descargar_pdf_por_profesor'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_estadisticas_informe_individual_en_una_pasada(self):
+        from .views import estadisticas_informe_profesor
+
+        estudiantes = self.crear_estudiantes(3)
+        Evaluacion.objects.filter(estudiante=estudiantes[2], rac=self.rac_2).update(puntaje=3.5)
+        evaluaciones = list(
+            Evaluacion.objects.filter(profesor=self.profesor).select_related('estudiante', 'rac')
+            .prefetch_related('rac__gacs', 'rac__materias').order_by('estudiante__nombre', 'rac__numero')
+        )
+
+        generales, materias, detalle = estadisticas_informe_profesor(evaluaciones)
+
+        self.assertEqual(generales['total_evaluaciones'], 6)
+        self.assertEqual(generales['total_estudiantes'], 3)
+        self.assertAlmostEqual(generales['promedio_general'], 19.5 / 6)
+        self.assertEqual(generales['estadisticas_puntaje'], {
+            0.0: 0, 1.0: 0, 2.0: 2, 3.0: 0, 3.5: 1, 4.0: 3, 5.0: 0
+        })
+        calculo = materias[f"Cálculo (ID: {self.materia.id})"]
+        self.assertEqual((calculo['total_evaluaciones'], calculo['total_estudiantes'], calculo['total_racs']), (6, 3, 2))
+        self.assertEqual(calculo['estadisticas_puntaje'], generales['estadisticas_puntaje'])
+        tercero = detalle[estudiantes[2].id]
+        self.assertEqual(tercero['promedio'], 3.75)
+        self.assertEqual(tercero['materias'], ['Cálculo'])
+        self.assertEqual(tercero['gacs'][1]['evaluaciones'], [4.0, 3.5])
+        self.assertEqual(tercero['gacs'][1]['promedio'], 3.75)
+        self.assertEqual(tercero['gacs'][2]['promedio'], 3.5)
+        self.assertEqual(tercero['estadisticas_puntaje'][3.5], 1)
+        self.assertEqual(list(detalle), [e.id for e in estudiantes])
+
+        response = self.client.get(reverse('descargar_informe_profesor_individual', args=[self.profesor.id]))
+        self.assertEqual(response.status_code, 200)
+
+
+@SIN_CACHE_INFORMES
+class EstudiantesPorSemestreTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+
+    def test_pdf_con_consultas_constantes(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.crear_estudiantes(2)
+        self.crear_estudiantes(2, desde=2, grupo='2A')
+        url = reverse('descargar_pdf_estudiantes_por_semestre')
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as pocos:
+            response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+        self.crear_estudiantes(10, desde=4)
+        self.crear_estudiantes(10, desde=14, grupo='2B')
+        with CaptureQueriesContext(connection) as muchos:
+            self.client.get(url)
+        self.assertEqual(len(muchos), len(pocos))
+
+    def test_evaluaciones_fuera_de_los_periodos_se_clasifican_por_fecha(self):
+        estudiante = self.crear_estudiantes(1, grupo='2A')[0]
+        actual = Evaluacion.objects.first().periodo
+        antiguo = PeriodoAcademico.objects.create(
+            año=actual.año - 5, semestre=1, nombre='Antiguo',
+            fecha_inicio=actual.fecha_inicio.replace(year=actual.año - 5),
+            fecha_fin=actual.fecha_fin.replace(year=actual.año - 5), activo=False
+        )
+        Evaluacion.objects.filter(estudiante=estudiante, rac=self.rac_2).update(periodo=antiguo)
+
+        from .views import obtener_resultados_estudiante_por_semestre_interno
+        resultados = obtener_resultados_estudiante_por_semestre_interno(estudiante.id)
+
+        racs = sum(
+            resultados[semestre]['resumen_general']['total_racs_evaluados']
+            for semestre in ('primer_semestre', 'segundo_semestre')
+        )
+        self.assertEqual(racs, 2)
+
+    def test_filtro_de_periodo_en_la_base_de_datos(self):
+        from .views import resultados_por_semestre_estudiantes
+
+        primero = self.crear_estudiantes(1)[0]
+        segundo = self.crear_estudiantes(1, desde=1, grupo='2A')[0]
+        actual = Evaluacion.objects.first().periodo
+        anterior = PeriodoAcademico.objects.create(
+            año=actual.año - 1, semestre=actual.semestre, nombre='Anterior',
+            fecha_inicio=actual.fecha_inicio.replace(year=actual.año - 1),
+            fecha_fin=actual.fecha_fin.replace(year=actual.año - 1), activo=False
+        )
+        Evaluacion.objects.filter(estudiante=primero, rac=self.rac_2).update(periodo=anterior)
+
+        tabla = Evaluacion._meta.db_table
+        with CaptureQueriesContext(connection) as consultas:
+            resultados = resultados_por_semestre_estudiantes(
+                Estudiante.objects.all(), filtro=Q(periodo__id__in=[anterior.id])
+            )
+        # Ninguna consulta lee todas las evaluaciones de todos los períodos
+        lecturas = [c['sql'] for c in consultas if f'FROM "{tabla}"' in c['sql']]
+        self.assertEqual(len(lecturas), 2)
+        self.assertTrue(all('"periodo_id" IN' in sql or '"grupo" IN' in sql for sql in lecturas))
+
+        self.assertEqual(resultados[primero.id]['filtrado']['resumen_general']['total_evaluaciones'], 1)
+        self.assertNotIn('primer_semestre', resultados[primero.id])
+        self.assertEqual(resultados[segundo.id]['filtrado']['resumen_general']['total_evaluaciones'], 0)
+        self.assertEqual(resultados[segundo.id]['segundo_semestre']['resumen_general']['total_racs_evaluados'], 2)
+
+        response = self.client.get(reverse('descargar_pdf_estudiantes_por_semestre'), {'periodo': anterior.codigo})
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    def test_renderizado_por_fragmentos_conserva_las_paginas(self):
+        from . import pdf_paralelo
+        if pdf_paralelo.PdfReader is None:
+            self.skipTest('pypdf no está instalado')
+        from io import BytesIO
+
+        resultados = {
+            'filtrado': {
+                'resumen_general': {'promedio_general': 3.5, 'total_evaluaciones': 2},
+                'grafico_gacs': [{'gac': 'GAC 1', 'promedio': 3.5}],
+            },
+        }
+        secciones = [
+            {'nombre': f'ESTUDIANTE {i}', 'grupo': '1A', 'documento': str(i),
+             'segundo_semestre': False, 'resultados': resultados}
+            for i in range(6)
+        ]
+        contexto = {'fecha': '01/01/2025 00:00'}
+
+        def paginas(**opciones):
+            pdf = pdf_paralelo.renderizar_por_fragmentos(
+                pdf_paralelo.story_estudiantes_por_semestre, secciones, contexto, **opciones
+            )
+            lector = pdf_paralelo.PdfReader(BytesIO(pdf))
+            return [pagina.extract_text().split('\n')[0] for pagina in lector.pages]
+
+        serie = paginas(procesos=1)
+        paralelo = paginas(procesos=3, minimo_por_fragmento=1)
+        self.assertEqual(len(serie), 6)
+        self.assertEqual(paralelo, serie)
+
+
+@SIN_CACHE_INFORMES
+class InformesPDFTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+
+    def test_estilos_y_plantillas_compartidos(self):
+        from .informes_pdf import COMPACTA, estilo_tabla, estilos_pdf
+        from .views import crear_estilos_pdf
+
+        self.assertIs(crear_estilos_pdf(), estilos_pdf())
+        self.assertIs(
+            estilo_tabla(encabezado='darkgreen', filas='lightgreen', **COMPACTA),
+            estilo_tabla(encabezado='darkgreen', filas='lightgreen', **COMPACTA)
+        )
+
+    def test_todos_los_informes_generan_pdf(self):
+        materia = Materia.objects.create(nombre='Cálculo', descripcion='')
+        materia.racs.set([self.rac_1, self.rac_2])
+        materia.profesores.add(self.profesor)
+        estudiantes = self.crear_estudiantes(2) + self.crear_estudiantes(1, desde=2, grupo='2A')
+        urls = [reverse(nombre) for nombre in (
+            'descargar_pdf_resumen_general', 'descargar_pdf_por_gac', 'descargar_pdf_por_profesor',
+            'descargar_pdf_por_estudiante', 'descargar_pdf_estudiantes_por_semestre',
+        )]
+        urls.append(reverse('descargar_pdf_estudiante_individual', args=[estudiantes[2].id]))
+        urls.append(reverse('descargar_informe_profesor_individual', args=[self.profesor.id]))
+
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertEqual(response['Content-Type'], 'application/pdf', url)
+            # FileResponse por bloques desde el archivo temporal del informe
+            contenido = b''.join(response.streaming_content)
+            self.assertTrue(contenido.startswith(b'%PDF'), url)
+            self.assertEqual(int(response['Content-Length']), len(contenido), url)
+
+    def test_zip_de_estudiantes_por_grupo(self):
+        import zipfile
+        from io import BytesIO
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = reverse('descargar_zip_estudiantes')
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+        self.crear_estudiantes(2, grupo='2A')
+        self.crear_estudiantes(1, desde=2, grupo='1A')
+
+        def descargar():
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.get(url, {'grupo': '2A'})
+                contenido = b''.join(response.streaming_content)
+            return response, zipfile.ZipFile(BytesIO(contenido)), len(consultas)
+
+        response, archivo_zip, pocas = descargar()
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertEqual(archivo_zip.namelist(), ['2A/9000000_ESTUDIANTE_000.pdf', '2A/9000001_ESTUDIANTE_001.pdf'])
+        self.assertTrue(all(archivo_zip.read(n).startswith(b'%PDF') for n in archivo_zip.namelist()))
+
+        self.crear_estudiantes(8, desde=3, grupo='2A')
+        _, archivo_zip, muchas = descargar()
+        self.assertEqual(len(archivo_zip.namelist()), 10)
+        self.assertEqual(muchas, pocas)
+
+
+class ArtefactosPDFTests(DatosEvaluacionMixin, TestCase):
+
+    def setUp(self):
+        self.crear_base()
+        self.crear_estudiantes(2)
+        self.url = reverse('descargar_pdf_resumen_general')
+
+    def test_descarga_repetida_desde_disco_con_etag(self):
+        primera = self.client.get(self.url)
+        self.assertEqual(primera['Content-Type'], 'application/pdf')
+        etag = primera['ETag']
+
+        with self.assertNumQueries(0):
+            segunda = self.client.get(self.url)
+        self.assertEqual(segunda['ETag'], etag)
+        self.assertEqual(b''.join(segunda.streaming_content), b''.join(primera.streaming_content))
+
+        no_modificada = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(no_modificada.status_code, 304)
+
+        # Otros parámetros, otro artefacto
+        self.assertNotEqual(self.client.get(self.url, {'periodo': '1999-1'})['ETag'], etag)
+
+        # Una escritura cambia la versión de datos
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crear_estudiantes(1, desde=2)
+        nueva = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(nueva.status_code, 200)
+        self.assertNotEqual(nueva['ETag'], etag)
+
+    def test_if_none_match_comodin_solo_con_artefacto(self):
+        # Sin artefacto generado (o ya expulsado) '*' no coincide
+        primera = self.client.get(self.url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(primera.status_code, 200)
+        self.assertEqual(primera['Content-Type'], 'application/pdf')
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='*').status_code, 304)
+
+    def test_expulsion_lru_por_cuota(self):
+        from .artefactos import expulsar_artefactos, obtener_artefacto
+
+        claves = []
+        for periodo in ('1999-1', '1999-2', '2000-1'):
+            etag = self.client.get(self.url, {'periodo': periodo})['ETag']
+            claves.append(etag.strip('"'))
+        # El primero se vuelve a usar: el menos reciente pasa a ser el segundo
+        rutas = [obtener_artefacto(clave)[0] for clave in claves]
+        os.utime(rutas[1], (1, 1))
+        cuota = os.path.getsize(rutas[0]) + os.path.getsize(rutas[2])
+
+        self.assertEqual(expulsar_artefactos(cuota=cuota), 1)
+        self.assertIsNone(obtener_artefacto(claves[1])[0])
+        self.assertIsNotNone(obtener_artefacto(claves[0])[0])
+        self.assertIsNotNone(obtener_artefacto(claves[2])[0])
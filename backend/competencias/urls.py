@@ -16,7 +16,10 @@ urlpatterns = [
     path('api/evaluaciones/estudiante/<int:estudiante_id>/', views.obtener_evaluaciones_estudiante, name='obtener_evaluaciones_estudiante'),
     path('api/evaluaciones/crear/', views.crear_o_actualizar_evaluacion, name='crear_o_actualizar_evaluacion'),
     path('api/evaluaciones/masivas/', views.crear_evaluaciones_masivas, name='crear_evaluaciones_masivas'),
+    path('api/evaluaciones/matriz/', views.guardar_matriz_evaluaciones, name='guardar_matriz_evaluaciones'),
+    path('api/evaluaciones/sincronizar/', views.sincronizar_evaluaciones, name='sincronizar_evaluaciones'),
     path('api/evaluaciones/estadisticas/', views.estadisticas_evaluaciones, name='estadisticas_evaluaciones'),
+    path('api/evaluaciones/estadisticas/estudiantes/', views.estadisticas_evaluaciones_estudiantes, name='estadisticas_evaluaciones_estudiantes'),
     path('api/evaluaciones/estadisticas-por-gac/', views.estadisticas_por_gac, name='estadisticas_por_gac'),
     path('api/evaluaciones/resultados-estudiante/<int:estudiante_id>/', views.resultados_estudiante, name='resultados_estudiante'),
     path('api/evaluaciones/resultados-estudiante-semestre/<int:estudiante_id>/', views.resultados_estudiante_por_semestre, name='resultados_estudiante_por_semestre'),
@@ -29,6 +32,7 @@ urlpatterns = [
     path('api/informes/estudiante-profesores/', views.informes_por_estudiante_profesores, name='informes_por_estudiante_profesores'),
     path('api/informes/detalle-profesor-materia/<int:profesor_id>/<int:materia_id>/', views.informes_detalle_profesor_materia, name='informes_detalle_profesor_materia'),
     path('api/debug-datos/', views.debug_datos, name='debug_datos'),
+    path('api/debug-cache/', views.estadisticas_cache_informes, name='estadisticas_cache_informes'),
     path('api/materias/', views.obtener_todas_materias, name='obtener_todas_materias'),
     path('api/materias-profesor/', views.obtener_materias_profesor, name='obtener_materias_profesor'),
     path('api/gacs-por-materia/<int:materia_id>/', views.obtener_gacs_por_materia, name='obtener_gacs_por_materia'),
@@ -39,6 +43,7 @@ urlpatterns = [
     path('api/pdf/por-profesor/', views.descargar_pdf_por_profesor, name='descargar_pdf_por_profesor'),
     path('api/pdf/por-estudiante/', views.descargar_pdf_por_estudiante, name='descargar_pdf_por_estudiante'),
     path('api/pdf/estudiante-individual/<int:estudiante_id>/', views.descargar_pdf_estudiante_individual, name='descargar_pdf_estudiante_individual'),
+    path('api/pdf/estudiantes-zip/', views.descargar_zip_estudiantes, name='descargar_zip_estudiantes'),
     path('api/pdf/estudiantes-por-semestre/', views.descargar_pdf_estudiantes_por_semestre, name='descargar_pdf_estudiantes_por_semestre'),
     
     # URLs para períodos académicos
@@ -5,23 +5,34 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
 from django.core.exceptions import ValidationError
-from .models import GAC, RAC, Materia, Evaluacion, PeriodoAcademico
+from .models import (
+    GAC, RAC, Materia, Evaluacion, PeriodoAcademico, ResumenEstudianteGAC, CambioSincronizado,
+    GRUPOS_PRIMER_SEMESTRE, GRUPOS_SEGUNDO_SEMESTRE
+)
+from .analytics import DatosColumnares, calcular_resultados_globales
+from .artefactos import artefacto_pdf
+from .cache import cache_respuesta, estadisticas_cache
+from .informes_pdf import (
+    COMPACTA, MARGENES_INFORME, construir_pdf, encabezado_informe, estilo_tabla, estilos_pdf,
+    informe_pdf, respuesta_pdf, tabla, tabla_clave_valor, zip_en_streaming
+)
+from .pdf_paralelo import renderizar_por_fragmentos, story_estudiantes_por_semestre
 from .serializers import GACSerializer, RACSerializer, MateriaSerializer, EvaluacionSerializer, EstadisticaGACSerializer, PeriodoAcademicoSerializer
 from usuarios.models import Profesor, Estudiante
-from django.db.models import Avg, Count, F, Max
+from django.db.models import Avg, Count, F, Max, QuerySet, Subquery, Sum
 import random
-from django.http import JsonResponse, HttpResponse
+from collections import Counter
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 import logging
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+import json
+from reportlab.platypus import Table, Paragraph, Spacer, PageBreak
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from datetime import datetime
-import io
+from datetime import datetime, timedelta
+from django.db import transaction
 from django.utils import timezone
-from io import BytesIO
+from django.utils.dateparse import parse_datetime
+from django.utils.text import get_valid_filename
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -120,6 +131,7 @@ def obtener_racs(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def obtener_evaluaciones_estudiante(request, estudiante_id):
     """Obtener evaluaciones existentes de un estudiante"""
     try:
@@ -139,6 +151,13 @@ def obtener_evaluaciones_estudiante(request, estudiante_id):
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _id_entero(valor):
+    """Identificador numérico recibido en el cuerpo de la petición o None si no lo es"""
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def crear_o_actualizar_evaluacion(request):
@@ -158,16 +177,10 @@ def crear_o_actualizar_evaluacion(request):
 
         # Validar que el puntaje sea un valor válido
         try:
-            puntaje_float = float(puntaje)
-            valid_puntajes = [0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0]
-            if puntaje_float not in valid_puntajes:
-                return Response(
-                    {'error': 'El puntaje debe ser uno de los valores válidos: 0, 1, 2, 3, 3.5, 4, 5'}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except (ValueError, TypeError):
+            puntaje_float = Evaluacion.objects.validar_puntaje(puntaje)
+        except ValidationError:
             return Response(
-                {'error': 'El puntaje debe ser un número válido (0, 1, 2, 3, 3.5, 4, 5)'}, 
+                {'error': 'El puntaje debe ser uno de los valores válidos: 0, 1, 2, 3, 3.5, 4, 5'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
 
@@ -189,26 +202,12 @@ def crear_o_actualizar_evaluacion(request):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Buscar si ya existe una evaluación para este estudiante y RAC
-        evaluacion_existente = Evaluacion.objects.filter(
-            estudiante_id=estudiante_id,
-            rac_id=rac_id,
-            profesor_id=profesor_id
-        ).first()
-
-        if evaluacion_existente:
-            # Actualizar evaluación existente
-            evaluacion_existente.puntaje = puntaje_float
-            evaluacion_existente.save()
-            evaluacion = evaluacion_existente
-        else:
-            # Crear nueva evaluación
-            evaluacion = Evaluacion.objects.create(
-                estudiante_id=estudiante_id,
-                rac_id=rac_id,
-                profesor_id=profesor_id,
-                puntaje=puntaje_float
-            )
+        # Crear o actualizar con un upsert atómico sobre la restricción única del período
+        periodo = PeriodoAcademico.obtener_o_crear_periodo_actual()
+        Evaluacion.objects.guardar_puntajes(estudiante.id, profesor_id, {rac.id: puntaje_float}, periodo=periodo)
+        evaluacion = Evaluacion.objects.select_related('estudiante', 'profesor', 'rac', 'periodo').get(
+            estudiante=estudiante, rac=rac, profesor_id=profesor_id, periodo=periodo
+        )
 
         serializer = EvaluacionSerializer(evaluacion)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -243,9 +242,16 @@ def crear_evaluaciones_masivas(request):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        # Un solo lookup de RAC para todo el envío; la validación es en memoria
+        racs_existentes = set(RAC.objects.filter(
+            id__in={_id_entero(e.get('rac_id')) for e in evaluaciones} - {None}
+        ).values_list('id', flat=True))
+
         resultados = []
         evaluaciones_creadas = []
         evaluaciones_actualizadas = []
+        puntajes = {}
+        validas = []
 
         for eval_data in evaluaciones:
             rac_id = eval_data.get('rac_id')
@@ -261,50 +267,58 @@ def crear_evaluaciones_masivas(request):
 
             # Validar puntaje
             try:
-                puntaje_float = float(puntaje)
-                valid_puntajes = [0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0]
-                if puntaje_float not in valid_puntajes:
-                    resultados.append({
-                        'rac_id': rac_id,
-                        'error': f'El puntaje debe ser uno de los valores válidos: 0, 1, 2, 3, 3.5, 4, 5 (recibido: {puntaje})'
-                    })
-                    continue
-            except (ValueError, TypeError):
+                puntaje_float = Evaluacion.objects.validar_puntaje(puntaje)
+            except ValidationError:
                 resultados.append({
                     'rac_id': rac_id,
-                    'error': f'El puntaje debe ser un número válido (0, 1, 2, 3, 3.5, 4, 5) (recibido: {puntaje})'
+                    'error': f'El puntaje debe ser uno de los valores válidos: 0, 1, 2, 3, 3.5, 4, 5 (recibido: {puntaje})'
                 })
                 continue
 
             # Verificar que el RAC existe
-            try:
-                rac = RAC.objects.get(id=rac_id)
-            except RAC.DoesNotExist:
+            rac = _id_entero(rac_id)
+            if rac not in racs_existentes:
                 resultados.append({
                     'rac_id': rac_id,
                     'error': 'RAC no encontrado'
                 })
                 continue
 
-            # Crear o actualizar evaluación
-            evaluacion, created = Evaluacion.objects.update_or_create(
-                estudiante_id=estudiante_id,
-                rac_id=rac_id,
-                profesor_id=profesor_id,
-                defaults={'puntaje': puntaje_float}
-            )
+            # Si un RAC se repite, el último puntaje es el que queda guardado
+            puntajes[rac] = puntaje_float
+            validas.append((len(resultados), rac_id, rac, puntaje_float))
+            resultados.append(None)
+
+        # Crear o actualizar todas las evaluaciones válidas en una sola escritura
+        creadas = Evaluacion.objects.guardar_puntajes(estudiante.id, profesor_id, puntajes)
+
+        # Cada RAC se cuenta una vez, en su última aparición
+        ultimas = {rac: posicion for posicion, _, rac, _ in validas}
+
+        for posicion, rac_id, rac, puntaje_float in validas:
+            if ultimas[rac] != posicion:
+                # Reemplazada por una entrada posterior del mismo RAC: se informa el puntaje guardado
+                resultados[posicion] = {
+                    'rac_id': rac_id,
+                    'puntaje': puntajes[rac],
+                    'created': False,
+                    'superseded': True,
+                    'success': True
+                }
+                continue
 
+            created = rac in creadas
             if created:
                 evaluaciones_creadas.append(rac_id)
             else:
                 evaluaciones_actualizadas.append(rac_id)
 
-            resultados.append({
+            resultados[posicion] = {
                 'rac_id': rac_id,
                 'puntaje': puntaje_float,
                 'created': created,
                 'success': True
-            })
+            }
 
         return Response({
             'message': 'Evaluaciones procesadas correctamente',
@@ -322,6 +336,250 @@ def crear_evaluaciones_masivas(request):
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def guardar_matriz_evaluaciones(request):
+    """
+    Calificar un grupo completo en una sola petición.
+
+    Cuerpo: {"grupo": "1A", "racs": [rac_id, ...], "estudiantes": [estudiante_id, ...],
+    "puntajes": [[puntaje | null, ...], ...]}, con una fila de `puntajes` por
+    estudiante y una columna por RAC. Las celdas null se omiten. La respuesta
+    trae `estados` con la misma forma: "creada", "actualizada", null o el error
+    de la celda ("puntaje_invalido", "rac_no_encontrado", "estudiante_no_encontrado").
+    """
+    try:
+        grupo = request.data.get('grupo')
+        rac_ids = request.data.get('racs') or []
+        estudiante_ids = request.data.get('estudiantes') or []
+        matriz = request.data.get('puntajes') or []
+        profesor_id = request.user.id
+
+        # Validar la forma de la matriz
+        if not grupo or not rac_ids or not estudiante_ids:
+            return Response(
+                {'error': 'Grupo, RACs y estudiantes son requeridos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(matriz) != len(estudiante_ids) or any(
+            not isinstance(fila, list) or len(fila) != len(rac_ids) for fila in matriz
+        ):
+            return Response(
+                {'error': 'La matriz de puntajes debe tener una fila por estudiante y una columna por RAC'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        columnas = [_id_entero(rac_id) for rac_id in rac_ids]
+        filas = [_id_entero(estudiante_id) for estudiante_id in estudiante_ids]
+        if len(set(columnas)) != len(columnas) or len(set(filas)) != len(filas):
+            return Response(
+                {'error': 'Los RACs y los estudiantes de la matriz no pueden repetirse'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Una consulta para los estudiantes matriculados del grupo y otra para los RAC
+        estudiantes_validos = set(Estudiante.objects.filter(
+            id__in=set(filas) - {None}, grupo=grupo, estado='matriculado'
+        ).values_list('id', flat=True))
+        racs_validos = set(RAC.objects.filter(id__in=set(columnas) - {None}).values_list('id', flat=True))
+
+        estados = []
+        puntajes = {}
+        for estudiante_id, fila in zip(filas, matriz):
+            estados_fila = []
+            for rac_id, puntaje in zip(columnas, fila):
+                if puntaje is None:
+                    estados_fila.append(None)
+                    continue
+                try:
+                    puntaje_float = Evaluacion.objects.validar_puntaje(puntaje)
+                except ValidationError:
+                    estados_fila.append('puntaje_invalido')
+                    continue
+                if estudiante_id not in estudiantes_validos:
+                    estados_fila.append('estudiante_no_encontrado')
+                elif rac_id not in racs_validos:
+                    estados_fila.append('rac_no_encontrado')
+                else:
+                    puntajes[(estudiante_id, rac_id)] = puntaje_float
+                    estados_fila.append('actualizada')
+            estados.append(estados_fila)
+
+        # Toda la matriz en una transacción con un único upsert
+        creadas = Evaluacion.objects.guardar_matriz_puntajes(profesor_id, puntajes)
+        for i, estudiante_id in enumerate(filas):
+            for j, rac_id in enumerate(columnas):
+                if estados[i][j] == 'actualizada' and (estudiante_id, rac_id) in creadas:
+                    estados[i][j] = 'creada'
+
+        celdas = [estado for fila in estados for estado in fila]
+        return Response({
+            'grupo': grupo,
+            'racs': rac_ids,
+            'estudiantes': estudiante_ids,
+            'estados': estados,
+            'resumen': {
+                'creadas': celdas.count('creada'),
+                'actualizadas': celdas.count('actualizada'),
+                'omitidas': celdas.count(None),
+                'errores': len(celdas) - len(puntajes) - celdas.count(None)
+            }
+        }, status=status.HTTP_201_CREATED)
+
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+MAXIMO_CAMBIOS_SINCRONIZACION = 1000
+# fecha_modificacion se fija antes de confirmar la transacción: una escritura
+# concurrente puede quedar con una fecha anterior al token ya entregado
+MARGEN_SINCRONIZACION = timedelta(minutes=5)
+
+
+def _fecha_cliente(valor):
+    """Fecha ISO 8601 enviada por el cliente como datetime aware, o None"""
+    fecha = parse_datetime(str(valor)) if valor else None
+    if fecha is not None and timezone.is_naive(fecha):
+        fecha = timezone.make_aware(fecha)
+    return fecha
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def sincronizar_evaluaciones(request):
+    """
+    Sincronizar en un solo intercambio los puntajes guardados sin conexión.
+
+    Cuerpo: {"token": <token de la sincronización anterior o null>, "cambios":
+    [{"clave", "estudiante_id", "rac_id", "puntaje", "fecha_cliente"}, ...]},
+    con una clave única generada por el cliente para cada cambio y
+    fecha_cliente en ISO 8601. El lote se aplica en una transacción: cada
+    clave se aplica una sola vez y gana la última escritura: un cambio
+    anterior a la fecha_escritura de la evaluación en el servidor (la
+    fecha_cliente que la dejó vigente, o la hora del servidor si se guardó en
+    línea) queda "obsoleto". La respuesta trae el estado de cada cambio, las
+    evaluaciones del profesor en el período actual modificadas desde `token`
+    y el token para la próxima sincronización.
+
+    El token es la fecha_modificacion (hora del servidor) de la última
+    evaluación entregada. Como se fija antes de confirmar la transacción, el
+    delta vuelve a incluir las modificadas en MARGEN_SINCRONIZACION antes del
+    token y el cliente debe descartar repetidas por id. Una escritura cuya
+    transacción tarde más que ese margen en confirmarse no aparece en el delta;
+    el cliente la recupera sincronizando con token null.
+    """
+    try:
+        cambios = request.data.get('cambios') or []
+        token = request.data.get('token')
+        profesor_id = request.user.id
+
+        if not isinstance(cambios, list) or len(cambios) > MAXIMO_CAMBIOS_SINCRONIZACION:
+            return Response(
+                {'error': f'Los cambios deben ser una lista de máximo {MAXIMO_CAMBIOS_SINCRONIZACION} elementos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        desde = _fecha_cliente(token)
+        if token and desde is None:
+            return Response({'error': 'Token de sincronización inválido'}, status=status.HTTP_400_BAD_REQUEST)
+        cambios = [c for c in cambios if isinstance(c, dict)]
+
+        # Validación en memoria: una consulta de estudiantes, una de RACs y una de claves
+        estudiantes_validos = set(Estudiante.objects.filter(
+            id__in={_id_entero(c.get('estudiante_id')) for c in cambios} - {None}, estado='matriculado'
+        ).values_list('id', flat=True))
+        racs_validos = set(RAC.objects.filter(
+            id__in={_id_entero(c.get('rac_id')) for c in cambios} - {None}
+        ).values_list('id', flat=True))
+        claves_registradas = set(CambioSincronizado.objects.filter(
+            profesor_id=profesor_id, clave__in={str(c.get('clave')) for c in cambios if c.get('clave')}
+        ).values_list('clave', flat=True))
+
+        resultados = []
+        registrar = []
+        # (estudiante_id, rac_id) -> (fecha_cliente, puntaje, resultado) del cambio más reciente del lote
+        ultimos = {}
+        for cambio in cambios:
+            clave = str(cambio.get('clave') or '')
+            resultado = {'clave': clave or None}
+            resultados.append(resultado)
+            if not clave or len(clave) > 64:
+                resultado.update(estado='error', error='Clave de idempotencia inválida')
+                continue
+            if clave in claves_registradas:
+                resultado['estado'] = 'duplicado'
+                continue
+            claves_registradas.add(clave)
+
+            fecha = _fecha_cliente(cambio.get('fecha_cliente'))
+            estudiante_id = _id_entero(cambio.get('estudiante_id'))
+            rac_id = _id_entero(cambio.get('rac_id'))
+            try:
+                puntaje = Evaluacion.objects.validar_puntaje(cambio.get('puntaje'))
+            except ValidationError:
+                resultado.update(estado='error', error='El puntaje debe ser uno de los valores válidos: 0, 1, 2, 3, 3.5, 4, 5')
+                continue
+            if fecha is None:
+                resultado.update(estado='error', error='fecha_cliente inválida')
+            elif estudiante_id not in estudiantes_validos:
+                resultado.update(estado='error', error='Estudiante no encontrado o no matriculado')
+            elif rac_id not in racs_validos:
+                resultado.update(estado='error', error='RAC no encontrado')
+            else:
+                resultado['estado'] = 'obsoleto'
+                registrar.append((resultado, fecha))
+                anterior = ultimos.get((estudiante_id, rac_id))
+                if anterior is None or anterior[0] <= fecha:
+                    ultimos[(estudiante_id, rac_id)] = (fecha, puntaje, resultado)
+
+        periodo = PeriodoAcademico.obtener_o_crear_periodo_actual()
+        with transaction.atomic():
+            # Última escritura gana frente a la evaluación ya guardada en el servidor
+            escritas = {
+                (estudiante_id, rac_id): fecha_escritura or fecha_modificacion
+                for estudiante_id, rac_id, fecha_escritura, fecha_modificacion in Evaluacion.objects.select_for_update().filter(
+                    profesor_id=profesor_id, periodo=periodo,
+                    estudiante_id__in={estudiante_id for estudiante_id, _ in ultimos},
+                    rac_id__in={rac_id for _, rac_id in ultimos}
+                ).order_by().values_list('estudiante_id', 'rac_id', 'fecha_escritura', 'fecha_modificacion')
+            }
+            puntajes = {}
+            fechas = {}
+            for clave_evaluacion, (fecha, puntaje, resultado) in ultimos.items():
+                escrita = escritas.get(clave_evaluacion)
+                if escrita is None or escrita <= fecha:
+                    puntajes[clave_evaluacion] = puntaje
+                    fechas[clave_evaluacion] = fecha
+                    resultado['estado'] = 'aplicado'
+            Evaluacion.objects.guardar_matriz_puntajes(profesor_id, puntajes, periodo, fechas)
+
+            CambioSincronizado.objects.bulk_create([
+                CambioSincronizado(
+                    profesor_id=profesor_id, clave=resultado['clave'],
+                    resultado=resultado['estado'], fecha_cliente=fecha
+                )
+                for resultado, fecha in registrar
+            ], ignore_conflicts=True)
+
+        # Cambios del servidor desde el token del cliente (incluye los recién aplicados),
+        # releyendo el margen anterior al token
+        delta = Evaluacion.objects.filter(profesor_id=profesor_id, periodo=periodo)
+        if desde is not None:
+            delta = delta.filter(fecha_modificacion__gte=desde - MARGEN_SINCRONIZACION)
+        evaluaciones = list(delta.order_by('fecha_modificacion').values(
+            'id', 'estudiante_id', 'rac_id', 'puntaje', 'fecha_escritura', 'fecha_modificacion'
+        ))
+
+        return Response({
+            'resultados': resultados,
+            'evaluaciones': evaluaciones,
+            'token': evaluaciones[-1]['fecha_modificacion'].isoformat() if evaluaciones else token,
+            'periodo_id': periodo.id
+        })
+
+    except ValidationError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 from django.db.models import Avg, Count, F
 from django.db.models import Q
 
@@ -338,51 +596,89 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Avg, Count
 
+
+def filtro_periodo(request, campo='periodo'):
+    """
+    Q para filtrar por período académico en la base de datos sobre `campo`.
+
+    Parámetros (id o código del período, p. ej. 2025-1):
+      ?periodo=<p>[,<p>...]                   uno o varios períodos
+      ?periodo_desde=<p>&periodo_hasta=<p>    rango por fecha de inicio, extremos opcionales
+    """
+    filtro = Q()
+
+    periodos = [p.strip() for p in request.GET.get('periodo', '').split(',') if p.strip()]
+    if periodos:
+        ids = [int(p) for p in periodos if p.isdigit()]
+        codigos = [p for p in periodos if not p.isdigit()]
+        por_periodo = Q()
+        if ids:
+            por_periodo |= Q(**{f'{campo}__id__in': ids})
+        if codigos:
+            por_periodo |= Q(**{f'{campo}__codigo__in': codigos})
+        filtro &= por_periodo
+
+    # Los extremos del rango se resuelven como subconsulta, sin consultas adicionales
+    for parametro, operador in (('periodo_desde', 'gte'), ('periodo_hasta', 'lte')):
+        valor = request.GET.get(parametro, '').strip()
+        if valor:
+            referencia = PeriodoAcademico.objects.filter(**{'pk' if valor.isdigit() else 'codigo': valor})
+            filtro &= Q(**{
+                f'{campo}__fecha_inicio__{operador}': Subquery(referencia.values('fecha_inicio')[:1])
+            })
+
+    return filtro
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def estadisticas_evaluaciones(request):
     try:
-        # Evaluaciones únicas por (profesor, estudiante) -> tomar la última fecha
+        evaluaciones = Evaluacion.objects.filter(filtro_periodo(request))
+
+        # Evaluaciones únicas por (profesor, estudiante, GAC) -> puntaje máximo
         evaluaciones_unicas = (
-            Evaluacion.objects
+            evaluaciones
             .values('profesor', 'estudiante', 'rac__gacs')
-            .annotate(ultima_fecha=Max('fecha'), puntaje=Max('puntaje'))
+            .annotate(puntaje_max=Max('puntaje'))
+            .order_by()
         )
 
-        total_evaluaciones = evaluaciones_unicas.count()
-        total_estudiantes = Evaluacion.objects.values('estudiante').distinct().count()
+        total_estudiantes = evaluaciones.values('estudiante').distinct().order_by().count()
 
         # Promedio general de todas las evaluaciones
-        promedio_general = Evaluacion.objects.aggregate(promedio=Avg('puntaje'))['promedio'] or 0.0
+        promedio_general = evaluaciones.aggregate(promedio=Avg('puntaje'))['promedio'] or 0.0
+
+        # Totales y acumuladores por GAC en una sola pasada, sin materializar las filas
+        total_evaluaciones = 0
+        aprobadas = 0
+        acumulado_gac = {}
+        for e in evaluaciones_unicas.iterator(chunk_size=2000):
+            aprobada = e['puntaje_max'] >= 3
+            total_evaluaciones += 1
+            aprobadas += aprobada
+            if e['rac__gacs'] is None:
+                continue
+            acumulado = acumulado_gac.setdefault(e['rac__gacs'], {'total': 0, 'aprobadas': 0, 'suma': 0.0})
+            acumulado['total'] += 1
+            acumulado['suma'] += e['puntaje_max']
+            acumulado['aprobadas'] += aprobada
 
         # Aprobadas / Reprobadas basado en evaluaciones únicas
-        aprobadas = sum(1 for e in evaluaciones_unicas if e['puntaje'] >= 3)
         reprobadas = total_evaluaciones - aprobadas
         porcentaje_aprobacion = (aprobadas / total_evaluaciones * 100) if total_evaluaciones > 0 else 0
 
-        # Datos por estudiante para BI
-        estudiantes_data = []
-        estudiantes_qs = Estudiante.objects.all()
-        for est in estudiantes_qs:
-            est_evals = evaluaciones_unicas.filter(estudiante=est.id)
-            for e in est_evals:
-                gac_obj = GAC.objects.get(id=e['rac__gacs'])
-                estudiantes_data.append({
-                    "estudiante": est.nombre,
-                    "gac": gac_obj.numero,
-                    "gac_descripcion": gac_obj.descripcion,
-                    "puntaje": e['puntaje']
-                })
+        gacs = list(GAC.objects.all())
 
         # Top 5 GACs
         top_gacs_data = []
-        gacs = GAC.objects.all()
         for g in gacs:
-            evals_gac = [e for e in evaluaciones_unicas if e['rac__gacs'] == g.id]
-            total = len(evals_gac)
-            aprobadas_gac = sum(1 for e in evals_gac if e['puntaje'] >= 3)
+            acumulado = acumulado_gac.get(g.id, {'total': 0, 'aprobadas': 0, 'suma': 0.0})
+            total = acumulado['total']
+            aprobadas_gac = acumulado['aprobadas']
             reprobadas_gac = total - aprobadas_gac
-            promedio_gac = sum(e['puntaje'] for e in evals_gac) / total if total > 0 else 0
+            promedio_gac = acumulado['suma'] / total if total > 0 else 0
             porcentaje_aprobacion_gac = (aprobadas_gac / total * 100) if total > 0 else 0
             top_gacs_data.append({
                 "gac_numero": g.numero,
@@ -404,40 +700,130 @@ def estadisticas_evaluaciones(request):
                 "porcentaje_aprobacion": round(porcentaje_aprobacion, 2)
             },
             "top_gacs": top_gacs_data,
-            "estudiantes": estudiantes_data
         })
     except Exception as e:
         print("Error en estadisticas_evaluaciones:", e)
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def filas_estudiante_gac(evaluaciones):
+    """Puntaje máximo por (estudiante, profesor, GAC), ordenado por estudiante para paginar por cursor"""
+    return (
+        evaluaciones
+        .filter(rac__gacs__isnull=False)
+        .values(
+            'estudiante', 'estudiante__nombre', 'profesor',
+            'rac__gacs', 'rac__gacs__numero', 'rac__gacs__descripcion'
+        )
+        .annotate(puntaje_max=Max('puntaje'))
+        .order_by('estudiante', 'profesor', 'rac__gacs')
+    )
+
+
+def formatear_fila_estudiante_gac(fila):
+    return {
+        "estudiante_id": fila['estudiante'],
+        "estudiante": fila['estudiante__nombre'],
+        "gac": fila['rac__gacs__numero'],
+        "gac_descripcion": fila['rac__gacs__descripcion'],
+        "puntaje": fila['puntaje_max'],
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cache_respuesta
+def estadisticas_evaluaciones_estudiantes(request):
+    """
+    Detalle estudiante × GAC del tablero de estadísticas.
+
+    Por defecto paginado por cursor (?cursor=<último estudiante_id>&limite=<n>, máx. 1000
+    estudiantes por página). Con ?formato=ndjson se envía todo como un flujo de líneas JSON.
+    Acepta los mismos filtros de período que las demás vistas de informes.
+    """
+    try:
+        evaluaciones = Evaluacion.objects.filter(filtro_periodo(request))
+
+        if request.GET.get('formato') == 'ndjson':
+            filas = filas_estudiante_gac(evaluaciones).iterator(chunk_size=2000)
+
+            def generar():
+                for fila in filas:
+                    yield json.dumps(formatear_fila_estudiante_gac(fila), ensure_ascii=False) + "\n"
+
+            return StreamingHttpResponse(generar(), content_type='application/x-ndjson')
+
+        try:
+            cursor = int(request.GET.get('cursor', 0))
+            limite = min(max(int(request.GET.get('limite', 100)), 1), 1000)
+        except ValueError:
+            return Response({'error': 'cursor y limite deben ser enteros'}, status=status.HTTP_400_BAD_REQUEST)
+
+        estudiante_ids = list(
+            evaluaciones
+            .filter(estudiante_id__gt=cursor)
+            .values_list('estudiante_id', flat=True)
+            .distinct()
+            .order_by('estudiante_id')[:limite + 1]
+        )
+        hay_mas = len(estudiante_ids) > limite
+        estudiante_ids = estudiante_ids[:limite]
+
+        filas = filas_estudiante_gac(evaluaciones.filter(estudiante_id__in=estudiante_ids))
+        return Response({
+            "estudiantes": [formatear_fila_estudiante_gac(fila) for fila in filas],
+            "siguiente_cursor": estudiante_ids[-1] if hay_mas else None,
+            "limite": limite,
+        })
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def resumen_por_gac(resumenes, *campos):
+    """Sumar filas de ResumenEstudianteGAC por GAC (y los campos extra indicados), ordenadas por número de GAC"""
+    return (
+        resumenes.values('gac_id', 'gac__numero', 'gac__descripcion', *campos)
+        .annotate(
+            total=Sum('total_evaluaciones'),
+            suma=Sum('suma_puntajes'),
+            total_aprobadas=Sum('aprobadas')
+        )
+        .order_by('gac__numero')
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def estadisticas_por_gac(request):
-    """Obtener estadísticas de evaluaciones por cada GAC"""
+    """Obtener estadísticas de evaluaciones por cada GAC (filtrable por período, ver filtro_periodo)"""
     try:
-        gacs = GAC.objects.all().order_by('numero')
-        estadisticas_gac = []
+        # Condición aplicada dentro de los agregados: una sola consulta agrupada por GAC
+        filtro = Q(resumenes__isnull=False) & filtro_periodo(request, 'resumenes__periodo')
+
+        gacs = (
+            GAC.objects
+            .annotate(
+                total=Sum('resumenes__total_evaluaciones', filter=filtro),
+                suma=Sum('resumenes__suma_puntajes', filter=filtro),
+                total_aprobadas=Sum('resumenes__aprobadas', filter=filtro)
+            )
+            .filter(total__gt=0)
+            .order_by('numero')
+        )
 
+        estadisticas_gac = []
         for gac in gacs:
-            evaluaciones_gac = Evaluacion.objects.filter(rac__gacs=gac)
-
-            if evaluaciones_gac.exists():
-                promedio_gac = evaluaciones_gac.aggregate(
-                    promedio=Avg('puntaje')
-                )['promedio'] or 0.0
-
-                aprobadas_gac = evaluaciones_gac.filter(puntaje__gte=3).count()
-                total_gac = evaluaciones_gac.count()
-
-                estadisticas_gac.append({
-                    'gac_numero': gac.numero,
-                    'gac_descripcion': gac.descripcion[:100] + "..." if len(gac.descripcion) > 100 else gac.descripcion,
-                    'promedio': float(promedio_gac),
-                    'total_evaluaciones': total_gac,
-                    'aprobadas': aprobadas_gac,
-                    'reprobadas': total_gac - aprobadas_gac,
-                    'porcentaje_aprobacion': (aprobadas_gac / total_gac * 100) if total_gac > 0 else 0
-                })
+            total_gac = gac.total
+            aprobadas_gac = gac.total_aprobadas
+            estadisticas_gac.append({
+                'gac_numero': gac.numero,
+                'gac_descripcion': gac.descripcion[:100] + "..." if len(gac.descripcion) > 100 else gac.descripcion,
+                'promedio': float(gac.suma / total_gac),
+                'total_evaluaciones': total_gac,
+                'aprobadas': aprobadas_gac,
+                'reprobadas': total_gac - aprobadas_gac,
+                'porcentaje_aprobacion': (aprobadas_gac / total_gac * 100) if total_gac > 0 else 0
+            })
 
         serializer = EstadisticaGACSerializer(estadisticas_gac, many=True)
         return Response({
@@ -450,19 +836,19 @@ def estadisticas_por_gac(request):
     
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def resultados_estudiante(request, estudiante_id):
     try:
         estudiante = Estudiante.objects.get(pk=estudiante_id)
 
         # Todas las evaluaciones del estudiante
-        evaluaciones = Evaluacion.objects.filter(estudiante=estudiante)
+        evaluaciones = Evaluacion.objects.filter(estudiante=estudiante).filter(filtro_periodo(request))
 
         # Promedio general
         promedio_general = evaluaciones.aggregate(promedio=Avg("puntaje"))["promedio"] or 0
 
         # Totales
         total_evaluaciones = evaluaciones.values("profesor").distinct().count()
-        total_gacs = evaluaciones.values("rac__gacs__id").distinct().count()
         total_racs = evaluaciones.values("rac__id").distinct().count()
 
         # === Gráfico: promedio por profesor ===
@@ -476,24 +862,17 @@ def resultados_estudiante(request, estudiante_id):
             for g in grafico_profesores_qs
         ]
 
-        # === Gráfico: promedio por GAC ===
-        grafico_gacs_qs = (
-            evaluaciones.values("rac__gacs__id")
-            .annotate(
-                numero=F("rac__gacs__numero"),
-                descripcion=F("rac__gacs__descripcion"),
-                promedio=Avg("puntaje"),
-            )
-            .order_by("numero")
-        )
+        # === Gráfico: promedio por GAC (desde el resumen) ===
         grafico_gacs = [
             {
-                "gac": f"GAC {g['numero']}",
-                "descripcion": g["descripcion"],
-                "promedio": round(g["promedio"], 2),
+                "gac": f"GAC {g['gac__numero']}",
+                "descripcion": g["gac__descripcion"],
+                "promedio": round(g["suma"] / g["total"], 2),
             }
-            for g in grafico_gacs_qs
+            for g in resumen_por_gac(estudiante.resumenes_gac.filter(filtro_periodo(request)))
+            if g["total"]
         ]
+        total_gacs = len(grafico_gacs)
 
         # === Lista de evaluaciones detalladas ===
         evaluaciones_detalle = [
@@ -503,7 +882,7 @@ def resultados_estudiante(request, estudiante_id):
                 "rac_descripcion": e.rac.descripcion,
                 "puntaje": e.puntaje,
             }
-            for e in evaluaciones
+            for e in evaluaciones.select_related("profesor", "rac")
         ]
 
         data = {
@@ -588,8 +967,8 @@ def determinar_semestre_por_fecha(fecha_evaluacion, grupo_estudiante):
     from datetime import datetime
     
     # Definir grupos por semestre
-    primer_semestre_grupos = ['Virtual 1', '1A', '1B', '1C']
-    segundo_semestre_grupos = ['2A', '2B', '2C']
+    primer_semestre_grupos = GRUPOS_PRIMER_SEMESTRE
+    segundo_semestre_grupos = GRUPOS_SEGUNDO_SEMESTRE
     
     # Definir fechas de corte para el año académico
     # Se puede ajustar según el calendario académico de la universidad
@@ -610,14 +989,15 @@ def determinar_semestre_por_fecha(fecha_evaluacion, grupo_estudiante):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def resultados_estudiante_por_semestre(request, estudiante_id):
     """Obtener resultados de un estudiante separados por semestre basándose en periodos académicos"""
     try:
         estudiante = Estudiante.objects.get(pk=estudiante_id)
         
         # Definir grupos por semestre
-        primer_semestre = ['Virtual 1', '1A', '1B', '1C']
-        segundo_semestre = ['2A', '2B', '2C']
+        primer_semestre = GRUPOS_PRIMER_SEMESTRE
+        segundo_semestre = GRUPOS_SEGUNDO_SEMESTRE
         
         # Determinar el semestre actual del estudiante
         grupo_actual = estudiante.grupo
@@ -628,7 +1008,7 @@ def resultados_estudiante_por_semestre(request, estudiante_id):
         
         # Determinar período anterior para estudiantes de segundo semestre
         periodo_anterior = None
-        if es_segundo_semestre:
+        if es_segundo_semestre and periodo_actual:
             if periodo_actual.semestre == 2:  # Si estamos en segundo semestre
                 # El período anterior es el primer semestre del mismo año
                 periodo_anterior = PeriodoAcademico.objects.filter(
@@ -689,7 +1069,7 @@ def resultados_estudiante_por_semestre(request, estudiante_id):
             print(f"Usando períodos académicos - Evaluaciones primer semestre ({periodo_anterior.codigo}): {len(evaluaciones_primer_semestre)}")
         
         evaluaciones_segundo_semestre = list(evaluaciones_periodo_actual)
-        print(f"Usando períodos académicos - Evaluaciones segundo semestre ({periodo_actual.codigo}): {len(evaluaciones_segundo_semestre)}")
+        print(f"Usando períodos académicos - Evaluaciones segundo semestre ({periodo_actual.codigo if periodo_actual else 'N/A'}): {len(evaluaciones_segundo_semestre)}")
         
         def procesar_evaluaciones(evaluaciones_list, semestre_nombre):
             if not evaluaciones_list:
@@ -968,536 +1348,221 @@ def debug_clasificacion_semestres(request, estudiante_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@artefacto_pdf
 def descargar_pdf_estudiantes_por_semestre(request):
     """Generar PDF de estudiantes con resultados por semestre y por GAC"""
     try:
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
-        from django.http import HttpResponse
-        from datetime import datetime
-        
-        # Crear buffer para el PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Estilos
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.darkblue
-        )
+        # Avance para los trabajos en segundo plano (reportes.trabajos)
+        reportar_progreso = getattr(request, 'reportar_progreso', None)
         
-        # Obtener todos los estudiantes
+        # Obtener todos los estudiantes y sus resultados en un número fijo de consultas
         estudiantes = Estudiante.objects.all().order_by('grupo', 'nombre')
+        resultados_estudiantes = resultados_por_semestre_estudiantes(estudiantes, filtro=filtro_periodo(request))
         
-        # Preparar datos para el PDF
-        story = []
-        
-        # Título principal
-        story.append(Paragraph("INFORME DE ESTUDIANTES POR SEMESTRE Y GAC", title_style))
-        story.append(Paragraph(f"Generado el: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Procesar cada estudiante
-        for estudiante in estudiantes:
-            # Información del estudiante
-            story.append(Paragraph(f"<b>ESTUDIANTE:</b> {estudiante.nombre}", heading_style))
-            story.append(Paragraph(f"<b>GRUPO:</b> {estudiante.grupo} | <b>DOCUMENTO:</b> {estudiante.documento}", styles['Normal']))
-            
-            # Determinar si es segundo semestre
-            es_segundo_semestre = estudiante.grupo in ['2A', '2B', '2C']
-            
-            if es_segundo_semestre:
-                # Obtener resultados por semestre
-                try:
-                    resultados = obtener_resultados_estudiante_por_semestre_interno(estudiante.id)
-                    
-                    # Primer Semestre
-                    if resultados['primer_semestre']['resumen_general']['total_evaluaciones'] > 0:
-                        story.append(Paragraph("<b>PRIMER SEMESTRE</b>", styles['Heading3']))
-                        story.append(Paragraph(f"Promedio General: {resultados['primer_semestre']['resumen_general']['promedio_general']:.2f}", styles['Normal']))
-                        story.append(Paragraph(f"Total Evaluaciones: {resultados['primer_semestre']['resumen_general']['total_evaluaciones']}", styles['Normal']))
-                        
-                        # Tabla de GACs - Primer Semestre
-                        if resultados['primer_semestre']['grafico_gacs']:
-                            gac_data = [['GAC', 'Promedio', 'Estado']]
-                            for gac in resultados['primer_semestre']['grafico_gacs']:
-                                estado = "Excelente" if gac['promedio'] >= 4.5 else "Bueno" if gac['promedio'] >= 3.5 else "Regular" if gac['promedio'] >= 2.5 else "Deficiente"
-                                gac_data.append([gac['gac'], f"{gac['promedio']:.2f}", estado])
-                            
-                            gac_table = Table(gac_data, colWidths=[1.5*inch, 1*inch, 1.5*inch])
-                            gac_table.setStyle(TableStyle([
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                            ]))
-                            story.append(gac_table)
-                            story.append(Spacer(1, 12))
-                    
-                    # Segundo Semestre
-                    if resultados['segundo_semestre']['resumen_general']['total_evaluaciones'] > 0:
-                        story.append(Paragraph("<b>SEGUNDO SEMESTRE</b>", styles['Heading3']))
-                        story.append(Paragraph(f"Promedio General: {resultados['segundo_semestre']['resumen_general']['promedio_general']:.2f}", styles['Normal']))
-                        story.append(Paragraph(f"Total Evaluaciones: {resultados['segundo_semestre']['resumen_general']['total_evaluaciones']}", styles['Normal']))
-                        
-                        # Tabla de GACs - Segundo Semestre
-                        if resultados['segundo_semestre']['grafico_gacs']:
-                            gac_data = [['GAC', 'Promedio', 'Estado']]
-                            for gac in resultados['segundo_semestre']['grafico_gacs']:
-                                estado = "Excelente" if gac['promedio'] >= 4.5 else "Bueno" if gac['promedio'] >= 3.5 else "Regular" if gac['promedio'] >= 2.5 else "Deficiente"
-                                gac_data.append([gac['gac'], f"{gac['promedio']:.2f}", estado])
-                            
-                            gac_table = Table(gac_data, colWidths=[1.5*inch, 1*inch, 1.5*inch])
-                            gac_table.setStyle(TableStyle([
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.green),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-                                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                            ]))
-                            story.append(gac_table)
-                            story.append(Spacer(1, 12))
-                    
-                except Exception as e:
-                    story.append(Paragraph(f"Error al obtener resultados: {str(e)}", styles['Normal']))
-            else:
-                # Para estudiantes de primer semestre, obtener resultados normales
-                try:
-                    evaluaciones = Evaluacion.objects.filter(estudiante=estudiante)
-                    if evaluaciones.exists():
-                        promedio_general = evaluaciones.aggregate(promedio=Avg("puntaje"))["promedio"] or 0
-                        total_evaluaciones = evaluaciones.count()
-                        
-                        story.append(Paragraph("<b>PRIMER SEMESTRE</b>", styles['Heading3']))
-                        story.append(Paragraph(f"Promedio General: {promedio_general:.2f}", styles['Normal']))
-                        story.append(Paragraph(f"Total Evaluaciones: {total_evaluaciones}", styles['Normal']))
-                        
-                        # Obtener GACs
-                        gacs_data = {}
-                        for evaluacion in evaluaciones:
-                            for gac in evaluacion.rac.gacs.all():
-                                gac_key = f"GAC {gac.numero}"
-                                if gac_key not in gacs_data:
-                                    gacs_data[gac_key] = []
-                                gacs_data[gac_key].append(evaluacion.puntaje)
-                        
-                        if gacs_data:
-                            gac_data = [['GAC', 'Promedio', 'Estado']]
-                            for gac_key, puntajes in gacs_data.items():
-                                promedio = sum(puntajes) / len(puntajes)
-                                estado = "Excelente" if promedio >= 4.5 else "Bueno" if promedio >= 3.5 else "Regular" if promedio >= 2.5 else "Deficiente"
-                                gac_data.append([gac_key, f"{promedio:.2f}", estado])
-                            
-                            gac_table = Table(gac_data, colWidths=[1.5*inch, 1*inch, 1.5*inch])
-                            gac_table.setStyle(TableStyle([
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                            ]))
-                            story.append(gac_table)
-                            story.append(Spacer(1, 12))
-                    else:
-                        story.append(Paragraph("No hay evaluaciones registradas", styles['Normal']))
-                        
-                except Exception as e:
-                    story.append(Paragraph(f"Error al obtener resultados: {str(e)}", styles['Normal']))
-            
-            story.append(PageBreak())
-        
-        # Construir PDF
-        doc.build(story)
-        
-        # Obtener el contenido del buffer
-        buffer.seek(0)
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="informe_estudiantes_por_semestre_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
+        # Datos planos por estudiante: las secciones se renderizan en varios procesos
+        secciones = [
+            {
+                'nombre': estudiante.nombre,
+                'grupo': estudiante.grupo,
+                'documento': estudiante.documento,
+                'segundo_semestre': estudiante.grupo in GRUPOS_SEGUNDO_SEMESTRE,
+                'resultados': resultados_estudiantes[estudiante.id],
+            }
+            for estudiante in estudiantes
+        ]
         
-        return response
+        if reportar_progreso:
+            reportar_progreso(20, f"Construyendo PDF de {len(secciones)} estudiantes")
+        pdf = renderizar_por_fragmentos(
+            story_estudiantes_por_semestre,
+            secciones,
+            contexto={'fecha': datetime.now().strftime('%d/%m/%Y %H:%M')},
+            en_archivo=True,
+            **MARGENES_INFORME
+        )
+        return respuesta_pdf(pdf, 'informe_estudiantes_por_semestre')
         
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
 
-def obtener_resultados_estudiante_por_semestre_interno(estudiante_id):
-    """Función interna para obtener resultados por semestre basándose en periodos académicos"""
-    estudiante = Estudiante.objects.get(pk=estudiante_id)
-    
-    # Definir grupos por semestre
-    primer_semestre = ['Virtual 1', '1A', '1B', '1C']
-    segundo_semestre = ['2A', '2B', '2C']
-    
-    # Determinar el semestre actual del estudiante
-    grupo_actual = estudiante.grupo
-    es_segundo_semestre = grupo_actual in segundo_semestre
-    
-    # Obtener período actual
-    periodo_actual = PeriodoAcademico.get_periodo_actual()
-    
-    # Determinar período anterior para estudiantes de segundo semestre
-    periodo_anterior = None
-    if es_segundo_semestre:
-        if periodo_actual.semestre == 2:  # Si estamos en segundo semestre
-            # El período anterior es el primer semestre del mismo año
-            periodo_anterior = PeriodoAcademico.objects.filter(
-                año=periodo_actual.año,
-                semestre=1
-            ).first()
-        elif periodo_actual.semestre == 1:  # Si estamos en primer semestre
-            # El período anterior es el segundo semestre del año anterior
-            periodo_anterior = PeriodoAcademico.objects.filter(
-                año=periodo_actual.año - 1,
-                semestre=2
-            ).first()
-    
-    # Obtener evaluaciones del período actual
-    evaluaciones_periodo_actual = Evaluacion.objects.filter(
-        estudiante=estudiante,
-        periodo=periodo_actual
-    )
-    
-    # Obtener evaluaciones del período anterior (solo para estudiantes de segundo semestre)
-    evaluaciones_periodo_anterior = []
-    if es_segundo_semestre and periodo_anterior:
-        evaluaciones_periodo_anterior = Evaluacion.objects.filter(
-            estudiante=estudiante,
-            periodo=periodo_anterior
-        )
-    
-    # Estrategia híbrida: usar períodos cuando estén disponibles, fechas como fallback
-    evaluaciones_primer_semestre = []
-    evaluaciones_segundo_semestre = []
-    
-    # Primero intentar con períodos académicos
-    if es_segundo_semestre and periodo_anterior:
-        evaluaciones_primer_semestre = list(evaluaciones_periodo_anterior)
-    
-    evaluaciones_segundo_semestre = list(evaluaciones_periodo_actual)
-    
-    # Si no hay suficientes evaluaciones con períodos, complementar con lógica de fechas
-    if not evaluaciones_primer_semestre and not evaluaciones_segundo_semestre:
-        # Obtener todas las evaluaciones del estudiante
-        todas_evaluaciones = Evaluacion.objects.filter(estudiante=estudiante)
-        
-        # Separar por fechas
-        for evaluacion in todas_evaluaciones:
-            semestre = determinar_semestre_por_fecha(evaluacion.fecha, grupo_actual)
-            if semestre == 'primer_semestre':
-                evaluaciones_primer_semestre.append(evaluacion)
-            else:  # segundo_semestre
-                evaluaciones_segundo_semestre.append(evaluacion)
-    
-    # Si hay evaluaciones con períodos pero faltan algunas, complementar con fechas
-    elif len(evaluaciones_primer_semestre) + len(evaluaciones_segundo_semestre) < todas_evaluaciones.count():
-        # Obtener IDs de evaluaciones ya procesadas
-        ids_procesadas = set()
-        for eval in evaluaciones_primer_semestre:
-            ids_procesadas.add(eval.id)
-        for eval in evaluaciones_segundo_semestre:
-            ids_procesadas.add(eval.id)
-        
-        # Procesar evaluaciones restantes por fechas
-        todas_evaluaciones = Evaluacion.objects.filter(estudiante=estudiante)
-        for evaluacion in todas_evaluaciones:
-            if evaluacion.id not in ids_procesadas:
-                semestre = determinar_semestre_por_fecha(evaluacion.fecha, grupo_actual)
-                if semestre == 'primer_semestre':
-                    evaluaciones_primer_semestre.append(evaluacion)
-                else:  # segundo_semestre
-                    evaluaciones_segundo_semestre.append(evaluacion)
-    
-    def procesar_evaluaciones_interno(evaluaciones_list, semestre_nombre):
-        if not evaluaciones_list:
-            return {
-                "semestre": semestre_nombre,
-                "resumen_general": {
-                    "promedio_general": 0,
-                    "total_evaluaciones": 0,
-                    "total_gacs_evaluados": 0,
-                    "total_racs_evaluados": 0,
-                },
-                "grafico_profesores": [],
-                "grafico_gacs": [],
-                "evaluaciones": [],
-            }
-        
-        # Promedio general
-        promedio_general = sum(e.puntaje for e in evaluaciones_list) / len(evaluaciones_list)
-        
-        # Totales
-        total_evaluaciones = len(set(e.profesor.id for e in evaluaciones_list))
-        total_gacs = len(set(gac.id for e in evaluaciones_list for gac in e.rac.gacs.all()))
-        total_racs = len(set(e.rac.id for e in evaluaciones_list))
-        
-        # === Gráfico: promedio por GAC ===
-        gacs_data = {}
-        for e in evaluaciones_list:
-            for gac in e.rac.gacs.all():
-                gac_key = f"GAC {gac.numero}"
-                if gac_key not in gacs_data:
-                    gacs_data[gac_key] = {
-                        "gac": gac_key,
-                        "descripcion": gac.descripcion,
-                        "puntajes": []
-                    }
-                gacs_data[gac_key]["puntajes"].append(e.puntaje)
-        
-        grafico_gacs = [
-            {
-                "gac": data["gac"],
-                "descripcion": data["descripcion"],
-                "promedio": round(sum(data["puntajes"]) / len(data["puntajes"]), 2)
-            }
-            for data in gacs_data.values()
-        ]
-        
+def _resultados_semestre(evaluaciones_list, semestre_nombre, gacs_de_rac):
+    """Resumen de un semestre a partir de tuplas (profesor_id, rac_id, puntaje)"""
+    if not evaluaciones_list:
         return {
             "semestre": semestre_nombre,
             "resumen_general": {
-                "promedio_general": round(promedio_general, 2),
-                "total_evaluaciones": total_evaluaciones,
-                "total_gacs_evaluados": total_gacs,
-                "total_racs_evaluados": total_racs,
+                "promedio_general": 0,
+                "total_evaluaciones": 0,
+                "total_gacs_evaluados": 0,
+                "total_racs_evaluados": 0,
             },
-            "grafico_gacs": grafico_gacs,
+            "grafico_profesores": [],
+            "grafico_gacs": [],
+            "evaluaciones": [],
         }
-    
-    # Procesar datos para cada semestre usando nombres de periodos
-    nombre_primer_semestre = periodo_anterior.nombre if periodo_anterior else "Primer Semestre"
-    nombre_segundo_semestre = periodo_actual.nombre if periodo_actual else "Segundo Semestre"
-    
-    datos_primer_semestre = procesar_evaluaciones_interno(evaluaciones_primer_semestre, nombre_primer_semestre)
-    datos_segundo_semestre = procesar_evaluaciones_interno(evaluaciones_segundo_semestre, nombre_segundo_semestre)
-    
+
+    # Promedio general
+    promedio_general = sum(puntaje for _, _, puntaje in evaluaciones_list) / len(evaluaciones_list)
+
+    # Totales
+    total_evaluaciones = len(set(profesor_id for profesor_id, _, _ in evaluaciones_list))
+    total_racs = len(set(rac_id for _, rac_id, _ in evaluaciones_list))
+
+    # === Gráfico: promedio por GAC (en orden de aparición) ===
+    gacs_data = {}
+    for _, rac_id, puntaje in evaluaciones_list:
+        for gac_id, numero, descripcion in gacs_de_rac.get(rac_id, ()):
+            if gac_id not in gacs_data:
+                gacs_data[gac_id] = {"gac": f"GAC {numero}", "descripcion": descripcion, "puntajes": []}
+            gacs_data[gac_id]["puntajes"].append(puntaje)
+
+    grafico_gacs = [
+        {
+            "gac": data["gac"],
+            "descripcion": data["descripcion"],
+            "promedio": round(sum(data["puntajes"]) / len(data["puntajes"]), 2)
+        }
+        for data in gacs_data.values()
+    ]
+
     return {
-        "primer_semestre": datos_primer_semestre,
-        "segundo_semestre": datos_segundo_semestre,
+        "semestre": semestre_nombre,
+        "resumen_general": {
+            "promedio_general": round(promedio_general, 2),
+            "total_evaluaciones": total_evaluaciones,
+            "total_gacs_evaluados": len(gacs_data),
+            "total_racs_evaluados": total_racs,
+        },
+        "grafico_gacs": grafico_gacs,
     }
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def resultados_globales(request):
-    """Obtener resultados globales completos con estadísticas detalladas"""
-    try:
-        # Todas las evaluaciones
-        evaluaciones = Evaluacion.objects.select_related('estudiante', 'profesor', 'rac', 'periodo').prefetch_related('rac__gacs', 'rac__materias').all()
+def resultados_por_semestre_estudiantes(estudiantes, filtro=None):
+    """
+    Resultados por semestre de varios estudiantes con un número fijo de consultas.
+
+    Carga el período actual y el anterior una sola vez, todas las evaluaciones de
+    los estudiantes en una consulta (values_list, ordenadas como Evaluacion) y la
+    relación RAC→GAC en otra, y reparte las evaluaciones por estudiante y período
+    en memoria con la misma estrategia que usaba el cálculo por estudiante:
+    períodos académicos primero y la fecha como respaldo para las evaluaciones
+    que no caen en ellos.
+
+    Si se indica `filtro` (p. ej. filtro_periodo(request)), cada resultado
+    incluye además "filtrado": promedio, total y GACs de las evaluaciones que lo
+    cumplen, leídas con el filtro aplicado en la base de datos. En ese caso
+    "primer_semestre" y "segundo_semestre" (que necesitan todos los períodos)
+    solo se calculan para los estudiantes de segundo semestre, que son los que
+    comparan ambos.
+
+    Devuelve {estudiante_id: {"primer_semestre": ..., "segundo_semestre": ...[, "filtrado": ...]}}
+    """
+    # Con un QuerySet las evaluaciones se seleccionan por subconsulta, sin listar ids
+    seleccion = estudiantes.values('id') if isinstance(estudiantes, QuerySet) else None
+    estudiantes = list(estudiantes)
+    if seleccion is None:
+        seleccion = [e.id for e in estudiantes]
+    periodo_actual = PeriodoAcademico.get_periodo_actual()
 
-        # Promedio general
-        promedio_general = evaluaciones.aggregate(promedio=Avg("puntaje"))["promedio"] or 0
+    # Período anterior (solo lo usan los estudiantes de segundo semestre)
+    periodo_anterior = None
+    if periodo_actual and any(e.grupo in GRUPOS_SEGUNDO_SEMESTRE for e in estudiantes):
+        if periodo_actual.semestre == 2:
+            periodo_anterior = PeriodoAcademico.objects.filter(año=periodo_actual.año, semestre=1).first()
+        elif periodo_actual.semestre == 1:
+            periodo_anterior = PeriodoAcademico.objects.filter(año=periodo_actual.año - 1, semestre=2).first()
+
+    # Todas las evaluaciones en una sola consulta, agrupadas por estudiante; con un
+    # filtro, solo las de los estudiantes que comparan semestres
+    evaluaciones = Evaluacion.objects.filter(estudiante__in=seleccion)
+    if filtro:
+        evaluaciones = evaluaciones.filter(estudiante__grupo__in=GRUPOS_SEGUNDO_SEMESTRE)
+    por_estudiante = {}
+    for fila in evaluaciones.values_list(
+        'estudiante_id', 'profesor_id', 'rac_id', 'periodo_id', 'puntaje', 'fecha'
+    ).iterator(chunk_size=2000):
+        por_estudiante.setdefault(fila[0], []).append(fila[1:])
+
+    # Las evaluaciones que cumplen el filtro, en su propia consulta filtrada
+    filtradas_por_estudiante = {}
+    if filtro:
+        for estudiante_id, profesor_id, rac_id, puntaje in (
+            Evaluacion.objects.filter(filtro, estudiante__in=seleccion)
+            .values_list('estudiante_id', 'profesor_id', 'rac_id', 'puntaje')
+            .iterator(chunk_size=2000)
+        ):
+            filtradas_por_estudiante.setdefault(estudiante_id, []).append((profesor_id, rac_id, puntaje))
+
+    # RAC → [(gac_id, numero, descripcion)] en el orden de GAC
+    gacs_de_rac = {}
+    for rac_id, gac_id, numero, descripcion in (
+        RAC.gacs.through.objects.order_by('gac__numero')
+        .values_list('rac_id', 'gac_id', 'gac__numero', 'gac__descripcion')
+    ):
+        gacs_de_rac.setdefault(rac_id, []).append((gac_id, numero, descripcion))
 
-        # Totales
-        total_evaluaciones = evaluaciones.count()
-        total_gacs = evaluaciones.values("rac__gacs__id").distinct().count()
-        total_racs = evaluaciones.values("rac__id").distinct().count()
-        total_estudiantes = evaluaciones.values("estudiante").distinct().count()
-        total_profesores = evaluaciones.values("profesor").distinct().count()
-        total_materias = evaluaciones.values("rac__materias__id").distinct().count()
+    nombre_primer_semestre = periodo_anterior.nombre if periodo_anterior else "Primer Semestre"
+    nombre_segundo_semestre = periodo_actual.nombre if periodo_actual else "Segundo Semestre"
 
-        # Definir grupos por semestre
-        primer_semestre = ['Virtual 1', '1A', '1B', '1C']
-        segundo_semestre = ['2A', '2B', '2C']
-        
-        # Estadísticas por semestre
-        evaluaciones_primer = evaluaciones.filter(estudiante__grupo__in=primer_semestre)
-        evaluaciones_segundo = evaluaciones.filter(estudiante__grupo__in=segundo_semestre)
-        
-        promedio_primer = evaluaciones_primer.aggregate(promedio=Avg("puntaje"))["promedio"] or 0
-        promedio_segundo = evaluaciones_segundo.aggregate(promedio=Avg("puntaje"))["promedio"] or 0
+    resultados = {}
+    for estudiante in estudiantes:
+        es_segundo_semestre = estudiante.grupo in GRUPOS_SEGUNDO_SEMESTRE
+        resultados[estudiante.id] = {}
 
-        # === Gráfico: promedio por profesor ===
-        grafico_profesores_qs = (
-            evaluaciones.values("profesor__nombre")
-            .annotate(promedio=Avg("puntaje"))
-            .order_by("-promedio")
-        )
-        grafico_profesores = [
-            {"profesor": g["profesor__nombre"], "promedio": round(g["promedio"], 2)}
-            for g in grafico_profesores_qs
-        ]
+        if filtro is not None:
+            if not filtro:
+                # Sin parámetros de período el filtrado son todas las evaluaciones
+                filtradas = [(p, r, puntaje) for p, r, _, puntaje, _ in por_estudiante.get(estudiante.id, [])]
+            else:
+                filtradas = filtradas_por_estudiante.get(estudiante.id, [])
+            filtrado = _resultados_semestre(filtradas, nombre_segundo_semestre, gacs_de_rac)
+            filtrado["resumen_general"]["total_evaluaciones"] = len(filtradas)
+            resultados[estudiante.id]["filtrado"] = filtrado
+            if not es_segundo_semestre:
+                continue
 
-        # === Gráfico: promedio por GAC ===
-        grafico_gacs_qs = (
-            evaluaciones.values("rac__gacs__id")
-            .annotate(
-                numero=F("rac__gacs__numero"),
-                descripcion=F("rac__gacs__descripcion"),
-                promedio=Avg("puntaje"),
-            )
-            .order_by("-promedio")
-        )
-        grafico_gacs = [
-            {
-                "gac": f"GAC {g['numero']}",
-                "descripcion": g["descripcion"],
-                "promedio": round(g["promedio"], 2),
-            }
-            for g in grafico_gacs_qs
-        ]
+        # Primero por período académico
+        primer, segundo, restantes = [], [], []
+        for profesor_id, rac_id, periodo_id, puntaje, fecha in por_estudiante.get(estudiante.id, []):
+            evaluacion = (profesor_id, rac_id, puntaje)
+            if periodo_actual and periodo_id == periodo_actual.id:
+                segundo.append(evaluacion)
+            elif es_segundo_semestre and periodo_anterior and periodo_id == periodo_anterior.id:
+                primer.append(evaluacion)
+            else:
+                restantes.append((evaluacion, fecha))
 
-        # === Gráfico: promedio por estudiante ===
-        grafico_estudiantes_qs = (
-            evaluaciones.values("estudiante__nombre")
-            .annotate(promedio=Avg("puntaje"))
-            .order_by("-promedio")
-        )
-        grafico_estudiantes = [
-            {"estudiante": g["estudiante__nombre"], "promedio": round(g["promedio"], 2)}
-            for g in grafico_estudiantes_qs
-        ]
+        # Las que no caen en esos períodos (o todas, si ninguna cae) se clasifican por fecha
+        for evaluacion, fecha in restantes:
+            if determinar_semestre_por_fecha(fecha, estudiante.grupo) == 'primer_semestre':
+                primer.append(evaluacion)
+            else:
+                segundo.append(evaluacion)
 
-        # === Estadísticas por GAC con semestres ===
-        gacs_stats = {}
-        for evaluacion in evaluaciones:
-            for gac in evaluacion.rac.gacs.all():
-                gac_key = f"GAC {gac.numero}"
-                if gac_key not in gacs_stats:
-                    gacs_stats[gac_key] = {
-                        'descripcion': gac.descripcion,
-                        'puntajes': [],
-                        'primer_semestre': [],
-                        'segundo_semestre': []
-                    }
-                
-                gacs_stats[gac_key]['puntajes'].append(evaluacion.puntaje)
-                
-                if evaluacion.estudiante.grupo in primer_semestre:
-                    gacs_stats[gac_key]['primer_semestre'].append(evaluacion.puntaje)
-                elif evaluacion.estudiante.grupo in segundo_semestre:
-                    gacs_stats[gac_key]['segundo_semestre'].append(evaluacion.puntaje)
-        
-        # Calcular promedios por GAC
-        gacs_por_semestre = []
-        for gac_key, gac_data in gacs_stats.items():
-            promedio_general_gac = sum(gac_data['puntajes']) / len(gac_data['puntajes']) if gac_data['puntajes'] else 0
-            promedio_primer_gac = sum(gac_data['primer_semestre']) / len(gac_data['primer_semestre']) if gac_data['primer_semestre'] else 0
-            promedio_segundo_gac = sum(gac_data['segundo_semestre']) / len(gac_data['segundo_semestre']) if gac_data['segundo_semestre'] else 0
-            
-            gacs_por_semestre.append({
-                'gac_numero': gac_key.split(' ')[1],
-                'gac_descripcion': gac_data['descripcion'],
-                'promedio_general': round(promedio_general_gac, 2),
-                'primer_semestre': {
-                    'promedio': round(promedio_primer_gac, 2),
-                    'total_evaluaciones': len(gac_data['primer_semestre'])
-                },
-                'segundo_semestre': {
-                    'promedio': round(promedio_segundo_gac, 2),
-                    'total_evaluaciones': len(gac_data['segundo_semestre'])
-                }
-            })
-        
-        # Ordenar GACs por promedio general
-        gacs_por_semestre.sort(key=lambda x: x['promedio_general'], reverse=True)
+        resultados[estudiante.id].update({
+            "primer_semestre": _resultados_semestre(primer, nombre_primer_semestre, gacs_de_rac),
+            "segundo_semestre": _resultados_semestre(segundo, nombre_segundo_semestre, gacs_de_rac),
+        })
 
-        # === Estadísticas por materia ===
-        materias_stats = {}
-        for evaluacion in evaluaciones:
-            for materia in evaluacion.rac.materias.all():
-                materia_key = f"{materia.id}_{materia.nombre}"
-                if materia_key not in materias_stats:
-                    materias_stats[materia_key] = {
-                        'materia_nombre': materia.nombre,
-                        'puntajes': [],
-                        'primer_semestre': [],
-                        'segundo_semestre': []
-                    }
-                
-                materias_stats[materia_key]['puntajes'].append(evaluacion.puntaje)
-                
-                if evaluacion.estudiante.grupo in primer_semestre:
-                    materias_stats[materia_key]['primer_semestre'].append(evaluacion.puntaje)
-                elif evaluacion.estudiante.grupo in segundo_semestre:
-                    materias_stats[materia_key]['segundo_semestre'].append(evaluacion.puntaje)
-        
-        # Calcular promedios por materia
-        materias_por_semestre = []
-        for materia_key, materia_data in materias_stats.items():
-            promedio_general_materia = sum(materia_data['puntajes']) / len(materia_data['puntajes']) if materia_data['puntajes'] else 0
-            promedio_primer_materia = sum(materia_data['primer_semestre']) / len(materia_data['primer_semestre']) if materia_data['primer_semestre'] else 0
-            promedio_segundo_materia = sum(materia_data['segundo_semestre']) / len(materia_data['segundo_semestre']) if materia_data['segundo_semestre'] else 0
-            
-            materias_por_semestre.append({
-                'materia_nombre': materia_data['materia_nombre'],
-                'promedio_general': round(promedio_general_materia, 2),
-                'primer_semestre': {
-                    'promedio': round(promedio_primer_materia, 2),
-                    'total_evaluaciones': len(materia_data['primer_semestre'])
-                },
-                'segundo_semestre': {
-                    'promedio': round(promedio_segundo_materia, 2),
-                    'total_evaluaciones': len(materia_data['segundo_semestre'])
-                }
-            })
-        
-        # Ordenar materias por promedio general
-        materias_por_semestre.sort(key=lambda x: x['promedio_general'], reverse=True)
+    return resultados
 
-        # === Lista de evaluaciones detalladas ===
-        evaluaciones_detalle = [
-            {
-                "estudiante": e.estudiante.nombre,
-                "profesor": e.profesor.nombre,
-                "rac_numero": e.rac.numero,
-                "rac_descripcion": e.rac.descripcion,
-                "puntaje": e.puntaje,
-            }
-            for e in evaluaciones
-        ]
 
-        data = {
-            "resumen_general": {
-                "promedio_general": round(promedio_general, 2),
-                "promedio_primer_semestre": round(promedio_primer, 2),
-                "promedio_segundo_semestre": round(promedio_segundo, 2),
-                "total_evaluaciones": total_evaluaciones,
-                "total_evaluaciones_primer": evaluaciones_primer.count(),
-                "total_evaluaciones_segundo": evaluaciones_segundo.count(),
-                "total_gacs_evaluados": total_gacs,
-                "total_racs_evaluados": total_racs,
-                "total_estudiantes": total_estudiantes,
-                "total_estudiantes_primer": evaluaciones_primer.values('estudiante').distinct().count(),
-                "total_estudiantes_segundo": evaluaciones_segundo.values('estudiante').distinct().count(),
-                "total_profesores": total_profesores,
-                "total_materias": total_materias,
-            },
-            "grafico_profesores": grafico_profesores,
-            "grafico_gacs": grafico_gacs,
-            "grafico_estudiantes": grafico_estudiantes,
-            "gacs_por_semestre": gacs_por_semestre,
-            "materias_por_semestre": materias_por_semestre,
-            "evaluaciones": evaluaciones_detalle,
-        }
+def obtener_resultados_estudiante_por_semestre_interno(estudiante_id):
+    """Función interna para obtener resultados por semestre basándose en periodos académicos"""
+    estudiante = Estudiante.objects.get(pk=estudiante_id)
+    return resultados_por_semestre_estudiantes([estudiante])[estudiante.id]
 
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cache_respuesta
+def resultados_globales(request):
+    """Obtener resultados globales completos con estadísticas detalladas"""
+    try:
+        # Columnas NumPy + agregados vectorizados (ver competencias/analytics.py)
+        datos = DatosColumnares.desde_bd(Evaluacion.objects.filter(filtro_periodo(request)))
+        data = calcular_resultados_globales(datos)
         return JsonResponse(data, safe=False)
 
     except Exception as e:
@@ -1505,69 +1570,64 @@ def resultados_globales(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def informes_por_gac_semestre(request):
     """Obtener promedios de GAC por semestre"""
     try:
-        # Definir grupos por semestre
-        primer_semestre = ['Virtual 1', '1A', '1B', '1C']
-        segundo_semestre = ['2A', '2B', '2C']
-        
-        # Obtener evaluaciones agrupadas por GAC y semestre
-        evaluaciones = Evaluacion.objects.select_related('estudiante', 'rac').prefetch_related('rac__gacs', 'rac__materias').all()
+        semestre_por_grupo = {grupo: 'primer_semestre' for grupo in GRUPOS_PRIMER_SEMESTRE}
+        semestre_por_grupo.update({grupo: 'segundo_semestre' for grupo in GRUPOS_SEGUNDO_SEMESTRE})
+        por_periodo = filtro_periodo(request)
         
         # Verificar si hay evaluaciones
-        if not evaluaciones.exists():
+        if not ResumenEstudianteGAC.objects.filter(por_periodo).exists():
             return JsonResponse({
                 'gacs_por_semestre': [],
                 'message': 'No hay evaluaciones disponibles'
             }, safe=False)
         
-        # Agrupar por GAC y semestre
+        # Totales por GAC y semestre desde el resumen
         gacs_data = {}
+        resumenes = ResumenEstudianteGAC.objects.filter(por_periodo, estudiante__grupo__in=semestre_por_grupo)
+        for fila in resumen_por_gac(resumenes, 'estudiante__grupo'):
+            gac_numero = fila['gac__numero']
+            if gac_numero not in gacs_data:
+                gacs_data[gac_numero] = {
+                    'gac_numero': gac_numero,
+                    'gac_descripcion': fila['gac__descripcion'],
+                    'primer_semestre': {'total': 0, 'suma': 0, 'promedio': 0, 'materias': {}},
+                    'segundo_semestre': {'total': 0, 'suma': 0, 'promedio': 0, 'materias': {}}
+                }
+            semestre_data = gacs_data[gac_numero][semestre_por_grupo[fila['estudiante__grupo']]]
+            semestre_data['total'] += fila['total']
+            semestre_data['suma'] += fila['suma']
         
-        for evaluacion in evaluaciones:
-            try:
-                grupo = evaluacion.estudiante.grupo
-                
-                # Determinar semestre
-                if grupo in primer_semestre:
-                    semestre = 'Primer Semestre'
-                elif grupo in segundo_semestre:
-                    semestre = 'Segundo Semestre'
-                else:
-                    continue  # Saltar grupos que no pertenecen a ningún semestre
-                
-                # Un RAC puede tener múltiples GACs
-                for gac in evaluacion.rac.gacs.all():
-                    gac_numero = gac.numero
-                    
-                    if gac_numero not in gacs_data:
-                        gacs_data[gac_numero] = {
-                            'gac_numero': gac_numero,
-                            'gac_descripcion': gac.descripcion,
-                            'primer_semestre': {'puntajes': [], 'promedio': 0, 'materias': {}},
-                            'segundo_semestre': {'puntajes': [], 'promedio': 0, 'materias': {}}
-                        }
-                    
-                    gacs_data[gac_numero][f"{semestre.lower().replace(' ', '_')}"]['puntajes'].append(evaluacion.puntaje)
-                    
-                    # Procesar materias para este GAC
-                    for materia in evaluacion.rac.materias.all():
-                        materia_key = f"{materia.id}_{materia.nombre}"
-                        semestre_key = f"{semestre.lower().replace(' ', '_')}"
-                        
-                        if materia_key not in gacs_data[gac_numero][semestre_key]['materias']:
-                            gacs_data[gac_numero][semestre_key]['materias'][materia_key] = {
-                                'materia_id': materia.id,
-                                'materia_nombre': materia.nombre,
-                                'puntajes': []
-                            }
-                        
-                        gacs_data[gac_numero][semestre_key]['materias'][materia_key]['puntajes'].append(evaluacion.puntaje)
-                        
-            except Exception as e:
-                print(f"Error procesando evaluación {evaluacion.id}: {e}")
+        # Desglose por materia: una consulta agrupada por (GAC, materia, grupo)
+        filas_materias = (
+            Evaluacion.objects
+            .filter(
+                por_periodo,
+                estudiante__grupo__in=semestre_por_grupo,
+                rac__gacs__isnull=False,
+                rac__materias__isnull=False
+            )
+            .values('rac__gacs__numero', 'rac__materias__id', 'rac__materias__nombre', 'estudiante__grupo')
+            .annotate(total=Count('id'), suma=Sum('puntaje'))
+            .order_by()
+        )
+        for fila in filas_materias:
+            gac_data = gacs_data.get(fila['rac__gacs__numero'])
+            if gac_data is None:
                 continue
+            materias = gac_data[semestre_por_grupo[fila['estudiante__grupo']]]['materias']
+            materia_key = f"{fila['rac__materias__id']}_{fila['rac__materias__nombre']}"
+            materia_data = materias.setdefault(materia_key, {
+                'materia_id': fila['rac__materias__id'],
+                'materia_nombre': fila['rac__materias__nombre'],
+                'total': 0,
+                'suma': 0
+            })
+            materia_data['total'] += fila['total']
+            materia_data['suma'] += fila['suma']
         
         # Calcular promedios
         resultado = []
@@ -1575,47 +1635,40 @@ def informes_por_gac_semestre(request):
             # Procesar cada semestre
             for semestre_key in ['primer_semestre', 'segundo_semestre']:
                 semestre_data = gac_data[semestre_key]
+                total = semestre_data.pop('total')
+                suma = semestre_data.pop('suma')
                 
                 # Calcular promedio general del GAC
-                if semestre_data['puntajes']:
-                    semestre_data['promedio'] = sum(semestre_data['puntajes']) / len(semestre_data['puntajes'])
-                    semestre_data['total_evaluaciones'] = len(semestre_data['puntajes'])
-                else:
-                    semestre_data['total_evaluaciones'] = 0
+                if total:
+                    semestre_data['promedio'] = suma / total
+                semestre_data['total_evaluaciones'] = total
                 
                 # Calcular promedios por materia
                 materias_resultado = []
-                for materia_key, materia_data in semestre_data['materias'].items():
-                    if materia_data['puntajes']:
-                        materia_data['promedio'] = sum(materia_data['puntajes']) / len(materia_data['puntajes'])
-                        materia_data['total_evaluaciones'] = len(materia_data['puntajes'])
-                        
-                        # Determinar nivel de desarrollo
-                        if materia_data['promedio'] >= 4.0:
-                            desarrollo = "Excelente"
-                        elif materia_data['promedio'] >= 3.0:
-                            desarrollo = "Bueno"
-                        elif materia_data['promedio'] >= 2.0:
-                            desarrollo = "Regular"
-                        else:
-                            desarrollo = "Deficiente"
-                        
-                        materias_resultado.append({
-                            'materia_id': materia_data['materia_id'],
-                            'materia_nombre': materia_data['materia_nombre'],
-                            'promedio': round(materia_data['promedio'], 2),
-                            'total_evaluaciones': materia_data['total_evaluaciones'],
-                            'desarrollo': desarrollo
-                        })
+                for materia_data in semestre_data['materias'].values():
+                    promedio = materia_data['suma'] / materia_data['total']
+                    
+                    # Determinar nivel de desarrollo
+                    if promedio >= 4.0:
+                        desarrollo = "Excelente"
+                    elif promedio >= 3.0:
+                        desarrollo = "Bueno"
+                    elif promedio >= 2.0:
+                        desarrollo = "Regular"
                     else:
-                        materia_data['total_evaluaciones'] = 0
+                        desarrollo = "Deficiente"
+                    
+                    materias_resultado.append({
+                        'materia_id': materia_data['materia_id'],
+                        'materia_nombre': materia_data['materia_nombre'],
+                        'promedio': round(promedio, 2),
+                        'total_evaluaciones': materia_data['total'],
+                        'desarrollo': desarrollo
+                    })
                 
                 # Ordenar materias por promedio descendente
                 materias_resultado.sort(key=lambda x: x['promedio'], reverse=True)
                 semestre_data['materias'] = materias_resultado
-                
-                # Limpiar datos de puntajes
-                del semestre_data['puntajes']
             
             resultado.append(gac_data)
         
@@ -1625,101 +1678,71 @@ def informes_por_gac_semestre(request):
         print(f"Error en informes_por_gac_semestre: {e}")
         return JsonResponse({"error": str(e)}, status=500)
 
+def color_semaforo(porcentaje_evaluacion):
+    """Semaforización según el porcentaje de estudiantes evaluados"""
+    if porcentaje_evaluacion <= 30:
+        return 'rojo'
+    elif porcentaje_evaluacion <= 60:
+        return 'amarillo'
+    return 'verde'
+
+
+def datos_profesor_materia(evaluaciones):
+    """
+    Promedio y cobertura por (profesor, materia) con dos consultas agrupadas:
+    agregados por par y estudiantes distintos por materia (compartido por todos
+    los profesores que dictan la materia).
+    """
+    con_materia = evaluaciones.filter(rac__materias__isnull=False)
+
+    totales_materia = dict(
+        con_materia.values_list('rac__materias__id')
+        .annotate(total=Count('estudiante', distinct=True))
+        .order_by()
+    )
+
+    filas = (
+        con_materia
+        .values('profesor_id', 'profesor__nombre', 'rac__materias__id', 'rac__materias__nombre')
+        .annotate(promedio=Avg('puntaje'), estudiantes_evaluados=Count('estudiante', distinct=True))
+        .order_by('profesor__nombre', 'rac__materias__nombre')
+    )
+
+    resultado = []
+    for fila in filas:
+        estudiantes_evaluados = fila['estudiantes_evaluados']
+        total_estudiantes = totales_materia.get(fila['rac__materias__id'], 0)
+        porcentaje_evaluacion = (estudiantes_evaluados / total_estudiantes * 100) if total_estudiantes > 0 else 0
+        resultado.append({
+            'profesor_id': fila['profesor_id'],
+            'profesor_nombre': fila['profesor__nombre'],
+            'materia_id': fila['rac__materias__id'],
+            'materia_nombre': fila['rac__materias__nombre'],
+            'promedio': round(fila['promedio'], 2),
+            'estudiantes_evaluados': estudiantes_evaluados,
+            'total_estudiantes': total_estudiantes,
+            'porcentaje_evaluacion': round(porcentaje_evaluacion, 1),
+        })
+    return resultado
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def informes_por_profesor_materia(request):
     """Obtener promedios por profesor y materia con semaforización"""
     try:
-        # Obtener evaluaciones con información de profesor, materia y estudiante
-        evaluaciones = Evaluacion.objects.select_related(
-            'profesor', 'estudiante', 'rac'
-        ).prefetch_related('rac__materias').all()
+        resultado = datos_profesor_materia(Evaluacion.objects.filter(filtro_periodo(request)))
         
         # Verificar si hay evaluaciones
-        if not evaluaciones.exists():
+        if not resultado:
             return JsonResponse({
                 'profesores_materias': [],
                 'message': 'No hay evaluaciones disponibles'
             }, safe=False)
         
-        # Agrupar por profesor y materia
-        profesores_data = {}
-        
-        for evaluacion in evaluaciones:
-            try:
-                profesor_id = evaluacion.profesor.id
-                profesor_nombre = evaluacion.profesor.nombre
-                
-                # Obtener materias del RAC
-                materias = evaluacion.rac.materias.all()
-                
-                for materia in materias:
-                    materia_id = materia.id
-                    materia_nombre = materia.nombre
-                    
-                    key = f"{profesor_id}_{materia_id}"
-                    
-                    if key not in profesores_data:
-                        profesores_data[key] = {
-                            'profesor_id': profesor_id,
-                            'profesor_nombre': profesor_nombre,
-                            'materia_id': materia_id,
-                            'materia_nombre': materia_nombre,
-                            'puntajes': [],
-                            'estudiantes_evaluados': set(),
-                            'total_estudiantes': 0
-                        }
-                    
-                    profesores_data[key]['puntajes'].append(evaluacion.puntaje)
-                    profesores_data[key]['estudiantes_evaluados'].add(evaluacion.estudiante.id)
-            except Exception as e:
-                print(f"Error procesando evaluación {evaluacion.id}: {e}")
-                continue
-        
-        # Calcular total de estudiantes por materia (todos los estudiantes que tienen RACs de esa materia)
-        from django.db.models import Count
-        for key, data in profesores_data.items():
-            try:
-                materia_id = data['materia_id']
-                # Contar estudiantes únicos que tienen RACs de esta materia
-                total_estudiantes = Evaluacion.objects.filter(
-                    rac__materias__id=materia_id
-                ).values('estudiante').distinct().count()
-                data['total_estudiantes'] = total_estudiantes
-            except Exception as e:
-                print(f"Error calculando total estudiantes para materia {data['materia_id']}: {e}")
-                data['total_estudiantes'] = 0
-        
-        # Calcular promedios y porcentajes
-        resultado = []
-        for data in profesores_data.values():
-            if data['puntajes']:
-                promedio = sum(data['puntajes']) / len(data['puntajes'])
-                estudiantes_evaluados = len(data['estudiantes_evaluados'])
-                total_estudiantes = data['total_estudiantes']
-                
-                # Calcular porcentaje de evaluación
-                porcentaje_evaluacion = (estudiantes_evaluados / total_estudiantes * 100) if total_estudiantes > 0 else 0
-                
-                # Semaforización
-                if porcentaje_evaluacion <= 30:
-                    color_semaforo = 'rojo'
-                elif porcentaje_evaluacion <= 60:
-                    color_semaforo = 'amarillo'
-                else:
-                    color_semaforo = 'verde'
-                
-                resultado.append({
-                    'profesor_id': data['profesor_id'],
-                    'profesor_nombre': data['profesor_nombre'],
-                    'materia_id': data['materia_id'],
-                    'materia_nombre': data['materia_nombre'],
-                    'promedio': round(promedio, 2),
-                    'estudiantes_evaluados': estudiantes_evaluados,
-                    'total_estudiantes': total_estudiantes,
-                    'porcentaje_evaluacion': round(porcentaje_evaluacion, 1),
-                    'color_semaforo': color_semaforo
-                })
+        for item in resultado:
+            item['color_semaforo'] = color_semaforo(item['porcentaje_evaluacion'])
         
         return JsonResponse({'profesores_materias': resultado}, safe=False)
         
@@ -1729,13 +1752,14 @@ def informes_por_profesor_materia(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def informes_por_estudiante_profesores(request):
     """Obtener promedios por estudiante y profesores evaluadores"""
     try:
         # Obtener evaluaciones con información de estudiante y profesor
-        evaluaciones = Evaluacion.objects.select_related(
+        evaluaciones = Evaluacion.objects.filter(filtro_periodo(request)).select_related(
             'estudiante', 'profesor'
-        ).all()
+        )
         
         # Agrupar por estudiante
         estudiantes_data = {}
@@ -1782,14 +1806,16 @@ def informes_por_estudiante_profesores(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cache_respuesta
 def informes_detalle_profesor_materia(request, profesor_id, materia_id):
     """Obtener detalle de estudiantes evaluados por un profesor en una materia específica"""
     try:
         # Obtener evaluaciones del profesor en la materia específica
         evaluaciones = Evaluacion.objects.filter(
+            filtro_periodo(request),
             profesor_id=profesor_id,
             rac__materias__id=materia_id
-        ).select_related('estudiante', 'rac').all()
+        ).select_related('estudiante', 'rac')
         
         # Obtener información del profesor y materia
         from usuarios.models import Profesor
@@ -1887,6 +1913,15 @@ def informes_detalle_profesor_materia(request, profesor_id, materia_id):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def estadisticas_cache_informes(request):
+    """Debug: aciertos/fallos de la caché de informes y versión de datos actual"""
+    try:
+        return Response(estadisticas_cache())
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def debug_datos(request):
@@ -2036,44 +2071,8 @@ def obtener_gacs_por_materia(request, materia_id):
 # ==================== FUNCIONES PARA GENERAR PDFs ====================
 
 def crear_estilos_pdf():
-    """Crear estilos personalizados para los PDFs"""
-    styles = getSampleStyleSheet()
-    
-    # Estilo para título principal
-    titulo_style = ParagraphStyle(
-        'TituloPrincipal',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    
-    # Estilo para subtítulos
-    subtitulo_style = ParagraphStyle(
-        'Subtitulo',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=20,
-        alignment=TA_LEFT,
-        textColor=colors.darkblue
-    )
-    
-    # Estilo para texto normal
-    texto_style = ParagraphStyle(
-        'TextoNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=12,
-        alignment=TA_LEFT
-    )
-    
-    return {
-        'titulo': titulo_style,
-        'subtitulo': subtitulo_style,
-        'texto': texto_style,
-        'normal': styles['Normal']
-    }
+    """Estilos personalizados para los PDFs (compartidos por proceso, ver informes_pdf)"""
+    return estilos_pdf()
 
 def crear_tabla_pdf(data, headers, col_widths=None):
     """Crear una tabla para el PDF"""
@@ -2084,78 +2083,22 @@ def crear_tabla_pdf(data, headers, col_widths=None):
     if headers and data[0] != headers:
         data.insert(0, headers)
     
-    # Crear la tabla
-    table = Table(data)
-    
-    # Estilo de la tabla
-    table_style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-    ])
-    
-    table.setStyle(table_style)
+    table = Table(data, colWidths=col_widths)
+    table.setStyle(estilo_tabla(fuente_filas=8, alternas=True))
     return table
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@artefacto_pdf
 def descargar_pdf_resumen_general(request):
     """Descargar PDF del resumen general completo"""
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
-        from django.http import HttpResponse
-        from datetime import datetime
-        
-        # Crear buffer para el PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Estilos personalizados con colores
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.darkgreen,
-            fontName='Helvetica-Bold'
-        )
-        
-        section_style = ParagraphStyle(
-            'CustomSection',
-            parent=styles['Heading3'],
-            fontSize=12,
-            spaceAfter=8,
-            textColor=colors.darkred,
-            fontName='Helvetica-Bold'
-        )
+        estilos = estilos_pdf()
         
         # Obtener datos del resumen general
-        evaluaciones = Evaluacion.objects.select_related('estudiante', 'profesor', 'rac').prefetch_related('rac__gacs', 'rac__materias').all()
+        evaluaciones = Evaluacion.objects.filter(filtro_periodo(request)).select_related(
+            'estudiante', 'profesor', 'rac'
+        ).prefetch_related('rac__gacs', 'rac__materias')
         
         # Estadísticas básicas
         promedio_general = evaluaciones.aggregate(promedio=Avg("puntaje"))["promedio"] or 0
@@ -2166,8 +2109,8 @@ def descargar_pdf_resumen_general(request):
         total_materias = evaluaciones.values("rac__materias__id").distinct().count()
         
         # Definir grupos por semestre
-        primer_semestre = ['Virtual 1', '1A', '1B', '1C']
-        segundo_semestre = ['2A', '2B', '2C']
+        primer_semestre = GRUPOS_PRIMER_SEMESTRE
+        segundo_semestre = GRUPOS_SEGUNDO_SEMESTRE
         
         # Estadísticas por semestre
         evaluaciones_primer = evaluaciones.filter(estudiante__grupo__in=primer_semestre)
@@ -2300,12 +2243,10 @@ def descargar_pdf_resumen_general(request):
         story = []
         
         # Título principal
-        story.append(Paragraph("📊 INFORME GENERAL COMPLETO", title_style))
-        story.append(Paragraph(f"Generado el: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-        story.append(Spacer(1, 20))
+        story.extend(encabezado_informe("📊 INFORME GENERAL COMPLETO"))
 
         # Resumen general con estadísticas básicas
-        story.append(Paragraph("📈 RESUMEN GENERAL", subtitle_style))
+        story.append(Paragraph("📈 RESUMEN GENERAL", estilos['subtitulo_informe']))
         
         resumen_table = [['Métrica', 'Valor', 'Primer Semestre', 'Segundo Semestre']]
         resumen_table.append([
@@ -2346,28 +2287,13 @@ def descargar_pdf_resumen_general(request):
         ])
         
         # Crear tabla resumen con colores
-        resumen_table_obj = Table(resumen_table, colWidths=[2*inch, 1*inch, 1*inch, 1*inch])
-        resumen_table_obj.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            # Filas de datos
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            # Colores específicos
-            ('BACKGROUND', (2, 1), (2, -1), colors.lightblue),  # Primer semestre
-            ('BACKGROUND', (3, 1), (3, -1), colors.lightgreen),  # Segundo semestre
-        ]))
+        resumen_table_obj = tabla(resumen_table, [2, 1, 1, 1], encabezado='darkblue', filas='beige', columnas=((2, 'lightblue'), (3, 'lightgreen')))
         
         story.append(resumen_table_obj)
         story.append(Spacer(1, 20))
 
         # Top GACs con mejor rendimiento
-        story.append(Paragraph("🎯 TOP GACs CON MEJOR RENDIMIENTO", subtitle_style))
+        story.append(Paragraph("🎯 TOP GACs CON MEJOR RENDIMIENTO", estilos['subtitulo_informe']))
         
         gac_table = [['GAC', 'Descripción', 'Promedio General', '1er Semestre', '2do Semestre', 'Total Evaluaciones']]
         for gac in gacs_resultado[:10]:  # Top 10 GACs
@@ -2380,26 +2306,13 @@ def descargar_pdf_resumen_general(request):
                 str(gac['total_evaluaciones'])
             ])
         
-        gac_table_obj = Table(gac_table, colWidths=[0.8*inch, 2*inch, 1*inch, 1*inch, 1*inch, 1*inch])
-        gac_table_obj.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            # Filas de datos
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
+        gac_table_obj = tabla(gac_table, [0.8, 2, 1, 1, 1, 1], encabezado='darkgreen', filas='lightgreen', **COMPACTA)
         
         story.append(gac_table_obj)
         story.append(Spacer(1, 20))
 
         # Top Materias con mejor rendimiento
-        story.append(Paragraph("📚 TOP MATERIAS CON MEJOR RENDIMIENTO", subtitle_style))
+        story.append(Paragraph("📚 TOP MATERIAS CON MEJOR RENDIMIENTO", estilos['subtitulo_informe']))
         
         materia_table = [['Materia', 'Promedio General', '1er Semestre', '2do Semestre', 'Total Evaluaciones']]
         for materia in materias_resultado[:10]:  # Top 10 materias
@@ -2411,26 +2324,13 @@ def descargar_pdf_resumen_general(request):
                 str(materia['total_evaluaciones'])
             ])
         
-        materia_table_obj = Table(materia_table, colWidths=[2.5*inch, 1*inch, 1*inch, 1*inch, 1*inch])
-        materia_table_obj.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            # Filas de datos
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightcoral),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
+        materia_table_obj = tabla(materia_table, [2.5, 1, 1, 1, 1], encabezado='darkred', filas='lightcoral', **COMPACTA)
         
         story.append(materia_table_obj)
         story.append(Spacer(1, 20))
 
         # Top Profesores con mejor rendimiento
-        story.append(Paragraph("👨‍🏫 TOP PROFESORES CON MEJOR RENDIMIENTO", subtitle_style))
+        story.append(Paragraph("👨‍🏫 TOP PROFESORES CON MEJOR RENDIMIENTO", estilos['subtitulo_informe']))
         
         profesor_table = [['Profesor', 'Promedio General', '1er Semestre', '2do Semestre', 'Total Evaluaciones']]
         for profesor in profesores_resultado[:10]:  # Top 10 profesores
@@ -2442,91 +2342,33 @@ def descargar_pdf_resumen_general(request):
                 str(profesor['total_evaluaciones'])
             ])
         
-        profesor_table_obj = Table(profesor_table, colWidths=[2*inch, 1*inch, 1*inch, 1*inch, 1*inch])
-        profesor_table_obj.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkorange),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            # Filas de datos
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightyellow),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
+        profesor_table_obj = tabla(profesor_table, [2, 1, 1, 1, 1], encabezado='darkorange', filas='lightyellow', **COMPACTA)
         
         story.append(profesor_table_obj)
         story.append(Spacer(1, 20))
 
-        # Construir PDF
-        doc.build(story)
-        buffer.seek(0)
-
-        # Crear respuesta HTTP
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="informe_general_completo_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-        return response
+        return informe_pdf(story, 'informe_general_completo', **MARGENES_INFORME)
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@artefacto_pdf
 def descargar_pdf_por_gac(request):
     """Descargar PDF del informe por GAC con colores y análisis por materia"""
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
-        from django.http import HttpResponse
-        from datetime import datetime
-        
-        # Crear buffer para el PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Estilos personalizados con colores
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.darkgreen,
-            fontName='Helvetica-Bold'
-        )
-        
-        section_style = ParagraphStyle(
-            'CustomSection',
-            parent=styles['Heading3'],
-            fontSize=12,
-            spaceAfter=8,
-            textColor=colors.darkred,
-            fontName='Helvetica-Bold'
-        )
+        estilos = estilos_pdf()
         
         # Obtener datos del informe por GAC
-        primer_semestre = ['Virtual 1', '1A', '1B', '1C']
-        segundo_semestre = ['2A', '2B', '2C']
+        primer_semestre = GRUPOS_PRIMER_SEMESTRE
+        segundo_semestre = GRUPOS_SEGUNDO_SEMESTRE
         
-        evaluaciones = Evaluacion.objects.select_related('estudiante', 'rac').prefetch_related('rac__gacs', 'rac__materias').all()
+        # Solo evaluaciones del período pedido y de grupos con semestre asignado
+        evaluaciones = Evaluacion.objects.filter(
+            filtro_periodo(request),
+            estudiante__grupo__in=primer_semestre + segundo_semestre
+        ).select_related('estudiante', 'rac').prefetch_related('rac__gacs', 'rac__materias')
         
         if not evaluaciones.exists():
             return JsonResponse({'error': 'No hay evaluaciones disponibles'}, status=404)
@@ -2600,12 +2442,10 @@ def descargar_pdf_por_gac(request):
         story = []
         
         # Título principal
-        story.append(Paragraph("🎯 INFORME POR GAC Y MATERIAS", title_style))
-        story.append(Paragraph(f"Generado el: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-        story.append(Spacer(1, 20))
+        story.extend(encabezado_informe("🎯 INFORME POR GAC Y MATERIAS"))
 
         # Resumen general por GAC
-        story.append(Paragraph("📊 RESUMEN GENERAL POR GAC", subtitle_style))
+        story.append(Paragraph("📊 RESUMEN GENERAL POR GAC", estilos['subtitulo_informe']))
         
         resumen_table = [['GAC', 'Descripción', '1er Semestre', 'Evaluaciones 1er', '2do Semestre', 'Evaluaciones 2do']]
         for gac_data in sorted(gacs_data.values(), key=lambda x: x['gac_numero']):
@@ -2619,36 +2459,21 @@ def descargar_pdf_por_gac(request):
             ])
         
         # Crear tabla resumen con colores
-        resumen_table_obj = Table(resumen_table, colWidths=[1*inch, 2*inch, 1*inch, 1*inch, 1*inch, 1*inch])
-        resumen_table_obj.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            # Filas de datos
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            # Colores específicos
-            ('BACKGROUND', (2, 1), (2, -1), colors.lightblue),  # 1er semestre
-            ('BACKGROUND', (4, 1), (4, -1), colors.lightgreen),  # 2do semestre
-        ]))
+        resumen_table_obj = tabla(resumen_table, [1, 2, 1, 1, 1, 1], encabezado='darkblue', filas='beige', columnas=((2, 'lightblue'), (4, 'lightgreen')))
         
         story.append(resumen_table_obj)
         story.append(Spacer(1, 20))
 
         # Detalles por GAC con análisis de materias
-        story.append(Paragraph("🔍 ANÁLISIS DETALLADO POR GAC Y MATERIA", subtitle_style))
+        story.append(Paragraph("🔍 ANÁLISIS DETALLADO POR GAC Y MATERIA", estilos['subtitulo_informe']))
         
         for gac_data in sorted(gacs_data.values(), key=lambda x: x['gac_numero']):
             # Información del GAC
-            story.append(Paragraph(f"<b>🎯 GAC {gac_data['gac_numero']}:</b> {gac_data['gac_descripcion']}", section_style))
+            story.append(Paragraph(f"<b>🎯 GAC {gac_data['gac_numero']}:</b> {gac_data['gac_descripcion']}", estilos['seccion']))
             
             # Primer Semestre
             if gac_data['primer_semestre']['total_evaluaciones'] > 0:
-                story.append(Paragraph(f"<b>📚 PRIMER SEMESTRE - Promedio General: {gac_data['primer_semestre']['promedio']:.2f}</b>", styles['Heading4']))
+                story.append(Paragraph(f"<b>📚 PRIMER SEMESTRE - Promedio General: {gac_data['primer_semestre']['promedio']:.2f}</b>", estilos['heading4']))
                 
                 # Tabla de materias - Primer Semestre
                 if gac_data['primer_semestre']['materias']:
@@ -2685,27 +2510,14 @@ def descargar_pdf_por_gac(request):
                             ])
                     
                     if len(materias_table) > 1:  # Si hay datos además del header
-                        materias_table_obj = Table(materias_table, colWidths=[2*inch, 1*inch, 1*inch, 1*inch])
-                        materias_table_obj.setStyle(TableStyle([
-                            # Header
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, 0), 9),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                            # Filas de datos
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                            ('FONTSIZE', (0, 1), (-1, -1), 8),
-                        ]))
+                        materias_table_obj = tabla(materias_table, [2, 1, 1, 1], encabezado='darkgreen', filas='lightgreen', **COMPACTA)
                         
                         story.append(materias_table_obj)
                         story.append(Spacer(1, 10))
             
             # Segundo Semestre
             if gac_data['segundo_semestre']['total_evaluaciones'] > 0:
-                story.append(Paragraph(f"<b>📚 SEGUNDO SEMESTRE - Promedio General: {gac_data['segundo_semestre']['promedio']:.2f}</b>", styles['Heading4']))
+                story.append(Paragraph(f"<b>📚 SEGUNDO SEMESTRE - Promedio General: {gac_data['segundo_semestre']['promedio']:.2f}</b>", estilos['heading4']))
                 
                 # Tabla de materias - Segundo Semestre
                 if gac_data['segundo_semestre']['materias']:
@@ -2742,20 +2554,7 @@ def descargar_pdf_por_gac(request):
                             ])
                     
                     if len(materias_table) > 1:  # Si hay datos además del header
-                        materias_table_obj = Table(materias_table, colWidths=[2*inch, 1*inch, 1*inch, 1*inch])
-                        materias_table_obj.setStyle(TableStyle([
-                            # Header
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, 0), 9),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                            # Filas de datos
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                            ('FONTSIZE', (0, 1), (-1, -1), 8),
-                        ]))
+                        materias_table_obj = tabla(materias_table, [2, 1, 1, 1], encabezado='darkgreen', filas='lightgreen', **COMPACTA)
                         
                         story.append(materias_table_obj)
                         story.append(Spacer(1, 10))
@@ -2766,182 +2565,55 @@ def descargar_pdf_por_gac(request):
             if (list(gacs_data.keys()).index(gac_data['gac_numero']) + 1) % 2 == 0:
                 story.append(PageBreak())
 
-        # Construir PDF
-        doc.build(story)
-        buffer.seek(0)
-
-        # Crear respuesta HTTP
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="informe_gac_detallado_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-        return response
+        return informe_pdf(story, 'informe_gac_detallado', **MARGENES_INFORME)
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@artefacto_pdf
 def descargar_pdf_por_profesor(request):
     """Descargar PDF del informe por profesor con colores y resultados por GAC"""
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
-        from django.http import HttpResponse
-        from datetime import datetime
-        
-        # Crear buffer para el PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Estilos personalizados con colores
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue,
-            fontName='Helvetica-Bold'
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            textColor=colors.darkgreen,
-            fontName='Helvetica-Bold'
-        )
-        
-        section_style = ParagraphStyle(
-            'CustomSection',
-            parent=styles['Heading3'],
-            fontSize=12,
-            spaceAfter=8,
-            textColor=colors.darkred,
-            fontName='Helvetica-Bold'
-        )
+        estilos = estilos_pdf()
         
-        # Obtener datos del informe por profesor
-        evaluaciones = Evaluacion.objects.select_related(
-            'profesor', 'estudiante', 'rac'
-        ).prefetch_related('rac__materias', 'rac__gacs').all()
+        # Obtener datos del informe por profesor (mismas consultas que informes_por_profesor_materia)
+        evaluaciones = Evaluacion.objects.filter(filtro_periodo(request))
+        resultado = datos_profesor_materia(evaluaciones)
         
-        if not evaluaciones.exists():
+        if not resultado:
             return JsonResponse({'error': 'No hay evaluaciones disponibles'}, status=404)
         
-        # Procesar datos por profesor-materia
-        profesores_data = {}
-        
-        for evaluacion in evaluaciones:
-            try:
-                profesor_id = evaluacion.profesor.id
-                profesor_nombre = evaluacion.profesor.nombre
-                
-                materias = evaluacion.rac.materias.all()
-                
-                for materia in materias:
-                    materia_id = materia.id
-                    materia_nombre = materia.nombre
-                    
-                    key = f"{profesor_id}_{materia_id}"
-                    
-                    if key not in profesores_data:
-                        profesores_data[key] = {
-                            'profesor_id': profesor_id,
-                            'profesor_nombre': profesor_nombre,
-                            'materia_id': materia_id,
-                            'materia_nombre': materia_nombre,
-                            'puntajes': [],
-                            'estudiantes_evaluados': set(),
-                            'total_estudiantes': 0,
-                            'gacs_data': {}
-                        }
-                    
-                    profesores_data[key]['puntajes'].append(evaluacion.puntaje)
-                    profesores_data[key]['estudiantes_evaluados'].add(evaluacion.estudiante.id)
-                    
-                    # Procesar GACs
-                    for gac in evaluacion.rac.gacs.all():
-                        gac_key = f"GAC {gac.numero}"
-                        if gac_key not in profesores_data[key]['gacs_data']:
-                            profesores_data[key]['gacs_data'][gac_key] = {
-                                'gac': gac_key,
-                                'descripcion': gac.descripcion,
-                                'puntajes': []
-                            }
-                        profesores_data[key]['gacs_data'][gac_key]['puntajes'].append(evaluacion.puntaje)
-                        
-            except Exception as e:
-                continue
-        
-        # Calcular total de estudiantes por materia
-        for key, data in profesores_data.items():
-            try:
-                materia_id = data['materia_id']
-                total_estudiantes = Evaluacion.objects.filter(
-                    rac__materias__id=materia_id
-                ).values('estudiante').distinct().count()
-                data['total_estudiantes'] = total_estudiantes
-            except Exception as e:
-                data['total_estudiantes'] = 0
+        # Promedios por GAC de cada (profesor, materia) en una consulta agrupada
+        gacs_por_clave = {}
+        filas_gacs = (
+            evaluaciones
+            .filter(rac__materias__isnull=False, rac__gacs__isnull=False)
+            .values('profesor_id', 'rac__materias__id', 'rac__gacs__numero', 'rac__gacs__descripcion')
+            .annotate(promedio=Avg('puntaje'), total=Count('id'))
+            .order_by('rac__gacs__numero')
+        )
+        for fila in filas_gacs:
+            gacs_por_clave.setdefault((fila['profesor_id'], fila['rac__materias__id']), []).append({
+                'gac': f"GAC {fila['rac__gacs__numero']}",
+                'descripcion': fila['rac__gacs__descripcion'],
+                'promedio': round(fila['promedio'], 2),
+                'total_evaluaciones': fila['total']
+            })
         
-        # Calcular promedios y porcentajes
-        resultado = []
-        for data in profesores_data.values():
-            if data['puntajes']:
-                promedio = sum(data['puntajes']) / len(data['puntajes'])
-                estudiantes_evaluados = len(data['estudiantes_evaluados'])
-                total_estudiantes = data['total_estudiantes']
-                
-                porcentaje_evaluacion = (estudiantes_evaluados / total_estudiantes * 100) if total_estudiantes > 0 else 0
-                
-                if porcentaje_evaluacion <= 30:
-                    color_semaforo = 'Rojo'
-                elif porcentaje_evaluacion <= 60:
-                    color_semaforo = 'Amarillo'
-                else:
-                    color_semaforo = 'Verde'
-                
-                # Calcular promedios por GAC
-                gacs_promedio = []
-                for gac_data in data['gacs_data'].values():
-                    if gac_data['puntajes']:
-                        promedio_gac = sum(gac_data['puntajes']) / len(gac_data['puntajes'])
-                        gacs_promedio.append({
-                            'gac': gac_data['gac'],
-                            'descripcion': gac_data['descripcion'],
-                            'promedio': round(promedio_gac, 2),
-                            'total_evaluaciones': len(gac_data['puntajes'])
-                        })
-                
-                resultado.append({
-                    'profesor_nombre': data['profesor_nombre'],
-                    'materia_nombre': data['materia_nombre'],
-                    'promedio': round(promedio, 2),
-                    'estudiantes_evaluados': estudiantes_evaluados,
-                    'total_estudiantes': total_estudiantes,
-                    'porcentaje_evaluacion': round(porcentaje_evaluacion, 1),
-                    'color_semaforo': color_semaforo,
-                    'gacs': gacs_promedio
-                })
+        for item in resultado:
+            item['color_semaforo'] = color_semaforo(item['porcentaje_evaluacion']).capitalize()
+            item['gacs'] = gacs_por_clave.get((item['profesor_id'], item['materia_id']), [])
 
         # Preparar datos para el PDF
         story = []
         
         # Título principal
-        story.append(Paragraph("📊 INFORME POR PROFESOR Y MATERIA", title_style))
-        story.append(Paragraph(f"Generado el: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-        story.append(Spacer(1, 20))
+        story.extend(encabezado_informe("📊 INFORME POR PROFESOR Y MATERIA"))
 
         # Tabla resumen con colores
-        story.append(Paragraph("📈 RESUMEN GENERAL", subtitle_style))
+        story.append(Paragraph("📈 RESUMEN GENERAL", estilos['subtitulo_informe']))
         
         resumen_table = [['Profesor', 'Materia', 'Promedio', 'Evaluados', 'Total', 'Progreso %', 'Estado']]
         for item in resultado:
@@ -2964,37 +2636,23 @@ def descargar_pdf_por_profesor(request):
             ])
         
         # Crear tabla con estilos de colores
-        resumen_table_obj = Table(resumen_table, colWidths=[1.5*inch, 1.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 1*inch])
-        resumen_table_obj.setStyle(TableStyle([
-            # Header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            # Filas de datos con colores alternados
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            # Colores específicos por promedio
-            ('BACKGROUND', (2, 1), (2, -1), colors.lightblue),  # Columna promedio
-        ]))
+        resumen_table_obj = tabla(resumen_table, [1.5, 1.8, 0.8, 0.8, 0.8, 0.8, 1], encabezado='darkblue', filas='beige', columnas=((2, 'lightblue'),))
         
         story.append(resumen_table_obj)
         story.append(Spacer(1, 20))
 
         # Detalles por profesor-materia con GACs
-        story.append(Paragraph("🎯 DETALLES POR PROFESOR Y MATERIA", subtitle_style))
+        story.append(Paragraph("🎯 DETALLES POR PROFESOR Y MATERIA", estilos['subtitulo_informe']))
         
         for item in resultado:
             # Información del profesor-materia
-            story.append(Paragraph(f"<b>👨‍🏫 PROFESOR:</b> {item['profesor_nombre']}", section_style))
-            story.append(Paragraph(f"<b>📚 MATERIA:</b> {item['materia_nombre']}", styles['Normal']))
-            story.append(Paragraph(f"<b>📊 PROMEDIO GENERAL:</b> {item['promedio']} | <b>ESTUDIANTES EVALUADOS:</b> {item['estudiantes_evaluados']}/{item['total_estudiantes']} ({item['porcentaje_evaluacion']}%)", styles['Normal']))
+            story.append(Paragraph(f"<b>👨‍🏫 PROFESOR:</b> {item['profesor_nombre']}", estilos['seccion']))
+            story.append(Paragraph(f"<b>📚 MATERIA:</b> {item['materia_nombre']}", estilos['normal']))
+            story.append(Paragraph(f"<b>📊 PROMEDIO GENERAL:</b> {item['promedio']} | <b>ESTUDIANTES EVALUADOS:</b> {item['estudiantes_evaluados']}/{item['total_estudiantes']} ({item['porcentaje_evaluacion']}%)", estilos['normal']))
             
             # Tabla de GACs si existen
             if item['gacs']:
-                story.append(Paragraph("<b>🎯 RESULTADOS POR GAC:</b>", styles['Heading4']))
+                story.append(Paragraph("<b>🎯 RESULTADOS POR GAC:</b>", estilos['heading4']))
                 
                 gac_table_data = [['GAC', 'Descripción', 'Promedio', 'Evaluaciones']]
                 for gac in item['gacs']:
@@ -3005,24 +2663,11 @@ def descargar_pdf_por_profesor(request):
                         str(gac['total_evaluaciones'])
                     ])
                 
-                gac_table = Table(gac_table_data, colWidths=[1*inch, 2.5*inch, 1*inch, 1*inch])
-                gac_table.setStyle(TableStyle([
-                    # Header
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    # Filas de datos
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ]))
+                gac_table = tabla(gac_table_data, [1, 2.5, 1, 1], encabezado='darkgreen', filas='lightgreen', **COMPACTA)
                 
                 story.append(gac_table)
             else:
-                story.append(Paragraph("<i>No hay datos de GAC disponibles para esta materia.</i>", styles['Normal']))
+                story.append(Paragraph("<i>No hay datos de GAC disponibles para esta materia.</i>", estilos['normal']))
             
             story.append(Spacer(1, 15))
             
@@ -3030,33 +2675,324 @@ def descargar_pdf_por_profesor(request):
             if (resultado.index(item) + 1) % 3 == 0:
                 story.append(PageBreak())
 
-        # Construir PDF
-        doc.build(story)
-        buffer.seek(0)
-
-        # Crear respuesta HTTP
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="informe_profesores_detallado_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-        return response
+        return informe_pdf(story, 'informe_profesores_detallado', **MARGENES_INFORME)
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
+def story_estudiante_individual(estudiante, evaluaciones, datos_estudiante):
+    """
+    Story del reporte detallado de un estudiante.
+
+    `evaluaciones` es la lista de evaluaciones del estudiante con profesor, rac y
+    rac__gacs ya cargados; `datos_estudiante` es su entrada en
+    resultados_por_semestre_estudiantes().
+    """
+    es_segundo_semestre = estudiante.grupo in GRUPOS_SEGUNDO_SEMESTRE
+    
+    # Procesar datos por GAC y RAC
+    gacs_data = {}
+    rac_data = []
+    
+    for evaluacion in evaluaciones:
+        # Datos por GAC
+        for gac in evaluacion.rac.gacs.all():
+            if gac.numero not in gacs_data:
+                gacs_data[gac.numero] = {
+                    'descripcion': gac.descripcion,
+                    'evaluaciones': [],
+                    'promedio': 0
+                }
+            gacs_data[gac.numero]['evaluaciones'].append(evaluacion.puntaje)
+        
+        # Datos por RAC
+        rac_data.append({
+            'numero': evaluacion.rac.numero,
+            'descripcion': evaluacion.rac.descripcion,
+            'puntaje': evaluacion.puntaje,
+            'profesor': evaluacion.profesor.nombre,
+            'gacs': [gac.numero for gac in evaluacion.rac.gacs.all()]
+        })
+    
+    # Calcular promedios por GAC
+    for gac_num, data in gacs_data.items():
+        if data['evaluaciones']:
+            data['promedio'] = round(sum(data['evaluaciones']) / len(data['evaluaciones']), 2)
+    
+    # Calcular promedio general
+    todos_puntajes = [eval.puntaje for eval in evaluaciones]
+    promedio_general = round(sum(todos_puntajes) / len(todos_puntajes), 2)
+    
+    # Crear PDF detallado
+    story = []
+    
+    # Obtener estilos personalizados
+    estilos = crear_estilos_pdf()
+    
+    # Título principal
+    titulo = Paragraph(f"📊 Reporte de Resultados - {estudiante.nombre}", estilos['titulo'])
+    story.append(titulo)
+    story.append(Spacer(1, 20))
+    
+    # Información del estudiante con colores
+    info_estudiante = [
+        ["👤 Estudiante:", estudiante.nombre],
+        ["🏫 Grupo:", estudiante.grupo],
+        ["🆔 Documento:", estudiante.documento],
+        ["📝 Total Evaluaciones:", str(len(evaluaciones))],
+        ["⭐ Promedio General:", f"{promedio_general}/5.0"]
+    ]
+    
+    tabla_info = tabla_clave_valor(info_estudiante, [2.2, 2.8], fondo='lightblue', fuente=11, negrita=(0,), relleno=(10, 8), alternas=True)
+    story.append(tabla_info)
+    story.append(Spacer(1, 20))
+
+    # Agregar evolución entre periodos si es estudiante de segundo semestre
+    if es_segundo_semestre and datos_estudiante.get('primer_semestre') and datos_estudiante.get('segundo_semestre'):
+        story.append(Paragraph("📈 Evolución de Calificaciones por Período", estilos['subtitulo']))
+        story.append(Spacer(1, 10))
+        
+        # Crear tabla de evolución
+        evolucion_data = [["Período", "Promedio", "Evaluaciones", "Evolución"]]
+        
+        primer_semestre = datos_estudiante['primer_semestre']
+        segundo_semestre = datos_estudiante['segundo_semestre']
+        
+        # Primer semestre
+        if primer_semestre.get('resumen_general', {}).get('promedio_general', 0) > 0:
+            evolucion_data.append([
+                primer_semestre.get('semestre', 'Primer Semestre'),
+                f"{primer_semestre['resumen_general']['promedio_general']:.2f}",
+                str(primer_semestre['resumen_general']['total_evaluaciones']),
+                "Primer período"
+            ])
+        
+        # Segundo semestre
+        if segundo_semestre.get('resumen_general', {}).get('promedio_general', 0) > 0:
+            promedio_segundo = segundo_semestre['resumen_general']['promedio_general']
+            promedio_primer = primer_semestre.get('resumen_general', {}).get('promedio_general', 0)
+            
+            evolucion_texto = ""
+            if promedio_primer > 0:
+                diferencia = promedio_segundo - promedio_primer
+                if diferencia > 0:
+                    evolucion_texto = f"📈 +{diferencia:.2f}"
+                elif diferencia < 0:
+                    evolucion_texto = f"📉 {diferencia:.2f}"
+                else:
+                    evolucion_texto = "➡️ Sin cambio"
+            else:
+                evolucion_texto = "Primer período"
+            
+            evolucion_data.append([
+                segundo_semestre.get('semestre', 'Segundo Semestre'),
+                f"{promedio_segundo:.2f}",
+                str(segundo_semestre['resumen_general']['total_evaluaciones']),
+                evolucion_texto
+            ])
+        
+        tabla_evolucion = tabla(evolucion_data, [2, 1, 1, 1.5], encabezado='darkblue', filas=None, relleno=(8, 6), alternas=True, vertical='MIDDLE')
+        story.append(tabla_evolucion)
+        story.append(Spacer(1, 15))
+    
+    # Resultados por GAC con colores
+    if gacs_data:
+        story.append(Paragraph("🎯 Resultados por GAC (Grupo de Área de Conocimiento)", estilos['subtitulo']))
+        story.append(Spacer(1, 10))
+        
+        gac_table_data = [["GAC", "Descripción", "Promedio", "Evaluaciones"]]
+        for gac_num, data in sorted(gacs_data.items()):
+            # Truncar descripción si es muy larga, manteniendo palabras completas
+            descripcion = data['descripcion']
+            if len(descripcion) > 45:
+                descripcion = descripcion[:45]
+                # Buscar el último espacio para no cortar palabras
+                ultimo_espacio = descripcion.rfind(' ')
+                if ultimo_espacio > 30:  # Solo si no es muy corto
+                    descripcion = descripcion[:ultimo_espacio]
+                descripcion += "..."
+            
+            gac_table_data.append([
+                f"GAC {gac_num}",
+                descripcion,
+                f"{data['promedio']}/5.0",
+                str(len(data['evaluaciones']))
+            ])
+        
+        gac_table = tabla(gac_table_data, [0.7, 3.5, 0.7, 0.7], encabezado='darkblue', filas=None, fuente=9, fuente_filas=8, relleno=(8, 6), izquierda=(1,), alternas=True, vertical='MIDDLE')
+        story.append(gac_table)
+        story.append(Spacer(1, 20))
+    
+    # Evaluaciones detalladas por RAC por períodos
+    if es_segundo_semestre and datos_estudiante.get('primer_semestre') and datos_estudiante.get('segundo_semestre'):
+        story.append(Paragraph("📋 Evaluaciones Detalladas por RAC por Períodos", estilos['subtitulo']))
+        story.append(Spacer(1, 10))
+        
+        # Estilos para texto dentro de celdas
+        cell_style = estilos['celda']
+        cell_style_center = estilos['celda_centro']
+        
+        # Procesar RACs del primer semestre
+        primer_semestre = datos_estudiante['primer_semestre']
+        segundo_semestre = datos_estudiante['segundo_semestre']
+        
+        # Crear tabla para primer semestre
+        if primer_semestre.get('grafico_gacs'):
+            story.append(Paragraph(f"📅 {primer_semestre.get('semestre', 'Primer Semestre')}", estilos['texto']))
+            story.append(Spacer(1, 5))
+            
+            # Obtener evaluaciones del primer semestre (usar lógica de fechas como fallback)
+            evaluaciones_primer = []
+            for evaluacion in evaluaciones:
+                # Verificar si pertenece al primer semestre por fecha
+                mes = evaluacion.fecha.month
+                if 1 <= mes <= 6:  # Enero a Junio = Primer Semestre
+                    evaluaciones_primer.append(evaluacion)
+            
+            if evaluaciones_primer:
+                rac_table_data_primer = [["RAC", "Descripción", "Profesor", "Puntaje", "GACs"]]
+                for evaluacion in evaluaciones_primer:
+                    # Truncar descripción si es muy larga
+                    descripcion = evaluacion.rac.descripcion
+                    if len(descripcion) > 45:
+                        descripcion = descripcion[:45] + "..."
+                    
+                    # Truncar nombre de profesor si es muy largo
+                    profesor = evaluacion.profesor.nombre
+                    if len(profesor) > 25:
+                        profesor = profesor[:25] + "..."
+                    
+                    rac_table_data_primer.append([
+                        Paragraph(f"<b>RAC {evaluacion.rac.numero}</b>", cell_style_center),
+                        Paragraph(descripcion, cell_style),
+                        Paragraph(profesor, cell_style),
+                        Paragraph(f"<b>{evaluacion.puntaje}/5</b>", cell_style_center),
+                        Paragraph(", ".join([f"GAC {gac.numero}" for gac in evaluacion.rac.gacs.all()]), cell_style_center)
+                    ])
+                
+                rac_table_primer = tabla(rac_table_data_primer, [0.6, 2.4, 1.5, 0.6, 1.4], encabezado='darkblue', filas=None, fuente=9, relleno=(6, 5), izquierda=(1, 2), alternas=True, vertical='TOP')
+                story.append(rac_table_primer)
+            else:
+                story.append(Paragraph("No hay evaluaciones registradas para este período.", estilos['texto']))
+            
+            story.append(Spacer(1, 15))
+        
+        # Crear tabla para segundo semestre
+        if segundo_semestre.get('grafico_gacs'):
+            story.append(Paragraph(f"📅 {segundo_semestre.get('semestre', 'Segundo Semestre')}", estilos['texto']))
+            story.append(Spacer(1, 5))
+            
+            # Obtener evaluaciones del segundo semestre (usar lógica de fechas como fallback)
+            evaluaciones_segundo = []
+            for evaluacion in evaluaciones:
+                # Verificar si pertenece al segundo semestre por fecha
+                mes = evaluacion.fecha.month
+                if 7 <= mes <= 12:  # Julio a Diciembre = Segundo Semestre
+                    evaluaciones_segundo.append(evaluacion)
+            
+            if evaluaciones_segundo:
+                rac_table_data_segundo = [["RAC", "Descripción", "Profesor", "Puntaje", "GACs"]]
+                for evaluacion in evaluaciones_segundo:
+                    # Truncar descripción si es muy larga
+                    descripcion = evaluacion.rac.descripcion
+                    if len(descripcion) > 45:
+                        descripcion = descripcion[:45] + "..."
+                    
+                    # Truncar nombre de profesor si es muy largo
+                    profesor = evaluacion.profesor.nombre
+                    if len(profesor) > 25:
+                        profesor = profesor[:25] + "..."
+                    
+                    rac_table_data_segundo.append([
+                        Paragraph(f"<b>RAC {evaluacion.rac.numero}</b>", cell_style_center),
+                        Paragraph(descripcion, cell_style),
+                        Paragraph(profesor, cell_style),
+                        Paragraph(f"<b>{evaluacion.puntaje}/5</b>", cell_style_center),
+                        Paragraph(", ".join([f"GAC {gac.numero}" for gac in evaluacion.rac.gacs.all()]), cell_style_center)
+                    ])
+                
+                rac_table_segundo = tabla(rac_table_data_segundo, [0.6, 2.4, 1.5, 0.6, 1.4], encabezado='darkgreen', filas=None, fuente=9, relleno=(6, 5), izquierda=(1, 2), alternas=True, vertical='TOP')
+                story.append(rac_table_segundo)
+            else:
+                story.append(Paragraph("No hay evaluaciones registradas para este período.", estilos['texto']))
+            
+            story.append(Spacer(1, 15))
+    
+    # Si no es estudiante de segundo semestre, mostrar tabla normal
+    elif rac_data:
+        story.append(Paragraph("📋 Evaluaciones Detalladas por RAC (Resultado de Aprendizaje Clave)", estilos['subtitulo']))
+        story.append(Spacer(1, 10))
+        
+        # Estilos para texto dentro de celdas
+        cell_style = estilos['celda']
+        cell_style_center = estilos['celda_centro']
+        
+        rac_table_data = [["RAC", "Descripción", "Profesor", "Puntaje", "GACs"]]
+        for rac in rac_data:
+            # Truncar descripción si es muy larga, manteniendo palabras completas
+            descripcion = rac['descripcion']
+            if len(descripcion) > 50:
+                descripcion = descripcion[:50]
+                # Buscar el último espacio para no cortar palabras
+                ultimo_espacio = descripcion.rfind(' ')
+                if ultimo_espacio > 35:  # Solo si no es muy corto
+                    descripcion = descripcion[:ultimo_espacio]
+                descripcion += "..."
+            
+            # Truncar nombre de profesor si es muy largo
+            profesor = rac['profesor']
+            if len(profesor) > 30:
+                profesor = profesor[:30] + "..."
+            
+            rac_table_data.append([
+                Paragraph(f"<b>RAC {rac['numero']}</b>", cell_style_center),
+                Paragraph(descripcion, cell_style),
+                Paragraph(profesor, cell_style),
+                Paragraph(f"<b>{rac['puntaje']}/5</b>", cell_style_center),
+                Paragraph(", ".join([f"GAC {gac}" for gac in rac['gacs']]), cell_style_center)
+            ])
+        
+        rac_table = tabla(rac_table_data, [0.6, 2.4, 1.5, 0.6, 1.4], encabezado='darkgreen', filas=None, fuente=9, relleno=(6, 5), izquierda=(1, 2), alternas=True, vertical='TOP')
+        story.append(rac_table)
+    
+    # Resumen con colores
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("📈 Resumen Ejecutivo", estilos['subtitulo']))
+    
+    # Determinar color del promedio general
+    color_promedio = colors.green if promedio_general >= 4.0 else \
+                    colors.blue if promedio_general >= 3.0 else \
+                    colors.orange if promedio_general >= 2.0 else colors.red
+    
+    resumen_texto = f"""
+    <para align="center">
+    <font color="{color_promedio.hexval()}" size="14"><b>Promedio General: {promedio_general}/5.0</b></font><br/>
+    <font size="10">
+    • Total de evaluaciones realizadas: <b>{len(evaluaciones)}</b><br/>
+    • GACs evaluados: <b>{len(gacs_data)}</b><br/>
+    • RACs evaluados: <b>{len(rac_data)}</b><br/>
+    • Estado: <b>{"Excelente" if promedio_general >= 4.0 else "Bueno" if promedio_general >= 3.0 else "Regular" if promedio_general >= 2.0 else "Necesita Mejora"}</b>
+    </font>
+    </para>
+    """
+    
+    resumen = Paragraph(resumen_texto, estilos['texto'])
+    story.append(resumen)
+    
+    # Pie de página
+    story.append(Spacer(1, 20))
+    fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M")
+    pie = Paragraph(f"📅 Reporte generado el {fecha_generacion} por el Sistema de Evaluación de Competencias", estilos['texto'])
+    story.append(pie)
+    
+    return story
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@artefacto_pdf
 def descargar_pdf_estudiante_individual(request, estudiante_id):
     """Descargar PDF detallado de un estudiante específico"""
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
-        from django.http import HttpResponse
-        from datetime import datetime
-        
         print(f"=== DEBUG PDF INDIVIDUAL ===")
         print(f"Estudiante ID solicitado: {estudiante_id}")
         print(f"Usuario autenticado: {request.user}")
@@ -3073,13 +3009,10 @@ def descargar_pdf_estudiante_individual(request, estudiante_id):
         print("Obteniendo datos del estudiante por semestre...")
         datos_estudiante = obtener_resultados_estudiante_por_semestre_interno(estudiante_id)
         
-        # Verificar si es estudiante de segundo semestre
-        segundo_semestre_grupos = ['2A', '2B', '2C']
-        es_segundo_semestre = estudiante.grupo in segundo_semestre_grupos
-        
         # Obtener evaluaciones del estudiante
         print("Obteniendo evaluaciones del estudiante...")
         evaluaciones = Evaluacion.objects.filter(
+            filtro_periodo(request),
             estudiante=estudiante
         ).select_related('profesor', 'rac').prefetch_related('rac__gacs')
         
@@ -3089,459 +3022,15 @@ def descargar_pdf_estudiante_individual(request, estudiante_id):
             print("No hay evaluaciones para este estudiante")
             return Response({'error': 'No hay evaluaciones para este estudiante'}, status=404)
         
-        # Procesar datos por GAC y RAC
-        print("Procesando datos por GAC y RAC...")
-        gacs_data = {}
-        rac_data = []
-        
-        for evaluacion in evaluaciones:
-            # Datos por GAC
-            for gac in evaluacion.rac.gacs.all():
-                if gac.numero not in gacs_data:
-                    gacs_data[gac.numero] = {
-                        'descripcion': gac.descripcion,
-                        'evaluaciones': [],
-                        'promedio': 0
-                    }
-                gacs_data[gac.numero]['evaluaciones'].append(evaluacion.puntaje)
-            
-            # Datos por RAC
-            rac_data.append({
-                'numero': evaluacion.rac.numero,
-                'descripcion': evaluacion.rac.descripcion,
-                'puntaje': evaluacion.puntaje,
-                'profesor': evaluacion.profesor.nombre,
-                'gacs': [gac.numero for gac in evaluacion.rac.gacs.all()]
-            })
-        
-        # Calcular promedios por GAC
-        print("Calculando promedios por GAC...")
-        for gac_num, data in gacs_data.items():
-            if data['evaluaciones']:
-                data['promedio'] = round(sum(data['evaluaciones']) / len(data['evaluaciones']), 2)
-        
-        # Calcular promedio general
-        todos_puntajes = [eval.puntaje for eval in evaluaciones]
-        promedio_general = round(sum(todos_puntajes) / len(todos_puntajes), 2)
-        print(f"Promedio general calculado: {promedio_general}")
-        
-        # Crear PDF detallado
-        print("Creando PDF detallado...")
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*inch)
-        story = []
-        
-        # Obtener estilos personalizados
-        print("Obteniendo estilos PDF...")
-        estilos = crear_estilos_pdf()
-        
-        # Título principal
-        titulo = Paragraph(f"📊 Reporte de Resultados - {estudiante.nombre}", estilos['titulo'])
-        story.append(titulo)
-        story.append(Spacer(1, 20))
-        
-        # Información del estudiante con colores
-        info_estudiante = [
-            ["👤 Estudiante:", estudiante.nombre],
-            ["🏫 Grupo:", estudiante.grupo],
-            ["🆔 Documento:", estudiante.documento],
-            ["📝 Total Evaluaciones:", str(len(evaluaciones))],
-            ["⭐ Promedio General:", f"{promedio_general}/5.0"]
-        ]
-        
-        tabla_info = Table(info_estudiante, colWidths=[2.2*inch, 2.8*inch])
-        tabla_info.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-            ('BACKGROUND', (1, 0), (1, -1), colors.white),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 10),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.lightgrey, colors.white]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-        ]))
-        story.append(tabla_info)
-        story.append(Spacer(1, 20))
-
-        # Agregar evolución entre periodos si es estudiante de segundo semestre
-        if es_segundo_semestre and datos_estudiante.get('primer_semestre') and datos_estudiante.get('segundo_semestre'):
-            print("Agregando evolución entre periodos al PDF...")
-            story.append(Paragraph("📈 Evolución de Calificaciones por Período", estilos['subtitulo']))
-            story.append(Spacer(1, 10))
-            
-            # Crear tabla de evolución
-            evolucion_data = [["Período", "Promedio", "Evaluaciones", "Evolución"]]
-            
-            primer_semestre = datos_estudiante['primer_semestre']
-            segundo_semestre = datos_estudiante['segundo_semestre']
-            
-            # Primer semestre
-            if primer_semestre.get('resumen_general', {}).get('promedio_general', 0) > 0:
-                evolucion_data.append([
-                    primer_semestre.get('semestre', 'Primer Semestre'),
-                    f"{primer_semestre['resumen_general']['promedio_general']:.2f}",
-                    str(primer_semestre['resumen_general']['total_evaluaciones']),
-                    "Primer período"
-                ])
-            
-            # Segundo semestre
-            if segundo_semestre.get('resumen_general', {}).get('promedio_general', 0) > 0:
-                promedio_segundo = segundo_semestre['resumen_general']['promedio_general']
-                promedio_primer = primer_semestre.get('resumen_general', {}).get('promedio_general', 0)
-                
-                evolucion_texto = ""
-                if promedio_primer > 0:
-                    diferencia = promedio_segundo - promedio_primer
-                    if diferencia > 0:
-                        evolucion_texto = f"📈 +{diferencia:.2f}"
-                    elif diferencia < 0:
-                        evolucion_texto = f"📉 {diferencia:.2f}"
-                    else:
-                        evolucion_texto = "➡️ Sin cambio"
-                else:
-                    evolucion_texto = "Primer período"
-                
-                evolucion_data.append([
-                    segundo_semestre.get('semestre', 'Segundo Semestre'),
-                    f"{promedio_segundo:.2f}",
-                    str(segundo_semestre['resumen_general']['total_evaluaciones']),
-                    evolucion_texto
-                ])
-            
-            tabla_evolucion = Table(evolucion_data, colWidths=[2*inch, 1*inch, 1*inch, 1.5*inch])
-            tabla_evolucion.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
-            story.append(tabla_evolucion)
-            story.append(Spacer(1, 15))
-        
-        # Resultados por GAC con colores
-        if gacs_data:
-            print("Agregando resultados por GAC...")
-            story.append(Paragraph("🎯 Resultados por GAC (Grupo de Área de Conocimiento)", estilos['subtitulo']))
-            story.append(Spacer(1, 10))
-            
-            gac_table_data = [["GAC", "Descripción", "Promedio", "Evaluaciones"]]
-            for gac_num, data in sorted(gacs_data.items()):
-                # Truncar descripción si es muy larga, manteniendo palabras completas
-                descripcion = data['descripcion']
-                if len(descripcion) > 45:
-                    descripcion = descripcion[:45]
-                    # Buscar el último espacio para no cortar palabras
-                    ultimo_espacio = descripcion.rfind(' ')
-                    if ultimo_espacio > 30:  # Solo si no es muy corto
-                        descripcion = descripcion[:ultimo_espacio]
-                    descripcion += "..."
-                
-                gac_table_data.append([
-                    f"GAC {gac_num}",
-                    descripcion,
-                    f"{data['promedio']}/5.0",
-                    str(len(data['evaluaciones']))
-                ])
-            
-            gac_table = Table(gac_table_data, colWidths=[0.7*inch, 3.5*inch, 0.7*inch, 0.7*inch])
-            gac_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Alineación izquierda para descripción
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-            ]))
-            story.append(gac_table)
-            story.append(Spacer(1, 20))
-        
-        # Evaluaciones detalladas por RAC por períodos
-        if es_segundo_semestre and datos_estudiante.get('primer_semestre') and datos_estudiante.get('segundo_semestre'):
-            print("Agregando evaluaciones detalladas por RAC por períodos...")
-            story.append(Paragraph("📋 Evaluaciones Detalladas por RAC por Períodos", estilos['subtitulo']))
-            story.append(Spacer(1, 10))
-            
-            # Obtener estilos base de reportlab
-            styles_base = getSampleStyleSheet()
-            
-            # Estilo para texto dentro de celdas
-            cell_style = ParagraphStyle(
-                'CellStyle',
-                parent=styles_base['Normal'],
-                fontSize=8,
-                leading=10,
-                alignment=TA_LEFT
-            )
-            
-            cell_style_center = ParagraphStyle(
-                'CellStyleCenter',
-                parent=styles_base['Normal'],
-                fontSize=8,
-                leading=10,
-                alignment=TA_CENTER
-            )
-            
-            # Procesar RACs del primer semestre
-            primer_semestre = datos_estudiante['primer_semestre']
-            segundo_semestre = datos_estudiante['segundo_semestre']
-            
-            # Crear tabla para primer semestre
-            if primer_semestre.get('grafico_gacs'):
-                story.append(Paragraph(f"📅 {primer_semestre.get('semestre', 'Primer Semestre')}", estilos['texto']))
-                story.append(Spacer(1, 5))
-                
-                # Obtener evaluaciones del primer semestre (usar lógica de fechas como fallback)
-                evaluaciones_primer = []
-                for evaluacion in evaluaciones:
-                    # Verificar si pertenece al primer semestre por fecha
-                    mes = evaluacion.fecha.month
-                    if 1 <= mes <= 6:  # Enero a Junio = Primer Semestre
-                        evaluaciones_primer.append(evaluacion)
-                
-                if evaluaciones_primer:
-                    rac_table_data_primer = [["RAC", "Descripción", "Profesor", "Puntaje", "GACs"]]
-                    for evaluacion in evaluaciones_primer:
-                        # Truncar descripción si es muy larga
-                        descripcion = evaluacion.rac.descripcion
-                        if len(descripcion) > 45:
-                            descripcion = descripcion[:45] + "..."
-                        
-                        # Truncar nombre de profesor si es muy largo
-                        profesor = evaluacion.profesor.nombre
-                        if len(profesor) > 25:
-                            profesor = profesor[:25] + "..."
-                        
-                        rac_table_data_primer.append([
-                            Paragraph(f"<b>RAC {evaluacion.rac.numero}</b>", cell_style_center),
-                            Paragraph(descripcion, cell_style),
-                            Paragraph(profesor, cell_style),
-                            Paragraph(f"<b>{evaluacion.puntaje}/5</b>", cell_style_center),
-                            Paragraph(", ".join([f"GAC {gac.numero}" for gac in evaluacion.rac.gacs.all()]), cell_style_center)
-                        ])
-                    
-                    rac_table_primer = Table(rac_table_data_primer, colWidths=[0.6*inch, 2.4*inch, 1.5*inch, 0.6*inch, 1.4*inch])
-                    rac_table_primer.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
-                        ('ALIGN', (2, 1), (2, -1), 'LEFT'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 9),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                        ('TOPPADDING', (0, 0), (-1, -1), 6),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 5),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-                    ]))
-                    story.append(rac_table_primer)
-                else:
-                    story.append(Paragraph("No hay evaluaciones registradas para este período.", estilos['texto']))
-                
-                story.append(Spacer(1, 15))
-            
-            # Crear tabla para segundo semestre
-            if segundo_semestre.get('grafico_gacs'):
-                story.append(Paragraph(f"📅 {segundo_semestre.get('semestre', 'Segundo Semestre')}", estilos['texto']))
-                story.append(Spacer(1, 5))
-                
-                # Obtener evaluaciones del segundo semestre (usar lógica de fechas como fallback)
-                evaluaciones_segundo = []
-                for evaluacion in evaluaciones:
-                    # Verificar si pertenece al segundo semestre por fecha
-                    mes = evaluacion.fecha.month
-                    if 7 <= mes <= 12:  # Julio a Diciembre = Segundo Semestre
-                        evaluaciones_segundo.append(evaluacion)
-                
-                if evaluaciones_segundo:
-                    rac_table_data_segundo = [["RAC", "Descripción", "Profesor", "Puntaje", "GACs"]]
-                    for evaluacion in evaluaciones_segundo:
-                        # Truncar descripción si es muy larga
-                        descripcion = evaluacion.rac.descripcion
-                        if len(descripcion) > 45:
-                            descripcion = descripcion[:45] + "..."
-                        
-                        # Truncar nombre de profesor si es muy largo
-                        profesor = evaluacion.profesor.nombre
-                        if len(profesor) > 25:
-                            profesor = profesor[:25] + "..."
-                        
-                        rac_table_data_segundo.append([
-                            Paragraph(f"<b>RAC {evaluacion.rac.numero}</b>", cell_style_center),
-                            Paragraph(descripcion, cell_style),
-                            Paragraph(profesor, cell_style),
-                            Paragraph(f"<b>{evaluacion.puntaje}/5</b>", cell_style_center),
-                            Paragraph(", ".join([f"GAC {gac.numero}" for gac in evaluacion.rac.gacs.all()]), cell_style_center)
-                        ])
-                    
-                    rac_table_segundo = Table(rac_table_data_segundo, colWidths=[0.6*inch, 2.4*inch, 1.5*inch, 0.6*inch, 1.4*inch])
-                    rac_table_segundo.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                        ('ALIGN', (1, 1), (1, -1), 'LEFT'),
-                        ('ALIGN', (2, 1), (2, -1), 'LEFT'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 9),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                        ('TOPPADDING', (0, 0), (-1, -1), 6),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 5),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-                    ]))
-                    story.append(rac_table_segundo)
-                else:
-                    story.append(Paragraph("No hay evaluaciones registradas para este período.", estilos['texto']))
-                
-                story.append(Spacer(1, 15))
-        
-        # Si no es estudiante de segundo semestre, mostrar tabla normal
-        elif rac_data:
-            print("Agregando evaluaciones detalladas por RAC (estudiante de primer semestre)...")
-            story.append(Paragraph("📋 Evaluaciones Detalladas por RAC (Resultado de Aprendizaje Clave)", estilos['subtitulo']))
-            story.append(Spacer(1, 10))
-            
-            # Obtener estilos base de reportlab
-            styles_base = getSampleStyleSheet()
-            
-            # Estilo para texto dentro de celdas
-            cell_style = ParagraphStyle(
-                'CellStyle',
-                parent=styles_base['Normal'],
-                fontSize=8,
-                leading=10,
-                alignment=TA_LEFT
-            )
-            
-            cell_style_center = ParagraphStyle(
-                'CellStyleCenter',
-                parent=styles_base['Normal'],
-                fontSize=8,
-                leading=10,
-                alignment=TA_CENTER
-            )
-            
-            rac_table_data = [["RAC", "Descripción", "Profesor", "Puntaje", "GACs"]]
-            for rac in rac_data:
-                # Truncar descripción si es muy larga, manteniendo palabras completas
-                descripcion = rac['descripcion']
-                if len(descripcion) > 50:
-                    descripcion = descripcion[:50]
-                    # Buscar el último espacio para no cortar palabras
-                    ultimo_espacio = descripcion.rfind(' ')
-                    if ultimo_espacio > 35:  # Solo si no es muy corto
-                        descripcion = descripcion[:ultimo_espacio]
-                    descripcion += "..."
-                
-                # Truncar nombre de profesor si es muy largo
-                profesor = rac['profesor']
-                if len(profesor) > 30:
-                    profesor = profesor[:30] + "..."
-                
-                rac_table_data.append([
-                    Paragraph(f"<b>RAC {rac['numero']}</b>", cell_style_center),
-                    Paragraph(descripcion, cell_style),
-                    Paragraph(profesor, cell_style),
-                    Paragraph(f"<b>{rac['puntaje']}/5</b>", cell_style_center),
-                    Paragraph(", ".join([f"GAC {gac}" for gac in rac['gacs']]), cell_style_center)
-                ])
-            
-            rac_table = Table(rac_table_data, colWidths=[0.6*inch, 2.4*inch, 1.5*inch, 0.6*inch, 1.4*inch])
-            rac_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('ALIGN', (1, 1), (1, -1), 'LEFT'),  # Alineación izquierda para descripción
-                ('ALIGN', (2, 1), (2, -1), 'LEFT'),  # Alineación izquierda para profesor
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('LEFTPADDING', (0, 0), (-1, -1), 5),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
-            story.append(rac_table)
-        
-        # Resumen con colores
-        print("Agregando resumen final...")
-        story.append(Spacer(1, 20))
-        story.append(Paragraph("📈 Resumen Ejecutivo", estilos['subtitulo']))
-        
-        # Determinar color del promedio general
-        color_promedio = colors.green if promedio_general >= 4.0 else \
-                        colors.blue if promedio_general >= 3.0 else \
-                        colors.orange if promedio_general >= 2.0 else colors.red
-        
-        resumen_texto = f"""
-        <para align="center">
-        <font color="{color_promedio.hexval()}" size="14"><b>Promedio General: {promedio_general}/5.0</b></font><br/>
-        <font size="10">
-        • Total de evaluaciones realizadas: <b>{len(evaluaciones)}</b><br/>
-        • GACs evaluados: <b>{len(gacs_data)}</b><br/>
-        • RACs evaluados: <b>{len(rac_data)}</b><br/>
-        • Estado: <b>{"Excelente" if promedio_general >= 4.0 else "Bueno" if promedio_general >= 3.0 else "Regular" if promedio_general >= 2.0 else "Necesita Mejora"}</b>
-        </font>
-        </para>
-        """
-        
-        resumen = Paragraph(resumen_texto, estilos['texto'])
-        story.append(resumen)
-        
-        # Pie de página
-        story.append(Spacer(1, 20))
-        fecha_generacion = datetime.now().strftime("%d/%m/%Y %H:%M")
-        pie = Paragraph(f"📅 Reporte generado el {fecha_generacion} por el Sistema de Evaluación de Competencias", estilos['texto'])
-        story.append(pie)
+        story = story_estudiante_individual(estudiante, list(evaluaciones), datos_estudiante)
         
         # Construir PDF
         print("Construyendo PDF...")
-        try:
-            doc.build(story)
-            print("PDF construido exitosamente")
-        except Exception as e:
-            print(f"Error al construir PDF: {e}")
-            raise e
-        
-        # Preparar respuesta
-        print("Preparando respuesta...")
-        try:
-            buffer.seek(0)
-            response = HttpResponse(buffer.read(), content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="resultados_detallados_{estudiante.nombre.replace(" ", "_")}.pdf"'
-            print("Respuesta preparada exitosamente")
-            return response
-        except Exception as e:
-            print(f"Error al preparar respuesta: {e}")
-            raise e
+        return informe_pdf(
+            story,
+            nombre_archivo=f"resultados_detallados_{estudiante.nombre.replace(' ', '_')}.pdf",
+            topMargin=1*inch
+        )
         
     except Exception as e:
         print(f"Error generando PDF individual: {e}")
@@ -3551,13 +3040,74 @@ def descargar_pdf_estudiante_individual(request, estudiante_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+def descargar_zip_estudiantes(request):
+    """
+    ZIP con el reporte detallado en PDF de cada estudiante de un grupo y/o período.
+
+    Parámetros: ?grupo=<grupo> y/o los filtros de período de filtro_periodo().
+    Los datos de todos los estudiantes se cargan en unas pocas consultas; cada
+    PDF se genera y se envía antes de pasar al siguiente, así que en memoria
+    queda un solo PDF a la vez.
+    """
+    try:
+        grupo = request.GET.get('grupo', '').strip()
+        filtro = filtro_periodo(request)
+        if not grupo and not filtro:
+            return Response({'error': 'Indique un grupo y/o un período'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        estudiantes = Estudiante.objects.order_by('grupo', 'nombre')
+        if grupo:
+            estudiantes = estudiantes.filter(grupo=grupo)
+        
+        # Evaluaciones de todos los estudiantes en una consulta (más la de GACs)
+        evaluaciones_por_estudiante = {}
+        evaluaciones = Evaluacion.objects.filter(
+            filtro, estudiante__in=estudiantes
+        ).select_related('profesor', 'rac').prefetch_related('rac__gacs').order_by('estudiante_id', '-fecha')
+        for evaluacion in evaluaciones:
+            evaluaciones_por_estudiante.setdefault(evaluacion.estudiante_id, []).append(evaluacion)
+        
+        # Como en el reporte individual, solo estudiantes con evaluaciones
+        estudiantes = [e for e in estudiantes if e.id in evaluaciones_por_estudiante]
+        if not estudiantes:
+            return Response({'error': 'No hay evaluaciones para los estudiantes indicados'}, status=status.HTTP_404_NOT_FOUND)
+        resultados = resultados_por_semestre_estudiantes(estudiantes)
+        
+        def archivos():
+            errores = []
+            for estudiante in estudiantes:
+                try:
+                    story = story_estudiante_individual(
+                        estudiante, evaluaciones_por_estudiante.pop(estudiante.id), resultados.pop(estudiante.id)
+                    )
+                    pdf = construir_pdf(story, {'topMargin': 1*inch})
+                except Exception as e:
+                    logger.exception("Error generando el PDF del estudiante %s", estudiante.id)
+                    errores.append(f"{estudiante.documento} - {estudiante.nombre}: {e}")
+                    continue
+                nombre = get_valid_filename(f"{estudiante.documento}_{estudiante.nombre}")
+                yield f"{get_valid_filename(estudiante.grupo)}/{nombre}.pdf", pdf
+            if errores:
+                yield 'errores.txt', "\n".join(errores).encode('utf-8')
+        
+        nombre_zip = f"reportes_estudiantes_{get_valid_filename(grupo or 'periodo')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        response = StreamingHttpResponse(zip_en_streaming(archivos()), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{nombre_zip}"'
+        return response
+        
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@artefacto_pdf
 def descargar_pdf_por_estudiante(request):
     """Descargar PDF del informe por estudiante"""
     try:
         # Obtener datos del informe por estudiante
-        evaluaciones = Evaluacion.objects.select_related(
+        evaluaciones = Evaluacion.objects.filter(filtro_periodo(request)).select_related(
             'estudiante', 'profesor'
-        ).all()
+        )
         
         # Procesar datos (mismo código que en informes_por_estudiante_profesores)
         estudiantes_data = {}
@@ -3597,8 +3147,6 @@ def descargar_pdf_por_estudiante(request):
         resultado.sort(key=lambda x: x['promedio'], reverse=True)
 
         # Crear PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
         story = []
         estilos = crear_estilos_pdf()
 
@@ -3642,14 +3190,7 @@ def descargar_pdf_por_estudiante(request):
         
         story.append(crear_tabla_pdf(estudiante_data_table, None))
 
-        # Construir PDF
-        doc.build(story)
-        buffer.seek(0)
-
-        # Crear respuesta HTTP
-        response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="informe_por_estudiante_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
-        return response
+        return informe_pdf(story, 'informe_por_estudiante')
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
@@ -3677,6 +3218,11 @@ def obtener_periodo_actual(request):
     """Obtener el período académico actual"""
     try:
         periodo_actual = PeriodoAcademico.get_periodo_actual()
+        if periodo_actual is None:
+            return Response(
+                {'error': 'No hay un período académico activo'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         serializer = PeriodoAcademicoSerializer(periodo_actual)
         return Response(serializer.data)
     except Exception as e:
@@ -3701,8 +3247,116 @@ def crear_periodo_academico(request):
 # INFORME INDIVIDUAL DE PROFESOR
 # ===============================
 
+PUNTAJES_INFORME = [0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0]
+
+
+def _distribucion_puntajes(conteo):
+    """Cantidad de evaluaciones por cada puntaje de la escala a partir de un Counter"""
+    return {puntaje: conteo[puntaje] for puntaje in PUNTAJES_INFORME}
+
+
+def estadisticas_informe_profesor(evaluaciones):
+    """
+    Estadísticas del informe individual de un profesor en una sola pasada.
+
+    Recibe sus evaluaciones (con estudiante, rac__gacs y rac__materias ya
+    cargados) y acumula sumas y Counter de puntajes por profesor, materia y
+    estudiante en el mismo recorrido. Devuelve (estadisticas_generales,
+    materias_stats, estudiantes_detalle) con la forma que usa
+    generar_pdf_informe_profesor.
+    """
+    conteo_general = Counter()
+    suma_general = 0
+    materias_stats = {}
+    estudiantes_detalle = {}
+    # clave -> [suma de puntajes, Counter de puntajes]
+    acumulado_materias = {}
+    acumulado_estudiantes = {}
+    claves_materia = {}
+
+    for evaluacion in evaluaciones:
+        puntaje = evaluacion.puntaje
+        estudiante = evaluacion.estudiante
+        materias = evaluacion.rac.materias.all()
+        suma_general += puntaje
+        conteo_general[puntaje] += 1
+
+        # Agrupar por curso/materia
+        for materia in materias:
+            materia_key = claves_materia.get(materia.id)
+            if materia_key is None:
+                materia_key = claves_materia[materia.id] = f"{materia.nombre} (ID: {materia.id})"
+            data = materias_stats.get(materia_key)
+            if data is None:
+                data = materias_stats[materia_key] = {
+                    'materia': materia,
+                    'evaluaciones': [],
+                    'estudiantes': set(),
+                    'racs': set()
+                }
+                acumulado_materias[materia_key] = [0, Counter()]
+            data['evaluaciones'].append(evaluacion)
+            data['estudiantes'].add(estudiante)
+            data['racs'].add(evaluacion.rac)
+            acumulado = acumulado_materias[materia_key]
+            acumulado[0] += puntaje
+            acumulado[1][puntaje] += 1
+
+        # Agrupar por estudiante
+        data = estudiantes_detalle.get(estudiante.id)
+        if data is None:
+            data = estudiantes_detalle[estudiante.id] = {
+                'estudiante': estudiante,
+                'evaluaciones': [],
+                'materias': set(),
+                'gacs': {}
+            }
+            acumulado_estudiantes[estudiante.id] = [0, Counter()]
+        data['evaluaciones'].append(evaluacion)
+        data['materias'].update(materia.nombre for materia in materias)
+        for gac in evaluacion.rac.gacs.all():
+            gac_data = data['gacs'].get(gac.numero)
+            if gac_data is None:
+                gac_data = data['gacs'][gac.numero] = {
+                    'descripcion': gac.descripcion,
+                    'evaluaciones': [],
+                    'promedio': 0
+                }
+            gac_data['evaluaciones'].append(puntaje)
+        acumulado = acumulado_estudiantes[estudiante.id]
+        acumulado[0] += puntaje
+        acumulado[1][puntaje] += 1
+
+    for materia_key, data in materias_stats.items():
+        suma, conteo = acumulado_materias[materia_key]
+        data['total_evaluaciones'] = len(data['evaluaciones'])
+        data['total_estudiantes'] = len(data['estudiantes'])
+        data['total_racs'] = len(data['racs'])
+        data['promedio'] = suma / data['total_evaluaciones']
+        data['estadisticas_puntaje'] = _distribucion_puntajes(conteo)
+
+    for estudiante_id, data in estudiantes_detalle.items():
+        suma, conteo = acumulado_estudiantes[estudiante_id]
+        data['total_evaluaciones'] = len(data['evaluaciones'])
+        data['promedio'] = suma / data['total_evaluaciones']
+        data['materias'] = list(data['materias'])
+        for gac_data in data['gacs'].values():
+            gac_data['promedio'] = round(sum(gac_data['evaluaciones']) / len(gac_data['evaluaciones']), 2)
+        data['estadisticas_puntaje'] = _distribucion_puntajes(conteo)
+
+    total_evaluaciones = sum(conteo_general.values())
+    estadisticas_generales = {
+        'total_evaluaciones': total_evaluaciones,
+        'total_estudiantes': len(estudiantes_detalle),
+        'promedio_general': suma_general / total_evaluaciones if total_evaluaciones else 0,
+        'estadisticas_puntaje': _distribucion_puntajes(conteo_general)
+    }
+    return estadisticas_generales, materias_stats, estudiantes_detalle
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@artefacto_pdf
 def descargar_informe_profesor_individual(request, profesor_id):
     """Generar y descargar informe individual completo de un profesor"""
     try:
@@ -3714,6 +3368,7 @@ def descargar_informe_profesor_individual(request, profesor_id):
         
         # Obtener todas las evaluaciones del profesor
         evaluaciones = Evaluacion.objects.filter(
+            filtro_periodo(request),
             profesor=profesor
         ).select_related('estudiante', 'rac', 'periodo').prefetch_related(
             'rac__gacs', 'rac__materias'
@@ -3722,96 +3377,12 @@ def descargar_informe_profesor_individual(request, profesor_id):
         if not evaluaciones.exists():
             return Response({'error': 'El profesor no tiene evaluaciones registradas'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Calcular estadísticas generales
-        total_evaluaciones = evaluaciones.count()
-        promedio_general = evaluaciones.aggregate(promedio=Avg('puntaje'))['promedio'] or 0
-        
-        # Estadísticas por puntaje
-        estadisticas_puntaje = {}
-        for puntaje in [0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0]:
-            count = evaluaciones.filter(puntaje=puntaje).count()
-            estadisticas_puntaje[puntaje] = count
-        
-        # Obtener estudiantes únicos evaluados
-        estudiantes_evaluados = evaluaciones.values('estudiante').distinct()
-        total_estudiantes = estudiantes_evaluados.count()
-        
-        # Agrupar por curso/materia
-        materias_stats = {}
-        for evaluacion in evaluaciones:
-            for materia in evaluacion.rac.materias.all():
-                materia_key = f"{materia.nombre} (ID: {materia.id})"
-                if materia_key not in materias_stats:
-                    materias_stats[materia_key] = {
-                        'materia': materia,
-                        'evaluaciones': [],
-                        'estudiantes': set(),
-                        'racs': set()
-                    }
-                materias_stats[materia_key]['evaluaciones'].append(evaluacion)
-                materias_stats[materia_key]['estudiantes'].add(evaluacion.estudiante)
-                materias_stats[materia_key]['racs'].add(evaluacion.rac)
-        
-        # Calcular estadísticas por materia
-        for materia_key, data in materias_stats.items():
-            evaluaciones_materia = data['evaluaciones']
-            data['total_evaluaciones'] = len(evaluaciones_materia)
-            data['total_estudiantes'] = len(data['estudiantes'])
-            data['total_racs'] = len(data['racs'])
-            data['promedio'] = sum(e.puntaje for e in evaluaciones_materia) / len(evaluaciones_materia)
-            
-            # Estadísticas por puntaje para esta materia
-            data['estadisticas_puntaje'] = {}
-            for puntaje in [0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0]:
-                count = len([e for e in evaluaciones_materia if e.puntaje == puntaje])
-                data['estadisticas_puntaje'][puntaje] = count
-        
-        # Agrupar evaluaciones por estudiante
-        estudiantes_detalle = {}
-        for evaluacion in evaluaciones:
-            estudiante = evaluacion.estudiante
-            if estudiante.id not in estudiantes_detalle:
-                estudiantes_detalle[estudiante.id] = {
-                    'estudiante': estudiante,
-                    'evaluaciones': [],
-                    'materias': set(),
-                    'gacs': {}
-                }
-            estudiantes_detalle[estudiante.id]['evaluaciones'].append(evaluacion)
-            
-            # Agregar materias del estudiante
-            for materia in evaluacion.rac.materias.all():
-                estudiantes_detalle[estudiante.id]['materias'].add(materia.nombre)
-            
-            # Agregar GACs del estudiante
-            for gac in evaluacion.rac.gacs.all():
-                if gac.numero not in estudiantes_detalle[estudiante.id]['gacs']:
-                    estudiantes_detalle[estudiante.id]['gacs'][gac.numero] = {
-                        'descripcion': gac.descripcion,
-                        'evaluaciones': [],
-                        'promedio': 0
-                    }
-                estudiantes_detalle[estudiante.id]['gacs'][gac.numero]['evaluaciones'].append(evaluacion.puntaje)
-        
-        # Calcular estadísticas por estudiante
-        for estudiante_id, data in estudiantes_detalle.items():
-            evaluaciones_estudiante = data['evaluaciones']
-            data['total_evaluaciones'] = len(evaluaciones_estudiante)
-            data['promedio'] = sum(e.puntaje for e in evaluaciones_estudiante) / len(evaluaciones_estudiante)
-            data['materias'] = list(data['materias'])
-            
-            # Calcular promedios por GAC para este estudiante
-            for gac_num, gac_data in data['gacs'].items():
-                if gac_data['evaluaciones']:
-                    gac_data['promedio'] = round(sum(gac_data['evaluaciones']) / len(gac_data['evaluaciones']), 2)
-                else:
-                    gac_data['promedio'] = 0
-            
-            # Estadísticas por puntaje para este estudiante
-            data['estadisticas_puntaje'] = {}
-            for puntaje in [0.0, 1.0, 2.0, 3.0, 3.5, 4.0, 5.0]:
-                count = len([e for e in evaluaciones_estudiante if e.puntaje == puntaje])
-                data['estadisticas_puntaje'][puntaje] = count
+        # Todas las estadísticas del profesor en una pasada sobre sus evaluaciones
+        evaluaciones = list(evaluaciones)
+        estadisticas_generales, materias_stats, estudiantes_detalle = estadisticas_informe_profesor(evaluaciones)
+        total_evaluaciones = estadisticas_generales['total_evaluaciones']
+        total_estudiantes = estadisticas_generales['total_estudiantes']
+        promedio_general = estadisticas_generales['promedio_general']
         
         # Obtener período actual
         periodo_actual = PeriodoAcademico.get_periodo_actual()
@@ -3829,15 +3400,10 @@ def descargar_informe_profesor_individual(request, profesor_id):
             'profesor': profesor,
             'periodo': periodo_actual,
             'fecha_generacion': timezone.now(),
-            'estadisticas_generales': {
-                'total_evaluaciones': total_evaluaciones,
-                'total_estudiantes': total_estudiantes,
-                'promedio_general': promedio_general,
-                'estadisticas_puntaje': estadisticas_puntaje
-            },
+            'estadisticas_generales': estadisticas_generales,
             'materias': materias_stats,
             'estudiantes': estudiantes_detalle,
-            'evaluaciones_detalladas': list(evaluaciones)
+            'evaluaciones_detalladas': evaluaciones
         }
         
         print("Datos preparados, llamando a generar_pdf_informe_profesor...")
@@ -3855,47 +3421,12 @@ def descargar_informe_profesor_individual(request, profesor_id):
 def generar_pdf_informe_profesor(datos_informe):
     """Generar PDF del informe individual de profesor"""
     try:
-        # Importaciones necesarias
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.lib import colors
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-        from io import BytesIO
-        from django.http import HttpResponse
-        from datetime import datetime
-        import logging
-        
-        logger = logging.getLogger(__name__)
-        
         print("=== DEBUG PDF PROFESOR INDIVIDUAL ===")
         print(f"Datos del informe recibidos: {list(datos_informe.keys())}")
         
-        # Crear buffer para el PDF
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=1*inch)
-        
-        # Estilos básicos
-        styles = getSampleStyleSheet()
-        
-        # Crear estilos personalizados
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=20,
-            textColor=colors.darkblue
-        )
+        estilos = estilos_pdf()
+        title_style = estilos['titulo']
+        subtitle_style = estilos['subtitulo']
         
         # Lista de elementos del PDF
         story = []
@@ -3919,17 +3450,7 @@ def generar_pdf_informe_profesor(datos_informe):
         
         info_profesor.append(['Fecha de Generación:', datetime.now().strftime("%d/%m/%Y %H:%M")])
         
-        tabla_info = Table(info_profesor, colWidths=[2*inch, 4*inch])
-        tabla_info.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (1, 0), (1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        tabla_info = tabla_clave_valor(info_profesor, [2, 4])
         
         story.append(tabla_info)
         story.append(Spacer(1, 20))
@@ -3944,17 +3465,7 @@ def generar_pdf_informe_profesor(datos_informe):
             ['Promedio General:', f"{stats['promedio_general']:.2f}"]
         ]
         
-        tabla_stats = Table(stats_data, colWidths=[3*inch, 2*inch])
-        tabla_stats.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (1, 0), (1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        tabla_stats = tabla_clave_valor(stats_data, [3, 2], fondo='lightblue', fuente=11, negrita=(0, 1))
         
         story.append(tabla_stats)
         story.append(Spacer(1, 20))
@@ -3985,17 +3496,7 @@ def generar_pdf_informe_profesor(datos_informe):
                 f"{porcentaje:.1f}%"
             ])
         
-        tabla_puntajes = Table(puntajes_data, colWidths=[1*inch, 2*inch, 1*inch, 1*inch])
-        tabla_puntajes.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (1, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        tabla_puntajes = tabla(puntajes_data, [1, 2, 1, 1], encabezado='darkblue', filas='white', fuente=9, fuente_filas=9)
         
         story.append(tabla_puntajes)
         story.append(Spacer(1, 20))
@@ -4015,17 +3516,7 @@ def generar_pdf_informe_profesor(datos_informe):
                     str(data['total_evaluaciones'])
                 ])
             
-            tabla_estudiantes = Table(estudiantes_data, colWidths=[2.2*inch, 0.8*inch, 1*inch, 1*inch])
-            tabla_estudiantes.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('BACKGROUND', (1, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
+            tabla_estudiantes = tabla(estudiantes_data, [2.2, 0.8, 1, 1], encabezado='darkgreen', filas='white', fuente=8, fuente_filas=8, relleno_encabezado=6)
             
             story.append(tabla_estudiantes)
             story.append(Spacer(1, 10))
@@ -4055,39 +3546,14 @@ def generar_pdf_informe_profesor(datos_informe):
                 
                 gacs_estudiantes_data.append(fila_gacs)
             
-            tabla_gacs_estudiantes = Table(gacs_estudiantes_data, colWidths=[2.5*inch, 1*inch, 1*inch, 1*inch])
-            tabla_gacs_estudiantes.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 7),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-                ('BACKGROUND', (1, 1), (-1, -1), colors.white),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
+            tabla_gacs_estudiantes = tabla(gacs_estudiantes_data, [2.5, 1, 1, 1], encabezado='darkblue', filas='white', fuente=7, fuente_filas=7, relleno_encabezado=5, alternas=True)
             
             story.append(tabla_gacs_estudiantes)
         
         # Construir PDF
         print(f"Construyendo PDF con {len(story)} elementos...")
-        try:
-            doc.build(story)
-            print("PDF construido exitosamente")
-        except Exception as build_error:
-            print(f"Error al construir PDF: {build_error}")
-            raise build_error
-        
-        buffer.seek(0)
-        pdf_content = buffer.getvalue()
-        print(f"PDF generado con {len(pdf_content)} bytes")
-        
-        # Crear respuesta HTTP
-        response = HttpResponse(pdf_content, content_type='application/pdf')
         filename = f"informe_profesor_{profesor.nombre.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        response['Content-Length'] = len(pdf_content)
+        response = informe_pdf(story, nombre_archivo=filename, topMargin=1*inch)
         
         print(f"Respuesta HTTP creada con archivo: {filename}")
         return response
@@ -153,6 +153,61 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# ======================
+#  CACHÉ
+# ======================
+# 'reportes' guarda las respuestas de lectura de /api/informes/* y /api/evaluaciones/*
+# (ver competencias/cache.py). En memoria local por defecto; con REPORTES_CACHE_DIR
+# se usa una caché en archivos compartida entre workers de gunicorn. La versión de
+# datos que invalida las entradas vive en MEDIA_ROOT, así que las escrituras de los
+# workers de reportes e importaciones la renuevan para todos los procesos.
+_REPORTES_CACHE_DIR = _env('REPORTES_CACHE_DIR', '')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'reportes': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if _REPORTES_CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': _REPORTES_CACHE_DIR or 'reportes',
+        'TIMEOUT': int(_env('REPORTES_CACHE_TIMEOUT', '604800')),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(_env('REPORTES_CACHE_MAX_ENTRIES', '500')),
+            'CULL_FREQUENCY': 4,
+        },
+    },
+}
+
+# ======================
+#  INFORMES PDF
+# ======================
+# Procesos para renderizar por fragmentos los informes por estudiante
+# (ver competencias/pdf_paralelo.py). 0 = núcleos disponibles, 1 = sin paralelismo.
+PDF_PROCESOS = int(_env('PDF_PROCESOS', '0'))
+
+# Los PDFs se construyen en memoria hasta este tamaño y por encima en un archivo
+# temporal; la respuesta se envía por bloques (ver competencias/informes_pdf.py).
+PDF_MEMORIA_MAX_MB = int(_env('PDF_MEMORIA_MAX_MB', '4'))
+
+# PDFs ya generados en MEDIA_ROOT/reportes_cache (ver competencias/artefactos.py);
+# al superar la cuota se eliminan los usados hace más tiempo. 0 desactiva el almacén.
+REPORTES_ARTEFACTOS_CUOTA_MB = int(_env('REPORTES_ARTEFACTOS_CUOTA_MB', '200'))
+
+# ======================
+#  IMPORTACIÓN DE EXCEL
+# ======================
+# Las hojas de estudiantes se leen fila a fila y se guardan por bloques de
+# IMPORTACION_FILAS_POR_LOTE filas (ver usuarios/importacion.py), así que el
+# tamaño del archivo no afecta la memoria. 0 = sin límite de tamaño.
+IMPORTACION_EXCEL_MAX_MB = int(_env('IMPORTACION_EXCEL_MAX_MB', '50'))
+IMPORTACION_FILAS_POR_LOTE = int(_env('IMPORTACION_FILAS_POR_LOTE', '500'))
+
+# Procesos para calcular las contraseñas iniciales al importar profesores
+# (ver usuarios/importacion.py). 0 = núcleos disponibles, 1 = sin paralelismo.
+IMPORTACION_PROCESOS_HASH = int(_env('IMPORTACION_PROCESOS_HASH', '0'))
+
 # ======================
 #  CORS
 # ======================
@@ -39,8 +39,11 @@ urlpatterns = [
     re_path(r'api/grupos', views.get_grupos, name='get_grupos'),
     re_path(r'api/import-excel-estudiantes', views.import_excel_estudiantes, name='import_excel_estudiantes'),
     re_path(r'api/export-excel-estudiantes', views.export_excel_estudiantes, name='export_excel_estudiantes'),
+    path('api/importaciones/', views.trabajos_importacion, name='trabajos_importacion'),  # Importaciones en segundo plano
+    path('api/importaciones/<int:trabajo_id>/', views.estado_trabajo_importacion, name='estado_trabajo_importacion'),
     re_path(r'api/perfil', views.get_current_user, name='get_current_user'),
     path('competencias/', include('competencias.urls')),  # Incluir URLs de competencias
+    path('reportes/', include('reportes.urls')),  # Trabajos de reportes en segundo plano
 ]
 
 # Configuración para servir archivos media en desarrollo
@@ -1,3 +1,11 @@
 from django.contrib import admin
+from .models import TrabajoReporte
 
-# Register your models here.
+
+@admin.register(TrabajoReporte)
+class TrabajoReporteAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'estado', 'progreso', 'solicitado_por', 'fecha_creacion', 'fecha_fin']
+    list_filter = ['estado', 'tipo']
+    search_fields = ['solicitado_por__nombre', 'mensaje']
+    readonly_fields = ['fecha_creacion', 'fecha_inicio', 'fecha_fin']
+    ordering = ['-fecha_creacion']
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-18 07:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoReporte',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('resumen_general', 'Resumen general'), ('por_gac', 'Informe por GAC'), ('por_profesor', 'Informe por profesor'), ('por_estudiante', 'Informe por estudiante'), ('estudiantes_por_semestre', 'Estudiantes por semestre'), ('estudiante_individual', 'Estudiante individual'), ('profesor_individual', 'Profesor individual')], max_length=40, verbose_name='Tipo de informe')),
+                ('parametros', models.JSONField(blank=True, default=dict, verbose_name='Parámetros')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_proceso', 'En proceso'), ('completado', 'Completado'), ('error', 'Error')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('progreso', models.PositiveSmallIntegerField(default=0, verbose_name='Progreso (%)')),
+                ('mensaje', models.CharField(blank=True, max_length=500, verbose_name='Mensaje')),
+                ('archivo', models.FileField(blank=True, upload_to='reportes/%Y/%m/', verbose_name='Archivo generado')),
+                ('nombre_archivo', models.CharField(blank=True, max_length=255, verbose_name='Nombre del archivo')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True, verbose_name='Inicio del procesamiento')),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True, verbose_name='Fin del procesamiento')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trabajos_reporte', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de reporte',
+                'verbose_name_plural': 'Trabajos de reporte',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_creacion'], name='reportes_tr_estado_b191d5_idx')],
+            },
+        ),
+    ]
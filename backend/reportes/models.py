@@ -1,3 +1,118 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
+
+from usuarios.models import Profesor
+
+
+class TrabajoReporte(models.Model):
+    """
+    Solicitud de generación de un informe PDF fuera del ciclo de la petición.
+
+    La API crea el trabajo en estado pendiente; el comando procesar_reportes lo
+    reclama, genera el PDF con la misma vista de competencias y guarda el archivo
+    en MEDIA_ROOT. El cliente consulta el estado hasta que esté completado.
+    """
+    PENDIENTE = 'pendiente'
+    EN_PROCESO = 'en_proceso'
+    COMPLETADO = 'completado'
+    ERROR = 'error'
+
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_PROCESO, 'En proceso'),
+        (COMPLETADO, 'Completado'),
+        (ERROR, 'Error'),
+    ]
+
+    TIPOS = [
+        ('resumen_general', 'Resumen general'),
+        ('por_gac', 'Informe por GAC'),
+        ('por_profesor', 'Informe por profesor'),
+        ('por_estudiante', 'Informe por estudiante'),
+        ('estudiantes_por_semestre', 'Estudiantes por semestre'),
+        ('estudiante_individual', 'Estudiante individual'),
+        ('profesor_individual', 'Profesor individual'),
+    ]
+
+    tipo = models.CharField(max_length=40, choices=TIPOS, verbose_name="Tipo de informe")
+    parametros = models.JSONField(default=dict, blank=True, verbose_name="Parámetros")
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE, verbose_name="Estado")
+    progreso = models.PositiveSmallIntegerField(default=0, verbose_name="Progreso (%)")
+    mensaje = models.CharField(max_length=500, blank=True, verbose_name="Mensaje")
+    archivo = models.FileField(upload_to='reportes/%Y/%m/', blank=True, verbose_name="Archivo generado")
+    nombre_archivo = models.CharField(max_length=255, blank=True, verbose_name="Nombre del archivo")
+    solicitado_por = models.ForeignKey(
+        Profesor,
+        on_delete=models.SET_NULL,
+        related_name="trabajos_reporte",
+        verbose_name="Solicitado por",
+        null=True,
+        blank=True
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    fecha_inicio = models.DateTimeField(null=True, blank=True, verbose_name="Inicio del procesamiento")
+    fecha_fin = models.DateTimeField(null=True, blank=True, verbose_name="Fin del procesamiento")
+
+    class Meta:
+        verbose_name = "Trabajo de reporte"
+        verbose_name_plural = "Trabajos de reporte"
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} #{self.pk} ({self.estado})"
+
+    @classmethod
+    def tomar_siguiente(cls):
+        """
+        Reclamar el trabajo pendiente más antiguo.
+
+        El cambio de estado es un UPDATE condicionado a estado=pendiente, así que
+        si hay varios workers solo uno de ellos obtiene cada trabajo.
+        """
+        while True:
+            pk = (
+                cls.objects.filter(estado=cls.PENDIENTE)
+                .order_by('fecha_creacion', 'pk')
+                .values_list('pk', flat=True)
+                .first()
+            )
+            if pk is None:
+                return None
+            reclamado = cls.objects.filter(pk=pk, estado=cls.PENDIENTE).update(
+                estado=cls.EN_PROCESO,
+                progreso=0,
+                mensaje='Iniciando',
+                fecha_inicio=timezone.now(),
+            )
+            if reclamado:
+                return cls.objects.get(pk=pk)
+
+    @classmethod
+    def liberar_colgados(cls, minutos=None):
+        """
+        Devolver a pendiente los trabajos en proceso de un worker que se detuvo:
+        todos, o solo los iniciados hace más de `minutos`.
+        """
+        trabajos = cls.objects.filter(estado=cls.EN_PROCESO)
+        if minutos is not None:
+            trabajos = trabajos.filter(fecha_inicio__lt=timezone.now() - timedelta(minutes=minutos))
+        return trabajos.update(
+            estado=cls.PENDIENTE,
+            progreso=0,
+            mensaje='Reencolado tras detenerse el worker',
+            fecha_inicio=None,
+        )
 
-# Create your models here.
+    def actualizar_progreso(self, progreso, mensaje=None):
+        """Guardar el avance sin tocar el resto de campos"""
+        self.progreso = max(0, min(100, int(progreso)))
+        campos = {'progreso': self.progreso}
+        if mensaje is not None:
+            self.mensaje = mensaje[:500]
+            campos['mensaje'] = self.mensaje
+        TrabajoReporte.objects.filter(pk=self.pk).update(**campos)
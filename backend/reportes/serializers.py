@@ -0,0 +1,31 @@
+from rest_framework import serializers
+from .models import TrabajoReporte
+
+
+class TrabajoReporteSerializer(serializers.ModelSerializer):
+    tipo_display = serializers.CharField(source='get_tipo_display', read_only=True)
+    estado_display = serializers.CharField(source='get_estado_display', read_only=True)
+    url_estado = serializers.SerializerMethodField()
+    url_descarga = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TrabajoReporte
+        fields = [
+            'id', 'tipo', 'tipo_display', 'parametros', 'estado', 'estado_display',
+            'progreso', 'mensaje', 'nombre_archivo', 'fecha_creacion', 'fecha_inicio',
+            'fecha_fin', 'url_estado', 'url_descarga'
+        ]
+
+    def _url(self, nombre, obj):
+        from django.urls import reverse
+        url = reverse(nombre, args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def get_url_estado(self, obj):
+        return self._url('estado_trabajo_reporte', obj)
+
+    def get_url_descarga(self, obj):
+        if obj.estado != TrabajoReporte.COMPLETADO:
+            return None
+        return self._url('descargar_trabajo_reporte', obj)
@@ -1,3 +1,108 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from competencias.models import GAC, RAC, Evaluacion
+from usuarios.models import Profesor, Estudiante
+from .models import TrabajoReporte
+
+
+class TrabajoReporteTests(TestCase):
+    """Encolar → procesar_reportes → estado → descarga"""
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        ajustes = override_settings(MEDIA_ROOT=self.media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        self.profesor = Profesor.objects.create_user(
+            correo='profesor@unbosque.edu.co', nombre='Profesor Prueba',
+            cedula='1000001', contrasenia='secreta'
+        )
+        gac = GAC.objects.create(numero=1, descripcion='Comunicación')
+        rac = RAC.objects.create(numero=1, descripcion='RAC uno')
+        rac.gacs.set([gac])
+        estudiante = Estudiante.objects.create(
+            documento='9000001', nombre='ESTUDIANTE 001', correo='e1@unbosque.edu.co',
+            grupo='2A', estado='matriculado'
+        )
+        Evaluacion.objects.create(estudiante=estudiante, rac=rac, profesor=self.profesor, puntaje=4.0)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.profesor)
+
+    def encolar(self, tipo, **parametros):
+        return self.client.post(
+            reverse('trabajos_reporte'), {'tipo': tipo, 'parametros': parametros}, format='json'
+        )
+
+    def procesar(self):
+        call_command('procesar_reportes', '--una-vez', stdout=StringIO())
+
+    def test_flujo_completo(self):
+        respuesta = self.encolar('estudiantes_por_semestre', periodo='')
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertEqual(respuesta.data['estado'], 'pendiente')
+        self.assertIsNone(respuesta.data['url_descarga'])
+        trabajo_id = respuesta.data['id']
+
+        descarga = reverse('descargar_trabajo_reporte', args=[trabajo_id])
+        self.assertEqual(self.client.get(descarga).status_code, 409)
+
+        self.procesar()
+
+        estado = self.client.get(reverse('estado_trabajo_reporte', args=[trabajo_id]))
+        self.assertEqual(estado.data['estado'], 'completado', estado.data['mensaje'])
+        self.assertEqual(estado.data['progreso'], 100)
+        self.assertTrue(estado.data['url_descarga'].endswith(descarga))
+
+        archivo = self.client.get(descarga)
+        self.assertEqual(archivo.status_code, 200)
+        self.assertEqual(archivo['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(archivo.streaming_content).startswith(b'%PDF'))
+
+    def test_parametros_invalidos(self):
+        self.assertEqual(self.encolar('inexistente').status_code, 400)
+        self.assertEqual(self.encolar('profesor_individual').status_code, 400)
+        self.assertFalse(TrabajoReporte.objects.exists())
+
+    def test_error_de_la_vista_queda_registrado(self):
+        respuesta = self.encolar('estudiante_individual', estudiante_id=999999)
+        self.procesar()
+
+        trabajo = TrabajoReporte.objects.get(pk=respuesta.data['id'])
+        self.assertEqual(trabajo.estado, TrabajoReporte.ERROR)
+        self.assertTrue(trabajo.mensaje)
+        self.assertFalse(trabajo.archivo)
+
+    def test_trabajo_de_otro_usuario_no_es_visible(self):
+        trabajo_id = self.encolar('resumen_general').data['id']
+        otro = Profesor.objects.create_user(
+            correo='otro@unbosque.edu.co', nombre='Otro', cedula='1000002', contrasenia='secreta'
+        )
+        self.client.force_authenticate(user=otro)
+        respuesta = self.client.get(reverse('estado_trabajo_reporte', args=[trabajo_id]))
+        self.assertEqual(respuesta.status_code, 404)
+
+    def test_tomar_siguiente_no_reclama_dos_veces(self):
+        TrabajoReporte.objects.create(tipo='resumen_general', solicitado_por=self.profesor)
+        primero = TrabajoReporte.tomar_siguiente()
+        self.assertEqual(primero.estado, TrabajoReporte.EN_PROCESO)
+        self.assertIsNone(TrabajoReporte.tomar_siguiente())
+
+    def test_reencola_al_reiniciar_el_worker(self):
+        # El worker se detuvo hace un momento, muy por debajo de --minutos-colgado
+        TrabajoReporte.objects.create(tipo='resumen_general', solicitado_por=self.profesor)
+        trabajo = TrabajoReporte.tomar_siguiente()
+
+        self.procesar()
+
+        trabajo.refresh_from_db()
+        self.assertEqual(trabajo.estado, TrabajoReporte.COMPLETADO, trabajo.mensaje)
@@ -0,0 +1,129 @@
+"""
+Ejecución de trabajos de reporte.
+
+Cada tipo de TrabajoReporte se asocia a una vista descargar_pdf_* de
+competencias. El worker la invoca con una petición construida a partir de los
+parámetros guardados (mismos filtros ?periodo= que la descarga directa), de modo
+que el PDF generado en segundo plano es idéntico al de la descarga síncrona.
+"""
+import re
+
+from django.core.files.base import ContentFile, File
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .models import TrabajoReporte
+
+# tipo → (nombre de la vista en competencias.views, argumentos de ruta obligatorios)
+VISTAS_REPORTE = {
+    'resumen_general': ('descargar_pdf_resumen_general', ()),
+    'por_gac': ('descargar_pdf_por_gac', ()),
+    'por_profesor': ('descargar_pdf_por_profesor', ()),
+    'por_estudiante': ('descargar_pdf_por_estudiante', ()),
+    'estudiantes_por_semestre': ('descargar_pdf_estudiantes_por_semestre', ()),
+    'estudiante_individual': ('descargar_pdf_estudiante_individual', ('estudiante_id',)),
+    'profesor_individual': ('descargar_informe_profesor_individual', ('profesor_id',)),
+}
+
+# Filtros de consulta que se reenvían a la vista
+PARAMETROS_CONSULTA = ('periodo', 'periodo_desde', 'periodo_hasta')
+
+
+def validar_parametros(tipo, parametros):
+    """
+    Normalizar los parámetros de un trabajo.
+
+    Devuelve (parametros_limpios, error). Solo se conservan los argumentos de
+    ruta del tipo y los filtros de período admitidos.
+    """
+    if tipo not in VISTAS_REPORTE:
+        return None, f"Tipo de reporte no válido: {tipo}"
+    if not isinstance(parametros, dict):
+        return None, "Los parámetros deben ser un objeto"
+
+    _, argumentos = VISTAS_REPORTE[tipo]
+    limpios = {}
+    for argumento in argumentos:
+        try:
+            limpios[argumento] = int(parametros[argumento])
+        except (KeyError, TypeError, ValueError):
+            return None, f"El parámetro {argumento} es obligatorio y debe ser numérico"
+
+    for nombre in PARAMETROS_CONSULTA:
+        valor = parametros.get(nombre)
+        if valor not in (None, ''):
+            limpios[nombre] = str(valor)
+    return limpios, None
+
+
+def _nombre_archivo(respuesta, trabajo):
+    """Nombre de descarga de la vista (FileResponse o Content-Disposition), o uno genérico"""
+    if getattr(respuesta, 'filename', None):
+        return respuesta.filename
+    coincidencia = re.search(r'filename="([^"]+)"', respuesta.get('Content-Disposition', ''))
+    if coincidencia:
+        return coincidencia.group(1)
+    return f"{trabajo.tipo}_{trabajo.pk}.pdf"
+
+
+def _mensaje_error(respuesta):
+    """Texto de error de una respuesta JSON/texto de la vista"""
+    datos = getattr(respuesta, 'data', None)
+    if isinstance(datos, dict) and 'error' in datos:
+        return str(datos['error'])
+    contenido = b''.join(respuesta.streaming_content) if respuesta.streaming else respuesta.content
+    return contenido.decode('utf-8', errors='replace')[:500] or f"HTTP {respuesta.status_code}"
+
+
+def ejecutar_trabajo(trabajo):
+    """Generar el PDF de un trabajo ya reclamado y guardar el resultado"""
+    from competencias import views as vistas_competencias
+
+    try:
+        if trabajo.solicitado_por is None:
+            raise ValueError("El usuario que solicitó el reporte ya no existe")
+
+        nombre_vista, argumentos = VISTAS_REPORTE[trabajo.tipo]
+        vista = getattr(vistas_competencias, nombre_vista)
+        kwargs = {argumento: trabajo.parametros[argumento] for argumento in argumentos}
+        consulta = {
+            nombre: trabajo.parametros[nombre]
+            for nombre in PARAMETROS_CONSULTA if nombre in trabajo.parametros
+        }
+
+        request = APIRequestFactory().get('/', consulta)
+        force_authenticate(request, user=trabajo.solicitado_por)
+        # Las vistas que recorren muchos elementos informan su avance por aquí
+        request.reportar_progreso = lambda progreso, mensaje=None: trabajo.actualizar_progreso(
+            10 + progreso * 0.8, mensaje
+        )
+
+        trabajo.actualizar_progreso(10, 'Generando informe')
+        respuesta = vista(request, **kwargs)
+
+        if respuesta.status_code != 200 or respuesta.get('Content-Type') != 'application/pdf':
+            raise ValueError(_mensaje_error(respuesta))
+
+        trabajo.actualizar_progreso(90, 'Guardando archivo')
+        trabajo.nombre_archivo = _nombre_archivo(respuesta, trabajo)
+        archivo = getattr(respuesta, 'file_to_stream', None)
+        if archivo is not None:
+            # El PDF ya está en un archivo temporal: se copia por bloques
+            try:
+                trabajo.archivo.save(trabajo.nombre_archivo, File(archivo), save=False)
+            finally:
+                respuesta.close()
+        else:
+            contenido = b''.join(respuesta.streaming_content) if respuesta.streaming else respuesta.content
+            trabajo.archivo.save(trabajo.nombre_archivo, ContentFile(contenido), save=False)
+
+        trabajo.estado = TrabajoReporte.COMPLETADO
+        trabajo.progreso = 100
+        trabajo.mensaje = 'Informe generado'
+    except Exception as e:
+        trabajo.estado = TrabajoReporte.ERROR
+        trabajo.mensaje = str(e)[:500]
+
+    trabajo.fecha_fin = timezone.now()
+    trabajo.save(update_fields=['estado', 'progreso', 'mensaje', 'archivo', 'nombre_archivo', 'fecha_fin'])
+    return trabajo
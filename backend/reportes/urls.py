@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('api/trabajos/', views.trabajos_reporte, name='trabajos_reporte'),
+    path('api/trabajos/<int:trabajo_id>/', views.estado_trabajo_reporte, name='estado_trabajo_reporte'),
+    path('api/trabajos/<int:trabajo_id>/descargar/', views.descargar_trabajo_reporte, name='descargar_trabajo_reporte'),
+]
@@ -1,3 +1,86 @@
-from django.shortcuts import render
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from .models import TrabajoReporte
+from .serializers import TrabajoReporteSerializer
+from .trabajos import validar_parametros
+
+
+def obtener_trabajo(request, trabajo_id):
+    """Trabajo visible para el usuario: los propios, o cualquiera si es staff"""
+    trabajos = TrabajoReporte.objects.all()
+    if not request.user.is_staff:
+        trabajos = trabajos.filter(solicitado_por=request.user)
+    return trabajos.filter(pk=trabajo_id).first()
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def trabajos_reporte(request):
+    """
+    GET: últimos trabajos del usuario.
+    POST: encolar un informe PDF ({"tipo": ..., "parametros": {...}}) y responder 202
+    de inmediato; el comando procesar_reportes lo genera en segundo plano.
+    """
+    try:
+        if request.method == 'GET':
+            trabajos = TrabajoReporte.objects.filter(solicitado_por=request.user)[:20]
+            serializer = TrabajoReporteSerializer(trabajos, many=True, context={'request': request})
+            return Response(serializer.data)
+
+        tipo = request.data.get('tipo')
+        parametros, error = validar_parametros(tipo, request.data.get('parametros') or {})
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        trabajo = TrabajoReporte.objects.create(
+            tipo=tipo,
+            parametros=parametros,
+            solicitado_por=request.user,
+            mensaje='En cola'
+        )
+        serializer = TrabajoReporteSerializer(trabajo, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def estado_trabajo_reporte(request, trabajo_id):
+    """Estado y progreso de un trabajo (el cliente consulta hasta completado o error)"""
+    try:
+        trabajo = obtener_trabajo(request, trabajo_id)
+        if trabajo is None:
+            return Response({'error': 'Trabajo no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = TrabajoReporteSerializer(trabajo, context={'request': request})
+        return Response(serializer.data)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def descargar_trabajo_reporte(request, trabajo_id):
+    """Servir el PDF generado desde el almacenamiento de media"""
+    try:
+        trabajo = obtener_trabajo(request, trabajo_id)
+        if trabajo is None:
+            return Response({'error': 'Trabajo no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+        if trabajo.estado != TrabajoReporte.COMPLETADO or not trabajo.archivo:
+            return Response(
+                {'error': 'El informe aún no está disponible', 'estado': trabajo.estado},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return FileResponse(
+            trabajo.archivo.open('rb'),
+            as_attachment=True,
+            filename=trabajo.nombre_archivo or trabajo.archivo.name.rsplit('/', 1)[-1],
+            content_type='application/pdf'
+        )
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -18,6 +18,18 @@ connection.ensure_connection()
 print('Django y BD OK')
 " || { echo "Error: Django o conexion a BD fallo"; exit 1; }
 
+# Worker de informes PDF en segundo plano (cola en la tabla TrabajoReporte)
+if [ "${REPORTES_WORKER:-1}" = "1" ]; then
+  echo "Iniciando worker de reportes..."
+  python manage.py procesar_reportes &
+fi
+
+# Worker de importaciones de Excel (cola en la tabla TrabajoImportacion)
+if [ "${IMPORTACIONES_WORKER:-1}" = "1" ]; then
+  echo "Iniciando worker de importaciones..."
+  python manage.py procesar_importaciones &
+fi
+
 echo "Iniciando Gunicorn en 0.0.0.0:$PORT"
 exec gunicorn project_grado_api.wsgi:application \
   --bind "0.0.0.0:$PORT" \
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Profesor, Estudiante
+from .models import Profesor, Estudiante, TrabajoImportacion
 
 @admin.register(Profesor)
 class ProfesorAdmin(UserAdmin):
@@ -53,3 +53,13 @@ class EstudianteAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ('documento', 'nombre', 'correo', 'grupo', 'estado')
+
+
+@admin.register(TrabajoImportacion)
+class TrabajoImportacionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo', 'estado', 'filas_procesadas', 'creados', 'actualizados', 'fallidos',
+                    'solicitado_por', 'fecha_creacion', 'fecha_fin')
+    list_filter = ('estado', 'tipo')
+    search_fields = ('nombre_archivo', 'solicitado_por__nombre', 'mensaje')
+    readonly_fields = ('fecha_creacion', 'fecha_inicio', 'fecha_actualizacion', 'fecha_fin')
+    ordering = ('-fecha_creacion',)
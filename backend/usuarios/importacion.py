@@ -0,0 +1,582 @@
+"""
+Importación de estudiantes (Excel de grupos) y profesores desde Excel.
+
+Las hojas .xlsx se leen con openpyxl en modo solo lectura, fila a fila, y se
+procesan por bloques de IMPORTACION_FILAS_POR_LOTE filas: cada bloque se
+normaliza con operaciones de pandas y se guarda en su propia transacción. Así
+la memoria usada depende del tamaño del bloque y no del archivo.
+
+Los conteos acumulados se guardan en la misma transacción que cada bloque (ver
+al_guardar_lote), de modo que un TrabajoImportacion interrumpido se retoma
+desde el último bloque confirmado.
+
+Las contraseñas iniciales de los profesores se calculan en un
+ProcessPoolExecutor (ver hashear_contrasenias) porque el hash es, con
+diferencia, lo más costoso de importarlos.
+"""
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from competencias.cache import invalidar_cache
+from .models import Estudiante, Profesor, TrabajoImportacion
+
+# Hojas del archivo de grupos que se importan, en este orden
+HOJAS_ESTUDIANTES = ['GRUPO VIRTUAL 1', 'EGP- 1A', 'EGP-1B', 'EGP -1C', 'EGP-2A', 'EGP- 2B', 'EGP-2C']
+COLUMNAS_FILA_ESTUDIANTE = ['hoja', 'estado', 'fila', 'documento', 'nombre', 'correo', 'grupo']
+VALORES_VACIOS = ['nan', 'NaN', '']
+
+# Columnas del Excel de profesores → campo; el encabezado está en la fila 4
+COLUMNAS_PROFESORES = {
+    'APELLIDOS NOMBRES': 'nombre_completo',
+    'No. DE IDENTIFICACIÓN': 'cedula',
+    'CORREO  INSTITUCIONAL': 'correo_institucional',  # OJO: doble espacio
+    'CORREO PERSONAL': 'correo_personal'
+}
+COLUMNAS_OBLIGATORIAS_PROFESORES = ['APELLIDOS NOMBRES', 'No. DE IDENTIFICACIÓN']
+FILAS_ANTES_ENCABEZADO_PROFESORES = 3
+
+# Mensajes de error por fila que se conservan; el resto solo se cuenta
+MAXIMO_ERRORES = 20
+
+# Contraseñas mínimas por proceso para que compense repartir el hash
+MINIMO_POR_PROCESO_HASH = 4
+
+
+def abrir_libro_excel(archivo):
+    """
+    Abrir el libro para leerlo por hojas con filas_hoja.
+
+    Los .xlsx se abren en modo solo lectura (las filas se cargan a medida que
+    se recorren). Los .xls, que openpyxl no admite, se cargan completos con pandas.
+    """
+    if archivo.name.endswith('.xls'):
+        return pd.read_excel(archivo, sheet_name=None, header=None)
+    return load_workbook(archivo, read_only=True, data_only=True)
+
+
+def cerrar_libro_excel(libro):
+    """Liberar el archivo que mantiene abierto un libro en modo solo lectura"""
+    if not isinstance(libro, dict):
+        libro.close()
+
+
+def _valor_celda(valor):
+    """Como en pandas, los enteros guardados como float vuelven a ser int"""
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _nombres_hojas(libro):
+    return list(libro) if isinstance(libro, dict) else libro.sheetnames
+
+
+def filas_hoja(libro, nombre=None):
+    """
+    Iterador perezoso de las filas (tuplas de valores) de una hoja, o None si
+    no existe. Sin nombre se usa la primera hoja.
+    """
+    nombres = _nombres_hojas(libro)
+    if nombre is None:
+        nombre = nombres[0] if nombres else None
+    if nombre not in nombres:
+        return None
+    if isinstance(libro, dict):
+        return libro[nombre].itertuples(index=False, name=None)
+    return (tuple(_valor_celda(v) for v in fila) for fila in libro[nombre].iter_rows(values_only=True))
+
+
+def contar_filas(libro, nombres):
+    """
+    Filas de las hojas indicadas según las dimensiones del libro (para el
+    progreso de los trabajos), o None si el archivo no las declara.
+    """
+    total = 0
+    for nombre in nombres:
+        if nombre not in _nombres_hojas(libro):
+            continue
+        filas = len(libro[nombre]) if isinstance(libro, dict) else libro[nombre].max_row
+        if filas is None:
+            return None
+        total += filas
+    return total
+
+
+def _columna_texto(df, indice):
+    """Columna como texto sin espacios; vacía si la hoja no tiene tantas columnas"""
+    if df.shape[1] > indice:
+        return df.iloc[:, indice].fillna('').astype(str).str.strip()
+    return pd.Series('', index=df.index, dtype=object)
+
+
+def _ultima_fila(mascara):
+    """Índice de la última fila marcada en la máscara, o None"""
+    indices = mascara.index[mascara.to_numpy(dtype=bool)]
+    return int(indices[-1]) if len(indices) else None
+
+
+def _normalizar_estudiantes(df, estado, nombre_hoja, grupo):
+    """
+    Filas de estudiantes de un bloque, con COLUMNAS_FILA_ESTUDIANTE: documento
+    solo con dígitos, nombre y grupo en mayúsculas y correo en minúsculas o
+    temporal si falta. Descarta las filas vacías y las de separación.
+    """
+    # Columnas: No., DOCUMENTO, APELLIDOS Y NOMBRES, EMAIL INSTITUCIONAL
+    documento = _columna_texto(df, 1)
+    nombre = _columna_texto(df, 2)
+    correo = _columna_texto(df, 3)
+    separador = _columna_texto(df, 0).str.upper().str.contains('LISTADO', regex=False)
+
+    con_datos = ~documento.isin(VALORES_VACIOS) & ~nombre.isin(VALORES_VACIOS) & ~separador
+    documento = documento[con_datos].str.replace(r'\D', '', regex=True)
+    correo = correo[con_datos]
+    correo = correo.str.lower().where(
+        ~correo.isin(VALORES_VACIOS), 'temp' + documento + '@unbosque.edu.co'
+    )
+    return pd.DataFrame({
+        'hoja': nombre_hoja,
+        'estado': estado[con_datos],
+        'fila': documento.index + 1,
+        'documento': documento,
+        'nombre': nombre[con_datos].str.upper(),
+        'correo': correo,
+        'grupo': grupo.upper(),
+    }, columns=COLUMNAS_FILA_ESTUDIANTE)
+
+
+def lotes_hoja_estudiantes(nombre_hoja, filas, info, tamano_lote):
+    """
+    Generar los estudiantes de una hoja de grupo por bloques de tamano_lote filas.
+
+    Se genera un DataFrame con COLUMNAS_FILA_ESTUDIANTE por bloque, vacío si el
+    bloque no tiene estudiantes, para que la posición de cada bloque no dependa
+    de su contenido. Los títulos PREMATRICULADOS y MATRICULADOS se detectan con
+    operaciones de pandas sobre el bloque y la sección abierta pasa al bloque
+    siguiente. info se completa con el grupo y las filas de los títulos a
+    medida que aparecen.
+    """
+    info.update({'grupo': nombre_hoja, 'prematricula_row': None, 'matriculados_row': None})
+    seccion = None
+    tras_titulo = False
+    inicio = 0
+
+    while True:
+        bloque = list(islice(filas, tamano_lote))
+        if not bloque:
+            return
+        df = pd.DataFrame(bloque, index=pd.RangeIndex(inicio, inicio + len(bloque)))
+        inicio += len(bloque)
+
+        # El grupo está en la fila 4, columna 3; si falta se usa el nombre de la hoja
+        if 3 in df.index and df.shape[1] > 2:
+            valor = df.at[3, 2]
+            grupo = '' if pd.isna(valor) else str(valor).strip()
+            info['grupo'] = grupo or nombre_hoja
+
+        # Títulos de sección (gana el último, como la sección abierta al leer)
+        texto = df.fillna('').astype(str).apply(lambda columna: columna.str.upper())
+        con_prematricula = texto.apply(lambda columna: columna.str.contains('PREMATRICULA', regex=False)).any(axis=1)
+        con_matricula = texto.apply(lambda columna: columna.str.contains('MATRICULA', regex=False)).any(axis=1)
+        con_matricula &= ~con_prematricula
+        titulo = con_prematricula | con_matricula
+        if con_prematricula.any():
+            info['prematricula_row'] = _ultima_fila(con_prematricula)
+        if con_matricula.any():
+            info['matriculados_row'] = _ultima_fila(con_matricula)
+
+        # Cada fila pertenece a la última sección abierta; la fila que sigue al
+        # título es la de encabezados
+        marcas = pd.Series(None, index=df.index, dtype=object)
+        marcas[con_prematricula] = 'prematricula'
+        marcas[con_matricula] = 'matriculado'
+        estado = marcas.ffill()
+        if seccion is not None:
+            estado = estado.fillna(seccion)
+        encabezado = titulo.shift(1, fill_value=tras_titulo)
+        datos = estado.notna() & ~titulo & ~encabezado
+
+        ultimo = estado.iloc[-1]
+        seccion = None if pd.isna(ultimo) else ultimo
+        tras_titulo = bool(titulo.iloc[-1])
+
+        if datos.any():
+            yield _normalizar_estudiantes(df[datos], estado[datos], nombre_hoja, info['grupo'])
+        else:
+            yield pd.DataFrame(columns=COLUMNAS_FILA_ESTUDIANTE)
+
+
+def _errores_campos(modelo, datos):
+    """Valida los datos contra los campos del modelo sin consultar la base de datos"""
+    errores = {}
+    for campo, valor in datos.items():
+        try:
+            modelo._meta.get_field(campo).clean(valor, None)
+        except ValidationError as e:
+            errores[campo] = e.messages
+    return errores
+
+
+def importar_filas_estudiantes(filas):
+    """
+    Crea o actualiza en bloque los estudiantes de filas (ver lotes_hoja_estudiantes).
+
+    Busca los existentes en una sola consulta y aplica los cambios con
+    bulk_create/bulk_update; se ejecuta dentro de la transacción del bloque
+    (ver _guardar_lote). Si un documento se repite gana la última fila, igual
+    que al guardar fila por fila. Devuelve los conteos, los estudiantes
+    procesados por hoja y los errores por fila.
+    """
+    errores = []
+    procesados = Counter()
+    creados = actualizados = 0
+    nuevos = {}
+    modificados = {}
+
+    documentos = set(filas['documento'][filas['documento'].str.len() >= 6])
+    existentes = Estudiante.objects.order_by().in_bulk(documentos, field_name='documento') if documentos else {}
+
+    for registro in filas.itertuples(index=False):
+        prefijo = f"{registro.hoja} - {registro.estado} - Fila {registro.fila}"
+        if len(registro.documento) < 6:
+            errores.append(f"{prefijo}: Documento inválido ({registro.documento})")
+            continue
+
+        estudiante = nuevos.get(registro.documento) or existentes.get(registro.documento)
+        datos = {
+            'nombre': registro.nombre,
+            'correo': registro.correo,
+            'grupo': registro.grupo,
+            'estado': registro.estado,
+        }
+        errores_fila = _errores_campos(Estudiante, {'documento': registro.documento, **datos})
+        if errores_fila:
+            accion = 'actualizar' if estudiante else 'crear'
+            errores.append(f"{prefijo}: Error al {accion} - {errores_fila}")
+            continue
+
+        if estudiante is None:
+            nuevos[registro.documento] = Estudiante(documento=registro.documento, **datos)
+            creados += 1
+        else:
+            cambios = {campo: valor for campo, valor in datos.items() if getattr(estudiante, campo) != valor}
+            for campo, valor in cambios.items():
+                setattr(estudiante, campo, valor)
+            # Solo se reescriben los existentes que de verdad cambian
+            if cambios and estudiante.pk:
+                modificados[registro.documento] = estudiante
+            actualizados += 1
+        procesados[registro.hoja] += 1
+
+    Estudiante.objects.bulk_create(nuevos.values(), batch_size=500)
+    Estudiante.objects.bulk_update(
+        modificados.values(), ['nombre', 'correo', 'grupo', 'estado'], batch_size=500
+    )
+    if nuevos or modificados:
+        # bulk_create y bulk_update no emiten post_save
+        invalidar_cache()
+
+    return {
+        'creados': creados,
+        'actualizados': actualizados,
+        'procesados': procesados,
+        'errores': errores,
+    }
+
+
+def _resultado_inicial(**extra):
+    """Conteos acumulados de una importación (se guardan tal cual en TrabajoImportacion)"""
+    return {
+        'lotes': 0,
+        'filas': 0,
+        'creados': 0,
+        'actualizados': 0,
+        'fallidos': 0,
+        'total_errores': 0,
+        'errores': [],
+        'segundos': 0,
+        'filas_por_segundo': None,
+        **extra,
+    }
+
+
+def _registrar_errores(resultado, mensajes):
+    resultado['total_errores'] += len(mensajes)
+    resultado['errores'].extend(mensajes[:MAXIMO_ERRORES - len(resultado['errores'])])
+
+
+def _guardar_lote(resultado, numero, importar, lote, al_guardar_lote, acumular=None):
+    """
+    Importar el bloque número numero y acumular sus conteos en resultado.
+
+    Todo ocurre en una transacción: si el proceso se detiene a mitad del
+    bloque no queda nada de él, ni datos ni conteos.
+    """
+    inicio = time.perf_counter()
+    with transaction.atomic():
+        parcial = importar(lote)
+        # Rendimiento sobre el tiempo de importar los bloques (validar, hashear, insertar)
+        resultado['segundos'] = round(resultado['segundos'] + time.perf_counter() - inicio, 3)
+        resultado['lotes'] = numero + 1
+        resultado['filas'] += len(lote)
+        resultado['creados'] += parcial['creados']
+        resultado['actualizados'] += parcial['actualizados']
+        resultado['fallidos'] += len(parcial['errores'])
+        if resultado['segundos']:
+            resultado['filas_por_segundo'] = round(resultado['filas'] / resultado['segundos'], 1)
+        _registrar_errores(resultado, parcial['errores'])
+        if acumular:
+            acumular(parcial)
+        if al_guardar_lote:
+            al_guardar_lote(resultado)
+
+
+def importar_estudiantes_excel(libro, tamano_lote=None, reanudar=None, al_guardar_lote=None):
+    """
+    Importar las hojas de grupo de un libro abierto con abrir_libro_excel.
+
+    Cada bloque de filas se guarda en su propia transacción, donde también se
+    llama al_guardar_lote(resultado). Con reanudar (un resultado guardado) se
+    saltan los bloques ya confirmados. Devuelve los conteos, el detalle por
+    hoja y los primeros MAXIMO_ERRORES mensajes de error.
+    """
+    tamano_lote = tamano_lote or settings.IMPORTACION_FILAS_POR_LOTE
+    resultado = reanudar or _resultado_inicial(detalle_hojas=[])
+    if reanudar is None:
+        _registrar_errores(resultado, [
+            f"Hoja no encontrada: {nombre_hoja}"
+            for nombre_hoja in HOJAS_ESTUDIANTES if nombre_hoja not in _nombres_hojas(libro)
+        ])
+
+    detalle = {info['hoja']: info for info in resultado['detalle_hojas']}
+    numero = 0
+    for nombre_hoja in HOJAS_ESTUDIANTES:
+        filas = filas_hoja(libro, nombre_hoja)
+        if filas is None:
+            continue
+        info = detalle.get(nombre_hoja)
+        if info is None:
+            info = detalle[nombre_hoja] = {'hoja': nombre_hoja, 'estudiantes_procesados': 0}
+            resultado['detalle_hojas'].append(info)
+
+        def acumular(parcial):
+            info['estudiantes_procesados'] += parcial['procesados'][nombre_hoja]
+
+        for lote in lotes_hoja_estudiantes(nombre_hoja, filas, info, tamano_lote):
+            if numero >= resultado['lotes'] and not lote.empty:
+                _guardar_lote(resultado, numero, importar_filas_estudiantes, lote, al_guardar_lote, acumular)
+            numero += 1
+
+    return resultado
+
+
+def encabezado_profesores(libro):
+    """Nombres de columna del Excel de profesores (fila 4 de la primera hoja)"""
+    filas = filas_hoja(libro) or iter(())
+    encabezado = next(islice(filas, FILAS_ANTES_ENCABEZADO_PROFESORES, None), ())
+    return ['' if valor is None else str(valor) for valor in encabezado]
+
+
+def columnas_faltantes_profesores(libro):
+    encabezado = encabezado_profesores(libro)
+    return [columna for columna in COLUMNAS_OBLIGATORIAS_PROFESORES if columna not in encabezado]
+
+
+def lotes_profesores(libro, tamano_lote):
+    """
+    Generar las filas del Excel de profesores por bloques de tamano_lote filas.
+
+    Cada DataFrame tiene fila (número para los mensajes, como antes: índice de
+    la fila de datos + 2), nombre, cedula (solo dígitos) y correo
+    (institucional o, si falta, personal). Las filas sin ningún valor se omiten.
+    """
+    encabezado = encabezado_profesores(libro)
+    indices = {
+        campo: encabezado.index(columna)
+        for columna, campo in COLUMNAS_PROFESORES.items() if columna in encabezado
+    }
+    filas = islice(filas_hoja(libro), FILAS_ANTES_ENCABEZADO_PROFESORES + 1, None)
+    inicio = 0
+
+    while True:
+        bloque = list(islice(filas, tamano_lote))
+        if not bloque:
+            return
+        df = pd.DataFrame(bloque, index=pd.RangeIndex(inicio, inicio + len(bloque)))
+        inicio += len(bloque)
+
+        columnas = {
+            campo: _columna_texto(df, indices[campo]) if campo in indices else pd.Series('', index=df.index, dtype=object)
+            for campo in COLUMNAS_PROFESORES.values()
+        }
+        institucional = columnas['correo_institucional']
+        correo = institucional.where(~institucional.str.lower().isin(['', 'nan']), columnas['correo_personal'])
+        yield pd.DataFrame({
+            'fila': df.index + 2,
+            'nombre': columnas['nombre_completo'],
+            'cedula': columnas['cedula'].str.replace(r'\D', '', regex=True),
+            'correo': correo,
+        })[~df.isna().all(axis=1).to_numpy()]
+
+
+def procesos_hash():
+    """Procesos para calcular contraseñas: IMPORTACION_PROCESOS_HASH en settings, o los núcleos disponibles"""
+    configurado = getattr(settings, 'IMPORTACION_PROCESOS_HASH', 0)
+    return max(1, configurado or os.cpu_count() or 1)
+
+
+def _hashear(contrasenias):
+    """Tarea de cada proceso"""
+    return [make_password(contrasenia) for contrasenia in contrasenias]
+
+
+def hashear_contrasenias(contrasenias, procesos=None):
+    """
+    make_password de cada contraseña, en el mismo orden, repartido en procesos.
+
+    Con un solo proceso (IMPORTACION_PROCESOS_HASH=1) o pocas contraseñas se
+    calculan en el proceso actual.
+    """
+    procesos = procesos or procesos_hash()
+    fragmentos = min(procesos, len(contrasenias) // MINIMO_POR_PROCESO_HASH)
+    if fragmentos < 2:
+        return _hashear(contrasenias)
+
+    tamano = -(-len(contrasenias) // fragmentos)
+    partes = [contrasenias[i:i + tamano] for i in range(0, len(contrasenias), tamano)]
+    with ProcessPoolExecutor(max_workers=len(partes)) as ejecutor:
+        return [hash_ for parte in ejecutor.map(_hashear, partes) for hash_ in parte]
+
+
+def _mensaje_unico(modelo, campo):
+    """Mensaje de Django para un valor repetido en un campo unique"""
+    field = modelo._meta.get_field(campo)
+    return str(field.error_messages['unique'] % {
+        'model_name': modelo._meta.verbose_name, 'field_label': field.verbose_name,
+    })
+
+
+def importar_filas_profesores(filas):
+    """
+    Crea en bloque los profesores de un bloque (ver lotes_profesores).
+
+    Valida en memoria, con una consulta para las cédulas y otra para los
+    correos ya registrados, calcula las contraseñas iniciales (la cédula) con
+    hashear_contrasenias y los inserta con bulk_create dentro de la transacción
+    del bloque.
+    """
+    errores = []
+    nuevos = []
+
+    correos = [Profesor.objects.normalize_email(correo) for correo in filas['correo']]
+    cedulas_usadas = set(
+        Profesor.objects.filter(cedula__in=set(filas['cedula'])).values_list('cedula', flat=True)
+    )
+    correos_usados = set(
+        Profesor.objects.filter(correo__in=set(correos)).values_list('correo', flat=True)
+    )
+
+    for registro, correo in zip(filas.itertuples(index=False), correos):
+        if not registro.nombre or not registro.cedula:
+            errores.append(f"Fila {registro.fila}: Nombre o cédula faltante o vacía")
+            continue
+        if len(registro.cedula) < 6:
+            errores.append(f"Fila {registro.fila}: Cédula inválida ({registro.cedula})")
+            continue
+
+        datos = {'cedula': registro.cedula, 'nombre': registro.nombre, 'correo': correo}
+        errores_fila = _errores_campos(Profesor, datos)
+        # Repetidos en la base de datos o en filas anteriores del archivo
+        if registro.cedula in cedulas_usadas:
+            errores_fila.setdefault('cedula', []).append(_mensaje_unico(Profesor, 'cedula'))
+        if correo in correos_usados:
+            errores_fila.setdefault('correo', []).append(_mensaje_unico(Profesor, 'correo'))
+        if errores_fila:
+            errores.append(f"Fila {registro.fila}: {errores_fila}")
+            continue
+
+        cedulas_usadas.add(registro.cedula)
+        correos_usados.add(correo)
+        nuevos.append(Profesor(**datos))
+
+    # Contraseña por defecto: la cédula
+    contrasenias = hashear_contrasenias([profesor.cedula for profesor in nuevos])
+    for profesor, contrasenia in zip(nuevos, contrasenias):
+        profesor.password = contrasenia
+    Profesor.objects.bulk_create(nuevos, batch_size=500)
+    if nuevos:
+        # bulk_create no emite post_save
+        invalidar_cache()
+
+    return {'creados': len(nuevos), 'actualizados': 0, 'errores': errores}
+
+
+def importar_profesores_excel(libro, tamano_lote=None, reanudar=None, al_guardar_lote=None):
+    """Importar el Excel de profesores por bloques; mismos parámetros que importar_estudiantes_excel"""
+    faltantes = columnas_faltantes_profesores(libro)
+    if faltantes:
+        raise ValueError(f'Faltan las siguientes columnas obligatorias: {", ".join(faltantes)}')
+
+    tamano_lote = tamano_lote or settings.IMPORTACION_FILAS_POR_LOTE
+    resultado = reanudar or _resultado_inicial()
+    for numero, lote in enumerate(lotes_profesores(libro, tamano_lote)):
+        if numero >= resultado['lotes'] and not lote.empty:
+            _guardar_lote(resultado, numero, importar_filas_profesores, lote, al_guardar_lote)
+    return resultado
+
+
+# tipo de TrabajoImportacion → (importador, hojas que cuentan para el progreso)
+IMPORTADORES = {
+    TrabajoImportacion.ESTUDIANTES: (importar_estudiantes_excel, HOJAS_ESTUDIANTES),
+    TrabajoImportacion.PROFESORES: (importar_profesores_excel, None),
+}
+
+
+def ejecutar_trabajo_importacion(trabajo):
+    """
+    Importar el archivo de un trabajo ya reclamado.
+
+    Si el trabajo ya tenía bloques confirmados (el worker anterior se detuvo)
+    se retoma desde el siguiente. Al completarse se borra el archivo subido.
+    """
+    try:
+        importador, hojas = IMPORTADORES[trabajo.tipo]
+        with trabajo.archivo.open('rb') as archivo:
+            libro = abrir_libro_excel(archivo)
+            try:
+                if trabajo.filas_totales is None:
+                    trabajo.filas_totales = contar_filas(libro, hojas or _nombres_hojas(libro)[:1])
+                trabajo.actualizar_mensaje(
+                    f'Retomando desde el bloque {trabajo.lotes_completados + 1}'
+                    if trabajo.lotes_completados else 'Importando'
+                )
+                resultado = importador(
+                    libro,
+                    tamano_lote=trabajo.filas_por_lote,
+                    reanudar=trabajo.resultado if trabajo.lotes_completados else None,
+                    al_guardar_lote=trabajo.registrar_avance,
+                )
+            finally:
+                cerrar_libro_excel(libro)
+
+        trabajo.resultado = resultado
+        trabajo.estado = TrabajoImportacion.COMPLETADO
+        trabajo.mensaje = 'Importación completada'
+        trabajo.archivo.delete(save=False)
+    except Exception as e:
+        trabajo.estado = TrabajoImportacion.ERROR
+        trabajo.mensaje = str(e)[:500]
+
+    trabajo.fecha_fin = timezone.now()
+    trabajo.save(update_fields=['estado', 'mensaje', 'resultado', 'archivo', 'filas_totales', 'fecha_fin'])
+    return trabajo
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from usuarios.importacion import ejecutar_trabajo_importacion
+from usuarios.models import TrabajoImportacion
+
+
+class Command(BaseCommand):
+    help = 'Worker local que importa los Excel de estudiantes y profesores encolados en TrabajoImportacion'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Procesar los trabajos pendientes y terminar (sin esperar nuevos)'
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2.0,
+            help='Segundos entre consultas cuando no hay trabajos (por defecto: 2)'
+        )
+        parser.add_argument(
+            '--minutos-colgado',
+            type=int,
+            default=10,
+            help='Mientras espera, reencolar trabajos en proceso sin avances en estos minutos (por defecto: 10)'
+        )
+
+    def handle(self, *args, **options):
+        intervalo = options['intervalo']
+
+        # Hay un solo worker local (start.sh): al arrancar, lo que quedó en proceso
+        # es de la ejecución anterior, sin importar cuánto hace que se detuvo
+        self.liberar(TrabajoImportacion.liberar_colgados())
+
+        self.stdout.write(f'Worker de importaciones iniciado (intervalo {intervalo}s)')
+        procesados = 0
+        try:
+            while True:
+                close_old_connections()
+                trabajo = TrabajoImportacion.tomar_siguiente()
+                if trabajo is None:
+                    if options['una_vez']:
+                        break
+                    self.liberar(TrabajoImportacion.liberar_colgados(options['minutos_colgado']))
+                    time.sleep(intervalo)
+                    continue
+
+                self.stdout.write(f'Procesando {trabajo}...')
+                inicio = time.perf_counter()
+                ejecutar_trabajo_importacion(trabajo)
+                duracion = time.perf_counter() - inicio
+                procesados += 1
+
+                if trabajo.estado == TrabajoImportacion.COMPLETADO:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Trabajo #{trabajo.pk} completado en {duracion:.1f}s: {trabajo.filas_procesadas} filas, '
+                        f'{trabajo.creados} creados, {trabajo.actualizados} actualizados, {trabajo.fallidos} con error'
+                    ))
+                else:
+                    self.stdout.write(self.style.ERROR(f'Trabajo #{trabajo.pk} con error: {trabajo.mensaje}'))
+        except KeyboardInterrupt:
+            self.stdout.write('Worker detenido')
+
+        self.stdout.write(self.style.SUCCESS(f'Trabajos procesados: {procesados}'))
+
+    def liberar(self, liberados):
+        if liberados:
+            self.stdout.write(self.style.WARNING(f'{liberados} importación(es) colgada(s) reencolada(s)'))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-18 08:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0004_profesor_foto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabajoImportacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('estudiantes', 'Estudiantes'), ('profesores', 'Profesores')], max_length=20, verbose_name='Tipo de importación')),
+                ('archivo', models.FileField(blank=True, upload_to='importaciones/%Y/%m/', verbose_name='Archivo subido')),
+                ('nombre_archivo', models.CharField(blank=True, max_length=255, verbose_name='Nombre del archivo')),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_proceso', 'En proceso'), ('completado', 'Completado'), ('error', 'Error')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('mensaje', models.CharField(blank=True, max_length=500, verbose_name='Mensaje')),
+                ('filas_por_lote', models.PositiveIntegerField(verbose_name='Filas por bloque')),
+                ('filas_totales', models.PositiveIntegerField(blank=True, null=True, verbose_name='Filas del archivo')),
+                ('lotes_completados', models.PositiveIntegerField(default=0, verbose_name='Bloques confirmados')),
+                ('filas_procesadas', models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')),
+                ('creados', models.PositiveIntegerField(default=0, verbose_name='Creados')),
+                ('actualizados', models.PositiveIntegerField(default=0, verbose_name='Actualizados')),
+                ('fallidos', models.PositiveIntegerField(default=0, verbose_name='Filas con error')),
+                ('resultado', models.JSONField(blank=True, default=dict, verbose_name='Resultado acumulado')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True, verbose_name='Inicio del procesamiento')),
+                ('fecha_actualizacion', models.DateTimeField(blank=True, null=True, verbose_name='Último avance')),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True, verbose_name='Fin del procesamiento')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trabajos_importacion', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de importación',
+                'verbose_name_plural': 'Trabajos de importación',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_creacion'], name='usuarios_tr_estado_278aaf_idx')],
+            },
+        ),
+    ]
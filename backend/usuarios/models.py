@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 
 class ProfesorManager(BaseUserManager):
@@ -104,4 +107,147 @@ class Estudiante(models.Model):
     @property
     def is_prematriculado(self):
         """Verificar si el estudiante está prematriculado"""
-        return self.estado == 'prematricula'
\ No newline at end of file
+        return self.estado == 'prematricula'
+
+
+class TrabajoImportacion(models.Model):
+    """
+    Importación de un Excel de estudiantes o profesores fuera del ciclo de la petición.
+
+    La API guarda el archivo y crea el trabajo en estado pendiente; el comando
+    procesar_importaciones lo reclama y lo importa por bloques (ver
+    usuarios/importacion.py). Tras cada bloque confirmado se guardan los
+    conteos, así que si el worker se detiene el trabajo se retoma desde ahí.
+    """
+    PENDIENTE = 'pendiente'
+    EN_PROCESO = 'en_proceso'
+    COMPLETADO = 'completado'
+    ERROR = 'error'
+
+    ESTADOS = [
+        (PENDIENTE, 'Pendiente'),
+        (EN_PROCESO, 'En proceso'),
+        (COMPLETADO, 'Completado'),
+        (ERROR, 'Error'),
+    ]
+
+    ESTUDIANTES = 'estudiantes'
+    PROFESORES = 'profesores'
+
+    TIPOS = [
+        (ESTUDIANTES, 'Estudiantes'),
+        (PROFESORES, 'Profesores'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPOS, verbose_name="Tipo de importación")
+    archivo = models.FileField(upload_to='importaciones/%Y/%m/', blank=True, verbose_name="Archivo subido")
+    nombre_archivo = models.CharField(max_length=255, blank=True, verbose_name="Nombre del archivo")
+    estado = models.CharField(max_length=20, choices=ESTADOS, default=PENDIENTE, verbose_name="Estado")
+    mensaje = models.CharField(max_length=500, blank=True, verbose_name="Mensaje")
+    filas_por_lote = models.PositiveIntegerField(verbose_name="Filas por bloque")
+    filas_totales = models.PositiveIntegerField(null=True, blank=True, verbose_name="Filas del archivo")
+    lotes_completados = models.PositiveIntegerField(default=0, verbose_name="Bloques confirmados")
+    filas_procesadas = models.PositiveIntegerField(default=0, verbose_name="Filas procesadas")
+    creados = models.PositiveIntegerField(default=0, verbose_name="Creados")
+    actualizados = models.PositiveIntegerField(default=0, verbose_name="Actualizados")
+    fallidos = models.PositiveIntegerField(default=0, verbose_name="Filas con error")
+    resultado = models.JSONField(default=dict, blank=True, verbose_name="Resultado acumulado")
+    solicitado_por = models.ForeignKey(
+        Profesor,
+        on_delete=models.SET_NULL,
+        related_name="trabajos_importacion",
+        verbose_name="Solicitado por",
+        null=True,
+        blank=True
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    fecha_inicio = models.DateTimeField(null=True, blank=True, verbose_name="Inicio del procesamiento")
+    fecha_actualizacion = models.DateTimeField(null=True, blank=True, verbose_name="Último avance")
+    fecha_fin = models.DateTimeField(null=True, blank=True, verbose_name="Fin del procesamiento")
+
+    class Meta:
+        verbose_name = "Trabajo de importación"
+        verbose_name_plural = "Trabajos de importación"
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_creacion']),
+        ]
+
+    def __str__(self):
+        return f"Importación de {self.get_tipo_display().lower()} #{self.pk} ({self.estado})"
+
+    @property
+    def progreso(self):
+        """Porcentaje aproximado según los bloques confirmados y las filas del archivo"""
+        if self.estado == self.COMPLETADO:
+            return 100
+        if not self.filas_totales:
+            return 0
+        return min(99, self.lotes_completados * self.filas_por_lote * 100 // self.filas_totales)
+
+    @classmethod
+    def tomar_siguiente(cls):
+        """
+        Reclamar el trabajo pendiente más antiguo.
+
+        El cambio de estado es un UPDATE condicionado a estado=pendiente, así que
+        si hay varios workers solo uno de ellos obtiene cada trabajo.
+        """
+        while True:
+            pk = (
+                cls.objects.filter(estado=cls.PENDIENTE)
+                .order_by('fecha_creacion', 'pk')
+                .values_list('pk', flat=True)
+                .first()
+            )
+            if pk is None:
+                return None
+            ahora = timezone.now()
+            reclamado = cls.objects.filter(pk=pk, estado=cls.PENDIENTE).update(
+                estado=cls.EN_PROCESO,
+                fecha_inicio=ahora,
+                fecha_actualizacion=ahora,
+            )
+            if reclamado:
+                return cls.objects.get(pk=pk)
+
+    @classmethod
+    def liberar_colgados(cls, minutos=None):
+        """
+        Devolver a pendiente los trabajos en proceso de un worker que se detuvo:
+        todos, o solo los que no avanzan hace más de `minutos`. Los conteos se
+        conservan para retomarlos.
+        """
+        trabajos = cls.objects.filter(estado=cls.EN_PROCESO)
+        if minutos is not None:
+            trabajos = trabajos.filter(fecha_actualizacion__lt=timezone.now() - timedelta(minutes=minutos))
+        return trabajos.update(
+            estado=cls.PENDIENTE,
+            mensaje='Reencolado tras detenerse el worker',
+        )
+
+    def actualizar_mensaje(self, mensaje):
+        """Guardar el mensaje sin tocar el resto de campos"""
+        self.mensaje = mensaje[:500]
+        self.fecha_actualizacion = timezone.now()
+        TrabajoImportacion.objects.filter(pk=self.pk).update(
+            mensaje=self.mensaje, fecha_actualizacion=self.fecha_actualizacion
+        )
+
+    def registrar_avance(self, resultado):
+        """
+        Guardar los conteos acumulados tras un bloque. Se llama dentro de la
+        transacción del bloque, así que los conteos y los datos se confirman juntos.
+        """
+        campos = {
+            'lotes_completados': resultado['lotes'],
+            'filas_procesadas': resultado['filas'],
+            'creados': resultado['creados'],
+            'actualizados': resultado['actualizados'],
+            'fallidos': resultado['fallidos'],
+            'resultado': resultado,
+            'fecha_actualizacion': timezone.now(),
+        }
+        for campo, valor in campos.items():
+            setattr(self, campo, valor)
+        TrabajoImportacion.objects.filter(pk=self.pk).update(**campos)
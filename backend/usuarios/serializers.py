@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Profesor
 from .models import Estudiante
+from .models import TrabajoImportacion
 from competencias.models import Materia
 
 # Serializer para mostrar materias con detalle
@@ -197,4 +198,26 @@ class EstudianteSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
-        return instance
\ No newline at end of file
+        return instance
+
+
+class TrabajoImportacionSerializer(serializers.ModelSerializer):
+    tipo_display = serializers.CharField(source='get_tipo_display', read_only=True)
+    estado_display = serializers.CharField(source='get_estado_display', read_only=True)
+    progreso = serializers.IntegerField(read_only=True)
+    url_estado = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TrabajoImportacion
+        fields = [
+            'id', 'tipo', 'tipo_display', 'nombre_archivo', 'estado', 'estado_display',
+            'progreso', 'mensaje', 'filas_totales', 'filas_procesadas', 'creados',
+            'actualizados', 'fallidos', 'resultado', 'fecha_creacion', 'fecha_inicio',
+            'fecha_fin', 'url_estado'
+        ]
+
+    def get_url_estado(self, obj):
+        from django.urls import reverse
+        url = reverse('estado_trabajo_importacion', args=[obj.pk])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -1,3 +1,298 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import Workbook
+from rest_framework.test import APIClient
+
+from competencias.cache import version_datos
+from . import importacion
+from .models import Estudiante, Profesor, TrabajoImportacion
+
+
+def libro_grupos(hojas):
+    """Archivo .xlsx con las hojas de grupo dadas como {nombre: filas}"""
+    libro = Workbook()
+    libro.remove(libro.active)
+    for nombre, filas in hojas.items():
+        hoja = libro.create_sheet(nombre)
+        for fila in filas:
+            hoja.append(fila)
+    contenido = BytesIO()
+    libro.save(contenido)
+    return SimpleUploadedFile(
+        'grupos.xlsx', contenido.getvalue(),
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+
+
+def libro_profesores(filas):
+    """Archivo .xlsx de profesores: tres filas de título, encabezado y datos"""
+    return libro_grupos({'Profesores': [
+        ['UNIVERSIDAD EL BOSQUE'], ['PLANTA DOCENTE'], [None],
+        ['APELLIDOS NOMBRES', 'No. DE IDENTIFICACIÓN', 'CORREO  INSTITUCIONAL', 'CORREO PERSONAL'],
+        *filas,
+    ]})
+
+
+def hoja_grupo(grupo, prematriculados, matriculados):
+    """Filas de una hoja con el formato del listado de grupos"""
+    encabezado = ['No.', 'DOCUMENTO', 'APELLIDOS Y NOMBRES', 'EMAIL INSTITUCIONAL']
+    return [
+        ['UNIVERSIDAD EL BOSQUE'],
+        ['LISTADO DE ESTUDIANTES'],
+        [None],
+        [None, 'GRUPO', grupo],
+        ['PREMATRICULADOS'],
+        encabezado,
+        *[[i + 1, *fila] for i, fila in enumerate(prematriculados)],
+        ['MATRICULADOS'],
+        encabezado,
+        *[[i + 1, *fila] for i, fila in enumerate(matriculados)],
+    ]
+
+
+class ImportarEstudiantesTests(TestCase):
+
+    def setUp(self):
+        self.admin = Profesor.objects.create_user(
+            correo='admin@unbosque.edu.co', nombre='Admin', cedula='2000001', contrasenia='secreta'
+        )
+        self.admin.is_staff = True
+        self.admin.save()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        self.url = reverse('import_excel_estudiantes')
+
+    def test_importacion_en_bloque_con_errores_por_fila(self):
+        Estudiante.objects.create(
+            documento='1000001', nombre='NOMBRE ANTERIOR', correo='anterior@unbosque.edu.co',
+            grupo='1A', estado='prematricula'
+        )
+        archivo = libro_grupos({
+            'EGP- 1A': hoja_grupo('1a', [
+                ['1.000.001', 'Estudiante Uno', 'UNO@unbosque.edu.co'],
+                ['1000002', 'Estudiante Dos', None],
+                ['123', 'Documento Corto', 'corto@unbosque.edu.co'],
+                ['1000003', 'Correo Malo', 'no-es-correo'],
+            ], [
+                ['1000002', 'Estudiante Dos', 'dos@unbosque.edu.co'],
+                ['1000004', 'Estudiante Cuatro', 'cuatro@unbosque.edu.co'],
+            ]),
+        })
+
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media):
+            version = version_datos()
+            # Un SELECT de existentes y la transacción con un INSERT y un UPDATE en bloque
+            with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(5):
+                response = self.client.post(self.url, {'file': archivo}, format='multipart')
+            self.assertEqual(response.status_code, 200)
+            # Los informes cacheados dejan de servirse aunque bulk_create no emita post_save
+            self.assertNotEqual(version_datos(), version)
+
+        # El documento repetido se crea con la primera fila y se actualiza con la segunda
+        self.assertEqual(response.data['creados'], 2)
+        self.assertEqual(response.data['actualizados'], 2)
+        detalle = response.data['detalle_hojas']
+        self.assertEqual(len(detalle), 1)
+        self.assertEqual(detalle[0]['grupo'], '1a')
+        self.assertEqual(detalle[0]['estudiantes_procesados'], 4)
+        self.assertEqual((detalle[0]['prematricula_row'], detalle[0]['matriculados_row']), (4, 10))
+
+        errores = response.data['errores']
+        self.assertEqual(len(errores), 8)  # seis hojas faltantes y dos filas
+        self.assertEqual(response.data['total_errores'], 8)
+        self.assertIn('EGP- 1A - prematricula - Fila 9: Documento inválido (123)', errores)
+        self.assertTrue(any(e.startswith('EGP- 1A - prematricula - Fila 10: Error al crear') for e in errores))
+
+        uno = Estudiante.objects.get(documento='1000001')
+        self.assertEqual((uno.nombre, uno.correo, uno.grupo), ('ESTUDIANTE UNO', 'uno@unbosque.edu.co', '1A'))
+        dos = Estudiante.objects.get(documento='1000002')
+        self.assertEqual((dos.correo, dos.estado), ('dos@unbosque.edu.co', 'matriculado'))
+        self.assertFalse(Estudiante.objects.filter(documento__in=['123', '1000003']).exists())
+        self.assertEqual(Estudiante.objects.count(), 3)
+
+    @override_settings(IMPORTACION_FILAS_POR_LOTE=3)
+    def test_lectura_por_bloques_conserva_secciones(self):
+        # Bloques de tres filas: los títulos y encabezados quedan en bloques distintos
+        # de sus datos y la sección abierta pasa de un bloque al siguiente
+        prematriculados = [[f'20000{i:02d}', f'Pre {i}', None] for i in range(5)]
+        matriculados = [[f'30000{i:02d}', f'Mat {i}', f'mat{i}@unbosque.edu.co'] for i in range(4)]
+        archivo = libro_grupos({
+            'EGP-2A': hoja_grupo('2A', prematriculados, matriculados),
+            'EGP-2C': hoja_grupo(None, [], [['4000001', 'Sin Grupo', None]]),
+        })
+
+        response = self.client.post(self.url, {'file': archivo}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['creados'], 10)
+        self.assertEqual(response.data['total_errores'], 5)  # hojas faltantes
+
+        detalle = {hoja['hoja']: hoja for hoja in response.data['detalle_hojas']}
+        self.assertEqual(detalle['EGP-2A']['estudiantes_procesados'], 9)
+        self.assertEqual((detalle['EGP-2A']['prematricula_row'], detalle['EGP-2A']['matriculados_row']), (4, 11))
+        self.assertEqual(detalle['EGP-2C']['grupo'], 'EGP-2C')
+
+        estados = dict(Estudiante.objects.values_list('documento', 'estado'))
+        self.assertEqual(sum(estado == 'prematricula' for estado in estados.values()), 5)
+        self.assertEqual(estados['3000003'], 'matriculado')
+        self.assertEqual(Estudiante.objects.get(documento='2000004').correo, 'temp2000004@unbosque.edu.co')
+        self.assertEqual(Estudiante.objects.get(documento='4000001').grupo, 'EGP-2C')
+
+
+@override_settings(
+    IMPORTACION_PROCESOS_HASH=2, PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']
+)
+class ImportarProfesoresTests(TestCase):
+
+    def setUp(self):
+        self.admin = Profesor.objects.create_user(
+            correo='admin@unbosque.edu.co', nombre='Admin', cedula='2000001', contrasenia='secreta'
+        )
+        self.admin.is_staff = True
+        self.admin.save()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_contrasenias_en_procesos_e_insercion_en_bloque(self):
+        filas = [[f'PROFESOR {i}', f'50000{i:02d}', f'p{i}@UNBOSQUE.EDU.CO', None] for i in range(10)]
+        filas += [
+            ['REPETIDO BD', '2000001', 'otro@unbosque.edu.co', None],
+            ['REPETIDO ARCHIVO', '5000099', 'p0@unbosque.edu.co', None],
+            ['CEDULA CORTA', '123', 'corta@unbosque.edu.co', None],
+        ]
+
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media):
+            version = version_datos()
+            # Dos SELECT de existentes y la transacción con un INSERT en bloque
+            with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(5):
+                response = self.client.post(reverse('import_excel_profesores'), {'file': libro_profesores(filas)},
+                                            format='multipart')
+            self.assertEqual(response.status_code, 200)
+            # Los informes de profesores cacheados dejan de servirse
+            self.assertNotEqual(version_datos(), version)
+        self.assertEqual((response.data['created'], response.data['total_rows']), (10, 13))
+        self.assertEqual(response.data['total_errors'], 3)
+        self.assertIn('Fila 14: Cédula inválida (123)', response.data['errors'])
+        self.assertTrue(any(e.startswith('Fila 12:') and 'cedula' in e for e in response.data['errors']))
+        self.assertTrue(any(e.startswith('Fila 13:') and 'correo' in e for e in response.data['errors']))
+        self.assertGreater(response.data['rows_per_second'], 0)
+
+        self.assertEqual(Profesor.objects.count(), 11)
+        for profesor in Profesor.objects.filter(cedula__startswith='50000'):
+            self.assertTrue(profesor.check_password(profesor.cedula))
+        self.assertEqual(Profesor.objects.get(cedula='5000003').correo, 'p3@unbosque.edu.co')
+
+    def test_hash_en_procesos_conserva_el_orden(self):
+        contrasenias = [str(i) for i in range(9)]
+        hashes = importacion.hashear_contrasenias(contrasenias)
+        self.assertEqual(len(hashes), 9)
+        self.assertTrue(all(check_password(c, h) for c, h in zip(contrasenias, hashes)))
+
+
+class TrabajoImportacionTests(TestCase):
+    """Encolar → procesar_importaciones → estado, y reanudación tras detenerse el worker"""
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        ajustes = override_settings(MEDIA_ROOT=media, IMPORTACION_FILAS_POR_LOTE=4)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        self.admin = Profesor.objects.create_user(
+            correo='admin@unbosque.edu.co', nombre='Admin', cedula='2000001', contrasenia='secreta'
+        )
+        self.admin.is_staff = True
+        self.admin.save()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def encolar(self, tipo, archivo):
+        return self.client.post(reverse('trabajos_importacion'), {'tipo': tipo, 'file': archivo}, format='multipart')
+
+    def procesar(self):
+        call_command('procesar_importaciones', '--una-vez', stdout=StringIO())
+
+    def archivo_estudiantes(self):
+        prematriculados = [[f'60000{i:02d}', f'Pre {i}', None] for i in range(6)]
+        matriculados = [[f'70000{i:02d}', f'Mat {i}', None] for i in range(6)]
+        return libro_grupos({'EGP-1B': hoja_grupo('1B', prematriculados, matriculados)})
+
+    def test_flujo_completo_estudiantes(self):
+        respuesta = self.encolar('estudiantes', self.archivo_estudiantes())
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertEqual((respuesta.data['estado'], respuesta.data['progreso']), ('pendiente', 0))
+
+        self.procesar()
+
+        estado = self.client.get(respuesta.data['url_estado'])
+        self.assertEqual(estado.data['estado'], 'completado', estado.data['mensaje'])
+        self.assertEqual(estado.data['progreso'], 100)
+        self.assertEqual(estado.data['filas_totales'], 20)
+        self.assertEqual((estado.data['filas_procesadas'], estado.data['creados'], estado.data['fallidos']), (12, 12, 0))
+        self.assertEqual(estado.data['resultado']['detalle_hojas'][0]['estudiantes_procesados'], 12)
+        self.assertFalse(TrabajoImportacion.objects.get().archivo)
+        self.assertEqual(Estudiante.objects.filter(grupo='1B').count(), 12)
+
+    def test_reanuda_desde_el_ultimo_bloque_confirmado(self):
+        trabajo_id = self.encolar('estudiantes', self.archivo_estudiantes()).data['id']
+
+        # El worker se detiene (no es un error de la importación) en el tercer bloque con datos
+        importar = importacion.importar_filas_estudiantes
+        llamadas = []
+
+        def detener_en_el_tercero(filas):
+            llamadas.append(len(filas))
+            if len(llamadas) == 3:
+                raise KeyboardInterrupt
+            return importar(filas)
+
+        with mock.patch.object(importacion, 'importar_filas_estudiantes', detener_en_el_tercero):
+            self.procesar()
+
+        trabajo = TrabajoImportacion.objects.get(pk=trabajo_id)
+        self.assertEqual(trabajo.estado, TrabajoImportacion.EN_PROCESO)
+        confirmadas = sum(llamadas[:2])
+        self.assertEqual((trabajo.filas_procesadas, trabajo.creados), (confirmadas, confirmadas))
+        self.assertEqual(Estudiante.objects.count(), confirmadas)
+
+        # Al reiniciar enseguida (muy por debajo de --minutos-colgado), el worker
+        # reencola el trabajo y sigue desde el bloque siguiente
+        self.procesar()
+        trabajo.refresh_from_db()
+        self.assertEqual(trabajo.estado, TrabajoImportacion.COMPLETADO, trabajo.mensaje)
+        self.assertEqual((trabajo.filas_procesadas, trabajo.creados, trabajo.actualizados), (12, 12, 0))
+        self.assertEqual(trabajo.resultado['detalle_hojas'][0]['estudiantes_procesados'], 12)
+        self.assertEqual(Estudiante.objects.count(), 12)
+
+    def test_profesores(self):
+        faltante = libro_grupos({'Profesores': [[None], [None], [None], ['APELLIDOS NOMBRES']]})
+        self.assertEqual(self.encolar('profesores', faltante).status_code, 400)
+        self.assertEqual(self.encolar('otro', self.archivo_estudiantes()).status_code, 400)
+
+        respuesta = self.encolar('profesores', libro_profesores([
+            ['PROFESOR UNO', 3000001, 'uno@unbosque.edu.co', None],
+            ['PROFESOR DOS', '3000002', None, 'dos@gmail.com'],
+            ['SIN CEDULA', None, 'sin@unbosque.edu.co', None],
+            ['PROFESOR UNO BIS', '3000003', 'uno@unbosque.edu.co', None],
+        ]))
+        self.assertEqual(respuesta.status_code, 202)
+        self.procesar()
+
+        trabajo = TrabajoImportacion.objects.get(pk=respuesta.data['id'])
+        self.assertEqual(trabajo.estado, TrabajoImportacion.COMPLETADO, trabajo.mensaje)
+        self.assertEqual((trabajo.filas_procesadas, trabajo.creados, trabajo.fallidos), (4, 2, 2))
+        self.assertIn('Fila 4: Nombre o cédula faltante o vacía', trabajo.resultado['errores'])
+        self.assertEqual(Profesor.objects.get(cedula='3000002').correo, 'dos@gmail.com')
+        self.assertTrue(Profesor.objects.get(cedula='3000001').check_password('3000001'))
@@ -9,12 +9,19 @@ from .models import Profesor
 from .serializers import ProfesorSerializer, ProfesorPerfilSerializer, ProfesorFotoSerializer
 from .permissions import IsStaffUser
 import pandas as pd
+from django.conf import settings
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from .models import Estudiante
 from .serializers import EstudianteSerializer
+from .models import TrabajoImportacion
+from .serializers import TrabajoImportacionSerializer
+from .importacion import (
+    abrir_libro_excel, cerrar_libro_excel, columnas_faltantes_profesores,
+    importar_estudiantes_excel, importar_profesores_excel,
+)
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -325,85 +332,30 @@ def import_excel_profesores(request):
             return Response({'error': 'El archivo debe ser Excel (.xlsx o .xls)'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            df = pd.read_excel(excel_file, skiprows=3)
+            libro = abrir_libro_excel(excel_file)
         except Exception as e:
             return Response({'error': f'Error al leer el archivo Excel: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        required_columns = {
-            'APELLIDOS NOMBRES': 'nombre_completo',
-            'No. DE IDENTIFICACIÓN': 'cedula',
-            'CORREO  INSTITUCIONAL': 'correo_institucional',  # OJO: doble espacio
-            'CORREO PERSONAL': 'correo_personal'
-        }
-
-        obligatory_columns = ['APELLIDOS NOMBRES', 'No. DE IDENTIFICACIÓN']
-        missing_columns = [col for col in obligatory_columns if col not in df.columns]
-
-        if missing_columns:
-            return Response({
-                'error': f'Faltan las siguientes columnas obligatorias: {", ".join(missing_columns)}'
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Procesar y limpiar datos
-        processed_data = {}
-        for excel_col, field_name in required_columns.items():
-            if excel_col in df.columns:
-                processed_data[field_name] = df[excel_col].fillna('').astype(str).str.strip()
-            else:
-                processed_data[field_name] = pd.Series([''] * len(df))
-
-        processed_df = pd.DataFrame(processed_data)
-
-        created_count = 0
-        errors = []
-
-        for index, row in processed_df.iterrows():
-            try:
-                nombre_completo = row.get('nombre_completo', '').strip()
-                cedula = ''.join(filter(str.isdigit, row.get('cedula', '').strip()))
-
-                # Obtener correo institucional y personal
-                correo_institucional = row.get('correo_institucional', '').strip()
-                correo_personal = row.get('correo_personal', '').strip()
-
-                # Validar y reemplazar si es necesario
-                if not correo_institucional or correo_institucional.lower() == 'nan':
-                    correo = correo_personal
-                else:
-                    correo = correo_institucional
-
-                if not nombre_completo or not cedula:
-                    errors.append(f"Fila {index + 2}: Nombre o cédula faltante o vacía")
-                    continue
-
-                if len(cedula) < 6:
-                    errors.append(f"Fila {index + 2}: Cédula inválida ({cedula})")
-                    continue
-
-                profesor_data = {
-                    'nombre': nombre_completo,
-                    'cedula': cedula,
-                    'correo': correo,
-                    'contrasenia': cedula  # Contraseña por defecto
-                }
-
-                serializer = ProfesorSerializer(data=profesor_data)
-
-                if serializer.is_valid():
-                    serializer.save()
-                    created_count += 1
-                else:
-                    errors.append(f"Fila {index + 2}: {serializer.errors}")
+        try:
+            missing_columns = columnas_faltantes_profesores(libro)
+            if missing_columns:
+                return Response({
+                    'error': f'Faltan las siguientes columnas obligatorias: {", ".join(missing_columns)}'
+                }, status=status.HTTP_400_BAD_REQUEST)
 
-            except Exception as e:
-                errors.append(f"Fila {index + 2}: Error inesperado - {str(e)}")
-                continue
+            # Lectura y guardado por bloques (ver usuarios/importacion.py)
+            resultado = importar_profesores_excel(libro)
+        finally:
+            cerrar_libro_excel(libro)
 
         return Response({
             'message': 'Importación completada',
-            'created': created_count,
-            'total_rows': len(processed_df),
-            'errors': errors
+            'created': resultado['creados'],
+            'total_rows': resultado['filas'],
+            'total_errors': resultado['total_errores'],
+            'errors': resultado['errores'],
+            'seconds': resultado['segundos'],
+            'rows_per_second': resultado['filas_por_segundo']
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
@@ -646,166 +598,35 @@ def import_excel_estudiantes(request):
                 'error': 'El archivo debe ser Excel (.xlsx o .xls)'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Validar tamaño (máximo 10MB)
-        if excel_file.size > 10 * 1024 * 1024:
+        # Validar tamaño (IMPORTACION_EXCEL_MAX_MB; 0 = sin límite)
+        limite_mb = settings.IMPORTACION_EXCEL_MAX_MB
+        if limite_mb and excel_file.size > limite_mb * 1024 * 1024:
             return Response({
-                'error': 'El archivo es demasiado grande (máximo 10MB)'
+                'error': f'El archivo es demasiado grande (máximo {limite_mb}MB)'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Hojas objetivo
-        target_sheets = ['GRUPO VIRTUAL 1', 'EGP- 1A', 'EGP-1B', 'EGP -1C', 'EGP-2A', 'EGP- 2B', 'EGP-2C']
-        
-        # Leer todas las hojas
+        # Abrir el libro; las hojas se leen fila a fila al importar
         try:
-            all_sheets = pd.read_excel(excel_file, sheet_name=None, header=None)
+            libro = abrir_libro_excel(excel_file)
         except Exception as e:
             return Response({
                 'error': f'Error al leer el archivo Excel: {str(e)}'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        created_count = 0
-        updated_count = 0
-        errors = []
-        sheets_processed = []
-        
-        def process_sheet(sheet_name, df):
-            nonlocal created_count, updated_count, errors
-            
-            # Obtener el grupo de la fila 3, columna 2
-            try:
-                grupo = str(df.iloc[3, 2]).strip()
-                if not grupo or grupo == 'nan':
-                    grupo = sheet_name  # Usar el nombre de la hoja como fallback
-            except:
-                grupo = sheet_name
-            
-            # Buscar secciones PREMATRICULADOS y MATRICULADOS
-            prematricula_start = None
-            matriculados_start = None
-            
-            for i, row in df.iterrows():
-                row_text = ' '.join([str(cell).upper() for cell in row if str(cell) != 'nan']).strip()
-                
-                if 'PREMATRICULA' in row_text:
-                    prematricula_start = i
-                elif 'MATRICULA' in row_text and 'PREMATRICULA' not in row_text:
-                    matriculados_start = i
-            
-            sheet_students = 0
-            
-            def process_section(start_row, estado):
-                nonlocal sheet_students
-                
-                if start_row is None:
-                    return
-                
-                # Los encabezados están siempre en start_row + 1
-                header_row = start_row + 1
-                data_start = start_row + 2
-                
-                # Determinar dónde termina esta sección
-                end_row = len(df)
-                if estado == 'prematricula' and matriculados_start is not None:
-                    end_row = matriculados_start
-                
-                # Procesar cada fila de estudiantes
-                for i in range(data_start, end_row):
-                    try:
-                        if i >= len(df):
-                            break
-                            
-                        row = df.iloc[i]
-                        
-                        # Extraer datos (columnas: No., DOCUMENTO, APELLIDOS Y NOMBRES, EMAIL INSTITUCIONAL)
-                        documento = str(row.iloc[1]).strip() if len(row) > 1 else ""
-                        nombre = str(row.iloc[2]).strip() if len(row) > 2 else ""
-                        correo = str(row.iloc[3]).strip() if len(row) > 3 else ""
-                        
-                        # Validar que no sea una fila vacía o de separación
-                        if not documento or documento in ['nan', 'NaN', ''] or 'LISTADO' in str(row.iloc[0]).upper():
-                            continue
-                        
-                        if not nombre or nombre in ['nan', 'NaN', '']:
-                            continue
-                        
-                        # Limpiar documento (solo números)
-                        documento = ''.join(filter(str.isdigit, documento))
-                        if len(documento) < 6:
-                            errors.append(f"{sheet_name} - {estado} - Fila {i+1}: Documento inválido ({documento})")
-                            continue
-                        
-                        # Validar correo
-                        if not correo or correo in ['nan', 'NaN', '']:
-                            correo = f"temp{documento}@unbosque.edu.co"
-                        else:
-                            correo = correo.lower().strip()
-                        
-                        # Crear datos del estudiante
-                        estudiante_data = {
-                            'documento': documento,
-                            'nombre': nombre.upper(),
-                            'correo': correo,
-                            'grupo': grupo,
-                            'estado': estado
-                        }
-                        
-                        # Verificar si ya existe
-                        try:
-                            estudiante_existente = Estudiante.objects.get(documento=documento)
-                            # Actualizar datos existentes
-                            serializer = EstudianteSerializer(estudiante_existente, data=estudiante_data, partial=True)
-                            if serializer.is_valid():
-                                serializer.save()
-                                updated_count += 1
-                                sheet_students += 1
-                            else:
-                                errors.append(f"{sheet_name} - {estado} - Fila {i+1}: Error al actualizar - {serializer.errors}")
-                                
-                        except Estudiante.DoesNotExist:
-                            # Crear nuevo estudiante
-                            serializer = EstudianteSerializer(data=estudiante_data)
-                            if serializer.is_valid():
-                                serializer.save()
-                                created_count += 1
-                                sheet_students += 1
-                            else:
-                                errors.append(f"{sheet_name} - {estado} - Fila {i+1}: Error al crear - {serializer.errors}")
-                                
-                    except Exception as e:
-                        errors.append(f"{sheet_name} - {estado} - Fila {i+1}: Error inesperado - {str(e)}")
-                        continue
-            
-            # Procesar ambas secciones
-            process_section(prematricula_start, 'prematricula')
-            process_section(matriculados_start, 'matriculado')
-            
-            return {
-                'grupo': grupo,
-                'estudiantes_procesados': sheet_students,
-                'prematricula_row': prematricula_start,
-                'matriculados_row': matriculados_start
-            }
-        
-        # Procesar solo las hojas objetivo
-        for sheet_name in target_sheets:
-            if sheet_name in all_sheets:
-                df = all_sheets[sheet_name]
-                result = process_sheet(sheet_name, df)
-                sheets_processed.append({
-                    'hoja': sheet_name,
-                    **result
-                })
-            else:
-                errors.append(f"Hoja no encontrada: {sheet_name}")
+        try:
+            resultado = importar_estudiantes_excel(libro)
+        finally:
+            cerrar_libro_excel(libro)
         
         return Response({
             'mensaje': 'Importación completada',
-            'hojas_procesadas': len(sheets_processed),
-            'creados': created_count,
-            'actualizados': updated_count,
-            'total_estudiantes': created_count + updated_count,
-            'detalle_hojas': sheets_processed,
-            'errores': errors[:20] if errors else []  # Limitar errores mostrados
+            'hojas_procesadas': len(resultado['detalle_hojas']),
+            'creados': resultado['creados'],
+            'actualizados': resultado['actualizados'],
+            'total_estudiantes': resultado['creados'] + resultado['actualizados'],
+            'detalle_hojas': resultado['detalle_hojas'],
+            'total_errores': resultado['total_errores'],
+            'errores': resultado['errores']  # Solo los primeros MAXIMO_ERRORES
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -813,6 +634,88 @@ def import_excel_estudiantes(request):
             'error': f'Error inesperado al procesar archivo: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated, IsStaffUser])
+def trabajos_importacion(request):
+    """
+    GET: últimas importaciones del usuario.
+    POST: guardar el Excel (file) y encolar su importación (tipo: estudiantes o
+    profesores); responde 202 de inmediato y el comando procesar_importaciones
+    lo importa por bloques en segundo plano.
+    """
+    try:
+        if request.method == 'GET':
+            trabajos = TrabajoImportacion.objects.filter(solicitado_por=request.user)[:20]
+            serializer = TrabajoImportacionSerializer(trabajos, many=True, context={'request': request})
+            return Response(serializer.data)
+
+        tipo = request.data.get('tipo')
+        if tipo not in dict(TrabajoImportacion.TIPOS):
+            return Response({
+                'error': f'Tipo de importación no válido: {tipo}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if 'file' not in request.FILES:
+            return Response({
+                'error': 'No se proporcionó archivo'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        excel_file = request.FILES['file']
+        if not excel_file.name.endswith(('.xlsx', '.xls')):
+            return Response({
+                'error': 'El archivo debe ser Excel (.xlsx o .xls)'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        limite_mb = settings.IMPORTACION_EXCEL_MAX_MB
+        if limite_mb and excel_file.size > limite_mb * 1024 * 1024:
+            return Response({
+                'error': f'El archivo es demasiado grande (máximo {limite_mb}MB)'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Comprobar que el archivo se puede leer antes de encolarlo
+        try:
+            libro = abrir_libro_excel(excel_file)
+        except Exception as e:
+            return Response({
+                'error': f'Error al leer el archivo Excel: {str(e)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            faltantes = columnas_faltantes_profesores(libro) if tipo == TrabajoImportacion.PROFESORES else []
+        finally:
+            cerrar_libro_excel(libro)
+        if faltantes:
+            return Response({
+                'error': f'Faltan las siguientes columnas obligatorias: {", ".join(faltantes)}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        trabajo = TrabajoImportacion.objects.create(
+            tipo=tipo,
+            archivo=excel_file,
+            nombre_archivo=excel_file.name,
+            filas_por_lote=settings.IMPORTACION_FILAS_POR_LOTE,
+            solicitado_por=request.user,
+            mensaje='En cola'
+        )
+        serializer = TrabajoImportacionSerializer(trabajo, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsStaffUser])
+def estado_trabajo_importacion(request, trabajo_id):
+    """Progreso de una importación (el cliente consulta hasta completado o error)"""
+    try:
+        trabajo = TrabajoImportacion.objects.filter(pk=trabajo_id).first()
+        if trabajo is None:
+            return Response({'error': 'Trabajo no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+        serializer = TrabajoImportacionSerializer(trabajo, context={'request': request})
+        return Response(serializer.data)
+    except Exception as e:
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_current_user(request):
@@ -144,6 +144,105 @@ export const useEvaluacionApi = () => {
     }
   };
 
+  const guardarMatrizEvaluaciones = async (grupo, racs, estudiantes, puntajes) => {
+    // Califica todo el grupo en una petición: puntajes[i][j] es el puntaje del
+    // estudiante i en el RAC j (null para omitir la celda)
+    try {
+      const response = await fetch(
+        `${API_BASE_URL}/api/evaluaciones/matriz/`,
+        {
+          method: "POST",
+          headers: {
+            ...getAuthHeaders(),
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({ grupo, racs, estudiantes, puntajes }),
+        }
+      );
+
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(
+          errorData.error || "Error al guardar la matriz de evaluaciones"
+        );
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error("Error en guardarMatrizEvaluaciones:", error);
+      throw error;
+    }
+  };
+
+  const CLAVE_CAMBIOS_PENDIENTES = "evaluaciones_pendientes";
+  const CLAVE_TOKEN_SINCRONIZACION = "evaluaciones_token";
+
+  const leerCambiosPendientes = () =>
+    JSON.parse(localStorage.getItem(CLAVE_CAMBIOS_PENDIENTES) || "[]");
+
+  const encolarCambioEvaluacion = (estudianteId, racId, puntaje) => {
+    // Guarda la calificación localmente para enviarla cuando haya conexión;
+    // la clave hace que reenviar el mismo lote no duplique cambios
+    const cambio = {
+      clave: crypto.randomUUID(),
+      estudiante_id: estudianteId,
+      rac_id: racId,
+      puntaje,
+      fecha_cliente: new Date().toISOString(),
+    };
+    localStorage.setItem(
+      CLAVE_CAMBIOS_PENDIENTES,
+      JSON.stringify([...leerCambiosPendientes(), cambio])
+    );
+    return cambio;
+  };
+
+  const sincronizarEvaluaciones = async () => {
+    // Envía los cambios pendientes y trae las evaluaciones modificadas en el
+    // servidor desde la última sincronización. El servidor relee un margen
+    // anterior al token, así que data.evaluaciones puede repetir evaluaciones
+    // ya recibidas: se aplican por id, reemplazando la copia local
+    try {
+      const cambios = leerCambiosPendientes();
+      const response = await fetch(
+        `${API_BASE_URL}/api/evaluaciones/sincronizar/`,
+        {
+          method: "POST",
+          headers: {
+            ...getAuthHeaders(),
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({
+            token: localStorage.getItem(CLAVE_TOKEN_SINCRONIZACION),
+            cambios,
+          }),
+        }
+      );
+
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.error || "Error al sincronizar evaluaciones");
+      }
+
+      const data = await response.json();
+      // Los cambios con error tampoco se aplicarán en un reintento
+      const confirmados = new Set(data.resultados.map((r) => r.clave));
+      localStorage.setItem(
+        CLAVE_CAMBIOS_PENDIENTES,
+        JSON.stringify(
+          leerCambiosPendientes().filter((c) => !confirmados.has(c.clave))
+        )
+      );
+      if (data.token) {
+        localStorage.setItem(CLAVE_TOKEN_SINCRONIZACION, data.token);
+      }
+      return data;
+    } catch (error) {
+      console.error("Error en sincronizarEvaluaciones:", error);
+      throw error;
+    }
+  };
+
   const obtenerEstadisticasGenerales = async () => {
     try {
       const response = await fetch(
@@ -165,6 +264,32 @@ export const useEvaluacionApi = () => {
     }
   };
 
+  // Detalle estudiante × GAC paginado por cursor (siguiente_cursor = null en la última página)
+  const obtenerEstadisticasEstudiantes = async (cursor = null, limite = 100) => {
+    try {
+      const params = new URLSearchParams({ limite: String(limite) });
+      if (cursor !== null) {
+        params.append("cursor", String(cursor));
+      }
+      const response = await fetch(
+        `${API_BASE_URL}/api/evaluaciones/estadisticas/estudiantes/?${params}`,
+        {
+          method: "GET",
+          headers: getAuthHeaders(),
+        }
+      );
+
+      if (!response.ok) {
+        throw new Error("Error al obtener estadísticas por estudiante");
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error("Error en obtenerEstadisticasEstudiantes:", error);
+      throw error;
+    }
+  };
+
   const obtenerEstadisticasPorGAC = async () => {
     try {
       const response = await fetch(
@@ -494,10 +619,73 @@ export const useEvaluacionApi = () => {
     }
   };
 
-  const descargarPDFEstudiantesPorSemestre = async () => {
+  const encolarReporte = async (tipo, parametros = {}) => {
     try {
+      const response = await fetch(`${API_ROOT}/reportes/api/trabajos/`, {
+        method: "POST",
+        headers: getAuthHeaders(),
+        body: JSON.stringify({ tipo, parametros }),
+      });
+
+      if (!response.ok) {
+        throw new Error("Error al encolar el reporte");
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error("Error en encolarReporte:", error);
+      throw error;
+    }
+  };
+
+  const obtenerEstadoReporte = async (trabajoId) => {
+    try {
+      const response = await fetch(
+        `${API_ROOT}/reportes/api/trabajos/${trabajoId}/`,
+        {
+          method: "GET",
+          headers: getAuthHeaders(),
+        }
+      );
+
+      if (!response.ok) {
+        throw new Error("Error al consultar el estado del reporte");
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error("Error en obtenerEstadoReporte:", error);
+      throw error;
+    }
+  };
+
+  // Encola el reporte, consulta su estado cada `intervalo` ms y descarga el PDF al completarse
+  const generarReporteEnSegundoPlano = async (
+    tipo,
+    parametros = {},
+    { intervalo = 2000, tiempoMaximo = 15 * 60 * 1000, alProgresar } = {}
+  ) => {
+    try {
+      let trabajo = await encolarReporte(tipo, parametros);
+      const inicio = Date.now();
+
+      while (trabajo.estado === "pendiente" || trabajo.estado === "en_proceso") {
+        if (Date.now() - inicio > tiempoMaximo) {
+          throw new Error("El reporte está tardando demasiado; intente más tarde");
+        }
+        await new Promise((resolve) => setTimeout(resolve, intervalo));
+        trabajo = await obtenerEstadoReporte(trabajo.id);
+        if (alProgresar) {
+          alProgresar(trabajo);
+        }
+      }
+
+      if (trabajo.estado !== "completado") {
+        throw new Error(trabajo.mensaje || "Error al generar el reporte");
+      }
+
       const response = await fetch(
-        `${API_BASE_URL}/api/pdf/estudiantes-por-semestre/`,
+        `${API_ROOT}/reportes/api/trabajos/${trabajo.id}/descargar/`,
         {
           method: "GET",
           headers: getAuthHeaders(),
@@ -505,24 +693,30 @@ export const useEvaluacionApi = () => {
       );
 
       if (!response.ok) {
-        throw new Error("Error al descargar PDF de estudiantes por semestre");
+        throw new Error("Error al descargar el reporte generado");
       }
 
       const blob = await response.blob();
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
-      a.download = `informe_estudiantes_por_semestre_${new Date().toISOString().slice(0, 19).replace(/:/g, '-')}.pdf`;
+      a.download = trabajo.nombre_archivo || `${tipo}_${trabajo.id}.pdf`;
       document.body.appendChild(a);
       a.click();
       window.URL.revokeObjectURL(url);
       document.body.removeChild(a);
+      return trabajo;
     } catch (error) {
-      console.error("Error en descargarPDFEstudiantesPorSemestre:", error);
+      console.error("Error en generarReporteEnSegundoPlano:", error);
       throw error;
     }
   };
 
+  const descargarPDFEstudiantesPorSemestre = async (opciones = {}) => {
+    // Informe pesado: se genera con el worker de reportes en lugar de bloquear la petición
+    return generarReporteEnSegundoPlano("estudiantes_por_semestre", {}, opciones);
+  };
+
   const descargarPDFEstudianteIndividual = async (estudianteId) => {
     try {
       const response = await fetch(
@@ -552,6 +746,41 @@ export const useEvaluacionApi = () => {
     }
   };
 
+  const descargarZIPEstudiantes = async ({ grupo = "", periodo = "" } = {}) => {
+    // Un ZIP con el PDF detallado de cada estudiante del grupo y/o período
+    try {
+      const params = new URLSearchParams();
+      if (grupo) params.append("grupo", grupo);
+      if (periodo) params.append("periodo", periodo);
+
+      const response = await fetch(
+        `${API_BASE_URL}/api/pdf/estudiantes-zip/?${params.toString()}`,
+        {
+          method: "GET",
+          headers: getAuthHeaders(),
+        }
+      );
+
+      if (!response.ok) {
+        const errorData = await response.json().catch(() => ({}));
+        throw new Error(errorData.error || "Error al descargar los PDFs de los estudiantes");
+      }
+
+      const blob = await response.blob();
+      const url = window.URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = url;
+      a.download = `reportes_estudiantes_${grupo || periodo}_${new Date().toISOString().slice(0, 19).replace(/:/g, '-')}.zip`;
+      document.body.appendChild(a);
+      a.click();
+      window.URL.revokeObjectURL(url);
+      document.body.removeChild(a);
+    } catch (error) {
+      console.error("Error en descargarZIPEstudiantes:", error);
+      throw error;
+    }
+  };
+
   const descargarPDFProfesorIndividual = async (profesorId, profesorNombre) => {
     const response = await fetch(
       `${API_BASE_URL}/api/pdf/profesor-individual/${profesorId}/`,
@@ -590,7 +819,11 @@ export const useEvaluacionApi = () => {
     obtenerEvaluacionesEstudiante,
     crearOActualizarEvaluacion,
     crearEvaluacionesMasivas,
+    guardarMatrizEvaluaciones,
+    encolarCambioEvaluacion,
+    sincronizarEvaluaciones,
     obtenerEstadisticasGenerales,
+    obtenerEstadisticasEstudiantes,
     obtenerEstadisticasPorGAC,
     obtenerResultadosEstudiante,
     obtenerResultadosEstudiantePorSemestre,
@@ -607,6 +840,10 @@ export const useEvaluacionApi = () => {
     descargarPDFPorEstudiante,
     descargarPDFEstudiantesPorSemestre,
     descargarPDFEstudianteIndividual,
+    descargarZIPEstudiantes,
     descargarPDFProfesorIndividual,
+    encolarReporte,
+    obtenerEstadoReporte,
+    generarReporteEnSegundoPlano,
   };
 };
@@ -957,6 +957,73 @@ export const importExcelEstudiantes = async (file) => {
   }
 };
 
+// Encola la importación de un Excel (tipo: "estudiantes" o "profesores");
+// el servidor responde de inmediato y la procesa en segundo plano
+export const encolarImportacionExcel = async (tipo, file) => {
+  const token = localStorage.getItem("token");
+  if (!token) throw new Error("Token no encontrado");
+
+  const formData = new FormData();
+  formData.append("tipo", tipo);
+  formData.append("file", file);
+
+  try {
+    const response = await axios.post(`${API_URL}/importaciones/`, formData, {
+      headers: {
+        Authorization: `Token ${token}`,
+        "Content-Type": "multipart/form-data",
+      },
+    });
+    return response.data;
+  } catch (error) {
+    console.error("Error al encolar la importación:", error);
+    throw error;
+  }
+};
+
+export const obtenerEstadoImportacion = async (trabajoId) => {
+  const token = localStorage.getItem("token");
+  if (!token) throw new Error("Token no encontrado");
+
+  try {
+    const response = await axios.get(`${API_URL}/importaciones/${trabajoId}/`, {
+      headers: {
+        Authorization: `Token ${token}`,
+      },
+    });
+    return response.data;
+  } catch (error) {
+    console.error("Error al consultar la importación:", error);
+    throw error;
+  }
+};
+
+// Encola la importación y consulta su progreso cada `intervalo` ms hasta que termine
+export const importarExcelEnSegundoPlano = async (
+  tipo,
+  file,
+  { intervalo = 2000, tiempoMaximo = 30 * 60 * 1000, alProgresar } = {}
+) => {
+  let trabajo = await encolarImportacionExcel(tipo, file);
+  const inicio = Date.now();
+
+  while (trabajo.estado === "pendiente" || trabajo.estado === "en_proceso") {
+    if (Date.now() - inicio > tiempoMaximo) {
+      throw new Error("La importación está tardando demasiado; consulte su estado más tarde");
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalo));
+    trabajo = await obtenerEstadoImportacion(trabajo.id);
+    if (alProgresar) {
+      alProgresar(trabajo);
+    }
+  }
+
+  if (trabajo.estado !== "completado") {
+    throw new Error(trabajo.mensaje || "Error al importar el archivo");
+  }
+  return trabajo;
+};
+
 export const exportEstudiantesExcel = async () => {
   const token = localStorage.getItem("token");
   if (!token) throw new Error("Token no encontrado");